@@ -33,6 +33,7 @@ from storybench.models.directus_models import (
     CriterionEvaluation
 )
 from storybench.models.response import Response, ResponseLLMEvaluation
+from storybench.database.services.judge_prompts import JudgePrompt, build_directus_sequence_judge_prompt
 
 # Configure logging
 logging.basicConfig(
@@ -209,50 +210,10 @@ class AutomatedEvaluationRunner:
             logger.error(f"Error creating evaluator for {provider}/{model_config['model_id']}: {str(e)}")
             return None
     
-    def _build_evaluation_prompt(self, responses: List[Dict], evaluation_criteria: StorybenchEvaluationStructure) -> str:
+    def _build_evaluation_prompt(self, responses: List[Dict], evaluation_criteria: StorybenchEvaluationStructure) -> JudgePrompt:
         """Build the evaluation prompt for the LLM using Directus criteria."""
-        
-        # Build criteria descriptions
-        criteria_text = ""
-        for criterion_key, criterion in evaluation_criteria.criteria.items():
-            criteria_text += f"\n{criterion.name}:\n{criterion.criteria}\nScale: {criterion.scale[0]}-{criterion.scale[1]}\n"
-        
-        prompt = f"""Evaluate this {len(responses)}-response creative writing sequence for coherence and quality.
-
-EVALUATION CRITERIA:
-{criteria_text}
-
-SCORING GUIDELINES:
-{evaluation_criteria.scoring_guidelines}
-
-SEQUENCE TO EVALUATE:
-"""        
-        for i, resp in enumerate(responses, 1):
-            prompt += f"\n--- Response {i} ---\n{resp['response']}\n"
-        
-        prompt += f"""
-RESPONSE METADATA:
-- Model: {responses[0]['model_name']}
-- Sequence: {responses[0]['sequence_name']}
-
-Please provide your evaluation in this exact format:
-
-CREATIVITY: [score 1-5]
-[brief justification]
-
-COHERENCE: [score 1-5]
-[brief justification]
-
-CHARACTER_DEPTH: [score 1-5]
-[brief justification]
-
-[Continue for all criteria...]
-
-OVERALL ASSESSMENT:
-[summary paragraph]
-"""
-        
-        return prompt    
+        return build_directus_sequence_judge_prompt(responses, evaluation_criteria)
+    
     def _parse_evaluation_response(self, evaluation_text: str, evaluation_criteria: StorybenchEvaluationStructure) -> List[CriterionEvaluation]:
         """Parse the LLM evaluation response into structured criterion evaluations."""
         
@@ -319,23 +280,20 @@ OVERALL ASSESSMENT:
             return None
         
         try:
-            # Build evaluation prompt
-            evaluation_prompt = self._build_evaluation_prompt(sequence_responses, eval_criteria)
+            # Build evaluation prompt; the instructions are identical for every
+            # sequence, so they form a prefix OpenAI can serve from its cache
+            judge_prompt = self._build_evaluation_prompt(sequence_responses, eval_criteria)
             
             # Call OpenAI API for evaluation
             completion = await self.openai_client.chat.completions.create(
                 model=self.config['evaluation']['evaluator_model'],
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert evaluator of creative writing. Provide detailed, objective assessments based on the given criteria."
-                    },
-                    {"role": "user", "content": evaluation_prompt}
-                ],
+                messages=judge_prompt.as_context().to_messages(judge_prompt.content),
                 temperature=self.config['evaluation']['temperature_evaluation'],
                 max_tokens=2000
             )            
             evaluation_text = completion.choices[0].message.content
+            usage = getattr(completion, "usage", None)
+            prompt_details = getattr(usage, "prompt_tokens_details", None)
             
             # Track evaluation cost
             if hasattr(completion, 'usage'):
@@ -349,7 +307,9 @@ OVERALL ASSESSMENT:
             return {
                 "raw_output": evaluation_text,
                 "criteria_results": criterion_evaluations,
-                "evaluator_model": self.config['evaluation']['evaluator_model']
+                "evaluator_model": self.config['evaluation']['evaluator_model'],
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "cached_prompt_tokens": getattr(prompt_details, "cached_tokens", None)
             }
             
         except Exception as e:
@@ -441,6 +401,8 @@ OVERALL ASSESSMENT:
                         "evaluation_criteria_id": f"directus_v{eval_criteria.version}",
                         "criteria_results": [asdict(cr) for cr in evaluation_result['criteria_results']],
                         "raw_evaluator_output": evaluation_result['raw_output'],
+                        "prompt_tokens": evaluation_result['prompt_tokens'],
+                        "cached_prompt_tokens": evaluation_result['cached_prompt_tokens'],
                         "timestamp": datetime.utcnow()
                     }
                     
@@ -7,6 +7,8 @@ evaluation pipeline for maximum performance.
 
 Usage:
     python run_parallel_pipeline.py [--models model1,model2] [--max-concurrent 5]
+    python run_parallel_pipeline.py --workers 4                  # 4 local processes
+    python run_parallel_pipeline.py --evaluation-id <id> --rate-share 0.5  # join from another host
 """
 
 import os
@@ -32,6 +34,8 @@ from storybench.database.connection import init_database
 from storybench.database.services.evaluation_runner import DatabaseEvaluationRunner
 from storybench.evaluators.litellm_evaluator import LiteLLMEvaluator
 from storybench.evaluators.api_evaluator import APIEvaluator
+from storybench.parallel import RateLimitManager
+from storybench.parallel.sharding import default_rate_share, launch_local_shards, wait_for_shards
 
 # Configure logging
 logging.basicConfig(
@@ -172,8 +176,16 @@ class ParallelPipelineRunner:
     async def run_parallel_pipeline(self, 
                                   selected_models: Optional[List[str]] = None,
                                   max_concurrent: int = 5,
-                                  num_runs: int = 3) -> Dict:
-        """Run the complete parallel evaluation pipeline."""
+                                  num_runs: int = 3,
+                                  evaluation_id: Optional[str] = None,
+                                  workers: int = 1,
+                                  rate_share: Optional[float] = None) -> Dict:
+        """Run the complete parallel evaluation pipeline.
+        
+        With ``evaluation_id`` this process joins an existing evaluation and
+        claims whatever work is left; ``workers`` > 1 launches that many local
+        processes sharing the evaluation and the provider rate limits.
+        """
         
         logger.info("\n🚀 StoryBench Parallel Pipeline")
         logger.info("=" * 60)
@@ -214,19 +226,37 @@ class ParallelPipelineRunner:
             
             # Update parallel runner concurrency
             self.evaluation_runner.parallel_runner.max_concurrent_sequences = max_concurrent
+            share = rate_share or default_rate_share(workers)
+            if share != 1.0:
+                self.evaluation_runner.parallel_runner.rate_limit_manager = RateLimitManager(share=share)
             
-            # Start evaluation
-            logger.info(f"\n🚀 Starting parallel evaluation...")
-            evaluation = await self.evaluation_runner.start_evaluation(
-                models=[m['name'] for m in all_models],
-                sequences=sequences,
-                criteria={"pipeline_version": "parallel_v2.0"},
-                global_settings={"num_runs": num_runs}
-            )
-            
-            evaluation_id = str(evaluation.id)
+            if evaluation_id:
+                logger.info(f"\n🔗 Joining evaluation {evaluation_id} ({share:.0%} of provider limits)")
+            else:
+                # Start evaluation
+                logger.info(f"\n🚀 Starting parallel evaluation...")
+                evaluation = await self.evaluation_runner.start_evaluation(
+                    models=[m['name'] for m in all_models],
+                    sequences=sequences,
+                    criteria={"pipeline_version": "parallel_v2.0"},
+                    global_settings={"num_runs": num_runs}
+                )
+                evaluation_id = str(evaluation.id)
             logger.info(f"📋 Evaluation ID: {evaluation_id}")
             
+            shard_processes = []
+            if workers > 1:
+                await self.evaluation_runner.task_repo.enqueue_tasks(
+                    evaluation_id, [m['name'] for m in all_models], list(sequences.keys()), num_runs
+                )
+                command = [sys.executable, str(Path(__file__).resolve()),
+                           "--config", self.config_path,
+                           "--max-concurrent", str(max_concurrent),
+                           "--runs", str(num_runs)]
+                if selected_models:
+                    command += ["--models", ",".join(selected_models)]
+                shard_processes = await launch_local_shards(command, evaluation_id, workers, share)
+            
             # Create evaluator factory
             evaluator_factory = self.create_evaluator_factory()
             
@@ -239,6 +269,9 @@ class ParallelPipelineRunner:
                 evaluator_factory=evaluator_factory
             )
             
+            if shard_processes:
+                await wait_for_shards(shard_processes)
+            
             end_time = datetime.now()
             total_duration = (end_time - start_time).total_seconds()
             
@@ -324,6 +357,9 @@ async def main():
     parser.add_argument('--config', default='config/models.yaml', help='Path to models config')
     parser.add_argument('--max-concurrent', type=int, default=5, help='Max concurrent sequences')
     parser.add_argument('--runs', type=int, default=3, help='Number of runs per sequence')
+    parser.add_argument('--evaluation-id', help='Join an existing evaluation instead of starting one')
+    parser.add_argument('--workers', type=int, default=1, help='Number of cooperating local worker processes')
+    parser.add_argument('--rate-share', type=float, help='Fraction of provider rate limits for this process (default: 1/workers)')
     parser.add_argument('--dry-run', action='store_true', help='Validate config without running')
     
     args = parser.parse_args()
@@ -370,7 +406,10 @@ async def main():
     results = await runner.run_parallel_pipeline(
         selected_models=selected_models,
         max_concurrent=args.max_concurrent,
-        num_runs=args.runs
+        num_runs=args.runs,
+        evaluation_id=args.evaluation_id,
+        workers=args.workers,
+        rate_share=args.rate_share
     )
     
     if results['success']:
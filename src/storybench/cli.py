@@ -3,6 +3,7 @@
 import asyncio
 import click
 import os
+import sys
 import json
 from pathlib import Path
 from datetime import datetime
@@ -15,6 +16,9 @@ from .evaluators.factory import EvaluatorFactory
 from .database.services.evaluation_runner import DatabaseEvaluationRunner
 from .database.services.sequence_evaluation_service import SequenceEvaluationService
 from .database.repositories.criteria_repo import CriteriaRepository
+from .utils.probe_cache import probe_cache
+from .parallel import RateLimitManager
+from .parallel.sharding import default_rate_share, launch_local_shards, wait_for_shards
 from tqdm import tqdm
 
 
@@ -220,7 +224,8 @@ async def _process_model(evaluator, cfg, tracker, config_hash, sequences, prompt
                         prompt=prompt_data["text"],
                         temperature=cfg.global_settings.temperature,
                         max_tokens=cfg.global_settings.max_tokens,
-                        max_retries=cfg.evaluation.max_retries
+                        max_retries=cfg.evaluation.max_retries,
+                        cache_sample=run
                     )
                     
                     # Add prompt text to response
@@ -765,6 +770,49 @@ async def _sync_prompts_async(version, list_versions, test_connection):
         click.echo(f"❌ Error: {e}")
 
 
+async def _configure_response_cache(backend, directory, ttl_hours, max_entries, database):
+    """Point the shared response cache at a bounded disk or MongoDB backend."""
+    from .utils.response_cache import response_cache, DiskCacheBackend, MongoCacheBackend
+    ttl_seconds = ttl_hours * 3600 if ttl_hours is not None else None
+    if backend == 'disk':
+        response_cache.configure(DiskCacheBackend(directory, max_entries=max_entries, ttl_seconds=ttl_seconds))
+        click.echo(f"🗄️  Response cache: {directory}")
+    else:
+        mongo_backend = MongoCacheBackend(database, max_entries=max_entries, ttl_seconds=ttl_seconds)
+        await mongo_backend.ensure_indexes()
+        response_cache.configure(mongo_backend)
+        click.echo("🗄️  Response cache: MongoDB")
+
+
+async def _echo_predicted_makespan(all_models, prompts_data, runs, max_concurrent, share):
+    """Print the predicted wall-clock time of a global-schedule run from response history."""
+    try:
+        from .database.connection import init_database
+        database = await init_database()
+    except Exception as e:
+        click.echo(f"  🔮 Predicted makespan: unavailable (no database: {e})")
+        return
+    
+    runner = DatabaseEvaluationRunner(database, enable_parallel=True)
+    runner.parallel_runner.max_concurrent_sequences = max_concurrent
+    if share != 1.0:
+        runner.parallel_runner.rate_limit_manager = RateLimitManager(share=share)
+    
+    estimator = await runner.build_latency_estimator([m['name'] for m in all_models])
+    without_history = [m['name'] for m in all_models if not estimator.has_history(m['name'])]
+    
+    config_order = runner.parallel_runner.predict_makespan(
+        all_models, prompts_data, runs, estimator, longest_first=False)
+    longest_first = runner.parallel_runner.predict_makespan(
+        all_models, prompts_data, runs, estimator, longest_first=True)
+    
+    click.echo(f"  🔮 Predicted makespan (config order): {config_order / 60:.1f} minutes")
+    click.echo(f"  🔮 Predicted makespan (--latency-aware): {longest_first / 60:.1f} minutes")
+    if without_history:
+        click.echo(f"  ⚠️  No latency history for {', '.join(without_history)} "
+                   f"(assuming {estimator.default_seconds:.0f}s per prompt)")
+
+
 @cli.command('parallel')
 @click.option('--config', '-c', default='config/models.yaml', help='Path to models config')
 @click.option('--prompts', '-p', default='config/prompts.json', help='Path to prompts config')
@@ -772,18 +820,45 @@ async def _sync_prompts_async(version, list_versions, test_connection):
 @click.option('--sequences', '-s', help='Comma-separated list of specific sequences to run')
 @click.option('--runs', '-r', default=3, help='Number of runs per sequence (default: 3)')
 @click.option('--max-concurrent', default=5, help='Max concurrent sequences (default: 5)')
+@click.option('--per-model', is_flag=True, help='Process models one at a time instead of the global scheduler')
+@click.option('--concurrent-runs', is_flag=True, help='Run the variance runs of a sequence concurrently (with --per-model)')
+@click.option('--probe-ttl', default=300.0, help='Seconds to reuse a model connectivity check (default: 300)')
+@click.option('--evaluation-id', help='Join an existing evaluation (resume, or add a worker on another host)')
+@click.option('--workers', default=1, help='Number of cooperating local worker processes (default: 1)')
+@click.option('--rate-share', type=float, help='Fraction of provider rate limits for this process (default: 1/workers)')
+@click.option('--latency-aware', is_flag=True, help='Start the longest-expected work first, using historical generation times')
+@click.option('--hedge', is_flag=True, help='Send a duplicate request when one runs past the model\'s p95 latency')
+@click.option('--response-cache', type=click.Choice(['off', 'disk', 'mongo']), default='off',
+              help='Reuse responses to identical requests (default: off)')
+@click.option('--response-cache-dir', default='.storybench_cache/responses', help='Directory for --response-cache disk')
+@click.option('--response-cache-ttl', type=float,
+              help='Hours to keep cached responses (default: no expiry; size is capped by --response-cache-max-entries)')
+@click.option('--response-cache-max-entries', default=10000,
+              help='Most cached responses to keep, evicting the least recently used (default: 10000)')
 @click.option('--dry-run', is_flag=True, help='Validate config without running')
-def parallel_evaluation(config, prompts, models, sequences, runs, max_concurrent, dry_run):
+def parallel_evaluation(config, prompts, models, sequences, runs, max_concurrent, per_model, concurrent_runs,
+                        probe_ttl, evaluation_id, workers, rate_share, latency_aware, hedge,
+                        response_cache, response_cache_dir, response_cache_ttl, response_cache_max_entries, dry_run):
     """
     Run parallel evaluation with 5x speedup via sequence-level parallelization.
     
     Phase 2.0 feature: Runs 5 sequences concurrently per model for dramatic
     performance improvement while maintaining context isolation.
+    
+    Several processes can share one evaluation: --workers N launches N local
+    processes, and --evaluation-id joins an evaluation from any host. Units
+    are claimed from the shared task queue, so no work is done twice.
     """
     click.echo("🚀 StoryBench Phase 2.0 - Parallel Evaluation")
     click.echo("=" * 60)
     
+    if per_model and (workers > 1 or evaluation_id):
+        click.echo("❌ --workers and --evaluation-id require the global scheduler (drop --per-model)")
+        return
+    
     async def run_parallel():
+        nonlocal evaluation_id
+        shard_processes = []
         try:
             # Load configuration
             import yaml
@@ -818,6 +893,9 @@ def parallel_evaluation(config, prompts, models, sequences, runs, max_concurrent
             click.echo(f"  📈 Total API calls: {len(all_models) * len(prompts_data) * 3 * runs}")
             
             if dry_run:
+                if not per_model:
+                    await _echo_predicted_makespan(all_models, prompts_data, runs, max_concurrent,
+                                                   rate_share or default_rate_share(workers))
                 click.echo("\n✅ Dry run successful - configuration valid")
                 return
             
@@ -848,20 +926,58 @@ def parallel_evaluation(config, prompts, models, sequences, runs, max_concurrent
             click.echo("⚡ Initializing parallel evaluation runner...")
             runner = DatabaseEvaluationRunner(database, enable_parallel=True)
             runner.parallel_runner.max_concurrent_sequences = max_concurrent
+            runner.parallel_runner.global_scheduling = not per_model
+            runner.parallel_runner.concurrent_runs = concurrent_runs
+            probe_cache.configure(ttl_seconds=probe_ttl)
+            share = rate_share or default_rate_share(workers)
+            if share != 1.0:
+                runner.parallel_runner.rate_limit_manager = RateLimitManager(share=share)
+            runner.parallel_runner.rate_limit_manager.tail_policy.hedging = hedge
+            if response_cache != 'off':
+                await _configure_response_cache(response_cache, response_cache_dir, response_cache_ttl,
+                                                response_cache_max_entries, database)
             click.echo("✅ Parallel runner ready")
             
-            # Start evaluation
-            click.echo("\n🚀 Starting parallel evaluation...")
-            evaluation = await runner.start_evaluation(
-                models=[m['name'] for m in all_models],
-                sequences=prompts_data,
-                criteria={"parallel_test": True},
-                global_settings={"num_runs": runs}
-            )
-            
-            evaluation_id = str(evaluation.id)
+            if evaluation_id:
+                click.echo(f"\n🔗 Joining evaluation {evaluation_id} ({share:.0%} of provider limits)")
+            else:
+                # Start evaluation
+                click.echo("\n🚀 Starting parallel evaluation...")
+                evaluation = await runner.start_evaluation(
+                    models=[m['name'] for m in all_models],
+                    sequences=prompts_data,
+                    criteria={"parallel_test": True},
+                    global_settings={"num_runs": runs}
+                )
+                evaluation_id = str(evaluation.id)
             click.echo(f"📋 Evaluation ID: {evaluation_id}")
             
+            if workers > 1:
+                # Enqueue once up front so the shards only ever claim
+                await runner.task_repo.enqueue_tasks(
+                    evaluation_id, [m['name'] for m in all_models], list(prompts_data.keys()), runs
+                )
+                command = [sys.executable, "-m", "storybench.cli", "parallel",
+                           "--config", config, "--prompts", prompts, "--runs", str(runs),
+                           "--max-concurrent", str(max_concurrent), "--probe-ttl", str(probe_ttl)]
+                if models:
+                    command += ["--models", models]
+                if sequences:
+                    command += ["--sequences", sequences]
+                if concurrent_runs:
+                    command.append("--concurrent-runs")
+                if latency_aware:
+                    command.append("--latency-aware")
+                if hedge:
+                    command.append("--hedge")
+                if response_cache != 'off':
+                    command += ["--response-cache", response_cache, "--response-cache-dir", response_cache_dir,
+                                "--response-cache-max-entries", str(response_cache_max_entries)]
+                    if response_cache_ttl is not None:
+                        command += ["--response-cache-ttl", str(response_cache_ttl)]
+                shard_processes = await launch_local_shards(command, evaluation_id, workers, share)
+                click.echo(f"👥 Launched {len(shard_processes)} additional worker processes")
+            
             # Create evaluator factory
             def create_evaluator(model_config):
                 from .evaluators.api_evaluator import APIEvaluator
@@ -883,9 +999,15 @@ def parallel_evaluation(config, prompts, models, sequences, runs, max_concurrent
                 models=all_models,
                 sequences=prompts_data,
                 num_runs=runs,
-                evaluator_factory=create_evaluator
+                evaluator_factory=create_evaluator,
+                latency_aware=latency_aware
             )
             
+            if shard_processes:
+                return_codes = await wait_for_shards(shard_processes)
+                failed_shards = sum(1 for code in return_codes if code != 0)
+                click.echo(f"👥 Worker processes finished ({failed_shards} failed)")
+            
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
@@ -897,6 +1019,8 @@ def parallel_evaluation(config, prompts, models, sequences, runs, max_concurrent
             if results.get('success', False):
                 click.echo(f"✅ Evaluation completed successfully!")
                 click.echo(f"⏱️  Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
+                if results.get('predicted_makespan_seconds') is not None:
+                    click.echo(f"🔮 Predicted: {results['predicted_makespan_seconds'] / 60:.1f} minutes")
                 click.echo(f"👥 Workers: {results['successful_workers']}/{results['total_workers']} successful")
                 
                 if 'performance_metrics' in results:
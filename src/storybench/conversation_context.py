@@ -0,0 +1,104 @@
+"""Segment-based conversation context shared by sequence workers and evaluators."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Flat rendering: a turn's prompt and response are joined by RESPONSE_SEPARATOR,
+# turns (and the current prompt) by TURN_SEPARATOR
+TURN_SEPARATOR = "\n\n---\n\n"
+RESPONSE_SEPARATOR = "\n\n"
+
+SYSTEM = "system"
+USER = "user"
+ASSISTANT = "assistant"
+
+
+@dataclass(frozen=True)
+class ContextSegment:
+    """One immutable piece of a conversation: instructions, a prompt or a response."""
+    role: str
+    text: str
+    name: Optional[str] = None
+    _token_counts: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+
+    def tokens(self, token_counter) -> int:
+        """Token count under ``token_counter``, computed once per tokenizer."""
+        count = self._token_counts.get(token_counter.name)
+        if count is None:
+            count = self._token_counts[token_counter.name] = token_counter.count(self.text)
+        return count
+
+
+class ConversationContext:
+    """
+    The history of one sequence run as prompt/response segments.
+
+    Appending is O(1) and never copies earlier turns; token counts are
+    cached on each segment, so checking the context against a limit only
+    tokenizes what was added since the last check. The same history renders
+    to a flat string for single-prompt backends or to chat messages.
+    """
+
+    def __init__(self):
+        self.segments: List[ContextSegment] = []
+        self._rendered: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    @property
+    def turn_count(self) -> int:
+        return sum(1 for segment in self.segments if segment.role == USER)
+
+    def append(self, role: str, text: str, name: Optional[str] = None) -> ContextSegment:
+        segment = ContextSegment(role=role, text=text, name=name)
+        self.segments.append(segment)
+        self._rendered = None
+        return segment
+
+    def add_system(self, text: str) -> ContextSegment:
+        """Instructions that precede every turn, such as a judge's criteria."""
+        return self.append(SYSTEM, text)
+
+    def add_turn(self, prompt: str, response: str, name: Optional[str] = None):
+        """Record a completed prompt and its response."""
+        self.append(USER, prompt, name)
+        self.append(ASSISTANT, response, name)
+
+    def clear(self):
+        self.segments = []
+        self._rendered = None
+
+    def render(self, prompt: Optional[str] = None) -> str:
+        """Flat string of the history, followed by ``prompt`` if given."""
+        if self._rendered is None:
+            parts = []
+            for segment in self.segments:
+                if segment.role == ASSISTANT:
+                    parts.append(RESPONSE_SEPARATOR)
+                elif parts:
+                    parts.append(TURN_SEPARATOR)
+                parts.append(segment.text)
+            self._rendered = "".join(parts)
+        if prompt is None:
+            return self._rendered
+        return f"{self._rendered}{TURN_SEPARATOR}{prompt}" if self._rendered else prompt
+
+    def to_messages(self, prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """Chat messages for the history, ending with ``prompt`` as a user message if given."""
+        messages = [{"role": segment.role, "content": segment.text} for segment in self.segments]
+        if prompt is not None:
+            messages.append({"role": USER, "content": prompt})
+        return messages
+
+    def token_count(self, token_counter, prompt: Optional[str] = None) -> int:
+        """Tokens in the flat rendering, from the cached segment counts."""
+        total = sum(segment.tokens(token_counter) for segment in self.segments)
+        responses = sum(1 for segment in self.segments if segment.role == ASSISTANT)
+        separators = len(self.segments) - responses - (1 if self.segments else 0)
+        if prompt:
+            total += token_counter.count(prompt)
+            separators += 1 if self.segments else 0
+        total += separators * token_counter.count(TURN_SEPARATOR)
+        total += responses * token_counter.count(RESPONSE_SEPARATOR)
+        return total
@@ -149,6 +149,27 @@ class DatabaseConnection:
             await evaluations_collection.create_index("config_hash", background=True)
             logger.info("✅ Created index: evaluations.config_hash")
             
+            # Judge results: the unevaluated-response anti-join looks them up by response
+            await self.database.response_llm_evaluations.create_index("response_id", background=True)
+            logger.info("✅ Created index: response_llm_evaluations.response_id")
+            
+            # Evaluation task queue: one task per unit, claims filter on status and lease
+            tasks_collection = self.database.evaluation_tasks
+            await tasks_collection.create_index([
+                ("evaluation_id", 1),
+                ("model_name", 1),
+                ("sequence", 1),
+                ("run", 1)
+            ], unique=True, background=True)
+            logger.info("✅ Created unique index: evaluation_tasks.evaluation_id+model_name+sequence+run")
+            
+            await tasks_collection.create_index([
+                ("evaluation_id", 1),
+                ("status", 1),
+                ("lease_expires_at", 1)
+            ], background=True)
+            logger.info("✅ Created compound index: evaluation_tasks.evaluation_id+status+lease_expires_at")
+            
             logger.info("Database indexes created successfully")
             
         except Exception as e:
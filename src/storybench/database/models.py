@@ -66,6 +66,14 @@ class ResponseStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     IN_PROGRESS = "in_progress"
+    PARTIAL = "partial"  # Streamed response cut short; kept for inspection, never judged
+
+class TaskStatus(str, Enum):
+    """Evaluation task queue status enumeration."""
+    PENDING = "pending"
+    LEASED = "leased"
+    COMPLETED = "completed"
+    FAILED = "failed"
 
 # Configuration Component Models (used within main config documents or other models)
 
@@ -248,6 +256,23 @@ class Response(BaseModel):
     status: ResponseStatus = ResponseStatus.COMPLETED
     error_message: Optional[str] = None
 
+class EvaluationTask(BaseModel):
+    """Queue document for one (evaluation, model, sequence, run) unit of work."""
+    model_config = ConfigDict(protected_namespaces=(), populate_by_name=True, arbitrary_types_allowed=True)
+    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    evaluation_id: str
+    model_name: str
+    sequence: str
+    run: int
+    status: TaskStatus = TaskStatus.PENDING
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    attempts: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+
 class EvaluationScore(BaseModel):
     """Automated evaluation score document."""
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -292,6 +317,8 @@ class ResponseLLMEvaluation(BaseModel):
     
     raw_evaluator_output: Optional[str] = None # For debugging, store the raw JSON/text from the evaluator LLM
     error_message: Optional[str] = None # If the evaluation attempt failed for this LLM
+    prompt_tokens: Optional[int] = None # Judge prompt size as reported by the provider
+    cached_prompt_tokens: Optional[int] = None # Part of prompt_tokens served from the provider's prefix cache
 
 class ApiKeys(BaseModel):
     """API keys configuration document with encryption."""
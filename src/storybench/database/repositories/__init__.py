@@ -7,6 +7,7 @@ from .prompt_repo import PromptRepository
 from .response_repo import ResponseRepository
 from .criteria_repo import CriteriaRepository
 from .response_llm_evaluation_repository import ResponseLLMEvaluationRepository
+from .task_repo import EvaluationTaskRepository
 
 __all__ = [
     "BaseRepository",
@@ -16,4 +17,5 @@ __all__ = [
     "ResponseRepository",
     "CriteriaRepository",
     "ResponseLLMEvaluationRepository",
+    "EvaluationTaskRepository",
 ]
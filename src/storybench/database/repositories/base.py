@@ -34,7 +34,9 @@ class BaseRepository(Generic[T], ABC):
         
     async def create(self, document: T) -> T:
         """
-        Create a new document.
+        Create a new document and read it back from the database.
+        
+        Hot write paths should use ``insert``, which skips the read-back.
         
         Args:
             document: Document to create
@@ -43,17 +45,7 @@ class BaseRepository(Generic[T], ABC):
             Created document (Pydantic model instance)
         """
         try:
-            # For Pydantic V2, use model_dump instead of dict
-            document_dict = document.model_dump(by_alias=True)  # exclude_unset defaults to False
-            
-            # If _id is part of the model and is None (e.g. from default_factory but not yet set),
-            # Pydantic might include it as None. Motor typically expects _id to be absent for auto-generation
-            # or present with a value.
-            if "_id" in document_dict and document_dict["_id"] is None:
-                document_dict.pop("_id")
-            # No need to explicitly handle document.id here if model_dump(by_alias=True) correctly maps 'id' to '_id'.
-            # If 'id' is a PyObjectId and already generated, it will be included (and possibly stringified by json_encoders
-            # if model_dump is used for serialization to JSON, but here it's for a Python dict for Motor).
+            document_dict = self._to_document(document)
 
             result = await self.collection.insert_one(document_dict)
             
@@ -81,6 +73,65 @@ class BaseRepository(Generic[T], ABC):
             logger.error(f"Error creating document in {self.collection_name}: {e}")
             raise
             
+    def _to_document(self, document: T) -> Dict[str, Any]:
+        """Dump a model for insertion, leaving ``_id`` out when it is unset."""
+        document_dict = document.model_dump(by_alias=True)
+        if "_id" in document_dict and document_dict["_id"] is None:
+            document_dict.pop("_id")
+        return document_dict
+
+    async def insert(self, document: T) -> T:
+        """
+        Create a new document without reading it back.
+        
+        Unlike ``create``, this skips the ``find_by_id`` round trip and the
+        second validation. The caller's model is modified in place: its
+        ``id`` is set to the inserted ``_id`` and the same instance is
+        returned, so a caller that still needs the unsaved state must copy
+        it first.
+        
+        Args:
+            document: Document to create; its ``id`` is overwritten
+            
+        Returns:
+            The same document instance
+        """
+        try:
+            result = await self.collection.insert_one(self._to_document(document))
+            document.id = result.inserted_id
+            return document
+            
+        except Exception as e:
+            logger.error(f"Error inserting document in {self.collection_name}: {e}")
+            raise
+
+    async def bulk_create(self, documents: List[T], ordered: bool = True) -> List[T]:
+        """
+        Create multiple documents in a single batch operation.
+        
+        Args:
+            documents: Documents to create
+            ordered: Stop at the first failed insert (True) or insert the rest
+            
+        Returns:
+            The same document instances, each modified in place with ``id``
+            set to the inserted ``_id``
+        """
+        if not documents:
+            return []
+            
+        try:
+            result = await self.collection.insert_many(
+                [self._to_document(document) for document in documents], ordered=ordered
+            )
+            for document, inserted_id in zip(documents, result.inserted_ids):
+                document.id = inserted_id
+            return documents
+            
+        except Exception as e:
+            logger.error(f"Error bulk creating documents in {self.collection_name}: {e}")
+            raise
+
     async def find_by_id(self, document_id: ObjectId) -> Optional[T]:
         """
         Find document by ID.
@@ -47,6 +47,27 @@ class EvaluationRepository(BaseRepository[Evaluation]):
             
         return await self.update_by_id(evaluation_id, update_data)
         
+    async def increment_progress(self, evaluation_id: ObjectId,
+                                 completed_delta: int,
+                                 current_model: str = None,
+                                 current_sequence: str = None,
+                                 current_run: int = None) -> bool:
+        """Atomically add to completed_tasks so several processes can report into one evaluation."""
+        update = {"$inc": {"completed_tasks": completed_delta}}
+        
+        current = {}
+        if current_model is not None:
+            current["current_model"] = current_model
+        if current_sequence is not None:
+            current["current_sequence"] = current_sequence
+        if current_run is not None:
+            current["current_run"] = current_run
+        if current:
+            update["$set"] = current
+            
+        result = await self.collection.update_one({"_id": evaluation_id}, update)
+        return result.modified_count > 0
+        
     async def mark_completed(self, evaluation_id: ObjectId) -> bool:
         """Mark evaluation as completed."""
         from datetime import datetime
@@ -39,14 +39,7 @@ class ResponseLLMEvaluationRepository(BaseRepository[ResponseLLMEvaluation]):
         Create a new ResponseLLMEvaluation document.
         Returns the created document with its ID.
         """
-        # The base 'create' method returns only the inserted_id.
-        # For consistency or if the full document is immediately needed, we can fetch it.
-        inserted_id = await super().create(evaluation)
-        created_evaluation = await self.find_by_id(inserted_id)
-        if not created_evaluation:
-            # This should ideally not happen if create was successful
-            raise Exception(f"Failed to retrieve newly created evaluation with id {inserted_id}")
-        return created_evaluation
+        return await self.insert(evaluation)
 
     # Placeholder for Phase 6: Manual Evaluation
     async def get_response_ids_needing_evaluation(
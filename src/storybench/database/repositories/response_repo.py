@@ -1,6 +1,6 @@
 """Response repository for managing model response documents."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 
@@ -42,6 +42,113 @@ class ResponseRepository(BaseRepository[Response]):
             
         return completed_tasks
         
+    async def delete_for_run(self, evaluation_id: str, model_name: str, sequence: str, run: int) -> int:
+        """Delete the responses of one run, e.g. a partial run left by a crashed worker."""
+        result = await self.collection.delete_many({
+            "evaluation_id": str(evaluation_id),
+            "model_name": model_name,
+            "sequence": sequence,
+            "run": run
+        })
+        return result.deleted_count
+        
+    async def count_completed_for_run(self, evaluation_id: str, model_name: str, sequence: str, run: int) -> int:
+        """Count the completed responses of one run, i.e. those counted as evaluation progress."""
+        return await self.collection.count_documents({
+            "evaluation_id": str(evaluation_id),
+            "model_name": model_name,
+            "sequence": sequence,
+            "run": run,
+            "status": ResponseStatus.COMPLETED.value
+        })
+        
+    def _unevaluated_pipeline(self, evaluation_collection: str, match: Optional[Dict[str, Any]]) -> List[dict]:
+        """Anti-join stages: each response with an ``evaluated`` count of its judge results.
+        
+        Partial (cut-off) responses are never judged and are left out.
+        """
+        return [
+            {"$match": {**(match or {}), "status": {"$ne": ResponseStatus.PARTIAL.value}}},
+            {"$lookup": {
+                "from": evaluation_collection,
+                "localField": "_id",
+                "foreignField": "response_id",
+                "as": "judge_results"
+            }},
+            {"$addFields": {"evaluated": {"$size": "$judge_results"}}},
+            {"$project": {"judge_results": 0}}
+        ]
+        
+    @monitor_query_performance("response_unevaluated")
+    async def find_unevaluated(self, evaluation_collection: str = "response_llm_evaluations",
+                               match: Optional[Dict[str, Any]] = None) -> List[Response]:
+        """Responses without any judge result, found in one aggregation."""
+        pipeline = self._unevaluated_pipeline(evaluation_collection, match) + [
+            {"$match": {"evaluated": 0}},
+            {"$project": {"evaluated": 0}}
+        ]
+        documents = await self.collection.aggregate(pipeline).to_list(length=None)
+        return [Response(**document) for document in documents]
+        
+    @monitor_query_performance("response_unevaluated_sequences")
+    async def find_unevaluated_sequences(self, evaluation_collection: str = "response_llm_evaluations",
+                                         match: Optional[Dict[str, Any]] = None
+                                         ) -> Dict[Tuple[str, str, int], List[Response]]:
+        """(model, sequence, run) groups in which no response has a judge result yet.
+        
+        Grouping and filtering happen server-side in one aggregation, so only
+        the responses that still need judging leave the database, each group
+        ordered by prompt_index.
+        """
+        pipeline = self._unevaluated_pipeline(evaluation_collection, match) + [
+            {"$sort": {"prompt_index": 1}},
+            {"$group": {
+                "_id": {"model_name": "$model_name", "sequence": "$sequence", "run": "$run"},
+                "evaluated": {"$sum": "$evaluated"},
+                "responses": {"$push": "$$ROOT"}
+            }},
+            {"$match": {"evaluated": 0}},
+            {"$sort": {"_id.model_name": 1, "_id.sequence": 1, "_id.run": 1}}
+        ]
+        sequences = {}
+        async for group in self.collection.aggregate(pipeline):
+            key = (group["_id"]["model_name"], group["_id"]["sequence"], group["_id"]["run"])
+            sequences[key] = [Response(**{k: v for k, v in document.items() if k != "evaluated"})
+                              for document in group["responses"]]
+        return sequences
+        
+    @monitor_query_performance("response_sequence_count")
+    async def count_sequences(self, match: Optional[Dict[str, Any]] = None) -> int:
+        """Number of distinct (model, sequence, run) groups."""
+        pipeline = [
+            {"$match": match or {}},
+            {"$group": {"_id": {"model_name": "$model_name", "sequence": "$sequence", "run": "$run"}}},
+            {"$count": "sequences"}
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(1)
+        return result[0]["sequences"] if result else 0
+        
+    @monitor_query_performance("response_latency_profile")
+    async def get_latency_profile(self, model_names: List[str]) -> List[dict]:
+        """Mean generation time per (model, sequence, prompt_index) across all evaluations."""
+        pipeline = [
+            {"$match": {
+                "model_name": {"$in": model_names},
+                "status": ResponseStatus.COMPLETED.value,
+                "generation_time": {"$gt": 0}
+            }},
+            {"$group": {
+                "_id": {
+                    "model_name": "$model_name",
+                    "sequence": "$sequence",
+                    "prompt_index": "$prompt_index"
+                },
+                "mean": {"$avg": "$generation_time"},
+                "count": {"$sum": 1}
+            }}
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
     @monitor_query_performance("response_count_by_evaluation")
     async def count_by_evaluation_id(self, evaluation_id: ObjectId) -> int:
         """Count responses for an evaluation with optimized query."""
@@ -124,22 +231,6 @@ class ResponseRepository(BaseRepository[Response]):
             }
             
     @monitor_query_performance("response_bulk_create")
-    async def bulk_create(self, responses: List[Response]) -> List[Response]:
+    async def bulk_create(self, responses: List[Response], ordered: bool = True) -> List[Response]:
         """Create multiple responses in a single batch operation."""
-        if not responses:
-            return []
-            
-        # Convert to documents
-        documents = []
-        for response in responses:
-            doc = response.model_dump()
-            documents.append(doc)
-        
-        # Batch insert
-        result = await self.collection.insert_many(documents)
-        
-        # Update responses with inserted IDs
-        for i, response in enumerate(responses):
-            response.id = result.inserted_ids[i]
-            
-        return responses
+        return await super().bulk_create(responses, ordered=ordered)
@@ -0,0 +1,169 @@
+"""Evaluation task repository implementing a lease-based work queue."""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from bson import ObjectId
+
+from ..models import EvaluationTask, TaskStatus
+from .base import BaseRepository
+
+DUPLICATE_KEY_ERROR = 11000
+
+class EvaluationTaskRepository(BaseRepository[EvaluationTask]):
+    """
+    Repository for evaluation task documents.
+
+    One document per (evaluation, model, sequence, run). Workers claim tasks
+    atomically with ``find_one_and_update``; a claim is a lease that must be
+    renewed while the run executes. Leases of crashed workers expire and the
+    task becomes claimable again.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        super().__init__(database, EvaluationTask)
+
+    def _get_collection_name(self) -> str:
+        return "evaluation_tasks"
+
+    @staticmethod
+    def _claimable_filter(now: datetime) -> Dict[str, Any]:
+        """Tasks nobody holds: pending, or leased with an expired lease."""
+        return {"$or": [
+            {"status": TaskStatus.PENDING.value},
+            {"status": TaskStatus.LEASED.value, "lease_expires_at": {"$lt": now}}
+        ]}
+
+    async def enqueue_tasks(self, evaluation_id: str, models: List[str],
+                            sequences: List[str], num_runs: int) -> int:
+        """Create missing task documents for an evaluation (idempotent).
+
+        Existing tasks keep their status. Concurrent enqueues are safe with the
+        unique (evaluation_id, model_name, sequence, run) index: duplicate key
+        errors from the other process are ignored.
+
+        Returns:
+            Number of newly created tasks
+        """
+        cursor = self.collection.find(
+            {"evaluation_id": evaluation_id},
+            {"_id": 0, "model_name": 1, "sequence": 1, "run": 1}
+        )
+        existing = {(doc["model_name"], doc["sequence"], doc["run"]) async for doc in cursor}
+
+        now = datetime.utcnow()
+        documents = []
+        for model_name in models:
+            for sequence in sequences:
+                for run in range(1, num_runs + 1):
+                    if (model_name, sequence, run) in existing:
+                        continue
+                    task = EvaluationTask(evaluation_id=evaluation_id, model_name=model_name,
+                                          sequence=sequence, run=run, created_at=now, updated_at=now)
+                    documents.append(task.model_dump(by_alias=True))
+
+        if not documents:
+            return 0
+        try:
+            result = await self.collection.insert_many(documents, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+                raise
+            return e.details.get("nInserted", 0)
+
+    async def claim_task(self, evaluation_id: str, model_name: str, sequence: str, run: int,
+                         owner: str, lease_seconds: float) -> Optional[EvaluationTask]:
+        """Atomically lease one specific task if it is claimable."""
+        now = datetime.utcnow()
+        query = {
+            "evaluation_id": evaluation_id,
+            "model_name": model_name,
+            "sequence": sequence,
+            "run": run,
+            **self._claimable_filter(now)
+        }
+        return await self._claim(query, owner, lease_seconds, now)
+
+    async def _claim(self, query: Dict[str, Any], owner: str, lease_seconds: float,
+                     now: datetime) -> Optional[EvaluationTask]:
+        document = await self.collection.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": TaskStatus.LEASED.value,
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        return self.model_class(**document) if document else None
+
+    async def find_claimable(self, evaluation_id: str) -> List[Dict[str, Any]]:
+        """List (model_name, sequence, run) of every claimable task."""
+        cursor = self.collection.find(
+            {"evaluation_id": evaluation_id, **self._claimable_filter(datetime.utcnow())},
+            {"_id": 0, "model_name": 1, "sequence": 1, "run": 1}
+        )
+        return await cursor.to_list(length=None)
+
+    async def renew_lease(self, task_id: ObjectId, owner: str, lease_seconds: float) -> bool:
+        """Extend a lease; False means the lease was lost to another worker."""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": task_id, "lease_owner": owner, "status": TaskStatus.LEASED.value},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=lease_seconds), "updated_at": now}}
+        )
+        return result.matched_count > 0
+
+    async def complete_task(self, task_id: ObjectId, owner: str) -> bool:
+        """Mark a leased task completed."""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": task_id, "lease_owner": owner, "status": TaskStatus.LEASED.value},
+            {"$set": {
+                "status": TaskStatus.COMPLETED.value,
+                "lease_expires_at": None,
+                "completed_at": now,
+                "updated_at": now,
+                "error_message": None
+            }}
+        )
+        return result.matched_count > 0
+
+    async def fail_task(self, task_id: ObjectId, owner: str, error_message: str,
+                        max_attempts: int) -> bool:
+        """Release a failed task for retry, or mark it failed after max_attempts."""
+        now = datetime.utcnow()
+        task = await self.collection.find_one({"_id": task_id, "lease_owner": owner})
+        if not task:
+            return False
+
+        status = TaskStatus.FAILED if task.get("attempts", 0) >= max_attempts else TaskStatus.PENDING
+        result = await self.collection.update_one(
+            {"_id": task_id, "lease_owner": owner, "status": TaskStatus.LEASED.value},
+            {"$set": {
+                "status": status.value,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "updated_at": now,
+                "error_message": error_message
+            }}
+        )
+        return result.matched_count > 0
+
+    async def count_by_status(self, evaluation_id: str) -> Dict[str, int]:
+        """Count tasks of an evaluation per status."""
+        pipeline = [
+            {"$match": {"evaluation_id": evaluation_id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]
+        counts = {status.value: 0 for status in TaskStatus}
+        async for doc in self.collection.aggregate(pipeline):
+            counts[doc["_id"]] = doc["count"]
+        return counts
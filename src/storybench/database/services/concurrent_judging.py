@@ -0,0 +1,97 @@
+"""
+Concurrent judge calls under the provider rate limits used for generation.
+
+Judge passes used to run one call at a time with a fixed sleep between
+calls. ConcurrentJudge instead runs them all through a RateLimitManager,
+whose per-minute buckets and adaptive concurrency window decide how many
+are in flight. A failed call is reported in its own outcome and never
+stops the others.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+from ...parallel.rate_limiting import RateLimitManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JudgeOutcome:
+    """Result of judging one item: ``result`` on success, ``error`` on failure."""
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and bool(self.result)
+
+
+class ConcurrentJudge:
+    """Runs judge calls for one provider concurrently within its rate limits."""
+
+    def __init__(self, provider: str, rate_limit_manager: Optional[RateLimitManager] = None,
+                 max_concurrent: Optional[int] = None):
+        """
+        Args:
+            provider: Provider whose rate limits the judge calls count against
+            rate_limit_manager: Shared manager, e.g. the generation runner's;
+                a private one is created when omitted
+            max_concurrent: Extra cap below the provider window, e.g. 1 for
+                a local judge model that serves one request at a time
+        """
+        self.provider = provider
+        self.rate_limit_manager = rate_limit_manager or RateLimitManager()
+        self.max_concurrent = max_concurrent
+
+    async def run(self,
+                  items: Sequence[Any],
+                  judge: Callable[[Any], Awaitable[Any]],
+                  describe: Callable[[Any], str] = str,
+                  estimate_tokens: Optional[Callable[[Any], int]] = None) -> List[JudgeOutcome]:
+        """Judge every item and return the outcomes in input order.
+
+        Args:
+            items: What to judge, e.g. sequences or single responses
+            judge: Coroutine function judging one item; exceptions are
+                recorded on the outcome (and rate-limit errors shrink the
+                provider's concurrency window)
+            describe: Label for an item in progress output
+            estimate_tokens: Prompt tokens for an item, counted against the
+                provider's tokens-per-minute budget
+        """
+        total = len(items)
+        completed = 0
+        cap = asyncio.Semaphore(self.max_concurrent) if self.max_concurrent else None
+
+        async def judge_one(item) -> JudgeOutcome:
+            if cap is None:
+                return await judge_limited(item)
+            async with cap:
+                return await judge_limited(item)
+
+        async def judge_limited(item) -> JudgeOutcome:
+            nonlocal completed
+            estimated_tokens = estimate_tokens(item) if estimate_tokens else 0
+            await self.rate_limit_manager.acquire(self.provider, estimated_tokens=estimated_tokens)
+            start_time = time.monotonic()
+            try:
+                outcome = JudgeOutcome(item, result=await judge(item))
+                self.rate_limit_manager.record_success(self.provider, latency=time.monotonic() - start_time)
+            except Exception as e:
+                self.rate_limit_manager.record_error(self.provider, error=e)
+                logger.error(f"Judging {describe(item)} failed: {e}")
+                outcome = JudgeOutcome(item, error=e)
+            finally:
+                self.rate_limit_manager.release(self.provider)
+
+            completed += 1
+            status = "✅" if outcome.succeeded else "❌"
+            print(f"{status} Judged {completed}/{total}: {describe(item)}", flush=True)
+            return outcome
+
+        return list(await asyncio.gather(*(judge_one(item) for item in items)))
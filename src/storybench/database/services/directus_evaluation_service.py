@@ -5,7 +5,6 @@ This service fetches evaluation criteria from Directus CMS at runtime instead of
 using local files or MongoDB storage.
 """
 
-import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -16,18 +15,22 @@ from ...clients.directus_models import StorybenchEvaluationStructure
 from ..repositories.response_repo import ResponseRepository
 from ..repositories.response_llm_evaluation_repository import ResponseLLMEvaluationRepository
 from ..models import Response, ResponseLLMEvaluation, CriterionEvaluation
+from ...parallel.rate_limiting import RateLimitManager
+from .concurrent_judging import ConcurrentJudge
 
 logger = logging.getLogger(__name__)
 
 class DirectusEvaluationService:
     """Service for evaluating creative writing responses using LLM with Directus-sourced criteria."""
     
-    def __init__(self, database: AsyncIOMotorDatabase, openai_api_key: str, directus_client: DirectusClient = None):
+    def __init__(self, database: AsyncIOMotorDatabase, openai_api_key: str, directus_client: DirectusClient = None,
+                 rate_limit_manager: Optional[RateLimitManager] = None):
         self.database = database
         self.response_repo = ResponseRepository(database)
         self.evaluation_repo = ResponseLLMEvaluationRepository(database)
         self.openai_client = AsyncOpenAI(api_key=openai_api_key)
         self.directus_client = directus_client or DirectusClient()
+        self.judge = ConcurrentJudge("openai", rate_limit_manager)
         
     async def get_evaluation_criteria(self, version_number: Optional[int] = None) -> StorybenchEvaluationStructure:
         """Fetch evaluation criteria from Directus."""
@@ -51,22 +54,15 @@ class DirectusEvaluationService:
         evaluation_criteria = await self.get_evaluation_criteria(evaluation_version)
         logger.info(f"Using evaluation criteria: {evaluation_criteria.version_name} (v{evaluation_criteria.version})")
         
-        # Get all responses
-        all_responses = await self.response_repo.find_many({})
-        logger.info(f"Found {len(all_responses)} total responses")
-        
-        # Filter out already evaluated responses
-        unevaluated_responses = []
-        for response in all_responses:
-            existing_evals = await self.evaluation_repo.get_evaluations_by_response_id(response.id)
-            if not existing_evals:
-                unevaluated_responses.append(response)
+        # Find unevaluated responses in one anti-join instead of a lookup per response
+        total_responses = await self.response_repo.collection.count_documents({})
+        unevaluated_responses = await self.response_repo.find_unevaluated(self.evaluation_repo.collection_name)
         
         logger.info(f"Found {len(unevaluated_responses)} unevaluated responses")
         
         # Evaluate each response
         results = {
-            "total_responses": len(all_responses),
+            "total_responses": total_responses,
             "unevaluated_responses": len(unevaluated_responses),
             "evaluations_created": 0,
             "evaluation_version": evaluation_criteria.version,
@@ -74,69 +70,64 @@ class DirectusEvaluationService:
             "errors": []
         }
         
-        for i, response in enumerate(unevaluated_responses):
-            try:
-                print(f" Evaluating response {i+1}/{len(unevaluated_responses)}: {response.model_name} - {response.sequence} - {response.prompt_name}", flush=True)
-                
-                evaluation = await self.evaluate_single_response(response, evaluation_criteria)
-                if evaluation:
-                    results["evaluations_created"] += 1
-                    print(f" Success! Total completed: {results['evaluations_created']}", flush=True)
-                else:
-                    print(f" Failed to evaluate", flush=True)
-                    
-                # Add small delay to avoid rate limiting
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                error_msg = f"Failed to evaluate response {response.id}: {str(e)}"
-                logger.error(error_msg)
-                results["errors"].append(error_msg)
+        outcomes = await self.judge.run(
+            unevaluated_responses,
+            lambda response: self._judge_response(response, evaluation_criteria),
+            describe=lambda response: f"{response.model_name} - {response.sequence} - {response.prompt_name}"
+        )
+        for outcome in outcomes:
+            if outcome.error is not None:
+                results["errors"].append(f"Failed to evaluate response {outcome.item.id}: {str(outcome.error)}")
+            elif outcome.result:
+                results["evaluations_created"] += 1
         
         return results
     
     async def evaluate_single_response(self, response: Response, evaluation_criteria: StorybenchEvaluationStructure) -> Optional[ResponseLLMEvaluation]:
         """Evaluate a single response using the LLM."""
-        
         try:
-            # Build evaluation prompt using Directus criteria
-            evaluation_prompt = self._build_evaluation_prompt(response, evaluation_criteria)
-            
-            # Call OpenAI API
-            completion = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert evaluator of creative writing. Provide detailed, objective assessments based on the given criteria."},
-                    {"role": "user", "content": evaluation_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            evaluation_text = completion.choices[0].message.content
-            
-            # Parse the evaluation response
-            criterion_evaluations = self._parse_evaluation_response(evaluation_text, evaluation_criteria)
-            
-            # Create and save evaluation document
-            llm_evaluation = ResponseLLMEvaluation(
-                response_id=response.id,
-                evaluating_llm_provider="openai",
-                evaluating_llm_model="gpt-4",
-                evaluation_criteria_id=f"directus_v{evaluation_criteria.version}",  # Reference to Directus version
-                criteria_results=criterion_evaluations,
-                raw_evaluator_output=evaluation_text
-            )
-            
-            saved_evaluation = await self.evaluation_repo.create(llm_evaluation)
-            logger.info(f"Created evaluation for response {response.id} using Directus criteria v{evaluation_criteria.version}")
-            
-            return saved_evaluation
-            
+            return await self._judge_response(response, evaluation_criteria)
         except Exception as e:
             logger.error(f"Error evaluating response {response.id}: {str(e)}")
             return None
     
+    async def _judge_response(self, response: Response, evaluation_criteria: StorybenchEvaluationStructure) -> Optional[ResponseLLMEvaluation]:
+        """Judge one response and save its evaluation; judge errors propagate to the caller."""
+        
+        # Build evaluation prompt using Directus criteria
+        evaluation_prompt = self._build_evaluation_prompt(response, evaluation_criteria)
+        
+        # Call OpenAI API
+        completion = await self.openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are an expert evaluator of creative writing. Provide detailed, objective assessments based on the given criteria."},
+                {"role": "user", "content": evaluation_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=2000
+        )
+        
+        evaluation_text = completion.choices[0].message.content
+        
+        # Parse the evaluation response
+        criterion_evaluations = self._parse_evaluation_response(evaluation_text, evaluation_criteria)
+        
+        # Create and save evaluation document
+        llm_evaluation = ResponseLLMEvaluation(
+            response_id=response.id,
+            evaluating_llm_provider="openai",
+            evaluating_llm_model="gpt-4",
+            evaluation_criteria_id=f"directus_v{evaluation_criteria.version}",  # Reference to Directus version
+            criteria_results=criterion_evaluations,
+            raw_evaluator_output=evaluation_text
+        )
+        
+        saved_evaluation = await self.evaluation_repo.insert(llm_evaluation)
+        logger.info(f"Created evaluation for response {response.id} using Directus criteria v{evaluation_criteria.version}")
+        
+        return saved_evaluation
+    
     def _build_evaluation_prompt(self, response: Response, evaluation_criteria: StorybenchEvaluationStructure) -> str:
         """Build the evaluation prompt for the LLM using Directus criteria."""
         
@@ -7,10 +7,10 @@ from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 
-from ..models import Evaluation, Response, EvaluationStatus, ResponseStatus, GlobalSettings
-from ..repositories import EvaluationRepository, ResponseRepository
+from ..models import Evaluation, Response, EvaluationStatus, ResponseStatus, GlobalSettings, TaskStatus
+from ..repositories import EvaluationRepository, ResponseRepository, EvaluationTaskRepository
 from ..services.config_service import ConfigService
-from ...parallel import ParallelSequenceEvaluationRunner
+from ...parallel import ParallelSequenceEvaluationRunner, EvaluationTaskQueue, LatencyEstimator
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +22,7 @@ class DatabaseEvaluationRunner:
         self.database = database
         self.evaluation_repo = EvaluationRepository(database)
         self.response_repo = ResponseRepository(database)
+        self.task_repo = EvaluationTaskRepository(database)
         self.config_service = ConfigService(database)
         
         # Progress caching to reduce database queries during active evaluations
@@ -35,7 +36,8 @@ class DatabaseEvaluationRunner:
             self.parallel_runner = ParallelSequenceEvaluationRunner(
                 database=database,
                 evaluation_runner=self,
-                max_concurrent_sequences=5  # 5 sequences can run in parallel
+                max_concurrent_sequences=5,  # 5 sequences can run in parallel
+                task_queue=EvaluationTaskQueue(self.task_repo, self.response_repo, self.evaluation_repo)
             )
         
     async def start_evaluation(self, 
@@ -90,8 +92,14 @@ class DatabaseEvaluationRunner:
                           prompt_name: str,
                           prompt_text: str,
                           response_text: str,
-                          generation_time: float) -> Response:
-        """Save a model response to the database."""
+                          generation_time: float,
+                          interrupted: Optional[str] = None) -> Response:
+        """Save a model response to the database.
+        
+        A streamed response that was cut short is passed with the reason in
+        ``interrupted``: it is stored with PARTIAL status and does not count
+        towards progress.
+        """
         try:
             # Handle both ObjectId and string types
             if isinstance(evaluation_id, str):
@@ -111,14 +119,16 @@ class DatabaseEvaluationRunner:
                 prompt_text=prompt_text,
                 response=response_text,
                 generation_time=generation_time,
-                status=ResponseStatus.COMPLETED
+                status=ResponseStatus.PARTIAL if interrupted else ResponseStatus.COMPLETED,
+                error_message=interrupted
             )
             
             # Save to database
-            response = await self.response_repo.create(response)
+            response = await self.response_repo.insert(response)
             
             # Update evaluation progress using ObjectId
-            await self._update_evaluation_progress(eval_id_obj, model_name, sequence, run)
+            if not interrupted:
+                await self._update_evaluation_progress(eval_id_obj, model_name, sequence, run)
             
             return response
             
@@ -160,20 +170,21 @@ class DatabaseEvaluationRunner:
         try:
             logger.debug(f"Flushing {len(self._batch_updates)} batched progress updates")
             
-            # Group updates by evaluation_id and get latest for each
+            # Group updates by evaluation_id: count them and keep the latest for each
             latest_updates = {}
+            update_counts = {}
             for update in self._batch_updates:
                 eval_id = str(update["evaluation_id"])
+                update_counts[eval_id] = update_counts.get(eval_id, 0) + 1
                 if eval_id not in latest_updates or update["timestamp"] > latest_updates[eval_id]["timestamp"]:
                     latest_updates[eval_id] = update
             
-            # Apply updates using cached counts instead of database queries
+            # Increment instead of overwriting, so shard processes working on the
+            # same evaluation merge their progress into one document
             for eval_id, update in latest_updates.items():
-                completed_count = self._progress_cache.get(eval_id, 0)
-                
-                await self.evaluation_repo.update_progress(
+                await self.evaluation_repo.increment_progress(
                     update["evaluation_id"],
-                    completed_count,
+                    update_counts[eval_id],
                     current_model=update["model_name"],
                     current_sequence=update["sequence"],
                     current_run=update["run"]
@@ -238,9 +249,16 @@ class DatabaseEvaluationRunner:
             logger.error(f"Failed to find incomplete evaluations: {e}")
             return []
             
+    async def flush_progress(self):
+        """Write batched progress increments now, e.g. when a generation phase ends."""
+        await self._flush_batch_updates()
+        
     async def mark_evaluation_completed(self, evaluation_id: ObjectId):
         """Mark an evaluation as completed."""
         try:
+            # Pending increments must land before the evaluation is settled,
+            # not in some later flush on behalf of another evaluation
+            await self._flush_batch_updates()
             await self.evaluation_repo.mark_completed(evaluation_id)
         except Exception as e:
             logger.error(f"Failed to mark evaluation completed: {e}")
@@ -248,25 +266,19 @@ class DatabaseEvaluationRunner:
     async def mark_evaluation_failed(self, evaluation_id: ObjectId, error_message: str):
         """Mark an evaluation as failed."""
         try:
+            await self._flush_batch_updates()
             await self.evaluation_repo.mark_failed(evaluation_id, error_message)
         except Exception as e:
             logger.error(f"Failed to mark evaluation failed: {e}")
         
     async def get_resume_tasks(self, evaluation_id: ObjectId) -> List[Dict[str, Any]]:
-        """Get list of incomplete tasks for resuming an evaluation."""
+        """Get list of incomplete (model, sequence, run) tasks for resuming an evaluation.
+        
+        Reads the task queue, so the cost depends on the remaining work rather
+        than on the number of saved responses.
+        """
         try:
-            evaluation = await self.evaluation_repo.find_by_id(evaluation_id)
-            if not evaluation:
-                return []
-                
-            # Get completed tasks
-            completed_tasks = await self.response_repo.find_incomplete_for_evaluation(evaluation_id)
-            
-            # Generate all possible tasks for this evaluation
-            # This would need access to the original sequences and settings
-            # For now, return completed task info
-            
-            return completed_tasks
+            return await self.task_repo.find_claimable(str(evaluation_id))
             
         except Exception as e:
             logger.error(f"Failed to get resume tasks: {e}")
@@ -347,13 +359,25 @@ class DatabaseEvaluationRunner:
             logger.error(f"Failed to finalize evaluation {evaluation_id}: {e}")
             return False
     
+    async def build_latency_estimator(self, model_names: List[str]) -> LatencyEstimator:
+        """Latency model from the generation times of all stored responses of these models."""
+        rows = await self.response_repo.get_latency_profile(model_names)
+        estimator = LatencyEstimator.from_rows(rows)
+        missing = [name for name in model_names if not estimator.has_history(name)]
+        if missing:
+            logger.info(f"No latency history for {len(missing)} models, assuming "
+                        f"{estimator.default_seconds:.1f}s per prompt: {', '.join(missing)}")
+        return estimator
+    
     async def run_parallel_evaluation(self,
                                     evaluation_id: str,
                                     models: List[Dict[str, Any]],
                                     sequences: Dict[str, List[Dict[str, str]]],
                                     num_runs: int,
                                     evaluator_factory,
-                                    progress_callback=None) -> Dict[str, Any]:
+                                    progress_callback=None,
+                                    latency_aware: bool = False,
+                                    on_run_complete=None) -> Dict[str, Any]:
         """
         Run evaluation using parallel sequence execution.
         
@@ -361,6 +385,11 @@ class DatabaseEvaluationRunner:
         - 5 sequences run concurrently per model
         - Context isolated between sequences
         - Context accumulates within each sequence run
+        
+        With ``latency_aware`` the longest-expected units (by historical
+        generation time) are started first. ``on_run_complete`` is called as
+        each sequence run finishes, e.g. ``JudgePipeline.on_run_complete`` to
+        judge runs while generation continues.
         """
         
         if not self.enable_parallel:
@@ -370,6 +399,12 @@ class DatabaseEvaluationRunner:
         logger.info(f"Scale: {len(models)} models × {len(sequences)} sequences × 3 prompts × {num_runs} runs")
         
         try:
+            if latency_aware:
+                self.parallel_runner.latency_estimator = await self.build_latency_estimator(
+                    [model["name"] for model in models]
+                )
+            
+            self.parallel_runner.on_run_complete = on_run_complete
             results = await self.parallel_runner.run_parallel_evaluation(
                 evaluation_id=evaluation_id,
                 models=models,
@@ -379,9 +414,17 @@ class DatabaseEvaluationRunner:
                 progress_callback=progress_callback
             )
             
-            # Update evaluation status based on results
+            # Flush so shard progress lands in the shared evaluation document
+            await self._flush_batch_updates()
+            
+            # Other shard processes may still hold tasks; the last one to finish settles the status
             eval_obj_id = ObjectId(evaluation_id)
-            if results.get("success", False):
+            task_counts = await self.task_repo.count_by_status(evaluation_id)
+            outstanding = task_counts[TaskStatus.PENDING.value] + task_counts[TaskStatus.LEASED.value]
+            if outstanding:
+                logger.info(f"Parallel evaluation {evaluation_id}: this process is done, "
+                            f"{outstanding} tasks remain for other workers")
+            elif results.get("success", False) or task_counts[TaskStatus.COMPLETED.value]:
                 await self.evaluation_repo.update_by_id(
                     eval_obj_id,
                     {"status": EvaluationStatus.COMPLETED.value}
@@ -87,7 +87,7 @@ class EvaluationService:
             generation_time=generation_time
         )
         
-        return await self.response_repo.create(response)
+        return await self.response_repo.insert(response)
         
     async def update_evaluation_progress(self, evaluation_id: ObjectId,
                                        current_model: str = None,
@@ -0,0 +1,89 @@
+"""
+Pipelined generate -> judge for one evaluation.
+
+Instead of waiting for every response to be generated, each sequence run
+is queued for judging the moment its last response is saved. Generation and
+judging then overlap, drawing on different provider quotas at the same time.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JudgePipeline:
+    """Judges the sequence runs of one evaluation while generation continues."""
+
+    def __init__(self, sequence_eval_service, evaluation_id: str,
+                 prompt_counts: Optional[Dict[str, int]] = None):
+        self.service = sequence_eval_service
+        self.evaluation_id = str(evaluation_id)
+        # Prompts per sequence name; the final sweep leaves runs short of these unjudged
+        self.prompt_counts = prompt_counts
+        self.criteria_config = None
+        self._tasks: List[asyncio.Task] = []
+        self.results: Dict[str, Any] = {
+            "evaluation_id": self.evaluation_id,
+            "pipelined_runs": 0,
+            "swept_sequences": 0,
+            "incomplete_runs": [],
+            "sequences_evaluated": 0,
+            "total_evaluations_created": 0,
+            "errors": []
+        }
+
+    async def start(self):
+        """Load the criteria every judge call of this evaluation uses."""
+        self.criteria_config = await self.service.criteria_repo.find_active()
+        if not self.criteria_config:
+            raise ValueError("No active evaluation criteria found")
+
+    def submit(self, model_name: str, sequence_name: str, run: int) -> asyncio.Task:
+        """Queue a finished run for judging and return its task."""
+        task = asyncio.create_task(self._judge_run(model_name, sequence_name, run))
+        self._tasks.append(task)
+        self.results["pipelined_runs"] += 1
+        return task
+
+    def on_run_complete(self, model_name: str, sequence_name: str, run_number: int, run_result: Dict[str, Any]):
+        """Run-completion callback for sequence workers; judges runs that answered every prompt.
+
+        An incomplete run is left to the task queue, which clears and reruns it;
+        whatever is still unjudged at the end is picked up by ``finish``.
+        """
+        if run_result.get("complete"):
+            self.submit(model_name, sequence_name, run_number)
+
+    async def _judge_run(self, model_name: str, sequence_name: str, run: int):
+        try:
+            run_results = await self.service.evaluate_run(
+                self.evaluation_id, model_name, sequence_name, run, self.criteria_config
+            )
+            self._merge(run_results)
+        except Exception as e:
+            error_msg = f"Failed to judge {model_name} - {sequence_name} - Run {run}: {str(e)}"
+            logger.error(error_msg)
+            self.results["errors"].append(error_msg)
+
+    def _merge(self, run_results: Dict[str, Any]):
+        self.results["sequences_evaluated"] += run_results["sequences_evaluated"]
+        self.results["total_evaluations_created"] += run_results["total_evaluations_created"]
+        self.results["errors"].extend(run_results["errors"])
+
+    async def finish(self) -> Dict[str, Any]:
+        """Wait for queued judging, then sweep up runs that were never submitted.
+
+        The sweep covers runs finished elsewhere, e.g. by another shard or
+        before a restart, and is a no-op when every run was pipelined. Runs
+        that never answered every prompt are reported in ``incomplete_runs``
+        rather than judged.
+        """
+        await asyncio.gather(*self._tasks)
+        sweep = await self.service.evaluate_sequences_for_evaluation(self.evaluation_id, self.prompt_counts)
+        self.results["swept_sequences"] = sweep["unevaluated_sequences"]
+        self.results["incomplete_runs"] = sweep["incomplete_runs"]
+        self.results["total_sequences"] = sweep["total_sequences"]
+        self._merge(sweep)
+        return self.results
@@ -0,0 +1,210 @@
+"""
+Judge prompts laid out for provider prefix caching.
+
+Every judge call for the same criteria starts with the same instructions
+block (role, scoring standards, criteria, output format), and only the
+content being judged follows it. Providers that cache prompt prefixes then
+serve the instructions from cache on all but the first call of an evaluation.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from ...clients.directus_models import StorybenchEvaluationStructure
+from ...conversation_context import ConversationContext
+from ..models import Response, EvaluationCriteria
+
+SEQUENCE_JUDGE_ROLE = (
+    "You are an expert evaluator of creative writing sequences. Evaluate how well responses "
+    "work together as a coherent narrative, with particular attention to how each response "
+    "builds upon previous ones."
+)
+
+RESPONSE_JUDGE_ROLE = (
+    "You are an expert evaluator of creative writing. Provide detailed, objective assessments "
+    "based on the given criteria."
+)
+
+SCORING_STANDARDS = """CRITICAL EVALUATION STANDARDS:
+- Use the FULL 1-5 scale. Most responses should score 2-3 (competent work)
+- Score 4 only for genuinely exceptional quality that exceeds professional standards
+- Score 5 ONLY for masterwork-level writing that redefines expectations
+- Be critical and realistic - even good AI responses have significant limitations
+- Compare against published professional fiction, not just other AI writing"""
+
+
+@dataclass(frozen=True)
+class JudgePrompt:
+    """A judge prompt split into its invariant instructions and the content to judge."""
+    instructions: str  # Identical for every call with the same criteria
+    content: str
+
+    @property
+    def text(self) -> str:
+        """The whole prompt as one string, instructions first, as flat backends receive it."""
+        return self.as_context().render(self.content)
+
+    def as_context(self) -> ConversationContext:
+        """A context holding the instructions, to pass alongside ``content`` as the prompt."""
+        context = ConversationContext()
+        context.add_system(self.instructions)
+        return context
+
+
+def build_sequence_judge_prompt(responses: List[Response], criteria_config: EvaluationCriteria) -> JudgePrompt:
+    """Judge prompt for a whole sequence, with per-response output blocks R1..R3.
+
+    The wording is the original sequence judge prompt, unchanged; only the
+    model, sequence and responses moved behind the instructions.
+    """
+    criteria_list = [f"• {name}: {criterion.description}" for name, criterion in criteria_config.criteria.items()]
+
+    instructions = f"""{SEQUENCE_JUDGE_ROLE}
+
+{SCORING_STANDARDS}
+
+EVALUATION CRITERIA (1-5 scale):
+{chr(10).join(criteria_list)}
+
+INSTRUCTIONS:
+Evaluate each response individually AND as part of the sequence. Pay special attention to COHERENCE - how well each response builds upon and connects with previous responses. Be stringent in your evaluation - most AI writing has room for improvement.
+
+OUTPUT FORMAT:
+R1 EVALUATION:
+creativity: [score] - [justification]
+coherence: [score] - [justification focusing on internal consistency]
+character_depth: [score] - [justification]
+dialogue_quality: [score] - [justification]
+visual_imagination: [score] - [justification]
+conceptual_depth: [score] - [justification]
+adaptability: [score] - [justification]
+
+R2 EVALUATION:
+creativity: [score] - [justification]
+coherence: [score] - [justification focusing on how it builds on R1]
+character_depth: [score] - [justification]
+dialogue_quality: [score] - [justification]
+visual_imagination: [score] - [justification]
+conceptual_depth: [score] - [justification]
+adaptability: [score] - [justification]
+
+R3 EVALUATION:
+creativity: [score] - [justification]
+coherence: [score] - [justification focusing on sequence progression]
+character_depth: [score] - [justification]
+dialogue_quality: [score] - [justification]
+visual_imagination: [score] - [justification]
+conceptual_depth: [score] - [justification]
+adaptability: [score] - [justification]"""
+
+    sequence_context = []
+    for i, response in enumerate(responses):
+        sequence_context.append(f"""
+=== RESPONSE {i+1}: {response.prompt_name} ===
+PROMPT: {response.prompt_text}
+
+RESPONSE: {response.response}
+""")
+
+    content = f"""Evaluate this {len(responses)}-response creative writing sequence for coherence and quality.
+
+MODEL: {responses[0].model_name} | SEQUENCE: {responses[0].sequence}
+
+SEQUENCE TO EVALUATE:
+{chr(10).join(sequence_context)}"""
+
+    return JudgePrompt(instructions=instructions, content=content)
+
+
+def build_response_judge_prompt(response: Response, criteria_config: EvaluationCriteria) -> JudgePrompt:
+    """Judge prompt for a single response.
+
+    The wording is the original single-response judge prompt, unchanged;
+    only the context and the response moved behind the instructions.
+    """
+    criteria_descriptions = [
+        f"**{name.upper()}** (Scale 1-{criterion.scale}): {criterion.description}"
+        for name, criterion in criteria_config.criteria.items()
+    ]
+
+    instructions = f"""{RESPONSE_JUDGE_ROLE}
+
+Please evaluate the following creative writing response based on these criteria:
+
+{chr(10).join(criteria_descriptions)}
+
+**INSTRUCTIONS:**
+For each criterion, provide:
+1. A score from 1 to {list(criteria_config.criteria.values())[0].scale}
+2. A detailed justification (2-3 sentences)
+
+Format your response as:
+CREATIVITY: [score]
+Justification: [your justification]
+
+COHERENCE: [score]
+Justification: [your justification]
+
+[Continue for all criteria...]
+
+Be objective, specific, and constructive in your evaluations."""
+
+    content = f"""**CONTEXT:**
+- Model: {response.model_name}
+- Sequence: {response.sequence}
+- Prompt: {response.prompt_name}
+- Prompt Text: {response.prompt_text}
+
+**RESPONSE TO EVALUATE:**
+{response.response}"""
+
+    return JudgePrompt(instructions=instructions, content=content)
+
+
+def build_directus_sequence_judge_prompt(responses: List[Dict[str, Any]],
+                                         evaluation_criteria: StorybenchEvaluationStructure) -> JudgePrompt:
+    """Judge prompt for a sequence of stored response documents, using Directus criteria.
+
+    The wording is the automated runner's original prompt, unchanged; the
+    sequence and its metadata moved behind the output format.
+    """
+    criteria_text = ""
+    for criterion in evaluation_criteria.criteria.values():
+        criteria_text += f"\n{criterion.name}:\n{criterion.criteria}\nScale: {criterion.scale[0]}-{criterion.scale[1]}\n"
+
+    instructions = f"""{RESPONSE_JUDGE_ROLE}
+
+EVALUATION CRITERIA:
+{criteria_text}
+
+SCORING GUIDELINES:
+{evaluation_criteria.scoring_guidelines}
+
+Please provide your evaluation in this exact format:
+
+CREATIVITY: [score 1-5]
+[brief justification]
+
+COHERENCE: [score 1-5]
+[brief justification]
+
+CHARACTER_DEPTH: [score 1-5]
+[brief justification]
+
+[Continue for all criteria...]
+
+OVERALL ASSESSMENT:
+[summary paragraph]"""
+
+    content = f"""Evaluate this {len(responses)}-response creative writing sequence for coherence and quality.
+
+RESPONSE METADATA:
+- Model: {responses[0]['model_name']}
+- Sequence: {responses[0]['sequence_name']}
+
+SEQUENCE TO EVALUATE:
+"""
+    for i, resp in enumerate(responses, 1):
+        content += f"\n--- Response {i} ---\n{resp['response']}\n"
+
+    return JudgePrompt(instructions=instructions, content=content)
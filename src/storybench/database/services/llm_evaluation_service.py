@@ -2,7 +2,6 @@
 LLM Evaluation Service for processing creative writing responses.
 """
 
-import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -12,18 +11,23 @@ from ..repositories.response_repo import ResponseRepository
 from ..repositories.criteria_repo import CriteriaRepository
 from ..repositories.response_llm_evaluation_repository import ResponseLLMEvaluationRepository
 from ..models import Response, ResponseLLMEvaluation, CriterionEvaluation, EvaluationCriteria
+from ...parallel.rate_limiting import RateLimitManager
+from .concurrent_judging import ConcurrentJudge
+from .judge_prompts import JudgePrompt, build_response_judge_prompt
 
 logger = logging.getLogger(__name__)
 
 class LLMEvaluationService:
     """Service for evaluating creative writing responses using LLM."""
     
-    def __init__(self, database: AsyncIOMotorDatabase, openai_api_key: str):
+    def __init__(self, database: AsyncIOMotorDatabase, openai_api_key: str,
+                 rate_limit_manager: Optional[RateLimitManager] = None):
         self.database = database
         self.response_repo = ResponseRepository(database)
         self.criteria_repo = CriteriaRepository(database)
         self.evaluation_repo = ResponseLLMEvaluationRepository(database)
         self.openai_client = AsyncOpenAI(api_key=openai_api_key)
+        self.judge = ConcurrentJudge("openai", rate_limit_manager)
         
     async def evaluate_all_responses(self) -> Dict[str, Any]:
         """Evaluate all responses in the database that haven't been evaluated yet."""
@@ -33,130 +37,83 @@ class LLMEvaluationService:
         if not criteria_config:
             raise ValueError("No active evaluation criteria found")
         
-        # Get all responses
-        all_responses = await self.response_repo.find_many({})
-        logger.info(f"Found {len(all_responses)} total responses")
-        
-        # Filter out already evaluated responses
-        unevaluated_responses = []
-        for response in all_responses:
-            existing_evals = await self.evaluation_repo.get_evaluations_by_response_id(response.id)
-            if not existing_evals:
-                unevaluated_responses.append(response)
+        # Find unevaluated responses in one anti-join instead of a lookup per response
+        total_responses = await self.response_repo.collection.count_documents({})
+        unevaluated_responses = await self.response_repo.find_unevaluated(self.evaluation_repo.collection_name)
         
         logger.info(f"Found {len(unevaluated_responses)} unevaluated responses")
         
         # Evaluate each response
         results = {
-            "total_responses": len(all_responses),
+            "total_responses": total_responses,
             "unevaluated_responses": len(unevaluated_responses),
             "evaluations_created": 0,
             "errors": []
         }
         
-        for i, response in enumerate(unevaluated_responses):
-            try:
-                print(f" Evaluating response {i+1}/{len(unevaluated_responses)}: {response.model_name} - {response.sequence} - {response.prompt_name}", flush=True)
-                
-                evaluation = await self.evaluate_single_response(response, criteria_config)
-                if evaluation:
-                    results["evaluations_created"] += 1
-                    print(f" Success! Total completed: {results['evaluations_created']}", flush=True)
-                else:
-                    print(f" Failed to evaluate", flush=True)
-                    
-                # Add small delay to avoid rate limiting
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                error_msg = f"Failed to evaluate response {response.id}: {str(e)}"
-                logger.error(error_msg)
-                results["errors"].append(error_msg)
+        outcomes = await self.judge.run(
+            unevaluated_responses,
+            lambda response: self._judge_response(response, criteria_config),
+            describe=lambda response: f"{response.model_name} - {response.sequence} - {response.prompt_name}"
+        )
+        for outcome in outcomes:
+            if outcome.error is not None:
+                results["errors"].append(f"Failed to evaluate response {outcome.item.id}: {str(outcome.error)}")
+            elif outcome.result:
+                results["evaluations_created"] += 1
         
         return results
     
     async def evaluate_single_response(self, response: Response, criteria_config: EvaluationCriteria) -> Optional[ResponseLLMEvaluation]:
         """Evaluate a single response using the LLM."""
-        
         try:
-            # Build evaluation prompt
-            evaluation_prompt = self._build_evaluation_prompt(response, criteria_config)
-            
-            # Call OpenAI API
-            completion = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert evaluator of creative writing. Provide detailed, objective assessments based on the given criteria."},
-                    {"role": "user", "content": evaluation_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            evaluation_text = completion.choices[0].message.content
-            
-            # Parse the evaluation response
-            criterion_evaluations = self._parse_evaluation_response(evaluation_text, criteria_config)
-            
-            # Create and save evaluation document
-            llm_evaluation = ResponseLLMEvaluation(
-                response_id=response.id,
-                evaluating_llm_provider="openai",
-                evaluating_llm_model="gpt-4",
-                evaluation_criteria_id=criteria_config.id,
-                criteria_results=criterion_evaluations,
-                raw_evaluator_output=evaluation_text
-            )
-            
-            saved_evaluation = await self.evaluation_repo.create(llm_evaluation)
-            logger.info(f"Created evaluation for response {response.id}")
-            
-            return saved_evaluation
-            
+            return await self._judge_response(response, criteria_config)
         except Exception as e:
             logger.error(f"Error evaluating response {response.id}: {str(e)}")
             return None
     
-    def _build_evaluation_prompt(self, response: Response, criteria_config: EvaluationCriteria) -> str:
+    async def _judge_response(self, response: Response, criteria_config: EvaluationCriteria) -> Optional[ResponseLLMEvaluation]:
+        """Judge one response and save its evaluation; judge errors propagate to the caller."""
+        
+        # Build evaluation prompt; the instructions are identical for every
+        # response, so they form a prefix OpenAI can serve from its cache
+        judge_prompt = self._build_evaluation_prompt(response, criteria_config)
+        
+        # Call OpenAI API
+        completion = await self.openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=judge_prompt.as_context().to_messages(judge_prompt.content),
+            temperature=0.3,
+            max_tokens=2000
+        )
+        
+        evaluation_text = completion.choices[0].message.content
+        usage = getattr(completion, "usage", None)
+        prompt_details = getattr(usage, "prompt_tokens_details", None)
+        
+        # Parse the evaluation response
+        criterion_evaluations = self._parse_evaluation_response(evaluation_text, criteria_config)
+        
+        # Create and save evaluation document
+        llm_evaluation = ResponseLLMEvaluation(
+            response_id=response.id,
+            evaluating_llm_provider="openai",
+            evaluating_llm_model="gpt-4",
+            evaluation_criteria_id=criteria_config.id,
+            criteria_results=criterion_evaluations,
+            raw_evaluator_output=evaluation_text,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            cached_prompt_tokens=getattr(prompt_details, "cached_tokens", None)
+        )
+        
+        saved_evaluation = await self.evaluation_repo.insert(llm_evaluation)
+        logger.info(f"Created evaluation for response {response.id}")
+        
+        return saved_evaluation
+    
+    def _build_evaluation_prompt(self, response: Response, criteria_config: EvaluationCriteria) -> JudgePrompt:
         """Build the evaluation prompt for the LLM."""
-        
-        criteria_descriptions = []
-        for criterion_name, criterion in criteria_config.criteria.items():
-            criteria_descriptions.append(
-                f"**{criterion_name.upper()}** (Scale 1-{criterion.scale}): {criterion.description}"
-            )
-        
-        prompt = f"""
-Please evaluate the following creative writing response based on these criteria:
-
-{chr(10).join(criteria_descriptions)}
-
-**CONTEXT:**
-- Model: {response.model_name}
-- Sequence: {response.sequence}
-- Prompt: {response.prompt_name}
-- Prompt Text: {response.prompt_text}
-
-**RESPONSE TO EVALUATE:**
-{response.response}
-
-**INSTRUCTIONS:**
-For each criterion, provide:
-1. A score from 1 to {list(criteria_config.criteria.values())[0].scale}
-2. A detailed justification (2-3 sentences)
-
-Format your response as:
-CREATIVITY: [score]
-Justification: [your justification]
-
-COHERENCE: [score]
-Justification: [your justification]
-
-[Continue for all criteria...]
-
-Be objective, specific, and constructive in your evaluations.
-"""
-        return prompt
+        return build_response_judge_prompt(response, criteria_config)
     
     def _parse_evaluation_response(self, evaluation_text: str, criteria_config: EvaluationCriteria) -> List[CriterionEvaluation]:
         """Parse the LLM's evaluation response into structured data."""
@@ -3,7 +3,6 @@ Sequence-aware LLM Evaluation Service for evaluating creative writing responses
 This service evaluates responses by sequence to properly assess coherence across related prompts.
 """
 
-import asyncio
 from bson import ObjectId
 import logging
 from typing import List, Dict, Any, Optional, Tuple
@@ -15,7 +14,10 @@ from ...models.config import ModelConfig as StoryBenchModelConfig # ModelConfig
 from ..repositories.response_repo import ResponseRepository
 from ..repositories.criteria_repo import CriteriaRepository
 from ..repositories.response_llm_evaluation_repository import ResponseLLMEvaluationRepository
-from ..models import Response, ResponseLLMEvaluation, CriterionEvaluation, EvaluationCriteria
+from ..models import Response, ResponseStatus, ResponseLLMEvaluation, CriterionEvaluation, EvaluationCriteria
+from ...parallel.rate_limiting import RateLimitManager
+from .concurrent_judging import ConcurrentJudge
+from .judge_prompts import build_sequence_judge_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +26,18 @@ class SequenceEvaluationService:
     
     def __init__(self, database: AsyncIOMotorDatabase, 
                  evaluator_model_config: StoryBenchModelConfig, 
-                 api_keys: Dict[str, str]):
+                 api_keys: Dict[str, str],
+                 rate_limit_manager: Optional[RateLimitManager] = None):
         self.database = database
         self.response_repo = ResponseRepository(database)
         self.criteria_repo = CriteriaRepository(database)
         self.evaluation_repo = ResponseLLMEvaluationRepository(database)
         
         self.evaluator_model_config = evaluator_model_config # Store for later use
+        # Judge calls share the provider limits of the generation side when given its manager;
+        # a local judge model serves one request at a time
+        self.judge = ConcurrentJudge(evaluator_model_config.provider, rate_limit_manager,
+                                     max_concurrent=1 if evaluator_model_config.type == "local" else None)
 
         factory_eval_config = {
             "type": evaluator_model_config.type,
@@ -68,176 +75,175 @@ class SequenceEvaluationService:
 
     async def evaluate_all_sequences(self) -> Dict[str, Any]:
         """Evaluate all response sequences that haven't been evaluated yet."""
+        return await self._evaluate_unevaluated_sequences()
+    
+    async def evaluate_sequences_for_evaluation(self, evaluation_id: str,
+                                                prompt_counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Evaluate the unevaluated sequences of one evaluation only.
+        
+        The scan is restricted by the responses.evaluation_id index, so the
+        cost follows the size of this evaluation rather than the whole history.
+        With ``prompt_counts`` (prompts per sequence name), runs with fewer
+        completed responses than their sequence has prompts are not judged
+        and are listed under ``incomplete_runs`` instead.
+        """
+        results = await self._evaluate_unevaluated_sequences({"evaluation_id": str(evaluation_id)},
+                                                             prompt_counts=prompt_counts)
+        results["evaluation_id"] = str(evaluation_id)
+        return results
+    
+    async def evaluate_run(self, evaluation_id: str, model_name: str, sequence: str, run: int,
+                           criteria_config: Optional[EvaluationCriteria] = None) -> Dict[str, Any]:
+        """Evaluate one sequence run of an evaluation unless it has been judged already."""
+        match = {"evaluation_id": str(evaluation_id), "model_name": model_name, "sequence": sequence, "run": run}
+        return await self._evaluate_unevaluated_sequences(match, criteria_config)
+    
+    async def _evaluate_unevaluated_sequences(self, match: Optional[Dict[str, Any]] = None,
+                                              criteria_config: Optional[EvaluationCriteria] = None,
+                                              prompt_counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Judge every unevaluated sequence among the responses selected by ``match``."""
         
         # Get active evaluation criteria
-        criteria_config = await self.criteria_repo.find_active()
+        criteria_config = criteria_config or await self.criteria_repo.find_active()
         if not criteria_config:
             raise ValueError("No active evaluation criteria found")
         
-        # Get all responses and group by sequence context
-        all_responses = await self.response_repo.find_many({})
-        logger.info(f"Found {len(all_responses)} total responses")
-        
-        # Group responses by (model, sequence, run) to create complete sequences
-        sequence_groups = self._group_responses_by_sequence(all_responses)
-        
-        # Filter out already evaluated sequences
-        unevaluated_sequences = []
-        for sequence_key, responses in sequence_groups.items():
-            # Check if any response in this sequence has been evaluated
-            sequence_evaluated = False
-            for response in responses:
-                existing_evals = await self.evaluation_repo.get_evaluations_by_response_id(response.id)
-                if existing_evals:
-                    sequence_evaluated = True
-                    break
-            
-            if not sequence_evaluated:
-                unevaluated_sequences.append((sequence_key, responses))
-        
-        logger.info(f"Found {len(unevaluated_sequences)} unevaluated sequences")
+        # Find unjudged sequences in one anti-join instead of a lookup per response
+        sequence_count = await self.response_repo.count_sequences(match)
+        unevaluated_sequences = list((await self.response_repo.find_unevaluated_sequences(
+            self.evaluation_repo.collection_name, match)).items())
+        logger.info(f"Found {len(unevaluated_sequences)} unevaluated sequences out of {sequence_count}")
+        
+        # A truncated story would be judged with a gap, and its judge results would
+        # keep the run from ever being judged once it is complete
+        incomplete_runs = []
+        if prompt_counts:
+            complete_sequences = []
+            for key, responses in unevaluated_sequences:
+                completed = sum(1 for r in responses if r.status == ResponseStatus.COMPLETED)
+                if completed < prompt_counts.get(key[1], 0):
+                    incomplete_runs.append(f"{key[0]} - {key[1]} - Run {key[2]} ({completed}/{prompt_counts[key[1]]} prompts)")
+                else:
+                    complete_sequences.append((key, responses))
+            unevaluated_sequences = complete_sequences
+            if incomplete_runs:
+                logger.warning(f"Skipping {len(incomplete_runs)} incomplete runs: {incomplete_runs}")
         
         # Evaluate each sequence
         results = {
-            "total_sequences": len(sequence_groups),
+            "total_sequences": sequence_count,
             "unevaluated_sequences": len(unevaluated_sequences),
+            "incomplete_runs": incomplete_runs,
             "sequences_evaluated": 0,
             "total_evaluations_created": 0,
             "errors": []
         }
         
-        for i, (sequence_key, responses) in enumerate(unevaluated_sequences):
-            try:
-                model_name, sequence_name, run = sequence_key
-                print(f"🔍 Evaluating sequence {i+1}/{len(unevaluated_sequences)}: {model_name} - {sequence_name} - Run {run}", flush=True)
-                
-                sequence_evaluations = await self.evaluate_sequence(responses, criteria_config)
-                if sequence_evaluations:
-                    results["sequences_evaluated"] += 1
-                    results["total_evaluations_created"] += len(sequence_evaluations)
-                    print(f"✅ Success! Created {len(sequence_evaluations)} evaluations", flush=True)
-                    
-                # Add delay to avoid rate limiting
-                await asyncio.sleep(3)
-                
-            except Exception as e:
-                error_msg = f"Failed to evaluate sequence {sequence_key}: {str(e)}"
-                logger.error(error_msg)
-                results["errors"].append(error_msg)
-                print(f"❌ {error_msg}", flush=True)
+        outcomes = await self.judge.run(
+            unevaluated_sequences,
+            lambda sequence: self._judge_sequence(sequence[1], criteria_config),
+            describe=lambda sequence: " - ".join(str(part) for part in sequence[0])
+        )
+        for outcome in outcomes:
+            if outcome.error is not None:
+                results["errors"].append(f"Failed to evaluate sequence {outcome.item[0]}: {str(outcome.error)}")
+            elif outcome.result:
+                results["sequences_evaluated"] += 1
+                results["total_evaluations_created"] += len(outcome.result)
         
         return results
     
-    def _group_responses_by_sequence(self, responses: List[Response]) -> Dict[Tuple[str, str, int], List[Response]]:
-        """Group responses by (model_name, sequence, run) and sort by prompt_index."""
-        
-        sequence_groups = {}
-        
-        for response in responses:
-            # Create key for grouping
-            sequence_key = (response.model_name, response.sequence, response.run)
-            
-            if sequence_key not in sequence_groups:
-                sequence_groups[sequence_key] = []
-            
-            sequence_groups[sequence_key].append(response)
-        
-        # Sort each group by prompt_index to ensure proper order
-        for sequence_key in sequence_groups:
-            sequence_groups[sequence_key].sort(key=lambda r: r.prompt_index)
-        
-        return sequence_groups
-    
     async def evaluate_sequence(self, responses: List[Response], criteria_config: EvaluationCriteria) -> Optional[List[ResponseLLMEvaluation]]:
         """Evaluate a complete sequence of responses with full context for coherence assessment."""
+        try:
+            return await self._judge_sequence(responses, criteria_config)
+        except Exception as e:
+            logger.error(f"Error evaluating sequence: {str(e)}")
+            return None
+    
+    async def _judge_sequence(self, responses: List[Response], criteria_config: EvaluationCriteria) -> Optional[List[ResponseLLMEvaluation]]:
+        """Judge one sequence and save its evaluations; judge errors propagate to the caller."""
         
         if not responses:
             return None
         
+        # Invariant instructions go first as a system segment so providers can
+        # serve them from their prefix cache; the sequence itself goes last
+        judge_prompt = build_sequence_judge_prompt(responses, criteria_config)
+        full_prompt_for_evaluator = judge_prompt.text
+        
+        # Monitor sequence evaluation context (but don't fail on size)
         try:
-            # Build sequence evaluation prompt with all responses in context
-            evaluation_prompt = self._build_sequence_evaluation_prompt(responses, criteria_config)
-            
-            # System prompt for the evaluator
-            system_prompt_content = "You are an expert evaluator of creative writing sequences. Evaluate how well responses work together as a coherent narrative, with particular attention to how each response builds upon previous ones."
-            # User prompt containing the actual sequence and criteria
-            user_prompt_content = self._build_sequence_evaluation_prompt(responses, criteria_config)
-
-            # Combine prompts. Specific formatting might be needed depending on the evaluator model.
-            # For many models, prepending system prompt to user prompt is a common approach.
-            full_prompt_for_evaluator = f"{system_prompt_content}\n\n{user_prompt_content}"
+            context_analytics = self.evaluator.get_context_analytics(full_prompt_for_evaluator)
+            logger.info(f"Sequence evaluation context monitoring: "
+                       f"sequence={responses[0].sequence}, "
+                       f"model={responses[0].model_name}, "
+                       f"responses_count={len(responses)}, "
+                       f"hash={context_analytics['prompt_hash']}, "
+                       f"tokens={context_analytics['estimated_tokens']}/{context_analytics['max_tokens']}, "
+                       f"utilization={context_analytics['utilization_percent']:.1f}%")
             
-            # Monitor sequence evaluation context (but don't fail on size)
-            try:
-                context_analytics = self.evaluator.get_context_analytics(full_prompt_for_evaluator)
-                logger.info(f"Sequence evaluation context monitoring: "
-                           f"sequence={responses[0].sequence}, "
-                           f"model={responses[0].model_name}, "
-                           f"responses_count={len(responses)}, "
-                           f"hash={context_analytics['prompt_hash']}, "
-                           f"tokens={context_analytics['estimated_tokens']}/{context_analytics['max_tokens']}, "
-                           f"utilization={context_analytics['utilization_percent']:.1f}%")
+            if not context_analytics['fits']:
+                # WARNING ONLY - let the model handle its own context limits
+                logger.warning(f"Sequence evaluation context large but proceeding: "
+                             f"sequence={responses[0].sequence}, "
+                             f"model={responses[0].model_name}, "
+                             f"responses={len(responses)}, "
+                             f"tokens={context_analytics['estimated_tokens']}/{context_analytics['max_tokens']}, "
+                             f"hash={context_analytics['prompt_hash']}. "
+                             f"Model will handle context naturally.")
+            else:
+                logger.debug(f"Sequence evaluation context within estimated limits")
                 
-                if not context_analytics['fits']:
-                    # WARNING ONLY - let the model handle its own context limits
-                    logger.warning(f"Sequence evaluation context large but proceeding: "
-                                 f"sequence={responses[0].sequence}, "
-                                 f"model={responses[0].model_name}, "
-                                 f"responses={len(responses)}, "
-                                 f"tokens={context_analytics['estimated_tokens']}/{context_analytics['max_tokens']}, "
-                                 f"hash={context_analytics['prompt_hash']}. "
-                                 f"Model will handle context naturally.")
-                else:
-                    logger.debug(f"Sequence evaluation context within estimated limits")
-                    
-            except Exception as e:
-                logger.warning(f"Context monitoring failed for sequence evaluation (non-fatal): {e}")
-                # Continue with evaluation even if monitoring fails
-            
-            evaluator_call_settings = {
-                "temperature": 0.3, # Consistent with original settings
-                "max_tokens": 4096  # Consistent with original settings
-            }
+        except Exception as e:
+            logger.warning(f"Context monitoring failed for sequence evaluation (non-fatal): {e}")
+            # Continue with evaluation even if monitoring fails
+        
+        evaluator_call_settings = {
+            "temperature": 0.3, # Consistent with original settings
+            "max_tokens": 4096  # Consistent with original settings
+        }
 
-            # Call the generic evaluator
-            eval_result_dict = await self.evaluator.generate_response(
-                prompt=full_prompt_for_evaluator,  
-                **evaluator_call_settings          
-            )
+        # Call the generic evaluator
+        eval_result_dict = await self.evaluator.generate_response(
+            prompt=judge_prompt.content,
+            context=judge_prompt.as_context(),
+            **evaluator_call_settings
+        )
+
+        evaluation_text = eval_result_dict.get("response") or eval_result_dict.get("text")
+        usage = eval_result_dict.get("usage") or {}
+        if not evaluation_text:
+            logger.error(f"Evaluator {self.evaluator.name} did not return a response text for sequence evaluation.")
+            # Consider how to handle this - perhaps raise an error or return None to skip this sequence.
+            # For now, returning None as the original code did on other exceptions.
+            return None
         
-            evaluation_text = eval_result_dict.get("text")  
-            if not evaluation_text:
-                logger.error(f"Evaluator {self.evaluator.name} did not return a response text for sequence evaluation.")
-                # Consider how to handle this - perhaps raise an error or return None to skip this sequence.
-                # For now, returning None as the original code did on other exceptions.
-                return None
-            
-            # Parse the evaluation response for each response in the sequence
-            sequence_evaluations = self._parse_sequence_evaluation_response(
-                evaluation_text, responses, criteria_config
+        # Parse the evaluation response for each response in the sequence
+        sequence_evaluations = self._parse_sequence_evaluation_response(
+            evaluation_text, responses, criteria_config
+        )
+        
+        # Create the evaluation documents and save the whole sequence in one batch
+        llm_evaluations = [
+            ResponseLLMEvaluation(
+                response_id=response.id,
+                evaluating_llm_provider=self.evaluator_model_config.provider,
+                evaluating_llm_model=self.evaluator_model_config.name, # Or model_name if more specific
+                evaluation_criteria_id=criteria_config.id,
+                criteria_results=criterion_evaluations,
+                raw_evaluator_output=evaluation_text,
+                prompt_tokens=usage.get("prompt_tokens"),
+                cached_prompt_tokens=usage.get("cached_tokens")
             )
-            
-            # Create and save evaluation documents
-            saved_evaluations = []
-            for response, criterion_evaluations in sequence_evaluations:
-                llm_evaluation = ResponseLLMEvaluation(
-                    response_id=response.id,
-                    evaluating_llm_provider=self.evaluator_model_config.provider,
-                    evaluating_llm_model=self.evaluator_model_config.name, # Or model_name if more specific
-                    evaluation_criteria_id=criteria_config.id,
-                    criteria_results=criterion_evaluations,
-                    raw_evaluator_output=evaluation_text
-                )
-                
-                saved_evaluation = await self.evaluation_repo.create(llm_evaluation)
-                saved_evaluations.append(saved_evaluation)
-                logger.info(f"Created sequence evaluation for response {response.id}")
-            
-            return saved_evaluations
-            
-        except Exception as e:
-            logger.error(f"Error evaluating sequence: {str(e)}")
-            return None
+            for response, criterion_evaluations in sequence_evaluations
+        ]
+        
+        saved_evaluations = await self.evaluation_repo.bulk_create(llm_evaluations)
+        logger.info(f"Created {len(saved_evaluations)} sequence evaluations for "
+                    f"{responses[0].model_name} - {responses[0].sequence} - Run {responses[0].run}")
+        
+        return saved_evaluations
 
     async def get_evaluation_summary(self) -> Dict[str, Any]:
         """Calculate and return a summary of all evaluations in the database."""
@@ -297,74 +303,7 @@ class SequenceEvaluationService:
     
     def _build_sequence_evaluation_prompt(self, responses: List[Response], criteria_config: EvaluationCriteria) -> str:
         """Build the sequence evaluation prompt that includes all responses in context."""
-        
-        # Build concise criteria descriptions
-        criteria_list = []
-        for criterion_name, criterion in criteria_config.criteria.items():
-            criteria_list.append(f"• {criterion_name}: {criterion.description}")
-        
-        # Build the sequence context
-        sequence_context = []
-        for i, response in enumerate(responses):
-            sequence_context.append(f"""
-=== RESPONSE {i+1}: {response.prompt_name} ===
-PROMPT: {response.prompt_text}
-
-RESPONSE: {response.response}
-""")
-        
-        model_name = responses[0].model_name
-        sequence_name = responses[0].sequence
-        
-        prompt = f"""Evaluate this {len(responses)}-response creative writing sequence for coherence and quality.
-
-MODEL: {model_name} | SEQUENCE: {sequence_name}
-
-CRITICAL EVALUATION STANDARDS:
-- Use the FULL 1-5 scale. Most responses should score 2-3 (competent work)
-- Score 4 only for genuinely exceptional quality that exceeds professional standards
-- Score 5 ONLY for masterwork-level writing that redefines expectations
-- Be critical and realistic - even good AI responses have significant limitations
-- Compare against published professional fiction, not just other AI writing
-
-EVALUATION CRITERIA (1-5 scale):
-{chr(10).join(criteria_list)}
-
-SEQUENCE TO EVALUATE:
-{chr(10).join(sequence_context)}
-
-INSTRUCTIONS:
-Evaluate each response individually AND as part of the sequence. Pay special attention to COHERENCE - how well each response builds upon and connects with previous responses. Be stringent in your evaluation - most AI writing has room for improvement.
-
-OUTPUT FORMAT:
-R1 EVALUATION:
-creativity: [score] - [justification]
-coherence: [score] - [justification focusing on internal consistency]
-character_depth: [score] - [justification]
-dialogue_quality: [score] - [justification]
-visual_imagination: [score] - [justification]
-conceptual_depth: [score] - [justification]
-adaptability: [score] - [justification]
-
-R2 EVALUATION:
-creativity: [score] - [justification]
-coherence: [score] - [justification focusing on how it builds on R1]
-character_depth: [score] - [justification]
-dialogue_quality: [score] - [justification]
-visual_imagination: [score] - [justification]
-conceptual_depth: [score] - [justification]
-adaptability: [score] - [justification]
-
-R3 EVALUATION:
-creativity: [score] - [justification]
-coherence: [score] - [justification focusing on sequence progression]
-character_depth: [score] - [justification]
-dialogue_quality: [score] - [justification]
-visual_imagination: [score] - [justification]
-conceptual_depth: [score] - [justification]
-adaptability: [score] - [justification]"""
-        
-        return prompt
+        return build_sequence_judge_prompt(responses, criteria_config).text
     
     def _parse_sequence_evaluation_response(self, evaluation_text: str, responses: List[Response], criteria_config: EvaluationCriteria) -> List[Tuple[Response, List[CriterionEvaluation]]]:
         """Parse the LLM's sequence evaluation response into structured data for each response."""
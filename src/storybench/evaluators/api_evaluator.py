@@ -10,9 +10,11 @@ import anthropic
 import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
 
-from .base import BaseEvaluator
+from .base import BaseEvaluator, cached_response
+from ..conversation_context import ConversationContext
 from ..unified_context_system import ContextLimitExceededError
 from ..utils.retry_handler import retry_handler
+from ..utils.probe_cache import probe_cache
 
 logger = logging.getLogger(__name__)
 
@@ -102,12 +104,53 @@ class APIEvaluator(BaseEvaluator):
         return 32768
     
     async def setup(self) -> bool:
-        """Setup API clients and test connectivity."""
+        """Setup API clients and test connectivity.
+        
+        Clients are created per evaluator, but the connectivity test goes
+        through the global probe cache so concurrent setups for the same
+        model and key share one request.
+        """
         try:
             logger.info(f"Setting up APIEvaluator for {self.name} ({self.provider})")
-            
-            if self.provider == "openai":
-                self.client = openai.AsyncOpenAI(api_key=self.api_keys.get("openai"))
+            self._create_client()
+        except Exception as e:
+            logger.error(f"Failed to setup APIEvaluator {self.name}: {e}")
+            return False
+        
+        connected = await probe_cache.get_or_probe(
+            self.provider,
+            self.model_name,
+            self.api_keys.get(self.provider),
+            self._probe_connectivity
+        )
+        if not connected:
+            return False
+        
+        self.is_setup = True
+        logger.info(f"APIEvaluator {self.name} setup complete with {self.context_manager.max_context_tokens} token context")
+        return True
+    
+    def _create_client(self):
+        """Create the provider client for this evaluator."""
+        if self.provider == "openai":
+            self.client = openai.AsyncOpenAI(api_key=self.api_keys.get("openai"))
+        elif self.provider == "anthropic":
+            self.client = anthropic.AsyncAnthropic(api_key=self.api_keys.get("anthropic"))
+        elif self.provider == "gemini":
+            genai.configure(api_key=self.api_keys.get("gemini"))
+            self.client = genai.GenerativeModel(self.model_name)
+        elif self.provider == "deepinfra":
+            self.client = openai.AsyncOpenAI(
+                api_key=self.api_keys.get("deepinfra"),
+                base_url="https://api.deepinfra.com/v1/openai"
+            )
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+    
+    async def _probe_connectivity(self) -> bool:
+        """Send a minimal request to verify the model is reachable."""
+        try:
+            if self.provider in ("openai", "deepinfra"):
                 # Test with a minimal request
                 if self.model_name.startswith("o3") or self.model_name.startswith("o4"):
                     await self.client.chat.completions.create(
@@ -123,8 +166,6 @@ class APIEvaluator(BaseEvaluator):
                     )
                 
             elif self.provider == "anthropic":
-                self.client = anthropic.AsyncAnthropic(api_key=self.api_keys.get("anthropic"))
-                # Test with a minimal request
                 await self.client.messages.create(
                     model=self.model_name,
                     max_tokens=1,
@@ -132,45 +173,22 @@ class APIEvaluator(BaseEvaluator):
                 )
                 
             elif self.provider == "gemini":
-                genai.configure(api_key=self.api_keys.get("gemini"))
-                self.client = genai.GenerativeModel(self.model_name)
-                # Test with a minimal request
-                response = await self.client.generate_content_async("Test")
-                
-            elif self.provider == "deepinfra":
-                self.client = openai.AsyncOpenAI(
-                    api_key=self.api_keys.get("deepinfra"),
-                    base_url="https://api.deepinfra.com/v1/openai"
-                )
-                # Test with a minimal request
-                if self.model_name.startswith("o3") or self.model_name.startswith("o4"):
-                    await self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": "Test"}],
-                        max_completion_tokens=10
-                    )
-                else:
-                    await self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": "Test"}],
-                        max_tokens=1
-                    )
-                
-            else:
-                raise ValueError(f"Unsupported provider: {self.provider}")
+                await self.client.generate_content_async("Test")
             
-            self.is_setup = True
-            logger.info(f"APIEvaluator {self.name} setup complete with {self.context_manager.max_context_tokens} token context")
             return True
             
         except Exception as e:
             logger.error(f"Failed to setup APIEvaluator {self.name}: {e}")
             return False
     
-    async def generate_response(self, prompt: str, **kwargs) -> Dict[str, Any]:
+    @cached_response
+    async def generate_response(self, prompt: str, context: Optional[ConversationContext] = None,
+                                **kwargs) -> Dict[str, Any]:
         """Generate response using the appropriate API with context validation."""
         if not self.is_setup:
             raise RuntimeError(f"Evaluator {self.name} not setup")
+        
+        prompt = self._with_context(prompt, context)
 
         start_time = time.time()
         
@@ -1,11 +1,57 @@
 """Abstract base class for all LLM evaluators."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import functools
 import time
 from datetime import datetime
 
+from ..conversation_context import ConversationContext
 from ..unified_context_system import UnifiedContextManager, ContextLimitExceededError
+from ..utils.response_cache import response_cache, make_cache_key, NON_SAMPLING_KWARGS
+from ..utils.tokenizers import tokenizer_registry
+
+
+def cached_response(generate):
+    """Serve ``generate_response`` from the response cache when possible.
+    
+    Decorates the ``generate_response`` of concrete evaluators. Besides the
+    evaluator's own arguments, the wrapped method accepts:
+        use_cache: False bypasses the cache entirely (no lookup, no write)
+        refresh_cache: True skips the lookup but stores the new response
+        cache_sample: Distinguishes deliberately repeated requests, such as
+            the variance runs of a sequence, which must not share an answer
+    
+    Only complete responses are stored. A hit replays the turn into the
+    evaluator's context and is marked with ``cached: True``.
+    """
+    @functools.wraps(generate)
+    async def wrapper(self, prompt: str, context: Optional[ConversationContext] = None,
+                      **kwargs) -> Dict[str, Any]:
+        use_cache = kwargs.pop("use_cache", True)
+        refresh_cache = kwargs.pop("refresh_cache", False)
+        cache_sample = kwargs.pop("cache_sample", None)
+        
+        cache = self.response_cache
+        if cache is None or not cache.enabled or not use_cache:
+            if cache is not None and cache.enabled:
+                cache.bypassed += 1
+            return await generate(self, prompt, context=context, **kwargs)
+        
+        start_time = time.time()
+        key = self._response_cache_key(prompt, context, kwargs, cache_sample)
+        
+        if not refresh_cache:
+            cached = await self._serve_cached_response(key, prompt, context, start_time)
+            if cached is not None:
+                return cached
+        
+        result = await generate(self, prompt, context=context, **kwargs)
+        if isinstance(result, dict) and not result.get("partial"):
+            await cache.store(key, result)
+        return result
+    
+    return wrapper
 
 
 class BaseEvaluator(ABC):
@@ -29,19 +75,27 @@ class BaseEvaluator(ABC):
         from ..langchain_context_manager import ContextStrategy
         context_config = ContextConfig(
             max_context_tokens=context_size,
-            strategy=ContextStrategy.PRESERVE_ALL  # No truncation policy
+            strategy=ContextStrategy.PRESERVE_ALL,  # No truncation policy
+            token_counter=tokenizer_registry.get_counter(config.get("provider"), config.get("model_name"))
         )
         self.context_manager = UnifiedContextManager(context_config)
         
-        # Initialize generation history for context accumulation
-        self.generation_history = ""
+        # History accumulated by calls that don't pass their own context
+        self.conversation = ConversationContext()
+        
+        # Shared response cache, unless disabled for this model
+        self.response_cache = response_cache if config.get("response_cache", True) else None
         
     @abstractmethod
-    async def generate_response(self, prompt: str, **kwargs) -> Dict[str, Any]:
+    async def generate_response(self, prompt: str, context: Optional[ConversationContext] = None,
+                                **kwargs) -> Dict[str, Any]:
         """Generate a response to the given prompt with context validation.
         
         Args:
             prompt: The input prompt text
+            context: Earlier turns to send before the prompt. The caller owns
+                it and records the new turn; without it the evaluator uses
+                and extends its own ``conversation``
             **kwargs: Additional generation parameters
             
         Returns:
@@ -122,13 +176,71 @@ class BaseEvaluator(ABC):
             'strategy': 'PRESERVE_ALL'  # We enforce strict no-truncation
         }
     
+    @property
+    def generation_history(self) -> str:
+        """The evaluator's own conversation as a flat string."""
+        return self.conversation.render()
+    
     def reset_context(self):
         """Reset the generation history/context.
         
         This is used between sequences to ensure clean context for coherence testing.
         """
-        self.generation_history = ""
+        self.conversation.clear()
+    
+    def _with_context(self, prompt: str, context: Optional[ConversationContext]) -> str:
+        """The prompt with a caller's context rendered in front, for single-prompt backends."""
+        return context.render(prompt) if context is not None else prompt
+        
+    async def lookup_cached_response(self, prompt: str, context: Optional[ConversationContext] = None,
+                                     cache_sample: Any = None, **kwargs) -> Optional[Dict[str, Any]]:
+        """The cached response ``generate_response`` would serve for this request, or None.
         
+        A hit is replayed into the evaluator's state and marked exactly as in
+        ``generate_response``. Callers that admit requests through a rate
+        limiter look here first, so a hit spends no provider budget; after a
+        miss they call ``generate_response`` with ``refresh_cache=True`` so the
+        lookup is not repeated.
+        """
+        if self.response_cache is None or not self.response_cache.enabled:
+            return None
+        start_time = time.time()
+        key = self._response_cache_key(prompt, context, kwargs, cache_sample)
+        return await self._serve_cached_response(key, prompt, context, start_time)
+    
+    def _response_cache_key(self, prompt: str, context: Optional[ConversationContext],
+                            kwargs: Dict[str, Any], cache_sample: Any) -> str:
+        return make_cache_key(self._cache_model_id(), self._cache_messages(prompt, context),
+                              self._cache_params(kwargs), cache_sample)
+    
+    async def _serve_cached_response(self, key: str, prompt: str, context: Optional[ConversationContext],
+                                     start_time: float) -> Optional[Dict[str, Any]]:
+        cached = await self.response_cache.lookup(key)
+        if cached is None:
+            return None
+        self._replay_cached_response(prompt, context, cached)
+        cached["cached"] = True
+        cached["cached_generation_time"] = cached.get("generation_time")
+        cached["generation_time"] = time.time() - start_time
+        return cached
+    
+    def _cache_model_id(self) -> str:
+        """Model identity for response cache keys."""
+        return f"{self.config.get('provider', 'unknown')}/{self.config.get('model_name', self.name)}"
+    
+    def _cache_messages(self, prompt: str, context: Optional[ConversationContext]) -> List[Dict[str, str]]:
+        """The messages a request for ``prompt`` would send, for cache keys."""
+        return [{"role": "user", "content": self._with_context(prompt, context)}]
+    
+    def _cache_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Sampling parameters a request with ``kwargs`` would use, for cache keys."""
+        return {k: v for k, v in kwargs.items() if k not in NON_SAMPLING_KWARGS}
+    
+    def _replay_cached_response(self, prompt: str, context: Optional[ConversationContext],
+                                result: Dict[str, Any]):
+        """Apply a cached response to evaluator state as if it had been generated."""
+        pass
+    
     def _create_response_dict(self, response_text: str, start_time: float, 
                              metadata: Optional[Dict] = None,
                              context_stats: Optional[Dict] = None) -> Dict[str, Any]:
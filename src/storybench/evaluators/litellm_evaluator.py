@@ -3,7 +3,7 @@
 import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import litellm
 from litellm import acompletion, ModelResponse
 from tenacity import (
@@ -14,8 +14,12 @@ from tenacity import (
     before_sleep_log
 )
 
-from .base import BaseEvaluator
+from .base import BaseEvaluator, cached_response
+from .stream_checkpoint import StreamCheckpoint
+from ..conversation_context import ConversationContext
 from ..unified_context_system import ContextLimitExceededError
+from ..utils.probe_cache import probe_cache
+from ..utils.latency_metrics import latency_metrics, STAGE_FIRST_TOKEN
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,14 @@ logger = logging.getLogger(__name__)
 litellm.drop_params = True  # Drop unsupported params instead of failing
 litellm.set_verbose = False  # Set to True for debugging
 
+# How a sequence's earlier turns are sent: one flattened user message, or
+# real user/assistant messages whose shared prefix providers can cache
+REQUEST_MODES = ("flat", "chat")
+
+# Providers that only cache prompt prefixes marked with cache_control; the
+# others (OpenAI, DeepSeek, Gemini) cache repeated prefixes automatically
+EXPLICIT_CACHE_PROVIDERS = {"anthropic"}
+
 
 class LiteLLMEvaluator(BaseEvaluator):
     """
@@ -52,9 +64,21 @@ class LiteLLMEvaluator(BaseEvaluator):
         self.litellm_model = self._construct_litellm_model_string()
         self._configure_litellm()
         
+        # Streaming consumes chunks as they arrive; partial text survives timeouts
+        self.streaming = config.get("streaming", False)
+        self.stream_checkpoint_dir = config.get("stream_checkpoint_dir")
+        self.last_checkpoint: Optional[StreamCheckpoint] = None
+        
+        # Chat mode sends prior turns as messages so providers can cache the prefix
+        self.request_mode = config.get("request_mode", "flat")
+        if self.request_mode not in REQUEST_MODES:
+            raise ValueError(f"Unknown request_mode for {name}: {self.request_mode}")
+        self.prompt_caching = config.get("prompt_caching", True)
+        
         # Track usage for logging
         self.total_prompt_tokens = 0
         self.total_completion_tokens = 0
+        self.total_cached_tokens = 0
         self.total_cost = 0.0
         
         logger.info(f"Initialized LiteLLMEvaluator for {self.litellm_model}")
@@ -129,9 +153,27 @@ class LiteLLMEvaluator(BaseEvaluator):
     async def setup(self) -> bool:
         """Test LiteLLM connectivity with the configured model.
         
+        The probe result is shared through the global probe cache, so many
+        evaluators for the same model and key only probe once per TTL.
+        
         Returns:
             True if setup successful, False otherwise
         """
+        return await probe_cache.get_or_probe(
+            self.provider,
+            self.litellm_model,
+            self._get_provider_api_key(),
+            self._probe_connectivity
+        )
+    
+    def _get_provider_api_key(self) -> Optional[str]:
+        """API key used for this evaluator's provider."""
+        if self.provider == "google":
+            return self.api_keys.get("gemini") or self.api_keys.get("google")
+        return self.api_keys.get(self.provider)
+    
+    async def _probe_connectivity(self) -> bool:
+        """Send a minimal completion to verify the model is reachable."""
         try:
             logger.info(f"Testing LiteLLM setup for {self.litellm_model}")
             
@@ -187,11 +229,185 @@ class LiteLLMEvaluator(BaseEvaluator):
             **kwargs
         )
     
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=60),
+        retry=retry_if_exception_type((
+            litellm.exceptions.RateLimitError,
+            litellm.exceptions.APIConnectionError,
+            litellm.exceptions.APIError,
+            litellm.exceptions.ServiceUnavailableError,
+            litellm.exceptions.Timeout
+        )),
+        before_sleep=before_sleep_log(logger, logging.WARNING)
+    )
+    async def _open_stream(self, messages: List[Dict], **kwargs):
+        """Start a streamed completion with retry logic.
+        
+        Only failures before the stream is established are retried; once text
+        has arrived, errors are handled by ``_generate_streaming``.
+        """
+        return await acompletion(
+            model=self.litellm_model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+    
+    async def _generate_streaming(self, messages: List[Dict], **kwargs) -> Dict[str, Any]:
+        """Consume a streamed completion chunk by chunk.
+        
+        The ``timeout`` kwarg is the deadline for the whole generation. If the
+        stream fails or hits the deadline after some text has arrived, the
+        partial text is returned (``interrupted`` holds the reason, ``timed_out``
+        tells a deadline from a stream error) instead of being discarded; it is
+        also kept in ``self.last_checkpoint``.
+        
+        Returns:
+            Dictionary with text, usage, finish_reason, interrupted, timed_out and stream_stats
+        """
+        deadline_seconds = kwargs.get("timeout", 300.0)
+        checkpoint = StreamCheckpoint(self.name, directory=self.stream_checkpoint_dir)
+        self.last_checkpoint = checkpoint
+        
+        start = time.monotonic()
+        first_token_at = None
+        content_chunks = 0
+        usage = None
+        finish_reason = None
+        interrupted = None
+        timed_out = False
+        
+        try:
+            stream = await self._open_stream(messages, **kwargs)
+            while True:
+                remaining = deadline_seconds - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    break
+                
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = getattr(choice.delta, "content", None)
+                if delta:
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                    content_chunks += 1
+                    checkpoint.append(delta)
+        except asyncio.TimeoutError:
+            interrupted = f"timeout after {deadline_seconds:.0f}s"
+            timed_out = True
+        except Exception as e:
+            if not checkpoint.chars:
+                raise
+            interrupted = str(e)
+        
+        end = time.monotonic()
+        if interrupted:
+            checkpoint.interrupt(interrupted)
+            if not checkpoint.chars:
+                raise litellm.exceptions.Timeout(
+                    message=f"No output from {self.litellm_model} before {interrupted}",
+                    model=self.litellm_model,
+                    llm_provider=self.provider
+                )
+        else:
+            checkpoint.complete()
+        
+        completion_tokens = getattr(usage, "completion_tokens", None) or content_chunks
+        time_to_first_token = first_token_at - start if first_token_at is not None else None
+        streaming_seconds = end - first_token_at if first_token_at is not None else 0.0
+        if time_to_first_token is not None:
+            latency_metrics.observe(STAGE_FIRST_TOKEN, self.provider, self.name, time_to_first_token)
+        
+        return {
+            "text": checkpoint.text,
+            "usage": usage,
+            "finish_reason": finish_reason,
+            "interrupted": interrupted,
+            "timed_out": timed_out,
+            "stream_stats": {
+                "time_to_first_token": time_to_first_token,
+                "tokens_per_second": completion_tokens / streaming_seconds if streaming_seconds > 0 else None,
+                "completion_tokens": completion_tokens,
+                "chunks": content_chunks,
+                "interrupted": interrupted
+            }
+        }
+    
+    def _cache_model_id(self) -> str:
+        return self.litellm_model
+    
+    def _build_messages(self, conversation: ConversationContext, prompt: str) -> Tuple[List[Dict[str, Any]], str]:
+        """Request messages for ``prompt`` after ``conversation``, and the flat context text.
+        
+        The flat text is built in both modes: it enforces the context limit
+        and is what token estimates are calibrated against.
+        """
+        context_text = self.context_manager.build_conversation(conversation, prompt)
+        if self.request_mode == "flat":
+            return [{"role": "user", "content": context_text}], context_text
+        
+        messages = conversation.to_messages(prompt)
+        if self.prompt_caching and self.provider in EXPLICIT_CACHE_PROVIDERS:
+            self._mark_cacheable_prefix(messages)
+        return messages, context_text
+    
+    @staticmethod
+    def _mark_cacheable_prefix(messages: List[Dict[str, Any]]):
+        """Add cache breakpoints at the system instructions and the last two user messages.
+        
+        The system breakpoint covers instructions shared by unrelated calls
+        (e.g. judge criteria). Of the user breakpoints, the newest writes the
+        prefix that the next turn of the run extends; the one before reads
+        what the previous turn wrote.
+        """
+        system_indexes = [index for index, message in enumerate(messages) if message["role"] == "system"]
+        user_indexes = [index for index, message in enumerate(messages) if message["role"] == "user"]
+        for index in system_indexes[-1:] + user_indexes[-2:]:
+            messages[index] = {
+                "role": messages[index]["role"],
+                "content": [{"type": "text", "text": messages[index]["content"],
+                             "cache_control": {"type": "ephemeral"}}]
+            }
+    
+    @staticmethod
+    def _cached_token_usage(usage) -> Dict[str, int]:
+        """Prompt-cache token counts from a LiteLLM usage block."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or getattr(usage, "cache_read_input_tokens", None) or 0
+        created = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return {"cached_tokens": cached, "cache_creation_tokens": created}
+    
+    def _cache_messages(self, prompt: str, context: Optional[ConversationContext]) -> List[Dict[str, Any]]:
+        conversation = context if context is not None else self.conversation
+        return self._build_messages(conversation, prompt)[0]
+    
+    def _cache_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {"temperature": 1.0, "max_tokens": 8192, **super()._cache_params(kwargs)}
+    
+    def _replay_cached_response(self, prompt: str, context: Optional[ConversationContext],
+                                result: Dict[str, Any]):
+        if context is None:
+            self.conversation.add_turn(prompt, result["response"])
+    
+    @cached_response
     async def generate_response(
         self,
         prompt: str,
+        context: Optional[ConversationContext] = None,
         temperature: float = 1.0,
         max_tokens: int = 8192,
+        stream: Optional[bool] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """Generate response using LiteLLM with LangChain context management.
@@ -204,12 +420,21 @@ class LiteLLMEvaluator(BaseEvaluator):
         
         Args:
             prompt: The prompt text
+            context: Earlier turns of the sequence; defaults to the evaluator's own history
             temperature: Generation temperature (0.0-2.0)
             max_tokens: Maximum tokens to generate
+            stream: Stream the response (defaults to the ``streaming`` config flag)
             **kwargs: Additional generation parameters
             
         Returns:
-            Dictionary with response and metadata
+            Dictionary with response and metadata. ``usage`` includes the
+            prompt tokens served from the provider's prompt cache
+            (``cached_tokens``) and written to it (``cache_creation_tokens``).
+            Streamed responses add
+            ``stream_stats`` and, if cut short, ``partial``/``interrupted``
+            (plus ``timed_out`` at the ``timeout`` deadline). A partial
+            response is not an answer: it is not added to the evaluator's
+            own history, and callers should not record it as a turn
             
         Raises:
             ContextLimitExceededError: If context exceeds model limits
@@ -217,22 +442,20 @@ class LiteLLMEvaluator(BaseEvaluator):
         start_time = time.time()
         
         try:
-            # Step 1: Build context using LangChain (preserves full history)
-            context = self.context_manager.build_context(
-                history_text=self.generation_history,
-                current_prompt=prompt
-            )
+            # Step 1: Pick the history for this request (preserves full history)
+            conversation = context if context is not None else self.conversation
             
-            # Get context statistics
-            context_stats = self.context_manager.get_context_stats(context)
+            # Step 2: Prepare messages for LiteLLM, enforcing the context limit
+            # (one flattened message, or one message per turn in chat mode)
+            messages, context_text = self._build_messages(conversation, prompt)
+            
+            # Get context statistics from the cached segment counts
+            context_stats = self.context_manager.get_conversation_stats(conversation, prompt)
             logger.info(
                 f"Context: {context_stats['estimated_tokens']}/{context_stats['max_tokens']} tokens "
                 f"({context_stats['token_utilization']:.1%} utilization)"
             )
             
-            # Step 2: Prepare messages for LiteLLM
-            messages = [{"role": "user", "content": context}]
-            
             # Step 3: Prepare completion parameters
             completion_kwargs = {
                 "temperature": temperature,
@@ -252,36 +475,48 @@ class LiteLLMEvaluator(BaseEvaluator):
             # Step 4: Generate response with retry logic
             logger.debug(f"Generating with {self.litellm_model}, temp={temperature}, max_tokens={max_tokens}")
             
-            response = await self._generate_with_retry(
-                messages=messages,
-                **completion_kwargs
-            )
-            
-            # Step 5: Extract response content
-            response_text = response.choices[0].message.content
+            use_stream = self.streaming if stream is None else stream
+            streamed = None
+            if use_stream:
+                streamed = await self._generate_streaming(messages, **completion_kwargs)
+                response_text = streamed["text"]
+                usage = streamed["usage"]
+            else:
+                response = await self._generate_with_retry(
+                    messages=messages,
+                    **completion_kwargs
+                )
+                # Step 5: Extract response content
+                response_text = response.choices[0].message.content
+                usage = getattr(response, 'usage', None)
             
             # Handle None content (some models may return None for certain inputs)
             if response_text is None:
                 response_text = ""
                 logger.warning(f"Model {self.litellm_model} returned None content")
             
-            # Step 6: Update generation history for next turn
-            self.generation_history = context + "\n\n" + response_text
+            # Step 6: Update generation history for next turn (callers passing a context record it themselves);
+            # cut-off text never becomes history
+            if context is None and not (streamed and streamed["interrupted"]):
+                self.conversation.add_turn(prompt, response_text)
             
             # Step 7: Calculate metrics
             generation_time = time.time() - start_time
             
             # Update usage tracking
-            if hasattr(response, 'usage') and response.usage:
-                self.total_prompt_tokens += response.usage.prompt_tokens
-                self.total_completion_tokens += response.usage.completion_tokens
-                
+            if usage:
+                self.total_prompt_tokens += usage.prompt_tokens
+                self.total_completion_tokens += usage.completion_tokens
+                cache_usage = self._cached_token_usage(usage)
+                self.total_cached_tokens += cache_usage["cached_tokens"]
+                self.context_manager.calibrate_tokens(context_text, usage.prompt_tokens)
+
                 # Calculate cost if available
                 try:
                     cost = litellm.completion_cost(
                         model=self.litellm_model,
-                        prompt_tokens=response.usage.prompt_tokens,
-                        completion_tokens=response.usage.completion_tokens
+                        prompt_tokens=usage.prompt_tokens,
+                        completion_tokens=usage.completion_tokens
                     )
                     self.total_cost += cost
                 except:
@@ -299,17 +534,27 @@ class LiteLLMEvaluator(BaseEvaluator):
                 "generation_time": generation_time,
                 "context_stats": context_stats,
                 "litellm_model": self.litellm_model,
+                "request_mode": self.request_mode,
             }
             
             # Add usage stats if available
-            if hasattr(response, 'usage') and response.usage:
+            if usage:
                 result["usage"] = {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens,
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "total_tokens": usage.total_tokens,
+                    **cache_usage,
                     "cost": cost
                 }
             
+            if streamed is not None:
+                result["stream_stats"] = streamed["stream_stats"]
+                result["finish_reason"] = streamed["finish_reason"]
+                if streamed["interrupted"]:
+                    result["partial"] = True
+                    result["interrupted"] = streamed["interrupted"]
+                    result["timed_out"] = streamed["timed_out"]
+            
             logger.info(f"Generated {len(response_text)} chars in {generation_time:.2f}s")
             return result
             
@@ -337,6 +582,7 @@ class LiteLLMEvaluator(BaseEvaluator):
                 f"LiteLLM session summary for {self.name}: "
                 f"Prompt tokens: {self.total_prompt_tokens:,}, "
                 f"Completion tokens: {self.total_completion_tokens:,}, "
+                f"Cached prompt tokens: {self.total_cached_tokens:,}, "
                 f"Total cost: ${self.total_cost:.4f}"
             )
     
@@ -352,7 +598,9 @@ class LiteLLMEvaluator(BaseEvaluator):
             "model_name": self.model_name,
             "litellm_model": self.litellm_model,
             "context_size": self.config.get("context_size", "unknown"),
+            "request_mode": self.request_mode,
             "total_tokens_used": self.total_prompt_tokens + self.total_completion_tokens,
+            "total_cached_tokens": self.total_cached_tokens,
             "total_cost": self.total_cost
         }
 
@@ -4,7 +4,10 @@ import os
 import time
 import logging
 import asyncio
+import functools
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Union
 
@@ -13,7 +16,9 @@ import requests
 from tqdm import tqdm
 from huggingface_hub import hf_hub_download
 
-from .base import BaseEvaluator
+from .base import BaseEvaluator, cached_response
+from ..conversation_context import ConversationContext
+from .model_registry import local_model_registry, ModelKey, ResidentModel
 from ..unified_context_system import create_32k_system, create_128k_system, create_1m_system, ContextLimitExceededError
 
 logger = logging.getLogger(__name__)
@@ -24,6 +29,9 @@ MODELS_DIR = Path(os.environ.get("STORYBENCH_MODELS_DIR", Path.cwd() / "models")
 # Ensure models directory exists
 MODELS_DIR.mkdir(exist_ok=True, parents=True)
 
+# Seconds between generation progress updates sent to progress callbacks
+GENERATION_PROGRESS_INTERVAL = 1.0
+
 
 class LocalEvaluator(BaseEvaluator):
     """Enhanced evaluator for local GGUF models using LangChain integration."""
@@ -50,6 +58,21 @@ class LocalEvaluator(BaseEvaluator):
         self.model_path = None
         self.llm = None  # This will be the LangChain wrapper
         self._progress_callbacks = set()
+        # llama.cpp blocks for the whole generation; it runs on this model's own
+        # thread so the event loop stays free (one generation at a time per model)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Resident models stay loaded in the process-wide registry after cleanup
+        self.resident = config.get("resident", True)
+        self._resident_model: Optional[ResidentModel] = None
+        
+        # KV cache reuse: later turns of a run only prefill the tokens after the
+        # shared prefix. The state is saved when other evaluators share the model.
+        self.kv_cache_reuse = config.get("kv_cache_reuse", True)
+        self._kv_state = None
+        self._kv_reset_pending = False
+        self.last_kv_stats: Dict[str, Any] = {}
         
         # Store model parameters from config, applying defaults
         # Handle both flattened config (from run_end_to_end.py) and nested "model_settings"/"settings"
@@ -96,7 +119,10 @@ class LocalEvaluator(BaseEvaluator):
             raise ValueError(f"Local model {name} missing required configuration: repo_id and filename")
     
     def register_progress_callback(self, callback):
-        """Register a callback for download progress updates.
+        """Register a callback for download, load and generation progress updates.
+        
+        Callbacks always run on the event loop thread, including the
+        updates sent while a generation is running on the model thread.
         
         Args:
             callback: Function that takes (progress_percent, status_message) as arguments
@@ -111,8 +137,170 @@ class LocalEvaluator(BaseEvaluator):
             except Exception as e:
                 logger.warning(f"Progress callback failed: {e}")
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._resident_model is not None:
+            return self._resident_model.executor  # Shared by every evaluator using the model
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"llama-{self.name}")
+        return self._executor
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking llama.cpp call on the model thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+    
+    async def _generate_off_loop(self, prompt: str, llm_params: Dict[str, Any]) -> str:
+        """Generate on the model thread, reporting progress and honouring cancellation.
+        
+        Cancelling the awaiting task stops the generation at the next token.
+        """
+        loop = self._loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        max_tokens = llm_params.get("max_tokens")
+        
+        def report(tokens: int):
+            progress = min(99.0, 100.0 * tokens / max_tokens) if max_tokens else 0.0
+            self._send_progress_threadsafe(progress, f"Generating: {tokens} tokens")
+        
+        future = loop.run_in_executor(
+            self._get_executor(), self._generate_blocking, prompt, llm_params, cancelled, report
+        )
+        try:
+            return await future
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    def _generate_blocking(self, prompt: str, llm_params: Dict[str, Any],
+                           cancelled: threading.Event, report) -> str:
+        """Runs on the model thread: stream tokens until done or cancelled."""
+        llama = getattr(self.llm, "client", None) if self.kv_cache_reuse else None
+        self.last_kv_stats = {}
+        if llama is not None:
+            self.last_kv_stats = self._prepare_kv_cache(llama, prompt)
+        try:
+            return self._stream_tokens(prompt, llm_params, cancelled, report)
+        finally:
+            if llama is not None:
+                self._finish_kv_turn(llama)
+    
+    def _prepare_kv_cache(self, llama, prompt: str) -> Dict[str, Any]:
+        """Put this run's KV cache in place and count the prompt tokens it covers.
+        
+        llama.cpp keeps the tokens it last evaluated and only prefills the part
+        of a new prompt after their common prefix, so a turn that extends the
+        previous one reuses the whole conversation so far.
+        """
+        restored = False
+        if self._kv_reset_pending:
+            llama.reset()
+            self._kv_state = None
+            self._kv_reset_pending = False
+        elif (self._kv_state is not None and self._resident_model is not None
+                and self._resident_model.kv_owner is not self):
+            # Another evaluator used the model since our last turn
+            llama.load_state(self._kv_state)
+            restored = True
+        
+        prompt_tokens = llama.tokenize(prompt.encode("utf-8"))
+        reused = 0
+        # The last prompt token is always evaluated again to produce logits
+        for cached, token in zip(llama.input_ids[:llama.n_tokens], prompt_tokens[:-1]):
+            if cached != token:
+                break
+            reused += 1
+        return {"prompt_tokens": len(prompt_tokens), "reused_prefix_tokens": reused, "kv_state_restored": restored}
+    
+    def _finish_kv_turn(self, llama):
+        """Record this turn as the model's KV contents, saving them if the model is shared."""
+        if self._resident_model is None:
+            return
+        self._resident_model.kv_owner = self
+        self._kv_state = llama.save_state() if self._resident_model.in_use > 1 else None
+    
+    def reset_context(self):
+        """Reset the generation history and start the next turn with an empty KV cache."""
+        super().reset_context()
+        self._kv_state = None
+        self._kv_reset_pending = True  # Applied on the model thread before the next turn
+    
+    def _stream_tokens(self, prompt: str, llm_params: Dict[str, Any],
+                       cancelled: threading.Event, report) -> str:
+        stream = getattr(self.llm, "stream", None)
+        if stream is None:
+            return self.llm(prompt, **llm_params)
+        
+        parts = []
+        last_report = time.monotonic()
+        for chunk in stream(prompt, **llm_params):
+            parts.append(chunk)
+            if cancelled.is_set():
+                logger.info(f"Generation for {self.name} cancelled after {len(parts)} tokens")
+                break
+            if time.monotonic() - last_report >= GENERATION_PROGRESS_INTERVAL:
+                report(len(parts))
+                last_report = time.monotonic()
+        return "".join(parts)
+    
+    def _registry_key(self) -> ModelKey:
+        filename = f"{self.subdirectory}/{self.filename}" if self.subdirectory else self.filename
+        return (self.repo_id, filename, self.model_parameters["n_ctx"])
+    
+    def _load_and_test(self) -> Tuple[Any, Any]:
+        """Load the model with LangChain and run a short test generation (blocking).
+        
+        Returns:
+            (context_manager, llm) for the loaded model
+        
+        Raises:
+            RuntimeError: If the test generation fails
+        """
+        self._send_progress_threadsafe(50, "Loading model with LangChain...")
+        
+        # Create unified LangChain system - context manager + LLM wrapper
+        context_size = self.model_parameters["n_ctx"]
+        logger.info(f"Initializing LangChain system with {context_size} context size")
+        model_params = {k: v for k, v in self.model_parameters.items() if k != 'n_ctx'}
+        
+        # Create the unified system based on context size
+        if context_size <= 32768:
+            logger.info("Using 32K unified context system")
+            context_manager, llm = create_32k_system(model_path=str(self.model_path), **model_params)
+        elif context_size <= 131072:
+            logger.info("Using 128K unified context system")
+            context_manager, llm = create_128k_system(model_path=str(self.model_path), **model_params)
+        else:
+            # Use 1M system for very large contexts
+            logger.info("Using 1M unified context system")
+            context_manager, llm = create_1m_system(model_path=str(self.model_path), **model_params)
+        
+        logger.info(f"LangChain system initialized with {context_manager.max_context_tokens} token context")
+        
+        # Test the model with a simple prompt
+        self._send_progress_threadsafe(90, "Testing model...")
+        test_prompt = "Hello, this is a test."
+        try:
+            context_manager.validate_context_size_strict(test_prompt, f"evaluator_{self.name}")
+            test_response = llm(test_prompt, max_tokens=10, temperature=0.1)
+            logger.info(f"Model test successful: {len(test_response)} chars generated")
+        except Exception as e:
+            raise RuntimeError(f"Model test failed: {e}") from e
+        
+        return context_manager, llm
+    
+    def _send_progress_threadsafe(self, progress: float, status: str):
+        """Send progress from the model thread via the event loop."""
+        if self._loop is None:
+            self._send_progress(progress, status)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._send_progress, progress, status)
+        except RuntimeError:
+            pass  # Event loop already closed
+    
     async def setup(self) -> bool:
         """Setup the evaluator by downloading and loading the model with LangChain."""
+        self._loop = asyncio.get_running_loop()
         try:
             logger.info(f"Setting up LocalEvaluator for {self.name}")
             
@@ -126,70 +314,18 @@ class LocalEvaluator(BaseEvaluator):
                 logger.error(f"Model file not found after download: {self.model_path}")
                 return False            
             logger.info(f"Model path confirmed: {self.model_path}")
-            self._send_progress(50, "Loading model with LangChain...")
             
-            # Create unified LangChain system - context manager + LLM wrapper
-            context_size = self.model_parameters["n_ctx"]
-            logger.info(f"Initializing LangChain system with {context_size} context size")
-            print(f"DEBUG: About to create unified system for {self.name}")
-            
-            # Create the unified system based on context size
-            if context_size <= 32768:
-                # Use 32K system
-                logger.info("Using 32K unified context system")
-                model_params = {k: v for k, v in self.model_parameters.items() if k != 'n_ctx'}
-                print(f"DEBUG: Calling create_32k_system for {self.name}")
-                unified_context_manager, self.llm = create_32k_system(
-                    model_path=str(self.model_path),
-                    **model_params
-                )
-                print(f"DEBUG: create_32k_system completed for {self.name}")
-                # Replace our context manager with the unified one for consistency
-                self.context_manager = unified_context_manager
-                
-            elif context_size <= 131072:
-                # Use 128K system  
-                logger.info("Using 128K unified context system")
-                model_params = {k: v for k, v in self.model_parameters.items() if k != 'n_ctx'}
-                unified_context_manager, self.llm = create_128k_system(
-                    model_path=str(self.model_path),
-                    **model_params
+            if self.resident:
+                # Shared with other evaluators; loaded and smoke-tested only once per process
+                if self._resident_model is not None:
+                    local_model_registry.release(self._resident_model)
+                self._resident_model = await local_model_registry.acquire(
+                    self._registry_key(), self._load_and_test, self.model_path.stat().st_size
                 )
-                self.context_manager = unified_context_manager
-                
+                self.context_manager = self._resident_model.context_manager
+                self.llm = self._resident_model.llm
             else:
-                # Use 1M system for very large contexts
-                logger.info("Using 1M unified context system") 
-                model_params = {k: v for k, v in self.model_parameters.items() if k != 'n_ctx'}
-                unified_context_manager, self.llm = create_1m_system(
-                    model_path=str(self.model_path),
-                    **model_params
-                )
-                self.context_manager = unified_context_manager
-            
-            print(f"DEBUG: Unified system created, about to test for {self.name}")
-            logger.info(f"LangChain system initialized with {self.context_manager.max_context_tokens} token context")
-            
-            # Test the model with a simple prompt
-            self._send_progress(90, "Testing model...")
-            test_prompt = "Hello, this is a test."
-            
-            try:
-                print(f"DEBUG: About to validate context for {self.name}")
-                # Validate test prompt doesn't exceed context
-                self.validate_context_size(test_prompt)
-                print(f"DEBUG: Context validation passed for {self.name}")
-                
-                # Test generation
-                print(f"DEBUG: About to test generation for {self.name}")
-                test_response = self.llm(test_prompt, max_tokens=10, temperature=0.1)
-                print(f"DEBUG: Test generation completed for {self.name}")
-                logger.info(f"Model test successful: {len(test_response)} chars generated")
-                
-            except Exception as e:
-                logger.error(f"Model test failed: {e}")
-                print(f"DEBUG: Model test failed for {self.name}: {e}")
-                return False
+                self.context_manager, self.llm = await self._run_blocking(self._load_and_test)
             
             self.is_setup = True
             self._send_progress(100, f"Model {self.name} ready")
@@ -202,11 +338,33 @@ class LocalEvaluator(BaseEvaluator):
             self._send_progress(0, f"Setup failed: {str(e)}")
             return False
     
-    async def generate_response(self, prompt: str, **kwargs) -> Dict[str, Any]:
+    def _sampling_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract generation parameters, using self.model_parameters as defaults."""
+        llm_params = {
+            "temperature": kwargs.get("temperature", self.model_parameters.get("temperature")),
+            "max_tokens": kwargs.get("max_tokens", self.model_parameters.get("max_tokens")),
+            "stop": kwargs.get("stop", self.model_parameters.get("stop")),
+            "top_k": kwargs.get("top_k", self.model_parameters.get("top_k")),
+            "top_p": kwargs.get("top_p", self.model_parameters.get("top_p")),
+            "repeat_penalty": kwargs.get("repeat_penalty", self.model_parameters.get("repeat_penalty")),
+        }
+        # Remove any params that ended up as None
+        return {k: v for k, v in llm_params.items() if v is not None}
+    
+    def _cache_model_id(self) -> str:
+        return f"local/{self.repo_id}/{self.subdirectory or ''}/{self.filename}"
+    
+    def _cache_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return self._sampling_params(kwargs)
+    
+    @cached_response
+    async def generate_response(self, prompt: str, context: Optional[ConversationContext] = None,
+                                **kwargs) -> Dict[str, Any]:
         """Generate response using LangChain-wrapped local model.
         
         Args:
             prompt: The prompt to send to the model
+            context: Earlier turns of the sequence, rendered in front of the prompt
             **kwargs: Additional parameters for generation
         
         Returns:
@@ -220,6 +378,7 @@ class LocalEvaluator(BaseEvaluator):
             raise RuntimeError(f"Model {self.name} is not loaded. Call setup() first.")
         
         start_time = time.time()
+        prompt = self._with_context(prompt, context)
         
         try:
             # STRICT CONTEXT VALIDATION - No truncation allowed
@@ -232,17 +391,7 @@ class LocalEvaluator(BaseEvaluator):
                        f"tokens={context_analytics['estimated_tokens']}/{context_analytics['max_tokens']}, "
                        f"utilization={context_analytics['utilization_percent']:.1f}%")
             
-            # Extract generation parameters, using self.model_parameters as defaults
-            llm_params = {
-                "temperature": kwargs.get("temperature", self.model_parameters.get("temperature")),
-                "max_tokens": kwargs.get("max_tokens", self.model_parameters.get("max_tokens")),
-                "stop": kwargs.get("stop", self.model_parameters.get("stop")),
-                "top_k": kwargs.get("top_k", self.model_parameters.get("top_k")),
-                "top_p": kwargs.get("top_p", self.model_parameters.get("top_p")),
-                "repeat_penalty": kwargs.get("repeat_penalty", self.model_parameters.get("repeat_penalty")),
-            }
-            # Remove any params that ended up as None
-            llm_params = {k: v for k, v in llm_params.items() if v is not None}
+            llm_params = self._sampling_params(kwargs)
 
             max_retries = 2  # Allow retries for stuck generations
             
@@ -255,8 +404,8 @@ class LocalEvaluator(BaseEvaluator):
                                f"max {max_gen_tokens} generation tokens, "
                                f"hash={context_analytics['prompt_hash']}")
                     
-                    # Generate response using LangChain wrapper
-                    response_text = self.llm(prompt, **llm_params)
+                    # Generate response using LangChain wrapper, off the event loop
+                    response_text = await self._generate_off_loop(prompt, llm_params)
                     
                     # Validate response
                     if response_text is None:
@@ -292,7 +441,7 @@ class LocalEvaluator(BaseEvaluator):
                         generated_text, 
                         start_time, 
                         metadata=metadata,
-                        context_stats=context_analytics
+                        context_stats={**context_analytics, **self.last_kv_stats}
                     )
                     
                 except Exception as e:
@@ -317,6 +466,8 @@ class LocalEvaluator(BaseEvaluator):
             # But we can clear any cached state if needed
             if hasattr(self.llm, 'reset'):
                 self.llm.reset()
+            # Start the retry from an empty KV cache
+            self._kv_reset_pending = True
             logger.debug(f"Model state reset for {self.name}")
         except Exception as e:
             logger.warning(f"Failed to reset model state: {e}")
@@ -324,11 +475,19 @@ class LocalEvaluator(BaseEvaluator):
     async def cleanup(self):
         """Clean up model resources."""
         try:
-            if self.llm:
+            if self._resident_model is not None:
+                # Keep the model loaded for the next evaluation; the registry evicts it
+                local_model_registry.release(self._resident_model)
+                self._resident_model = None
+                self.llm = None
+            elif self.llm:
                 # LangChain wrapper cleanup
                 if hasattr(self.llm, 'client') and hasattr(self.llm.client, 'close'):
                     self.llm.client.close()
                 self.llm = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
             self.is_setup = False
             logger.info(f"LocalEvaluator {self.name} cleaned up")
         except Exception as e:
@@ -383,7 +542,8 @@ class LocalEvaluator(BaseEvaluator):
                 
                 try:
                     # Use huggingface_hub for download
-                    downloaded_path = hf_hub_download(
+                    downloaded_path = await self._run_blocking(
+                        hf_hub_download,
                         repo_id=self.repo_id,
                         filename=self.filename,
                         subfolder=self.subdirectory,
@@ -0,0 +1,176 @@
+"""Process-wide registry of loaded local models."""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, str, int]  # (repo_id, filename, n_ctx)
+
+# Fraction of system RAM that resident models may use when no budget is configured
+DEFAULT_RAM_FRACTION = 0.5
+
+
+def default_ram_budget() -> Optional[int]:
+    """RAM budget in bytes from STORYBENCH_MODEL_RAM_GB, else half of system RAM."""
+    configured = os.environ.get("STORYBENCH_MODEL_RAM_GB")
+    if configured:
+        return int(float(configured) * 1024 ** 3)
+    try:
+        import psutil
+        return int(psutil.virtual_memory().total * DEFAULT_RAM_FRACTION)
+    except ImportError:
+        logger.warning("psutil not available, local model RAM budget is unlimited")
+        return None
+
+
+@dataclass
+class ResidentModel:
+    """A loaded llama.cpp model and the single thread that runs it."""
+    key: ModelKey
+    context_manager: Any
+    llm: Any
+    size_bytes: int
+    executor: ThreadPoolExecutor
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: int = 0
+    kv_owner: Any = None  # Evaluator whose turn is in the KV cache
+
+    def close(self):
+        """Free the model once no evaluator holds it."""
+        if hasattr(self.llm, 'client') and hasattr(self.llm.client, 'close'):
+            try:
+                self.llm.client.close()
+            except Exception as e:
+                logger.warning(f"Error closing model {self.key}: {e}")
+        self.executor.shutdown(wait=False)
+        self.llm = None
+        self.context_manager = None
+        self.kv_owner = None
+
+
+class LocalModelRegistry:
+    """
+    Keeps loaded GGUF models resident between evaluations.
+
+    Models are keyed by (repo_id, filename, n_ctx) and shared by every
+    evaluator that asks for the same key, so back-to-back evaluations skip
+    the model load. When loading a model would exceed ``ram_budget_bytes``,
+    the least recently used models that no evaluator is holding are evicted
+    first. Sizes are the GGUF file sizes, which is what llama.cpp maps into
+    memory. Concurrent requests for the same key wait for a single load.
+    """
+
+    def __init__(self, ram_budget_bytes: Optional[int] = None):
+        self.ram_budget_bytes = ram_budget_bytes if ram_budget_bytes is not None else default_ram_budget()
+        self.models: "OrderedDict[ModelKey, ResidentModel]" = OrderedDict()
+        self._load_locks: Dict[ModelKey, asyncio.Lock] = {}
+
+        # Statistics
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def configure(self, ram_budget_bytes: Optional[int]):
+        """Change the RAM budget; takes effect at the next load."""
+        self.ram_budget_bytes = ram_budget_bytes
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(model.size_bytes for model in self.models.values())
+
+    async def acquire(self,
+                      key: ModelKey,
+                      load: Callable[[], Tuple[Any, Any]],
+                      size_bytes: int) -> ResidentModel:
+        """
+        Return the resident model for ``key``, loading it if needed.
+
+        ``load`` is a blocking function returning (context_manager, llm);
+        it runs on the new model's thread. Every acquire must be paired
+        with a ``release``.
+        """
+        lock = self._load_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            model = self.models.get(key)
+            if model is not None:
+                self.hits += 1
+                logger.info(f"Reusing resident model {key}")
+            else:
+                self._make_room(size_bytes)
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"llama-{key[1]}")
+                try:
+                    context_manager, llm = await asyncio.get_running_loop().run_in_executor(executor, load)
+                except BaseException:
+                    executor.shutdown(wait=False)
+                    raise
+                model = ResidentModel(key=key, context_manager=context_manager, llm=llm,
+                                      size_bytes=size_bytes, executor=executor)
+                self.models[key] = model
+                self.loads += 1
+                logger.info(f"Loaded model {key} ({size_bytes / 1024 ** 3:.1f}GB, "
+                            f"{self.resident_bytes / 1024 ** 3:.1f}GB resident)")
+
+            self.models.move_to_end(key)
+            model.in_use += 1
+            return model
+
+    def release(self, model: ResidentModel):
+        """An evaluator is done with the model; it stays resident until evicted."""
+        model.in_use = max(0, model.in_use - 1)
+        model.last_used = time.monotonic()
+
+    def _make_room(self, size_bytes: int):
+        """Evict idle models, least recently used first, until ``size_bytes`` fits."""
+        if self.ram_budget_bytes is None:
+            return
+        for key in list(self.models):
+            if self.resident_bytes + size_bytes <= self.ram_budget_bytes:
+                return
+            if self.models[key].in_use == 0:
+                self.evict(key)
+        if self.resident_bytes + size_bytes > self.ram_budget_bytes:
+            logger.warning(f"Loading {size_bytes / 1024 ** 3:.1f}GB model exceeds the RAM budget: "
+                           f"{self.resident_bytes / 1024 ** 3:.1f}GB held by models in use")
+
+    def evict(self, key: ModelKey) -> bool:
+        """Unload one model if no evaluator is using it."""
+        model = self.models.get(key)
+        if model is None or model.in_use > 0:
+            return False
+        del self.models[key]
+        model.close()
+        self.evictions += 1
+        logger.info(f"Evicted model {key}")
+        return True
+
+    def clear(self):
+        """Unload every idle model."""
+        for key in list(self.models):
+            self.evict(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics for monitoring."""
+        return {
+            "ram_budget_bytes": self.ram_budget_bytes,
+            "resident_bytes": self.resident_bytes,
+            "models": [
+                {"repo_id": key[0], "filename": key[1], "n_ctx": key[2],
+                 "size_bytes": model.size_bytes, "in_use": model.in_use}
+                for key, model in self.models.items()
+            ],
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions
+        }
+
+
+# Global registry shared by every LocalEvaluator in the process
+local_model_registry = LocalModelRegistry()
@@ -0,0 +1,80 @@
+"""Partial-output checkpoints for streamed generations."""
+
+import logging
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StreamCheckpoint:
+    """
+    Accumulates streamed text and periodically flushes it to disk.
+
+    A generation that dies halfway (timeout, dropped connection) leaves its
+    partial text both in memory and, with a ``directory``, in a
+    ``.partial.txt`` file. The file is removed once the stream completes.
+    """
+
+    def __init__(self,
+                 label: str,
+                 directory: Optional[str] = None,
+                 flush_interval: float = 5.0,
+                 flush_chars: int = 2000):
+        self.label = label
+        self.flush_interval = flush_interval
+        self.flush_chars = flush_chars
+
+        self.parts: List[str] = []
+        self.chars = 0
+        self._flushed_chars = 0
+        self._last_flush = time.monotonic()
+
+        self.path: Optional[Path] = None
+        if directory:
+            safe_label = re.sub(r"[^A-Za-z0-9._-]+", "_", label)
+            timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+            self.path = Path(directory) / f"{safe_label}_{timestamp}.partial.txt"
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def append(self, delta: str):
+        """Add streamed text, flushing when enough time or text has accumulated."""
+        if not delta:
+            return
+        self.parts.append(delta)
+        self.chars += len(delta)
+        if (self.chars - self._flushed_chars >= self.flush_chars or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write the text received so far (no-op without a directory)."""
+        self._last_flush = time.monotonic()
+        if self.path is None or self.chars == self._flushed_chars:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(self.text, encoding="utf-8")
+            self._flushed_chars = self.chars
+        except OSError as e:
+            logger.warning(f"Could not write stream checkpoint {self.path}: {e}")
+
+    def complete(self):
+        """The stream finished normally; the checkpoint file is no longer needed."""
+        if self.path is not None and self.path.exists():
+            try:
+                self.path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove stream checkpoint {self.path}: {e}")
+
+    def interrupt(self, reason: str):
+        """Keep the partial output after a failed stream."""
+        self.flush()
+        location = f" (saved to {self.path})" if self.path is not None and self.chars else ""
+        logger.warning(f"Stream for {self.label} interrupted after {self.chars} chars: {reason}{location}")
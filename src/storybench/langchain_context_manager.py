@@ -14,6 +14,9 @@ except ImportError:
         "pip install langchain langchain-core langchain-community"
     )
 
+from .conversation_context import ConversationContext
+from .utils.tokenizers import TokenCounter, tokenizer_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +36,7 @@ class ContextConfig:
     strategy: ContextStrategy = ContextStrategy.PRESERVE_ALL
     preserve_structure: bool = True
     add_context_markers: bool = True
+    token_counter: Optional[TokenCounter] = None  # Default estimate if None
 
 
 
@@ -52,6 +56,7 @@ class LangChainContextManager:
             config: Context configuration. Uses defaults if None.
         """
         self.config = config or ContextConfig()
+        self.token_counter = self.config.token_counter or tokenizer_registry.get_counter()
         
         # Initialize text splitters
         self._init_text_splitters()
@@ -258,7 +263,7 @@ class LangChainContextManager:
         
         # Estimate how much history we can preserve
         history_chars = len(history_text)
-        chars_per_token = 3.5  # Conservative estimate
+        chars_per_token = history_chars / max(1, self._estimate_tokens(history_text))
         available_chars = int(available_for_history * chars_per_token)
         
         if history_chars <= available_chars:
@@ -301,13 +306,38 @@ class LangChainContextManager:
     
     def _estimate_tokens(self, text: str) -> int:
         """
-        Estimate token count for text.
+        Count tokens for text with the model family's tokenizer.
         
-        This is a simple estimation. In production, this should use
-        the actual tokenizer from the model being used.
+        Counts are memoized per segment, so history repeated on every turn
+        is only tokenized once.
         """
-        # Conservative estimation: ~3.5 characters per token
-        return int(len(text) / 3.5)
+        return self.token_counter.count(text)
+    
+    def set_token_counter(self, token_counter: TokenCounter):
+        """Switch tokenizers, e.g. to a local model's own once it is loaded."""
+        self.token_counter = token_counter
+    
+    def calibrate_tokens(self, text: str, actual_tokens: int):
+        """Refine an estimating counter with the token count a provider reported for ``text``."""
+        calibrate = getattr(self.token_counter, "calibrate", None)
+        if calibrate is not None:
+            calibrate(len(text), actual_tokens)
+    
+    def count_conversation_tokens(self, conversation: ConversationContext, prompt: Optional[str] = None) -> int:
+        """Tokens in the conversation rendered with ``prompt``, from cached segment counts."""
+        return conversation.token_count(self.token_counter, prompt)
+    
+    def get_conversation_stats(self, conversation: ConversationContext, prompt: Optional[str] = None) -> Dict[str, Any]:
+        """``get_context_stats`` for a conversation without recounting its history."""
+        tokens = self.count_conversation_tokens(conversation, prompt)
+        return {
+            "character_count": len(conversation.render(prompt)),
+            "estimated_tokens": tokens,
+            "max_tokens": self.config.max_context_tokens,
+            "token_utilization": tokens / self.config.max_context_tokens,
+            "strategy": self.config.strategy.value,
+            "turns": conversation.turn_count
+        }
     
     def get_context_stats(self, context: str) -> Dict[str, Any]:
         """Get statistics about the context."""
@@ -348,6 +378,6 @@ def build_langchain_context(
 
 
 # For migration compatibility
-def estimate_tokens_langchain(text: str) -> int:
-    """Estimate tokens using LangChain approach."""
-    return int(len(text) / 3.5)
+def estimate_tokens_langchain(text: str, provider: Optional[str] = None, model: Optional[str] = None) -> int:
+    """Count tokens with the tokenizer registered for the provider/model family."""
+    return tokenizer_registry.get_counter(provider, model).count(text)
@@ -9,6 +9,11 @@ from .sequence_workers import SequenceWorker, SequenceWorkerState
 from .rate_limiting import RateLimitManager, ProviderRateLimit  
 from .parallel_runner import ParallelSequenceEvaluationRunner
 from .progress_tracking import ParallelEvaluationProgress
+from .scheduler import GlobalWorkScheduler, WorkUnit
+from .evaluator_pool import EvaluatorPool
+from .task_queue import EvaluationTaskQueue
+from .latency_model import LatencyEstimator
+from .tail_latency import TailLatencyPolicy
 
 __all__ = [
     'SequenceWorker',
@@ -16,5 +21,11 @@ __all__ = [
     'RateLimitManager',
     'ProviderRateLimit',
     'ParallelSequenceEvaluationRunner',
-    'ParallelEvaluationProgress'
+    'ParallelEvaluationProgress',
+    'GlobalWorkScheduler',
+    'WorkUnit',
+    'EvaluatorPool',
+    'EvaluationTaskQueue',
+    'LatencyEstimator',
+    'TailLatencyPolicy'
 ]
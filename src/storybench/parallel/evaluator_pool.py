@@ -0,0 +1,128 @@
+"""
+Warm evaluator pool for parallel evaluations.
+
+Evaluators are expensive to set up (API clients, connectivity probes, local
+model loads), so the pool keeps set-up evaluators per model configuration
+and hands them out again for later runs. Context is reset on every
+checkout and every evaluator is cleaned up once when the pool shuts down.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluatorPool:
+    """Pool of warm, set-up evaluators keyed by model configuration."""
+
+    def __init__(self, evaluator_factory: Callable):
+        self.evaluator_factory = evaluator_factory
+
+        self.idle: Dict[str, List[Any]] = defaultdict(list)
+        self.all_evaluators: Dict[str, List[Any]] = defaultdict(list)
+        self._keys_by_evaluator: Dict[int, str] = {}
+        self._closed = False
+
+        # Statistics
+        self.created = 0
+        self.reused = 0
+        self.setup_failures = 0
+
+    @staticmethod
+    def pool_key(model_config: Dict[str, Any]) -> str:
+        """Stable fingerprint of a model configuration."""
+        serialized = json.dumps(model_config, sort_keys=True, default=str)
+        return hashlib.md5(serialized.encode('utf-8')).hexdigest()
+
+    async def checkout(self, model_config: Dict[str, Any]):
+        """Get a set-up evaluator for a model with a clean context."""
+        if self._closed:
+            raise RuntimeError("Evaluator pool has been shut down")
+
+        key = self.pool_key(model_config)
+
+        if self.idle[key]:
+            evaluator = self.idle[key].pop()
+            self.reused += 1
+        else:
+            evaluator = self.evaluator_factory(model_config)
+            try:
+                setup_ok = await evaluator.setup() is not False
+            except BaseException:
+                # Setup usually fails by raising; the half set-up evaluator may hold a loaded model
+                self.setup_failures += 1
+                await self._cleanup_evaluator(evaluator)
+                raise
+            if not setup_ok:
+                self.setup_failures += 1
+                await self._cleanup_evaluator(evaluator)
+                raise RuntimeError(f"Evaluator setup failed for model {model_config.get('name', key)}")
+
+            self.created += 1
+            self.all_evaluators[key].append(evaluator)
+            self._keys_by_evaluator[id(evaluator)] = key
+            logger.debug(f"Evaluator pool created evaluator #{len(self.all_evaluators[key])} for {model_config.get('name', key)}")
+
+        # Every checkout starts a fresh run: no history from the previous borrower
+        evaluator.reset_context()
+        return evaluator
+
+    async def checkin(self, evaluator):
+        """Return an evaluator to the pool for reuse."""
+        if self._closed:
+            return  # Already cleaned up by shutdown()
+
+        key = self._keys_by_evaluator.get(id(evaluator))
+        if key is None:
+            logger.warning("Evaluator returned to pool it did not come from; cleaning it up")
+            await self._cleanup_evaluator(evaluator)
+            return
+
+        self.idle[key].append(evaluator)
+
+    @asynccontextmanager
+    async def lease(self, model_config: Dict[str, Any]):
+        """Context manager that checks an evaluator out and back in."""
+        evaluator = await self.checkout(model_config)
+        try:
+            yield evaluator
+        finally:
+            await self.checkin(evaluator)
+
+    async def shutdown(self):
+        """Clean up every evaluator the pool created, exactly once."""
+        if self._closed:
+            return
+        self._closed = True
+
+        evaluators = [e for group in self.all_evaluators.values() for e in group]
+        if evaluators:
+            logger.info(f"Shutting down evaluator pool: {len(evaluators)} evaluators "
+                        f"({self.reused} reuses, {self.setup_failures} setup failures)")
+        await asyncio.gather(*[self._cleanup_evaluator(e) for e in evaluators])
+
+        self.idle.clear()
+        self.all_evaluators.clear()
+        self._keys_by_evaluator.clear()
+
+    async def _cleanup_evaluator(self, evaluator):
+        try:
+            await evaluator.cleanup()
+        except Exception as e:
+            logger.warning(f"Evaluator cleanup failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics for monitoring."""
+        return {
+            "evaluators_created": self.created,
+            "evaluators_reused": self.reused,
+            "setup_failures": self.setup_failures,
+            "idle_evaluators": sum(len(group) for group in self.idle.values()),
+            "model_configs": len(self.all_evaluators)
+        }
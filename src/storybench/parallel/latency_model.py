@@ -0,0 +1,94 @@
+"""
+Historical latency model for latency-aware scheduling.
+
+Built from the ``generation_time`` of saved responses, grouped per
+(model, sequence, prompt_index). Estimates fall back from the exact prompt
+to the same prompt position across sequences, then to the model's overall
+mean, then to a global default, so models without history still get a
+sensible expected duration.
+"""
+
+import logging
+import statistics
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Expected seconds per prompt when no response history exists at all
+DEFAULT_PROMPT_SECONDS = 30.0
+
+
+@dataclass
+class LatencyStats:
+    """Mean generation time over a number of historical responses."""
+    mean: float
+    count: int
+
+
+class LatencyEstimator:
+    """Predicts generation time of prompts and runs from response history."""
+
+    def __init__(self,
+                 stats: Dict[Tuple[str, str, int], LatencyStats],
+                 default_seconds: Optional[float] = None):
+        self.stats = stats
+
+        # Fallback levels, weighted by response counts
+        self.position_stats = self._pool(stats, lambda key: (key[0], key[2]))
+        self.model_stats = self._pool(stats, lambda key: key[0])
+
+        if default_seconds is None:
+            model_means = [s.mean for s in self.model_stats.values()]
+            default_seconds = statistics.median(model_means) if model_means else DEFAULT_PROMPT_SECONDS
+        self.default_seconds = default_seconds
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], default_seconds: Optional[float] = None) -> "LatencyEstimator":
+        """Build from aggregation rows: ``{"_id": {model_name, sequence, prompt_index}, "mean", "count"}``."""
+        stats = {}
+        for row in rows:
+            key = row["_id"]
+            stats[(key["model_name"], key["sequence"], key["prompt_index"])] = LatencyStats(
+                mean=float(row["mean"]), count=int(row["count"])
+            )
+        return cls(stats, default_seconds)
+
+    @staticmethod
+    def _pool(stats: Dict[Tuple[str, str, int], LatencyStats], group_key) -> Dict[Any, LatencyStats]:
+        totals: Dict[Any, Tuple[float, int]] = {}
+        for key, value in stats.items():
+            total, count = totals.get(group_key(key), (0.0, 0))
+            totals[group_key(key)] = (total + value.mean * value.count, count + value.count)
+        return {key: LatencyStats(mean=total / count, count=count)
+                for key, (total, count) in totals.items() if count}
+
+    def has_history(self, model_name: str) -> bool:
+        """Whether any responses of the model have been timed."""
+        return model_name in self.model_stats
+
+    def estimate_prompt(self, model_name: str, sequence: str, prompt_index: int) -> float:
+        """Expected seconds for one prompt."""
+        exact = self.stats.get((model_name, sequence, prompt_index))
+        if exact:
+            return exact.mean
+        position = self.position_stats.get((model_name, prompt_index))
+        if position:
+            return position.mean
+        model = self.model_stats.get(model_name)
+        if model:
+            return model.mean
+        return self.default_seconds
+
+    def estimate_run(self, model_name: str, sequence: str, num_prompts: int) -> float:
+        """Expected seconds for one run of a sequence (its prompts execute in order)."""
+        return sum(self.estimate_prompt(model_name, sequence, index) for index in range(num_prompts))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for logging/monitoring."""
+        return {
+            "models_with_history": len(self.model_stats),
+            "prompt_entries": len(self.stats),
+            "default_seconds": round(self.default_seconds, 2),
+            "model_mean_seconds": {model: round(s.mean, 2) for model, s in self.model_stats.items()}
+        }
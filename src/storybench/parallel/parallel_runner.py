@@ -15,7 +15,15 @@ from datetime import datetime
 
 from .sequence_workers import SequenceWorker
 from .rate_limiting import RateLimitManager
+from .tail_latency import TailLatencyPolicy
+from .scheduler import GlobalWorkScheduler, WorkUnit
+from .evaluator_pool import EvaluatorPool
+from .task_queue import EvaluationTaskQueue, UnitKey
+from .latency_model import LatencyEstimator
 from .progress_tracking import ParallelEvaluationProgress, ProgressReporter
+from ..utils.latency_metrics import latency_metrics
+from ..utils.response_cache import response_cache
+from ..utils.tokenizers import tokenizer_registry
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +34,50 @@ class ParallelSequenceEvaluationRunner:
     def __init__(self, 
                  database,
                  evaluation_runner,
-                 max_concurrent_sequences: Optional[int] = None):
+                 max_concurrent_sequences: Optional[int] = None,
+                 global_scheduling: bool = True,
+                 concurrent_runs: bool = False,
+                 use_evaluator_pool: bool = True,
+                 task_queue: Optional[EvaluationTaskQueue] = None,
+                 rate_limit_share: float = 1.0,
+                 latency_estimator: Optional[LatencyEstimator] = None,
+                 hedge_requests: bool = False):
         
         self.database = database
         self.evaluation_runner = evaluation_runner
-        self.rate_limit_manager = RateLimitManager()
+        # Shard processes each get a fraction of the provider budgets; timeouts
+        # adapt to observed latency and slow requests may be hedged (opt-in)
+        self.rate_limit_manager = RateLimitManager(
+            share=rate_limit_share,
+            tail_policy=TailLatencyPolicy(hedging=hedge_requests)
+        )
         
         # Conservative concurrency for 5 sequences - can be tuned up
         # Start with 5 (one per sequence) for safety
         self.max_concurrent_sequences = max_concurrent_sequences or 5
+        
+        # Global scheduling queues every (model, sequence, run) unit at once so all
+        # providers work concurrently; otherwise models are processed one by one
+        self.global_scheduling = global_scheduling
+        self.scheduler: Optional[GlobalWorkScheduler] = None
+        
+        # Run the variance runs of a sequence as independent tasks (per-model path)
+        self.concurrent_runs = concurrent_runs
+        
+        # Reuse set-up evaluators across runs instead of building one per run
+        self.use_evaluator_pool = use_evaluator_pool
+        self.evaluator_pool: Optional[EvaluatorPool] = None
+        
+        # Durable lease-based queue: only claimable units run (global scheduling)
+        self.task_queue = task_queue
+        
+        # Historical latency: when set, the longest-expected units start first (LPT)
+        self.latency_estimator = latency_estimator
+        self.predicted_makespan: Optional[float] = None
+        
+        # Run-completion callback handed to every worker (e.g. JudgePipeline.on_run_complete)
+        self.on_run_complete: Optional[Callable] = None
+
         self.progress = ParallelEvaluationProgress()
         
         # Worker management
@@ -52,7 +95,8 @@ class ParallelSequenceEvaluationRunner:
         Run evaluation with parallel sequence execution.
         
         Total scale: 12 models × 5 sequences × 3 prompts × 3 runs = 540 API calls
-        Expected speedup: 5x (5 sequences in parallel) per model
+        Expected speedup: 5x (5 sequences in parallel) per model, or close to the
+        slowest provider's share of the work with global scheduling enabled
         """
         
         logger.info(f"Starting parallel evaluation {evaluation_id}")
@@ -82,36 +126,70 @@ class ParallelSequenceEvaluationRunner:
             "performance_metrics": {}
         }
         
+        if self.use_evaluator_pool:
+            self.evaluator_pool = EvaluatorPool(evaluator_factory)
+        
         try:
-            # Process each model with parallel sequences
-            for model_index, model_config in enumerate(models):
-                model_name = model_config["name"]
-                logger.info(f"Starting parallel sequences for model {model_index + 1}/{len(models)}: {model_name}")
-                
-                model_result = await self._run_model_sequences_parallel(
+            if self.global_scheduling:
+                # Queue every (model, sequence, run) unit and saturate all providers at once
+                model_results = await self._run_global_schedule(
                     evaluation_id=evaluation_id,
-                    model_config=model_config,
+                    models=models,
                     sequences=sequences,
                     num_runs=num_runs,
                     evaluator_factory=evaluator_factory,
                     progress_reporter=progress_reporter
                 )
                 
-                results["model_results"][model_name] = model_result
-                results["total_workers"] += model_result["total_workers"]
-                results["successful_workers"] += model_result["successful_workers"]
-                results["failed_workers"] += model_result["failed_workers"]
-                
-                # Update progress
-                self.progress.completed_prompts += model_result.get("completed_prompts", 0)
-                progress_reporter.log_progress()
+                for model_name, model_result in model_results.items():
+                    results["model_results"][model_name] = model_result
+                    results["total_workers"] += model_result["total_workers"]
+                    results["successful_workers"] += model_result["successful_workers"]
+                    results["failed_workers"] += model_result["failed_workers"]
+            else:
+                # Process each model with parallel sequences
+                for model_index, model_config in enumerate(models):
+                    model_name = model_config["name"]
+                    logger.info(f"Starting parallel sequences for model {model_index + 1}/{len(models)}: {model_name}")
+                    
+                    model_result = await self._run_model_sequences_parallel(
+                        evaluation_id=evaluation_id,
+                        model_config=model_config,
+                        sequences=sequences,
+                        num_runs=num_runs,
+                        evaluator_factory=evaluator_factory,
+                        progress_reporter=progress_reporter
+                    )
+                    
+                    results["model_results"][model_name] = model_result
+                    results["total_workers"] += model_result["total_workers"]
+                    results["successful_workers"] += model_result["successful_workers"]
+                    results["failed_workers"] += model_result["failed_workers"]
+                    
+                    # Update progress
+                    self.progress.completed_prompts += model_result.get("completed_prompts", 0)
+                    progress_reporter.log_progress()
             
             # Final statistics
             results["end_time"] = datetime.utcnow()
             results["total_duration"] = (results["end_time"] - results["start_time"]).total_seconds()
             results["provider_stats"] = self.rate_limit_manager.get_all_provider_stats()
+            results["concurrency_windows"] = self.rate_limit_manager.get_concurrency_windows()
+            results["latency_percentiles"] = latency_metrics.summary()
+            results["tail_latency"] = self.rate_limit_manager.get_tail_latency_stats()
+            results["response_cache"] = response_cache.get_stats()
+            results["tokenizers"] = tokenizer_registry.get_stats()
+            if self.evaluator_pool:
+                results["evaluator_pool_stats"] = self.evaluator_pool.get_stats()
+            if self.task_queue:
+                results["task_queue_stats"] = self.task_queue.get_stats()
+            if self.predicted_makespan is not None:
+                results["predicted_makespan_seconds"] = self.predicted_makespan
             results["performance_metrics"] = self._calculate_performance_metrics(results)
-            results["success"] = results["successful_workers"] > 0
+            # A shard that found nothing left to claim has not failed
+            results["success"] = results["successful_workers"] > 0 or (
+                self.task_queue is not None and results["total_workers"] == 0
+            )
             
             # Final summary
             progress_reporter.log_final_summary(results)
@@ -122,19 +200,22 @@ class ParallelSequenceEvaluationRunner:
             logger.error(f"Parallel evaluation failed: {e}")
             results["error"] = str(e)
             results["success"] = False
-            return results    
-    async def _run_model_sequences_parallel(self,
-                                          evaluation_id: str,
-                                          model_config: Dict[str, Any],
-                                          sequences: Dict[str, List[Dict[str, str]]],
-                                          num_runs: int,
-                                          evaluator_factory: Callable,
-                                          progress_reporter) -> Dict[str, Any]:
-        """Run all 5 sequences for a single model in parallel."""
+            return results
         
+        finally:
+            # Shut every pooled evaluator down once, at the end of the evaluation
+            if self.evaluator_pool:
+                await self.evaluator_pool.shutdown()
+    
+    def _create_workers(self,
+                        evaluation_id: str,
+                        model_config: Dict[str, Any],
+                        sequences: Dict[str, List[Dict[str, str]]],
+                        num_runs: int,
+                        evaluator_factory: Callable) -> List[SequenceWorker]:
+        """Create one sequence worker per sequence for a model."""
         model_name = model_config["name"]
         
-        # Create workers for all 5 sequences
         workers = []
         for sequence_name, sequence_prompts in sequences.items():
             worker_id = f"{model_name}_{sequence_name}"
@@ -149,10 +230,251 @@ class ParallelSequenceEvaluationRunner:
                 evaluator_factory=evaluator_factory,
                 evaluation_runner=self.evaluation_runner,
                 evaluation_id=evaluation_id,
-                rate_limit_manager=self.rate_limit_manager
+                rate_limit_manager=self.rate_limit_manager,
+                concurrent_runs=self.concurrent_runs,
+                evaluator_pool=self.evaluator_pool,
+                on_run_complete=self.on_run_complete
             )
             workers.append(worker)
         
+        return workers
+    
+    async def _run_global_schedule(self,
+                                   evaluation_id: str,
+                                   models: List[Dict[str, Any]],
+                                   sequences: Dict[str, List[Dict[str, str]]],
+                                   num_runs: int,
+                                   evaluator_factory: Callable,
+                                   progress_reporter) -> Dict[str, Dict[str, Any]]:
+        """Run every (model, sequence, run) unit through one global scheduler.
+        
+        With a task queue, only units that are still claimable are scheduled and
+        each one is leased right before it starts, so restarted or concurrent
+        processes never repeat finished work.
+        """
+        
+        # Per-model cap keeps max_concurrent_sequences meaningful; providers cap the rest
+        self.scheduler = GlobalWorkScheduler(
+            rate_limit_manager=self.rate_limit_manager,
+            max_units_per_model=self.max_concurrent_sequences
+        )
+        
+        workers_by_model: Dict[str, List[SequenceWorker]] = {}
+        for model_config in models:
+            workers = self._create_workers(evaluation_id, model_config, sequences, num_runs, evaluator_factory)
+            workers_by_model[model_config["name"]] = workers
+        
+        claimable = None
+        if self.task_queue:
+            await self.task_queue.enqueue(evaluation_id, list(workers_by_model.keys()), list(sequences.keys()), num_runs)
+            claimable = await self.task_queue.claimable_units(evaluation_id)
+            logger.info(f"Task queue: {len(claimable)} claimable units for evaluation {evaluation_id}")
+        
+        scheduled_runs, scheduled_prompts = self._submit_units(self.scheduler, workers_by_model, num_runs, claimable)
+        
+        if self.latency_estimator:
+            self.scheduler.order_longest_first()
+            self.predicted_makespan = self.scheduler.predict_makespan()
+            logger.info(f"Latency-aware schedule: predicted makespan {self.predicted_makespan / 60:.1f} minutes")
+        
+        if claimable is not None:
+            # Progress covers only the work left for this process
+            self.progress.total_prompts = scheduled_prompts
+        
+        worker_results: Dict[str, Dict[str, Any]] = {}
+        remaining_runs: Dict[str, int] = dict(scheduled_runs)
+        skipped_runs: Dict[str, int] = {}
+        
+        def update_worker_counts():
+            active = sum(1 for worker_id, remaining in remaining_runs.items()
+                         if worker_id in worker_results and remaining > 0)
+            finished = [r for r in worker_results.values() if "success" in r]
+            completed = sum(1 for r in finished if r["success"])
+            self.progress.update_worker_count(active, completed, len(finished) - completed)
+        
+        async def execute_unit(unit: WorkUnit) -> Dict[str, Any]:
+            worker = unit.worker
+            task = None
+            if self.task_queue:
+                task = await self.task_queue.claim(evaluation_id, unit.model_name, unit.sequence_name, unit.run_number)
+                if task is None:
+                    # Another worker leased or finished it since we listed claimable units
+                    return {"run_number": unit.run_number, "completed_prompts": 0,
+                            "success": True, "skipped": True, "prompt_results": []}
+            
+            if worker.worker_id not in worker_results:
+                logger.info(f"Worker {worker.worker_id} starting: {worker.model_name} - {worker.sequence_name}")
+                worker_results[worker.worker_id] = worker.new_result()
+                update_worker_counts()
+            
+            if task is not None:
+                return await self.task_queue.run_leased(task, worker.execute_run(unit.run_number))
+            return await worker.execute_run(unit.run_number)
+        
+        # Queued units whose run failed or missed prompts; retried once the scheduler drains
+        retry_units: Dict[UnitKey, WorkUnit] = {}
+        
+        def on_unit_complete(unit: WorkUnit, run_result: Dict[str, Any]):
+            worker = unit.worker
+            remaining_runs[worker.worker_id] -= 1
+            if run_result.get("skipped"):
+                skipped_runs[worker.worker_id] = skipped_runs.get(worker.worker_id, 0) + 1
+            else:
+                worker.add_run_result(worker_results[worker.worker_id], run_result)
+                if self.task_queue and not run_result.get("complete", False):
+                    retry_units[(unit.model_name, unit.sequence_name, unit.run_number)] = unit
+            if remaining_runs[worker.worker_id] == 0 and worker.worker_id in worker_results:
+                worker.finalize_result(worker_results[worker.worker_id])
+            
+            self.progress.add_completed_prompts(run_result.get("completed_prompts", 0))
+            update_worker_counts()
+            progress_reporter.log_progress()
+        
+        await self.scheduler.run(execute_unit, on_unit_complete)
+        
+        # A failed task goes back to pending until max_attempts; this process may be
+        # the only one left to claim it, so retry until no failed unit is claimable
+        while retry_units:
+            claimable = await self.task_queue.claimable_units(evaluation_id)
+            retry = [unit for key, unit in retry_units.items() if key in claimable]
+            retry_units.clear()
+            if not retry:
+                break
+            
+            logger.info(f"Retrying {len(retry)} failed units of evaluation {evaluation_id}")
+            for unit in retry:
+                worker = unit.worker
+                remaining_runs[worker.worker_id] += 1
+                discarded = worker.discard_run_result(worker_results[worker.worker_id], unit.run_number)
+                self.progress.add_completed_prompts(-discarded)
+                self.scheduler.submit(WorkUnit(
+                    model_name=unit.model_name,
+                    sequence_name=unit.sequence_name,
+                    run_number=unit.run_number,
+                    provider=unit.provider,
+                    worker=worker,
+                    expected_duration=unit.expected_duration
+                ))
+            await self.scheduler.run(execute_unit, on_unit_complete)
+        
+        # Aggregate per model in the same shape as _run_model_sequences_parallel
+        model_results = {}
+        for model_name, workers in workers_by_model.items():
+            # Workers whose runs were all done elsewhere are not part of this process' share
+            workers = [w for w in workers
+                       if w.worker_id in worker_results or
+                       scheduled_runs.get(w.worker_id, 0) > skipped_runs.get(w.worker_id, 0)]
+            
+            model_result = {
+                "model_name": model_name,
+                "total_workers": len(workers),
+                "successful_workers": 0,
+                "failed_workers": 0,
+                "completed_prompts": 0,
+                "worker_results": []
+            }
+            
+            for worker in workers:
+                result = worker_results.get(worker.worker_id)
+                if result is None or "success" not in result:
+                    # Worker never started or did not finish all its runs
+                    model_result["failed_workers"] += 1
+                    model_result["worker_results"].append({
+                        "worker_id": worker.worker_id,
+                        "success": False,
+                        "error": "Worker did not complete all scheduled runs"
+                    })
+                    continue
+                
+                if result["success"]:
+                    model_result["successful_workers"] += 1
+                else:
+                    model_result["failed_workers"] += 1
+                
+                model_result["completed_prompts"] += result.get("completed_prompts", 0)
+                model_result["worker_results"].append(result)
+            
+            logger.info(f"Model {model_name} completed: {model_result['successful_workers']}/{model_result['total_workers']} workers successful")
+            model_results[model_name] = model_result
+        
+        return model_results
+    
+    def _submit_units(self,
+                      scheduler: GlobalWorkScheduler,
+                      workers_by_model: Dict[str, List[SequenceWorker]],
+                      num_runs: int,
+                      claimable=None):
+        """Submit one unit per (worker, run), optionally restricted to claimable units.
+        
+        Returns:
+            (scheduled runs per worker id, total scheduled prompts)
+        """
+        # Interleave models within each run so early runs of every model start first
+        scheduled_runs: Dict[str, int] = {}
+        scheduled_prompts = 0
+        for run_number in range(1, num_runs + 1):
+            for workers in workers_by_model.values():
+                for worker in workers:
+                    if claimable is not None and (worker.model_name, worker.sequence_name, run_number) not in claimable:
+                        continue
+                    scheduled_runs[worker.worker_id] = scheduled_runs.get(worker.worker_id, 0) + 1
+                    scheduled_prompts += len(worker.sequence_prompts)
+                    expected_duration = 0.0
+                    if self.latency_estimator:
+                        expected_duration = self.latency_estimator.estimate_run(
+                            worker.model_name, worker.sequence_name, len(worker.sequence_prompts)
+                        )
+                    scheduler.submit(WorkUnit(
+                        model_name=worker.model_name,
+                        sequence_name=worker.sequence_name,
+                        run_number=run_number,
+                        provider=worker.provider,
+                        worker=worker,
+                        expected_duration=expected_duration
+                    ))
+        return scheduled_runs, scheduled_prompts
+    
+    def predict_makespan(self,
+                         models: List[Dict[str, Any]],
+                         sequences: Dict[str, List[Dict[str, str]]],
+                         num_runs: int,
+                         latency_estimator: LatencyEstimator,
+                         longest_first: bool = True) -> float:
+        """Predict global-schedule wall-clock seconds without running anything (dry-run)."""
+        scheduler = GlobalWorkScheduler(
+            rate_limit_manager=self.rate_limit_manager,
+            max_units_per_model=self.max_concurrent_sequences
+        )
+        workers_by_model = {
+            model_config["name"]: self._create_workers("dry-run", model_config, sequences, num_runs, None)
+            for model_config in models
+        }
+        
+        previous_estimator = self.latency_estimator
+        self.latency_estimator = latency_estimator
+        try:
+            self._submit_units(scheduler, workers_by_model, num_runs)
+        finally:
+            self.latency_estimator = previous_estimator
+        
+        if longest_first:
+            scheduler.order_longest_first()
+        return scheduler.predict_makespan()
+    
+    async def _run_model_sequences_parallel(self,
+                                          evaluation_id: str,
+                                          model_config: Dict[str, Any],
+                                          sequences: Dict[str, List[Dict[str, str]]],
+                                          num_runs: int,
+                                          evaluator_factory: Callable,
+                                          progress_reporter) -> Dict[str, Any]:
+        """Run all 5 sequences for a single model in parallel."""
+        
+        model_name = model_config["name"]
+        
+        # Create workers for all 5 sequences
+        workers = self._create_workers(evaluation_id, model_config, sequences, num_runs, evaluator_factory)
+        
         # Execute workers with concurrency limit (max 5 for 5 sequences)
         semaphore = asyncio.Semaphore(self.max_concurrent_sequences)
         
@@ -240,4 +562,9 @@ class ParallelSequenceEvaluationRunner:
         provider_stats = self.rate_limit_manager.get_all_provider_stats()
         self.progress.provider_stats = provider_stats
         
-        return self.progress.to_dict()
+        progress = self.progress.to_dict()
+        progress["concurrency_windows"] = self.rate_limit_manager.get_concurrency_windows()
+        progress["latency_percentiles"] = latency_metrics.summary()
+        if self.scheduler:
+            progress["scheduler_stats"] = self.scheduler.get_stats()
+        return progress
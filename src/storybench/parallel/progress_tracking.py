@@ -42,6 +42,8 @@ class ParallelEvaluationProgress:
             return None
             
         elapsed = datetime.utcnow() - self.start_time
+        if elapsed.total_seconds() <= 0:
+            return None
         prompts_per_second = self.completed_prompts / elapsed.total_seconds()
         remaining_prompts = self.total_prompts - self.completed_prompts
         
@@ -127,7 +129,7 @@ class ProgressReporter:
         # Calculate recent throughput
         recent_completed = self.progress.completed_prompts - self.last_completed_count
         time_diff = (now - self.last_log_time).total_seconds() if self.last_log_time else 1
-        recent_throughput = (recent_completed / time_diff) * 60  # per minute
+        recent_throughput = (recent_completed / time_diff) * 60 if time_diff > 0 else 0.0  # per minute
         
         # Basic progress log
         logger.info(
@@ -1,16 +1,20 @@
 """
 Rate limiting management for parallel API calls across multiple providers.
 
-Handles provider-specific concurrency limits and request rate management
-with adaptive backoff and circuit breaker patterns.
+Handles provider-specific concurrency limits and request rate management.
+Per-minute request and token limits are enforced with O(1) token buckets;
+each provider's concurrency window adapts with additive-increase /
+multiplicative-decrease (AIMD) driven by rate-limit errors and p95 latency.
 """
 
 import asyncio
 import logging
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Deque, Tuple
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+
+from .tail_latency import TailLatencyPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -18,135 +22,398 @@ logger = logging.getLogger(__name__)
 @dataclass
 class ProviderRateLimit:
     """Rate limiting configuration per provider."""
-    max_concurrent: int
+    max_concurrent: int  # Ceiling of the adaptive concurrency window
     requests_per_minute: int
+    tokens_per_minute: int = 0  # 0 disables the token limit
+    min_concurrent: int = 1  # Floor of the adaptive concurrency window
     burst_capacity: int = 0
     backoff_factor: float = 1.5
     
     def __post_init__(self):
         if self.burst_capacity == 0:
             self.burst_capacity = self.max_concurrent * 2
+    
+    def scaled(self, share: float) -> "ProviderRateLimit":
+        """Limits for one of several processes sharing the provider budget."""
+        max_concurrent = max(1, round(self.max_concurrent * share))
+        return ProviderRateLimit(
+            max_concurrent=max_concurrent,
+            requests_per_minute=max(1, int(self.requests_per_minute * share)),
+            tokens_per_minute=int(self.tokens_per_minute * share),
+            min_concurrent=min(self.min_concurrent, max_concurrent),
+            burst_capacity=max(1, round(self.burst_capacity * share)),
+            backoff_factor=self.backoff_factor
+        )
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+    
+    Admission is O(1): callers reserve tokens up front and are told how long
+    to wait before the reservation is covered. The balance may go negative,
+    which queues later callers behind earlier ones without any bookkeeping.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity else rate_per_minute
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+    
+    def _refill(self, now: float):
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_second)
+            self.last_refill = now
+    
+    def reserve(self, amount: float = 1.0) -> float:
+        """Reserve tokens and return the seconds to wait before using them."""
+        now = time.monotonic()
+        self._refill(now)
+        
+        # A single request larger than the bucket can never fit; cap it so it waits at most one refill
+        amount = min(amount, self.capacity)
+        self.tokens -= amount
+        
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate_per_second
+    
+    def available(self) -> float:
+        """Tokens currently available (negative when callers are queued)."""
+        self._refill(time.monotonic())
+        return self.tokens
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limiter whose window adapts with AIMD.
+    
+    - Additive increase: each successful call grows the window by 1/window,
+      i.e. roughly +1 slot per window's worth of successes
+    - Multiplicative decrease: a rate-limit error, or a model's recent p95
+      latency above ``latency_factor`` times that model's baseline p95,
+      shrinks the window by ``decrease_factor`` (at most once per cooldown
+      period)
+    
+    Latency samples and baselines are kept per model, so a slow model
+    sharing the provider is not mistaken for a degraded provider. A baseline
+    is the best p95 seen within ``baseline_max_age_seconds``; after that it
+    is re-anchored at the current p95 so one fast burst cannot pin it.
+    
+    The window always stays between ``floor`` and ``ceiling``.
+    """
+    
+    def __init__(self,
+                 ceiling: int,
+                 floor: int = 1,
+                 decrease_factor: float = 0.5,
+                 latency_factor: float = 2.0,
+                 cooldown_seconds: float = 5.0,
+                 latency_samples: int = 50,
+                 min_latency_samples: int = 10,
+                 baseline_max_age_seconds: float = 600.0):
+        self.ceiling = ceiling
+        self.floor = max(1, min(floor, ceiling))
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.min_latency_samples = min_latency_samples
+        self.baseline_max_age_seconds = baseline_max_age_seconds
+        
+        self.window = float(ceiling)
+        self.in_flight = 0
+        self.latencies: Dict[Optional[str], Deque[float]] = defaultdict(lambda: deque(maxlen=latency_samples))
+        self.baselines: Dict[Optional[str], Tuple[float, float]] = {}  # model -> (p95, monotonic time set)
+        self.last_decrease: Optional[float] = None
+        self.rate_limit_errors = 0
+        self.decreases = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+    
+    @property
+    def limit(self) -> int:
+        """Current integer concurrency limit."""
+        return max(self.floor, min(self.ceiling, int(self.window)))
+    
+    async def acquire(self):
+        """Wait for a free slot in the current window."""
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # We were woken but will not use the slot: pass it on
+                    self._wake()
+                raise
+        self.in_flight += 1
+    
+    def release(self):
+        """Free a slot and wake waiters that now fit in the window."""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake()
+    
+    def _wake(self):
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+    
+    def p95_latency(self, model: Optional[str] = None) -> Optional[float]:
+        """p95 of the model's recent latency samples."""
+        samples = self.latencies.get(model)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    
+    def baseline_p95(self, model: Optional[str] = None) -> Optional[float]:
+        """The model's baseline p95 latency, or None before enough samples."""
+        baseline = self.baselines.get(model)
+        return baseline[0] if baseline else None
+    
+    def on_success(self, latency: Optional[float] = None, model: Optional[str] = None):
+        """Grow the window additively unless the model's latency has degraded."""
+        if latency is not None:
+            samples = self.latencies[model]
+            samples.append(latency)
+            if len(samples) >= self.min_latency_samples:
+                p95 = self.p95_latency(model)
+                now = time.monotonic()
+                baseline = self.baselines.get(model)
+                if baseline is None or p95 < baseline[0] or now - baseline[1] > self.baseline_max_age_seconds:
+                    self.baselines[model] = (p95, now)
+                elif p95 > baseline[0] * self.latency_factor:
+                    label = f"{model} " if model else ""
+                    if self._decrease(f"{label}p95 latency {p95:.1f}s > {self.latency_factor}x baseline {baseline[0]:.1f}s"):
+                        # Require fresh evidence before reacting to latency again
+                        samples.clear()
+                    return
+        
+        self.window = min(float(self.ceiling), self.window + 1.0 / self.window)
+        self._wake()
+    
+    def on_rate_limited(self):
+        """Shrink the window multiplicatively after a rate-limit error."""
+        self.rate_limit_errors += 1
+        self._decrease("rate limit error")
+    
+    def _decrease(self, reason: str) -> bool:
+        now = time.monotonic()
+        if self.last_decrease is not None and now - self.last_decrease < self.cooldown_seconds:
+            return False  # One decrease per burst of in-flight failures
+        
+        previous = self.limit
+        self.window = max(float(self.floor), self.window * self.decrease_factor)
+        self.last_decrease = now
+        self.decreases += 1
+        logger.warning(f"Concurrency window decreased {previous} -> {self.limit} ({reason})")
+        return True
+    
+    def in_backoff(self, recovery_seconds: float = 30.0) -> bool:
+        """Whether the window was decreased recently."""
+        return self.last_decrease is not None and time.monotonic() - self.last_decrease < recovery_seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for logging/monitoring."""
+        return {
+            "window": round(self.window, 2),
+            "limit": self.limit,
+            "floor": self.floor,
+            "ceiling": self.ceiling,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "latency": {
+                model or "default": {
+                    "p95": self.p95_latency(model),
+                    "baseline_p95": self.baseline_p95(model)
+                }
+                for model in self.latencies
+            },
+            "rate_limit_errors": self.rate_limit_errors,
+            "decreases": self.decreases
+        }
 
 
 class RateLimitManager:
     """Manages rate limiting across multiple API providers."""
     
-    # Provider-specific rate limits optimized for current 12 models scaling to 50+
+    # Provider-specific rate limits optimized for current 12 models scaling to 50+.
+    # max_concurrent/min_concurrent bound the adaptive concurrency window.
     PROVIDER_LIMITS = {
-        "anthropic": ProviderRateLimit(max_concurrent=10, requests_per_minute=400),  # Claude models
-        "openai": ProviderRateLimit(max_concurrent=12, requests_per_minute=800),     # GPT models  
-        "google": ProviderRateLimit(max_concurrent=8, requests_per_minute=600),     # Gemini models
-        "deepinfra": ProviderRateLimit(max_concurrent=8, requests_per_minute=300),  # Hosted models
-        "local": ProviderRateLimit(max_concurrent=4, requests_per_minute=120)       # Future local models
+        "anthropic": ProviderRateLimit(max_concurrent=10, requests_per_minute=400, tokens_per_minute=400_000, min_concurrent=2),  # Claude models
+        "openai": ProviderRateLimit(max_concurrent=12, requests_per_minute=800, tokens_per_minute=2_000_000, min_concurrent=2),   # GPT models  
+        "google": ProviderRateLimit(max_concurrent=8, requests_per_minute=600, tokens_per_minute=4_000_000, min_concurrent=2),    # Gemini models
+        "deepinfra": ProviderRateLimit(max_concurrent=8, requests_per_minute=300, tokens_per_minute=1_000_000, min_concurrent=1), # Hosted models
+        "local": ProviderRateLimit(max_concurrent=4, requests_per_minute=120, min_concurrent=1)       # Future local models
     }
     
-    def __init__(self):
-        self.provider_semaphores = {}
-        self.request_times = defaultdict(list)
-        self.circuit_breakers = defaultdict(bool)  # Track if provider is in circuit breaker mode
+    def __init__(self, share: float = 1.0, tail_policy: Optional[TailLatencyPolicy] = None):
+        """
+        Args:
+            share: Fraction of each provider's limits this process may use,
+                e.g. 0.25 when four shard processes split one API budget
+            tail_policy: Adaptive timeout / hedging policy (hedging off by default)
+        """
+        self.share = share
+        self.tail_policy = tail_policy or TailLatencyPolicy()
+        self.hedged_requests = defaultdict(int)
+        self.hedge_wins = defaultdict(int)
+        self.timeouts = defaultdict(int)
+        self.limits: Dict[str, ProviderRateLimit] = {
+            provider: limits if share == 1.0 else limits.scaled(share)
+            for provider, limits in self.PROVIDER_LIMITS.items()
+        }
+        self.concurrency_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self.request_buckets: Dict[str, TokenBucket] = {}
+        self.token_buckets: Dict[str, TokenBucket] = {}
+        self.request_windows = defaultdict(lambda: [0, 0])  # [minute index, requests in that minute]
         self.error_counts = defaultdict(int)
-        self.last_error_reset = defaultdict(lambda: datetime.utcnow())
         
-        # Initialize semaphores for each provider
-        for provider, limits in self.PROVIDER_LIMITS.items():
-            self.provider_semaphores[provider] = asyncio.Semaphore(limits.max_concurrent)
+        # Initialize concurrency windows and buckets for each provider
+        for provider, limits in self.limits.items():
+            self.concurrency_limiters[provider] = AdaptiveConcurrencyLimiter(
+                ceiling=limits.max_concurrent,
+                floor=limits.min_concurrent,
+                decrease_factor=1 / limits.backoff_factor
+            )
+            self.request_buckets[provider] = TokenBucket(
+                limits.requests_per_minute, capacity=limits.burst_capacity
+            )
+            if limits.tokens_per_minute:
+                self.token_buckets[provider] = TokenBucket(limits.tokens_per_minute)
+    
+    def _resolve_provider(self, provider: str) -> str:
+        """Map unknown providers onto the conservative fallback."""
+        return provider if provider in self.limits else "anthropic"
     
-    async def acquire(self, provider: str) -> bool:
-        """Acquire rate limit permission for provider."""
-        if provider not in self.PROVIDER_LIMITS:
+    async def acquire(self, provider: str, estimated_tokens: int = 0) -> bool:
+        """Acquire rate limit permission for provider.
+        
+        Args:
+            provider: Provider name
+            estimated_tokens: Estimated prompt tokens for the request, counted
+                against the provider's tokens-per-minute budget
+        """
+        if provider not in self.limits:
             logger.warning(f"Unknown provider {provider}, using anthropic defaults")
             provider = "anthropic"  # Conservative fallback
         
-        # Check circuit breaker
-        if self.circuit_breakers[provider]:
-            if self._should_reset_circuit_breaker(provider):
-                self.circuit_breakers[provider] = False
-                self.error_counts[provider] = 0
-                logger.info(f"Circuit breaker reset for {provider}")
-            else:
-                await asyncio.sleep(5)  # Wait before retry
-                return False
-        
-        # Wait for semaphore (concurrent requests limit)
-        await self.provider_semaphores[provider].acquire()
-        
-        # Check per-minute rate limit
-        now = datetime.utcnow()
-        minute_ago = now - timedelta(minutes=1)
-        
-        # Clean old requests
-        self.request_times[provider] = [
-            t for t in self.request_times[provider] if t > minute_ago
-        ]
-        
-        # Check if we're under the per-minute limit
-        current_requests = len(self.request_times[provider])
-        limit = self.PROVIDER_LIMITS[provider].requests_per_minute
-        
-        if current_requests >= limit:
-            # Need to wait until we can make another request
-            if self.request_times[provider]:
-                oldest_request = min(self.request_times[provider])
-                wait_until = oldest_request + timedelta(minutes=1)
-                wait_seconds = (wait_until - now).total_seconds()
-                
-                if wait_seconds > 0:
-                    logger.debug(f"Rate limit hit for {provider}, waiting {wait_seconds:.1f}s")
-                    await asyncio.sleep(wait_seconds)
+        # Reserve per-minute request and token budget before taking a slot,
+        # so waiting on the rate never blocks other callers' concurrency
+        wait_seconds = self.request_buckets[provider].reserve(1)
+        if estimated_tokens and provider in self.token_buckets:
+            wait_seconds = max(wait_seconds, self.token_buckets[provider].reserve(estimated_tokens))
+        
+        if wait_seconds > 0:
+            logger.debug(f"Rate limit hit for {provider}, waiting {wait_seconds:.1f}s")
+            await asyncio.sleep(wait_seconds)
+        
+        # Wait for a slot in the adaptive concurrency window
+        await self.concurrency_limiters[provider].acquire()
         
         # Record this request
-        self.request_times[provider].append(now)
+        self._count_request(provider)
         return True
     
+    def _count_request(self, provider: str):
+        """Count a request in the current fixed one-minute window."""
+        minute = int(time.monotonic() // 60)
+        window = self.request_windows[provider]
+        if window[0] != minute:
+            window[0] = minute
+            window[1] = 0
+        window[1] += 1
+    
+    def _requests_this_minute(self, provider: str) -> int:
+        """Requests counted in the current one-minute window."""
+        window = self.request_windows[provider]
+        return window[1] if window[0] == int(time.monotonic() // 60) else 0
+    
+    def get_max_concurrent(self, provider: str) -> int:
+        """Get the current adaptive concurrency limit for a provider."""
+        return self.concurrency_limiters[self._resolve_provider(provider)].limit
+    
     def release(self, provider: str):
         """Release rate limit permission for provider."""
-        if provider in self.provider_semaphores:
-            self.provider_semaphores[provider].release()
+        self.concurrency_limiters[self._resolve_provider(provider)].release()
     
-    def record_error(self, provider: str):
-        """Record an API error for circuit breaker logic."""
+    def record_error(self, provider: str, error: Optional[BaseException] = None):
+        """Record an API error; rate-limit errors shrink the concurrency window."""
+        provider = self._resolve_provider(provider)
         self.error_counts[provider] += 1
         
-        # Trip circuit breaker after 5 consecutive errors
-        if self.error_counts[provider] >= 5:
-            self.circuit_breakers[provider] = True
-            self.last_error_reset[provider] = datetime.utcnow()
-            logger.warning(f"Circuit breaker tripped for {provider} after {self.error_counts[provider]} errors")
+        if error is None or self._is_rate_limit_error(error):
+            self.concurrency_limiters[provider].on_rate_limited()
     
-    def record_success(self, provider: str):
-        """Record a successful API call."""
+    def record_success(self, provider: str, latency: Optional[float] = None, model: Optional[str] = None):
+        """Record a successful API call and its latency in seconds.
+        
+        With ``model`` the latency also feeds the per-model adaptive timeout
+        and is judged against that model's own latency baseline.
+        """
+        if model is not None and latency is not None:
+            self.tail_policy.record(provider, model, latency)
+        
+        provider = self._resolve_provider(provider)
         if self.error_counts[provider] > 0:
             self.error_counts[provider] = max(0, self.error_counts[provider] - 1)
+        
+        self.concurrency_limiters[provider].on_success(latency, model)
     
-    def _should_reset_circuit_breaker(self, provider: str) -> bool:
-        """Check if circuit breaker should be reset."""
-        if not self.circuit_breakers[provider]:
-            return False
+    def record_timeout(self, provider: str, model: str, timeout: float):
+        """Record a request abandoned at its adaptive timeout.
         
-        # Reset after 30 seconds
-        reset_time = self.last_error_reset[provider] + timedelta(seconds=30)
-        return datetime.utcnow() > reset_time
+        The timeout is kept as a latency sample so timeouts stretch, rather
+        than hide, the tail they are computed from.
+        """
+        self.tail_policy.record(provider, model, timeout)
+        self.timeouts[self._resolve_provider(provider)] += 1
+    
+    def record_hedge(self, provider: str):
+        """Count a hedged duplicate request against the hedge budget."""
+        self.hedged_requests[self._resolve_provider(provider)] += 1
+        self.tail_policy.hedges += 1
+    
+    def record_hedge_win(self, provider: str):
+        """Count a hedged request that finished before the original."""
+        self.hedge_wins[self._resolve_provider(provider)] += 1
+    
+    @staticmethod
+    def _is_rate_limit_error(error: BaseException) -> bool:
+        """Detect 429 / overload errors across provider SDKs and LiteLLM."""
+        status = getattr(error, "status_code", None) or getattr(error, "code", None)
+        if status in (429, 529):
+            return True
+        if "RateLimit" in type(error).__name__ or "ResourceExhausted" in type(error).__name__:
+            return True
+        message = str(error).lower()
+        return any(marker in message for marker in ("429", "rate limit", "rate_limit", "overloaded", "quota"))
     
     def get_provider_stats(self, provider: str) -> Dict[str, Any]:
         """Get current rate limit stats for a provider."""
-        if provider not in self.PROVIDER_LIMITS:
+        if provider not in self.limits:
             return {"error": "Unknown provider"}
         
-        limits = self.PROVIDER_LIMITS[provider]
-        current_concurrent = limits.max_concurrent - self.provider_semaphores[provider]._value
-        minute_requests = len([
-            t for t in self.request_times[provider] 
-            if t > datetime.utcnow() - timedelta(minutes=1)
-        ])
+        limits = self.limits[provider]
+        limiter = self.concurrency_limiters[provider]
+        current_concurrent = limiter.in_flight
+        minute_requests = self._requests_this_minute(provider)
         
         return {
             "provider": provider,
-            "max_concurrent": limits.max_concurrent,
+            "max_concurrent": limiter.limit,
             "current_concurrent": current_concurrent,
             "requests_per_minute_limit": limits.requests_per_minute,
             "requests_this_minute": minute_requests,
-            "utilization_percent": (current_concurrent / limits.max_concurrent) * 100,
-            "circuit_breaker_active": self.circuit_breakers[provider],
+            "utilization_percent": (current_concurrent / limiter.limit) * 100,
+            "circuit_breaker_active": limiter.in_backoff(),
             "error_count": self.error_counts[provider]
         }
     
@@ -154,5 +421,26 @@ class RateLimitManager:
         """Get stats for all providers."""
         return {
             provider: self.get_provider_stats(provider) 
-            for provider in self.PROVIDER_LIMITS.keys()
+            for provider in self.limits.keys()
+        }
+    
+    def get_tail_latency_stats(self) -> Dict[str, Any]:
+        """Adaptive timeouts plus timeout and hedge counts per provider."""
+        return {
+            **self.tail_policy.to_dict(),
+            "providers": {
+                provider: {
+                    "timeouts": self.timeouts[provider],
+                    "hedged_requests": self.hedged_requests[provider],
+                    "hedge_wins": self.hedge_wins[provider]
+                }
+                for provider in self.limits
+            }
+        }
+    
+    def get_concurrency_windows(self) -> Dict[str, Dict[str, Any]]:
+        """Get adaptive concurrency window details for all providers."""
+        return {
+            provider: limiter.to_dict()
+            for provider, limiter in self.concurrency_limiters.items()
         }
@@ -0,0 +1,243 @@
+"""
+Global cross-model work scheduler for parallel evaluations.
+
+Every (model, sequence, run) unit of an evaluation is submitted to one
+queue, partitioned into per-provider lanes. A single dispatcher starts
+units from every lane as long as the provider (and the owning model) has
+free capacity, so all providers are kept busy at the same time instead of
+one model at a time.
+"""
+
+import asyncio
+import heapq
+import logging
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Deque, Tuple
+
+from ..utils.latency_metrics import latency_metrics, STAGE_QUEUE_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkUnit:
+    """One schedulable unit of work: a single run of one sequence for one model."""
+    model_name: str
+    sequence_name: str
+    run_number: int
+    provider: str
+    worker: Any = None  # Owning SequenceWorker
+    expected_duration: float = 0.0  # Seconds, from historical latency (0 = unknown)
+    submitted_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def unit_id(self) -> str:
+        """Stable identifier for logging."""
+        return f"{self.model_name}_{self.sequence_name}_run_{self.run_number}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for logging/monitoring."""
+        return {
+            "unit_id": self.unit_id,
+            "model_name": self.model_name,
+            "sequence_name": self.sequence_name,
+            "run_number": self.run_number,
+            "provider": self.provider,
+            "expected_duration": self.expected_duration,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class GlobalWorkScheduler:
+    """
+    Dispatches work units across all models subject to per-provider limits.
+
+    Concurrency is bounded twice:
+    - per provider, by the ``max_concurrent`` limit of the rate limit manager
+    - per model, by ``max_units_per_model`` (optional)
+
+    Units within a provider lane are started in submission order, skipping
+    units whose model is already at its cap so other models can proceed.
+    ``order_longest_first`` reorders lanes by expected duration (LPT) so slow
+    units do not start last and stretch the tail of the evaluation.
+    """
+
+    def __init__(self,
+                 rate_limit_manager,
+                 max_units_per_model: Optional[int] = None):
+        self.rate_limit_manager = rate_limit_manager
+        self.max_units_per_model = max_units_per_model
+
+        self.lanes: Dict[str, Deque[WorkUnit]] = defaultdict(deque)
+        self.running_by_provider: Dict[str, int] = defaultdict(int)
+        self.running_by_model: Dict[str, int] = defaultdict(int)
+        self.completed_units = 0
+        self.failed_units = 0
+
+    @property
+    def pending_units(self) -> int:
+        """Number of units not yet started."""
+        return sum(len(lane) for lane in self.lanes.values())
+
+    @property
+    def running_units(self) -> int:
+        """Number of units currently executing."""
+        return sum(self.running_by_provider.values())
+
+    def submit(self, unit: WorkUnit):
+        """Add a unit to its provider lane."""
+        self.lanes[unit.provider].append(unit)
+
+    def order_longest_first(self):
+        """Sort every lane by expected duration, longest first (stable for ties)."""
+        for provider, lane in self.lanes.items():
+            self.lanes[provider] = deque(sorted(lane, key=lambda unit: unit.expected_duration, reverse=True))
+
+    def predict_makespan(self) -> float:
+        """
+        Predict the wall-clock seconds to drain the pending units.
+
+        Replays the dispatcher with each unit taking its ``expected_duration``
+        under the current provider capacities and per-model cap. Lanes are not
+        modified.
+        """
+        lanes = {provider: list(lane) for provider, lane in self.lanes.items()}
+        running_by_provider: Dict[str, int] = defaultdict(int)
+        running_by_model: Dict[str, int] = defaultdict(int)
+        finishing: List[Tuple[float, int, WorkUnit]] = []
+        now = 0.0
+        sequence = 0
+
+        while any(lanes.values()) or finishing:
+            for provider, lane in lanes.items():
+                capacity = self._provider_capacity(provider)
+                index = 0
+                while running_by_provider[provider] < capacity and index < len(lane):
+                    unit = lane[index]
+                    if (self.max_units_per_model is not None and
+                            running_by_model[unit.model_name] >= self.max_units_per_model):
+                        index += 1
+                        continue
+                    del lane[index]
+                    running_by_provider[provider] += 1
+                    running_by_model[unit.model_name] += 1
+                    heapq.heappush(finishing, (now + unit.expected_duration, sequence, unit))
+                    sequence += 1
+
+            if not finishing:
+                # Same condition the dispatcher reports as stalled
+                return float("inf")
+
+            now, _, unit = heapq.heappop(finishing)
+            running_by_provider[unit.provider] -= 1
+            running_by_model[unit.model_name] -= 1
+
+        return now
+
+    def _provider_capacity(self, provider: str) -> int:
+        """Current concurrency ceiling for a provider lane."""
+        return self.rate_limit_manager.get_max_concurrent(provider)
+
+    def _next_unit(self, provider: str) -> Optional[WorkUnit]:
+        """Pop the first unit in a lane whose model is below its cap."""
+        lane = self.lanes[provider]
+        for index, unit in enumerate(lane):
+            if (self.max_units_per_model is None or
+                    self.running_by_model[unit.model_name] < self.max_units_per_model):
+                del lane[index]
+                return unit
+        return None
+
+    def _ready_units(self) -> List[WorkUnit]:
+        """Collect every unit that may be started right now."""
+        ready = []
+        for provider in list(self.lanes.keys()):
+            while self.running_by_provider[provider] < self._provider_capacity(provider):
+                unit = self._next_unit(provider)
+                if unit is None:
+                    break
+                self.running_by_provider[provider] += 1
+                self.running_by_model[unit.model_name] += 1
+                ready.append(unit)
+        return ready
+
+    async def run(self,
+                  execute: Callable[[WorkUnit], Awaitable[Dict[str, Any]]],
+                  on_unit_complete: Optional[Callable[[WorkUnit, Dict[str, Any]], None]] = None
+                  ) -> List[Tuple[WorkUnit, Dict[str, Any]]]:
+        """
+        Execute all submitted units and return (unit, result) pairs.
+
+        ``execute`` must return a run result dict with at least a ``success``
+        key. Exceptions are converted into failed run results so one unit
+        never aborts the whole evaluation.
+        """
+        logger.info(
+            f"Global scheduler starting {self.pending_units} units across "
+            f"{len(self.lanes)} providers: "
+            + ", ".join(f"{p}={len(lane)}" for p, lane in self.lanes.items())
+        )
+
+        in_flight: Dict[asyncio.Task, WorkUnit] = {}
+        completed: List[Tuple[WorkUnit, Dict[str, Any]]] = []
+
+        while self.pending_units or in_flight:
+            for unit in self._ready_units():
+                unit.started_at = datetime.utcnow()
+                latency_metrics.observe(STAGE_QUEUE_WAIT, unit.provider, unit.model_name,
+                                        (unit.started_at - unit.submitted_at).total_seconds())
+                in_flight[asyncio.create_task(execute(unit))] = unit
+
+            if not in_flight:
+                # Nothing could be started and nothing is running: a lane has zero capacity
+                stuck = {p: len(lane) for p, lane in self.lanes.items() if lane}
+                logger.error(f"Global scheduler stalled with pending units: {stuck}")
+                break
+
+            done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                unit = in_flight.pop(task)
+                unit.finished_at = datetime.utcnow()
+                self.running_by_provider[unit.provider] -= 1
+                self.running_by_model[unit.model_name] -= 1
+
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.error(f"Unit {unit.unit_id} raised exception: {e}")
+                    result = {
+                        "run_number": unit.run_number,
+                        "completed_prompts": 0,
+                        "success": False,
+                        "error": str(e),
+                        "prompt_results": []
+                    }
+
+                if result.get("success", False):
+                    self.completed_units += 1
+                else:
+                    self.failed_units += 1
+
+                completed.append((unit, result))
+                if on_unit_complete:
+                    on_unit_complete(unit, result)
+
+        return completed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current scheduler stats for monitoring."""
+        return {
+            "pending_units": self.pending_units,
+            "running_units": self.running_units,
+            "completed_units": self.completed_units,
+            "failed_units": self.failed_units,
+            "running_by_provider": dict(self.running_by_provider),
+            "pending_by_provider": {p: len(lane) for p, lane in self.lanes.items()}
+        }
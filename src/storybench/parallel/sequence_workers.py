@@ -8,12 +8,25 @@ within runs and isolation between runs.
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Callable
+import time
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from .tail_latency import race_with_hedge
+from ..conversation_context import ConversationContext
+from ..utils.latency_metrics import latency_metrics, STAGE_RATE_LIMIT_WAIT, STAGE_GENERATION, STAGE_DB_WRITE
+
 logger = logging.getLogger(__name__)
 
+# Extra time the outer timeout allows an evaluator to end its own request at the
+# adaptive deadline (and return the streamed text so far) before it is cancelled
+DEADLINE_GRACE_SECONDS = 5.0
+
+
+class PartialResponseError(Exception):
+    """A streamed response was cut short; its text was stored as PARTIAL, not as an answer."""
+
 
 @dataclass 
 class SequenceWorkerState:
@@ -23,7 +36,7 @@ class SequenceWorkerState:
     worker_id: str
     run_number: int
     current_prompt_index: int = 0
-    context_history: List[Dict[str, str]] = field(default_factory=list)
+    context: ConversationContext = field(default_factory=ConversationContext)
     start_time: Optional[datetime] = None
     last_activity: Optional[datetime] = None
     error_count: int = 0
@@ -43,7 +56,7 @@ class SequenceWorkerState:
             "total_prompts": self.total_prompts,
             "error_count": self.error_count,
             "status": self.status,
-            "context_length": len(self.context_history),
+            "context_length": self.context.turn_count,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "last_activity": self.last_activity.isoformat() if self.last_activity else None
         }
@@ -59,6 +72,9 @@ class SequenceWorker:
     - 3 runs per sequence (for variance checking)
     - Context accumulation within each run
     - Context reset between runs
+    
+    With ``concurrent_runs`` enabled the runs execute as independent tasks,
+    each with its own evaluator instance and context history.
     """
     
     def __init__(self, 
@@ -71,7 +87,10 @@ class SequenceWorker:
                  evaluator_factory: Callable,
                  evaluation_runner,
                  evaluation_id: str,
-                 rate_limit_manager):
+                 rate_limit_manager,
+                 concurrent_runs: bool = False,
+                 evaluator_pool=None,
+                 on_run_complete: Optional[Callable] = None):
         
         self.worker_id = worker_id
         self.sequence_name = sequence_name
@@ -83,6 +102,11 @@ class SequenceWorker:
         self.evaluation_runner = evaluation_runner
         self.evaluation_id = evaluation_id
         self.rate_limit_manager = rate_limit_manager
+        self.concurrent_runs = concurrent_runs
+        self.evaluator_pool = evaluator_pool  # Optional EvaluatorPool shared across workers
+        # Called with (model_name, sequence_name, run_number, run_result) when a run finishes,
+        # e.g. to start judging it while other runs are still generating
+        self.on_run_complete = on_run_complete
         
         # Extract provider from model configuration
         self.provider = self._determine_provider(model_config)
@@ -114,11 +138,9 @@ class SequenceWorker:
         else:
             return "local"
     
-    async def execute(self) -> Dict[str, Any]:
-        """Execute all runs for this sequence."""
-        logger.info(f"Worker {self.worker_id} starting: {self.model_name} - {self.sequence_name}")
-        
-        results = {
+    def new_result(self) -> Dict[str, Any]:
+        """Create the empty aggregate result for this worker."""
+        return {
             "worker_id": self.worker_id,
             "sequence_name": self.sequence_name,
             "model_name": self.model_name,
@@ -131,32 +153,95 @@ class SequenceWorker:
             "start_time": datetime.utcnow(),
             "run_results": []
         }
+    
+    def add_run_result(self, results: Dict[str, Any], run_result: Dict[str, Any]):
+        """Fold a single run result into the worker aggregate."""
+        results["run_results"].append(run_result)
+        
+        if run_result["success"]:
+            results["completed_runs"] += 1
+            results["completed_prompts"] += run_result["completed_prompts"]
+        else:
+            results["failed_runs"] += 1
+            logger.warning(f"Run {run_result['run_number']} failed for {self.worker_id}")
+    
+    def discard_run_result(self, results: Dict[str, Any], run_number: int) -> int:
+        """Drop earlier attempts of a run from the aggregate before it is retried.
+        
+        Returns:
+            Number of completed prompts the discarded attempts had counted
+        """
+        discarded_prompts = 0
+        for run_result in [r for r in results["run_results"] if r["run_number"] == run_number]:
+            results["run_results"].remove(run_result)
+            if run_result["success"]:
+                results["completed_runs"] -= 1
+                results["completed_prompts"] -= run_result["completed_prompts"]
+                discarded_prompts += run_result["completed_prompts"]
+            else:
+                results["failed_runs"] -= 1
+        results.pop("success", None)  # The worker is unfinished again
+        return discarded_prompts
+    
+    def finalize_result(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp timing and overall success on the worker aggregate."""
+        results["run_results"].sort(key=lambda r: r["run_number"])
+        results["end_time"] = datetime.utcnow()
+        results["duration"] = (results["end_time"] - results["start_time"]).total_seconds()
+        results["success"] = results["completed_runs"] > 0
+        
+        logger.info(f"Worker {self.worker_id} completed: {results['completed_runs']}/{results['total_runs']} runs successful")
+        return results
+    
+    def get_run_state(self, run_number: int) -> SequenceWorkerState:
+        """Get the state object for a run number (1-based)."""
+        return self.run_states[run_number - 1]
+    
+    async def execute_run(self, run_number: int) -> Dict[str, Any]:
+        """Execute a single run of this sequence (used by the global scheduler)."""
+        return await self._execute_run(self.get_run_state(run_number))
+    
+    async def execute(self) -> Dict[str, Any]:
+        """Execute all runs for this sequence."""
+        logger.info(f"Worker {self.worker_id} starting: {self.model_name} - {self.sequence_name}")
+        
+        results = self.new_result()
         
         try:
-            # Execute each run sequentially (context must reset between runs)
-            for run_state in self.run_states:
-                run_result = await self._execute_run(run_state)
-                results["run_results"].append(run_result)
+            if self.concurrent_runs:
+                # Runs share no state: each gets its own evaluator and context history
+                run_results = await asyncio.gather(
+                    *[self._execute_run(run_state) for run_state in self.run_states],
+                    return_exceptions=True
+                )
                 
-                if run_result["success"]:
-                    results["completed_runs"] += 1
-                    results["completed_prompts"] += run_result["completed_prompts"]
-                else:
-                    results["failed_runs"] += 1
-                    logger.warning(f"Run {run_state.run_number} failed for {self.worker_id}")
+                for run_state, run_result in zip(self.run_states, run_results):
+                    if isinstance(run_result, Exception):
+                        logger.error(f"Run {run_state.run_number} for {self.worker_id} raised exception: {run_result}")
+                        run_state.status = "failed"
+                        run_result = {
+                            "run_number": run_state.run_number,
+                            "worker_id": run_state.worker_id,
+                            "completed_prompts": 0,
+                            "success": False,
+                            "error": str(run_result),
+                            "prompt_results": []
+                        }
+                    self.add_run_result(results, run_result)
+            else:
+                # Execute each run sequentially (context must reset between runs)
+                for run_state in self.run_states:
+                    run_result = await self._execute_run(run_state)
+                    self.add_run_result(results, run_result)
             
-            results["end_time"] = datetime.utcnow()
-            results["duration"] = (results["end_time"] - results["start_time"]).total_seconds()
-            results["success"] = results["completed_runs"] > 0
-            
-            logger.info(f"Worker {self.worker_id} completed: {results['completed_runs']}/{results['total_runs']} runs successful")
-            return results
+            return self.finalize_result(results)
             
         except Exception as e:
             logger.error(f"Worker {self.worker_id} failed with exception: {e}")
             results["error"] = str(e)
             results["success"] = False
-            return results    
+            return results
+    
     async def _execute_run(self, run_state: SequenceWorkerState) -> Dict[str, Any]:
         """Execute a single run (all 3 prompts in sequence with context accumulation)."""
         run_state.status = "running"
@@ -172,103 +257,147 @@ class SequenceWorker:
         }
         
         try:
-            # Create evaluator instance for this run
-            evaluator = self.evaluator_factory(self.model_config)
-            
-            # IMPORTANT: Setup the evaluator before use
-            await evaluator.setup()
+            # Get a set-up evaluator for this run (own instance, clean context)
+            evaluator = await self._checkout_evaluator()
             
-            # Execute 3 prompts in sequence with context accumulation
-            for prompt_index, prompt in enumerate(self.sequence_prompts):
-                run_state.current_prompt_index = prompt_index
-                run_state.last_activity = datetime.utcnow()
+            try:
+                # Execute 3 prompts in sequence with context accumulation
+                for prompt_index, prompt in enumerate(self.sequence_prompts):
+                    run_state.current_prompt_index = prompt_index
+                    run_state.last_activity = datetime.utcnow()
                 
-                try:
-                    # Build context from previous responses in this run
-                    context_text = self._build_context_text(run_state.context_history)
-                    
-                    # Acquire rate limit permission
-                    success = await self.rate_limit_manager.acquire(self.provider)
-                    if not success:
-                        raise Exception(f"Rate limit acquisition failed for {self.provider}")
-                    
                     try:
-                        # Execute prompt with context
-                        prompt_text_with_context = f"{context_text}\n\n{prompt['text']}" if context_text else prompt['text']
-                        
-                        response_dict = await evaluator.generate_response(
-                            prompt_text_with_context
+                        # A cached answer never reaches the provider, so it is served before
+                        # admission and spends no rate-limit budget or concurrency slot
+                        response_dict = await self._lookup_cached_response(
+                            evaluator, prompt['text'], run_state.context, run_state.run_number
                         )
+                        admitted = response_dict is None
                         
-                        # Extract response text and generation time from dict
-                        response_text = response_dict.get("response", "")
-                        generation_time = response_dict.get("generation_time", 0.0)
+                        if admitted:
+                            # Acquire rate limit permission (prompt size counts against tokens/min)
+                            estimated_tokens = self._estimate_prompt_tokens(evaluator, run_state.context, prompt['text'])
+                            with latency_metrics.time(STAGE_RATE_LIMIT_WAIT, self.provider, self.model_name):
+                                success = await self.rate_limit_manager.acquire(
+                                    self.provider,
+                                    estimated_tokens=estimated_tokens
+                                )
+                            if not success:
+                                raise Exception(f"Rate limit acquisition failed for {self.provider}")
+                    
+                        try:
+                            if admitted:
+                                # Execute prompt with context (adaptive timeout, optional hedge)
+                                with latency_metrics.time(STAGE_GENERATION, self.provider, self.model_name):
+                                    response_dict, observed_latency = await self._generate_with_tail_control(
+                                        evaluator, prompt['text'], run_state.context, estimated_tokens,
+                                        run_state.run_number
+                                    )
                         
-                        # Record success for circuit breaker
-                        self.rate_limit_manager.record_success(self.provider)
+                            # Extract response text and generation time from dict
+                            response_text = response_dict.get("response", "")
+                            generation_time = response_dict.get("generation_time", 0.0)
+                            cached = response_dict.get("cached", False)
+                            if cached and response_dict.get("cached_generation_time") is not None:
+                                # A hit's own time is the lookup; the response keeps its real one
+                                generation_time = response_dict["cached_generation_time"]
+                            
+                            if response_dict.get("partial"):
+                                # Keep the cut-off text for inspection, but never as an answer:
+                                # it stays out of the context, the judges and the success stats
+                                interrupted = response_dict.get("interrupted") or "stream interrupted"
+                                with latency_metrics.time(STAGE_DB_WRITE, self.provider, self.model_name):
+                                    await self.evaluation_runner.save_response(
+                                        evaluation_id=self.evaluation_id,
+                                        model_name=self.model_name,
+                                        sequence=self.sequence_name,
+                                        run=run_state.run_number,
+                                        prompt_index=prompt_index,
+                                        prompt_name=prompt["name"],
+                                        prompt_text=prompt["text"],
+                                        response_text=response_text,
+                                        generation_time=generation_time,
+                                        interrupted=interrupted
+                                    )
+                                raise PartialResponseError(f"Response cut short ({interrupted})")
                         
-                        # Save response to database
-                        await self.evaluation_runner.save_response(
-                            evaluation_id=self.evaluation_id,
-                            model_name=self.model_name,
-                            sequence=self.sequence_name,
-                            run=run_state.run_number,
-                            prompt_index=prompt_index,
-                            prompt_name=prompt["name"],
-                            prompt_text=prompt["text"],
-                            response_text=response_text,
-                            generation_time=generation_time
-                        )
+                            # Feed the adaptive concurrency window with the latency this prompt
+                            # actually waited, hedge delay included; a cache hit says nothing
+                            # about the provider's latency
+                            if admitted and not cached:
+                                self.rate_limit_manager.record_success(self.provider, latency=observed_latency,
+                                                                       model=self.model_name)
                         
-                        # Add to context history for next prompt in this run
-                        run_state.context_history.append({
-                            "prompt": prompt["text"],
-                            "response": response_text,
-                            "prompt_name": prompt["name"]
-                        })
+                            # Save response to database
+                            with latency_metrics.time(STAGE_DB_WRITE, self.provider, self.model_name):
+                                await self.evaluation_runner.save_response(
+                                    evaluation_id=self.evaluation_id,
+                                    model_name=self.model_name,
+                                    sequence=self.sequence_name,
+                                    run=run_state.run_number,
+                                    prompt_index=prompt_index,
+                                    prompt_name=prompt["name"],
+                                    prompt_text=prompt["text"],
+                                    response_text=response_text,
+                                    generation_time=generation_time
+                                )
                         
-                        run_state.completed_prompts += 1
-                        run_result["completed_prompts"] += 1
+                            # Add to context history for next prompt in this run
+                            run_state.context.add_turn(prompt["text"], response_text, name=prompt["name"])
                         
-                        run_result["prompt_results"].append({
-                            "prompt_index": prompt_index,
-                            "prompt_name": prompt["name"],
-                            "success": True,
-                            "generation_time": generation_time,
-                            "response_length": len(response_text)
-                        })
+                            run_state.completed_prompts += 1
+                            run_result["completed_prompts"] += 1
                         
-                        logger.debug(f"Worker {run_state.worker_id} completed prompt {prompt_index + 1}/3")
+                            run_result["prompt_results"].append({
+                                "prompt_index": prompt_index,
+                                "prompt_name": prompt["name"],
+                                "success": True,
+                                "generation_time": generation_time,
+                                "response_length": len(response_text),
+                                "cached_tokens": (response_dict.get("usage") or {}).get("cached_tokens", 0)
+                            })
                         
-                    except Exception as api_error:
-                        # Record error for circuit breaker
-                        self.rate_limit_manager.record_error(self.provider)
-                        raise api_error
+                            logger.debug(f"Worker {run_state.worker_id} completed prompt {prompt_index + 1}/3")
                         
-                    finally:
-                        # Always release rate limit
-                        self.rate_limit_manager.release(self.provider)
+                        except Exception as api_error:
+                            # Rate-limit errors shrink the adaptive concurrency window
+                            if admitted:
+                                self.rate_limit_manager.record_error(self.provider, error=api_error)
+                            raise api_error
                         
-                except Exception as prompt_error:
-                    logger.error(f"Worker {run_state.worker_id} failed on prompt {prompt_index}: {prompt_error}")
-                    run_state.error_count += 1
+                        finally:
+                            # Always release rate limit
+                            if admitted:
+                                self.rate_limit_manager.release(self.provider)
+                        
+                    except Exception as prompt_error:
+                        logger.error(f"Worker {run_state.worker_id} failed on prompt {prompt_index}: {prompt_error}")
+                        run_state.error_count += 1
                     
-                    run_result["prompt_results"].append({
-                        "prompt_index": prompt_index,
-                        "prompt_name": prompt["name"],
-                        "success": False,
-                        "error": str(prompt_error)
-                    })
+                        run_result["prompt_results"].append({
+                            "prompt_index": prompt_index,
+                            "prompt_name": prompt["name"],
+                            "success": False,
+                            "error": str(prompt_error)
+                        })
                     
-                    # Continue with next prompt instead of failing entire run
-                    continue
+                        # Continue with next prompt instead of failing entire run
+                        continue
             
-            # Mark run as successful if at least one prompt completed
+            finally:
+                await self._checkin_evaluator(evaluator)
+            
+            # Mark run as successful if at least one prompt completed; only a
+            # complete run (every prompt answered) may settle its queue task
             run_result["success"] = run_result["completed_prompts"] > 0
+            run_result["complete"] = run_result["completed_prompts"] == len(self.sequence_prompts)
             run_state.status = "completed" if run_result["success"] else "failed"
             
             # IMPORTANT: Reset context between runs (for variance checking)
-            run_state.context_history.clear()
+            run_state.context.clear()
+            
+            if self.on_run_complete:
+                self.on_run_complete(self.model_name, self.sequence_name, run_state.run_number, run_result)
             
             return run_result
             
@@ -278,16 +407,91 @@ class SequenceWorker:
             run_state.status = "failed"
             return run_result
     
-    def _build_context_text(self, context_history: List[Dict[str, str]]) -> str:
-        """Build accumulated context text from previous responses."""
-        if not context_history:
-            return ""
+    async def _generate_with_tail_control(self, evaluator, prompt_text: str, context: ConversationContext,
+                                          estimated_tokens: int, run_number: int) -> Tuple[Dict[str, Any], float]:
+        """Generate under the adaptive timeout, hedging a slow request if enabled.
+        
+        The adaptive timeout is passed to the evaluator as its ``timeout``, so a
+        streaming evaluator ends the request itself at the deadline and returns
+        the text so far as a ``partial`` result. The outer timeout, a little
+        later, only cancels evaluators that ignore the deadline.
+        
+        The run's context goes to whichever evaluator answers, so a hedge sees
+        the same history. The run number keys the response cache, so variance
+        runs never share a response. The caller has already looked the request
+        up in the cache, so both requests only store their answer.
+        
+        Returns:
+            (response, latency) - the latency is measured around the race, so a
+            winning hedge counts its delay and not just its own generation time
+        """
+        timeout, hedge_delay = self.rate_limit_manager.tail_policy.begin_request(self.provider, self.model_name)
+        hedge_timeout = timeout - hedge_delay if hedge_delay is not None else timeout
+        started = time.monotonic()
+        try:
+            response_dict, _, hedge_won = await race_with_hedge(
+                lambda: evaluator.generate_response(prompt_text, context=context, cache_sample=run_number,
+                                                    refresh_cache=True, timeout=timeout),
+                lambda: self._hedged_generate(prompt_text, context, estimated_tokens, run_number, hedge_timeout),
+                timeout=timeout + min(DEADLINE_GRACE_SECONDS, timeout / 4),
+                hedge_delay=hedge_delay
+            )
+        except asyncio.TimeoutError:
+            self.rate_limit_manager.record_timeout(self.provider, self.model_name, timeout)
+            raise TimeoutError(f"{self.model_name} did not respond within its adaptive timeout of {timeout:.0f}s")
+        latency = time.monotonic() - started
+        
+        if response_dict.get("timed_out"):
+            self.rate_limit_manager.record_timeout(self.provider, self.model_name, timeout)
+        if hedge_won:
+            self.rate_limit_manager.record_hedge_win(self.provider)
+        return response_dict, latency
+    
+    async def _lookup_cached_response(self, evaluator, prompt_text: str, context: ConversationContext,
+                                      run_number: int) -> Optional[Dict[str, Any]]:
+        """The evaluator's cached answer to this prompt of the run, or None."""
+        lookup = getattr(evaluator, "lookup_cached_response", None)
+        if lookup is None:
+            return None
+        return await lookup(prompt_text, context=context, cache_sample=run_number)
+    
+    async def _hedged_generate(self, prompt_text: str, context: ConversationContext, estimated_tokens: int,
+                               run_number: int, timeout: float) -> Dict[str, Any]:
+        """Duplicate request on a second evaluator, admitted and counted by the rate limiter."""
+        self.rate_limit_manager.record_hedge(self.provider)
+        await self.rate_limit_manager.acquire(self.provider, estimated_tokens=estimated_tokens)
+        try:
+            evaluator = await self._checkout_evaluator()
+            try:
+                return await evaluator.generate_response(prompt_text, context=context, cache_sample=run_number,
+                                                         refresh_cache=True, timeout=timeout)
+            finally:
+                await self._checkin_evaluator(evaluator)
+        finally:
+            self.rate_limit_manager.release(self.provider)
+    
+    async def _checkout_evaluator(self):
+        """Get an evaluator from the warm pool, or build and set one up."""
+        if self.evaluator_pool is not None:
+            return await self.evaluator_pool.checkout(self.model_config)
         
-        context_parts = []
-        for i, entry in enumerate(context_history):
-            context_parts.append(f"### Previous Response {i+1} ({entry['prompt_name']}):\n{entry['response']}")
+        evaluator = self.evaluator_factory(self.model_config)
         
-        return "\n\n".join(context_parts)
+        # IMPORTANT: Setup the evaluator before use
+        await evaluator.setup()
+        return evaluator
+    
+    async def _checkin_evaluator(self, evaluator):
+        """Return a pooled evaluator; unpooled evaluators are simply dropped."""
+        if self.evaluator_pool is not None:
+            await self.evaluator_pool.checkin(evaluator)
+    
+    def _estimate_prompt_tokens(self, evaluator, context: ConversationContext, prompt_text: str) -> int:
+        """Estimate prompt tokens using the evaluator's context manager."""
+        context_manager = getattr(evaluator, "context_manager", None)
+        if context_manager is None:
+            return 0
+        return context_manager.count_conversation_tokens(context, prompt_text)
     
     def get_current_state(self) -> Dict[str, Any]:
         """Get current state for monitoring."""
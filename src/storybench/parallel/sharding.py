@@ -0,0 +1,58 @@
+"""
+Multi-process sharding for parallel evaluations.
+
+Any number of processes - on one machine or on several hosts - can work on
+the same evaluation ID: each one schedules only the units it can claim from
+the shared task queue, so work is split without overlap and progress is
+merged into the same ``evaluations`` document. This module launches extra
+local shard processes and sizes each process's share of provider limits.
+"""
+
+import asyncio
+import logging
+import os
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Set in the environment of launched shard processes (1-based; the launcher is shard 0)
+SHARD_INDEX_ENV = "STORYBENCH_SHARD_INDEX"
+
+
+def default_rate_share(num_workers: int) -> float:
+    """Equal split of provider rate limits across cooperating processes."""
+    return 1.0 / max(1, num_workers)
+
+
+async def launch_local_shards(command: List[str],
+                              evaluation_id: str,
+                              num_workers: int,
+                              rate_share: float) -> List[asyncio.subprocess.Process]:
+    """
+    Start ``num_workers - 1`` shard processes joining ``evaluation_id``.
+
+    ``command`` is the launcher's own command line without the sharding
+    options; each shard runs it with ``--evaluation-id``, ``--workers 1`` and
+    ``--rate-share`` appended. The caller runs the remaining shard itself.
+    """
+    processes = []
+    for shard_index in range(1, num_workers):
+        argv = command + [
+            "--evaluation-id", evaluation_id,
+            "--workers", "1",
+            "--rate-share", f"{rate_share:.6f}"
+        ]
+        env = {**os.environ, SHARD_INDEX_ENV: str(shard_index)}
+        process = await asyncio.create_subprocess_exec(*argv, env=env)
+        logger.info(f"Launched shard {shard_index}/{num_workers - 1} (pid {process.pid}) for evaluation {evaluation_id}")
+        processes.append(process)
+    return processes
+
+
+async def wait_for_shards(processes: List[asyncio.subprocess.Process]) -> List[int]:
+    """Wait for launched shards and return their exit codes."""
+    return_codes = await asyncio.gather(*[process.wait() for process in processes])
+    for process, code in zip(processes, return_codes):
+        if code != 0:
+            logger.error(f"Shard process {process.pid} exited with code {code}")
+    return list(return_codes)
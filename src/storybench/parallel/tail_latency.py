@@ -0,0 +1,147 @@
+"""
+Tail-latency control: adaptive timeouts and hedged requests.
+
+Timeouts follow the observed latency of each (provider, model) instead of
+a fixed five minutes, so a stuck request frees its worker soon after it
+becomes an outlier. With hedging enabled, a request still running at the
+p95 gets a duplicate and whichever finishes first wins; hedges are capped
+to a fraction of all requests so they cannot amplify provider load.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict, deque
+from typing import Dict, Any, Optional, Callable, Awaitable, Deque, Tuple
+
+logger = logging.getLogger(__name__)
+
+LatencyKey = Tuple[str, str]  # (provider, model)
+
+
+class TailLatencyPolicy:
+    """Per-(provider, model) latency percentiles driving timeouts and hedging."""
+
+    def __init__(self,
+                 hedging: bool = False,
+                 min_timeout: float = 30.0,
+                 max_timeout: float = 300.0,
+                 timeout_percentile: float = 0.99,
+                 timeout_multiplier: float = 2.0,
+                 hedge_percentile: float = 0.95,
+                 max_hedge_fraction: float = 0.1,
+                 min_samples: int = 10,
+                 window: int = 100):
+        self.hedging = hedging
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.hedge_percentile = hedge_percentile
+        self.max_hedge_fraction = max_hedge_fraction
+        self.min_samples = min_samples
+
+        self.samples: Dict[LatencyKey, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self.requests = 0
+        self.hedges = 0
+
+    def record(self, provider: str, model: str, latency: float):
+        """Add an observed latency (timeouts are recorded at the timeout value)."""
+        self.samples[(provider, model)].append(latency)
+
+    def percentile(self, provider: str, model: str, q: float) -> Optional[float]:
+        """q-quantile of recent latencies, or None until ``min_samples`` are seen."""
+        samples = self.samples.get((provider, model))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def timeout_for(self, provider: str, model: str) -> float:
+        """Adaptive timeout: a multiple of the tail percentile, within bounds."""
+        tail = self.percentile(provider, model, self.timeout_percentile)
+        if tail is None:
+            return self.max_timeout
+        return max(self.min_timeout, min(self.max_timeout, tail * self.timeout_multiplier))
+
+    def begin_request(self, provider: str, model: str) -> Tuple[float, Optional[float]]:
+        """
+        Plan one request.
+
+        Returns:
+            (timeout, hedge delay) - the delay is None when hedging is off,
+            latency history is too short, or the hedge budget is used up
+        """
+        self.requests += 1
+        timeout = self.timeout_for(provider, model)
+        if not self.hedging or self.hedges >= self.max_hedge_fraction * self.requests:
+            return timeout, None
+        hedge_delay = self.percentile(provider, model, self.hedge_percentile)
+        if hedge_delay is None or hedge_delay >= timeout:
+            return timeout, None
+        return timeout, hedge_delay
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for logging/monitoring."""
+        return {
+            "hedging": self.hedging,
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "timeouts": {
+                f"{provider}/{model}": round(self.timeout_for(provider, model), 1)
+                for provider, model in self.samples
+            }
+        }
+
+
+async def race_with_hedge(primary: Callable[[], Awaitable[Any]],
+                          hedge: Callable[[], Awaitable[Any]],
+                          timeout: float,
+                          hedge_delay: Optional[float] = None) -> Tuple[Any, bool, bool]:
+    """
+    Await ``primary()``, starting ``hedge()`` if it runs past ``hedge_delay``.
+
+    The first call to succeed wins and the other is cancelled; if one fails
+    the other is still awaited. Everything is cancelled at ``timeout``.
+
+    Returns:
+        (result, hedged, hedge_won)
+
+    Raises:
+        asyncio.TimeoutError: Nothing succeeded within ``timeout``
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    primary_task = asyncio.ensure_future(primary())
+    pending = {primary_task}
+    hedge_task = None
+    last_error: Optional[BaseException] = None
+
+    try:
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                hedge_task = asyncio.ensure_future(hedge())
+                pending.add(hedge_task)
+
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), hedge_task is not None, task is hedge_task
+                last_error = task.exception()
+
+        if last_error is not None and not pending:
+            raise last_error
+        raise asyncio.TimeoutError(f"No response within {timeout:.0f}s")
+    finally:
+        for task in (primary_task, hedge_task):
+            if task is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # Mark the loser's failure as retrieved
@@ -0,0 +1,171 @@
+"""
+Lease-based task queue for crash-safe, resumable parallel evaluations.
+
+Every (model, sequence, run) unit of an evaluation is a document in the
+``evaluation_tasks`` collection. A worker claims a unit atomically before
+running it and keeps the lease alive with a heartbeat; if the process dies
+the lease expires and any later worker can reclaim the unit. Resuming an
+evaluation is simply claiming whatever is still claimable, so restart cost
+depends on the remaining work, not on the number of finished responses.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Dict, Any, List, Optional, Set, Tuple, Awaitable
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+UnitKey = Tuple[str, str, int]
+
+
+class EvaluationTaskQueue:
+    """Claims, heartbeats and settles evaluation tasks for one worker process."""
+
+    def __init__(self,
+                 task_repository,
+                 response_repository=None,
+                 evaluation_repository=None,
+                 owner: Optional[str] = None,
+                 lease_seconds: float = 300.0,
+                 max_attempts: int = 3):
+        self.task_repository = task_repository
+        self.response_repository = response_repository  # Used to clear partial runs on reclaim
+        self.evaluation_repository = evaluation_repository  # Keeps completed_tasks in step with cleared responses
+        self.owner = owner or self.default_owner()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        # Statistics
+        self.claimed = 0
+        self.reclaimed = 0
+        self.completed = 0
+        self.failed = 0
+        self.lost_leases = 0
+
+    @staticmethod
+    def default_owner() -> str:
+        """Unique lease owner id for this process."""
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def enqueue(self, evaluation_id: str, model_names: List[str],
+                      sequence_names: List[str], num_runs: int) -> int:
+        """Create task documents for an evaluation; existing tasks are left untouched."""
+        created = await self.task_repository.enqueue_tasks(
+            evaluation_id, model_names, sequence_names, num_runs
+        )
+        if created:
+            logger.info(f"Enqueued {created} tasks for evaluation {evaluation_id}")
+        return created
+
+    async def claimable_units(self, evaluation_id: str) -> Set[UnitKey]:
+        """Units that are neither completed, failed for good, nor leased by a live worker."""
+        tasks = await self.task_repository.find_claimable(evaluation_id)
+        return {(t["model_name"], t["sequence"], t["run"]) for t in tasks}
+
+    async def claim(self, evaluation_id: str, model_name: str, sequence: str, run: int):
+        """Lease one unit; returns None if another worker holds or finished it."""
+        task = await self.task_repository.claim_task(
+            evaluation_id, model_name, sequence, run, self.owner, self.lease_seconds
+        )
+        if task is None:
+            return None
+
+        self.claimed += 1
+        if task.attempts > 1:
+            # A previous attempt may have saved some prompts before dying; the run
+            # is re-executed from the start so its context chain stays consistent
+            self.reclaimed += 1
+            if self.response_repository is not None:
+                counted = 0
+                if self.evaluation_repository is not None and ObjectId.is_valid(evaluation_id):
+                    # Cut-off responses never counted as progress, so only completed ones are taken back
+                    counted = await self.response_repository.count_completed_for_run(
+                        evaluation_id, model_name, sequence, run
+                    )
+                deleted = await self.response_repository.delete_for_run(evaluation_id, model_name, sequence, run)
+                if deleted:
+                    logger.info(f"Cleared {deleted} partial responses for reclaimed task "
+                                f"{model_name}/{sequence}/run {run}")
+                if counted:
+                    await self.evaluation_repository.increment_progress(ObjectId(evaluation_id), -counted)
+        return task
+
+    async def run_leased(self, task, run: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Await a run while renewing its lease, then settle the task.
+
+        The task is completed only when the run answered every prompt
+        (``complete``); otherwise it is failed, which releases it for a retry
+        until ``max_attempts`` is reached. If the lease is lost to another
+        worker the run is cancelled at once and its result is reported as
+        skipped, so nothing more is saved or counted for a unit that now
+        belongs to the new owner.
+        """
+        run_task = asyncio.ensure_future(run)
+        heartbeat = asyncio.create_task(self._heartbeat(task, run_task))
+        try:
+            result = await run_task
+        except asyncio.CancelledError:
+            if not (heartbeat.done() and not heartbeat.cancelled() and heartbeat.result()):
+                raise
+            return self._lost_lease_result(task)
+        except Exception as e:
+            await self._settle_failed(task, str(e))
+            raise
+        finally:
+            heartbeat.cancel()
+
+        if result.get("complete", False):
+            if await self.task_repository.complete_task(task.id, self.owner):
+                self.completed += 1
+            else:
+                self.lost_leases += 1
+                logger.warning(f"Lease lost before completing task {task.model_name}/{task.sequence}/run {task.run}")
+                return self._lost_lease_result(task)
+        else:
+            # A run with missing prompts is released so it is cleared and rerun whole
+            await self._settle_failed(task, result.get("error") or "Run did not complete every prompt")
+        return result
+
+    @staticmethod
+    def _lost_lease_result(task) -> Dict[str, Any]:
+        """Run result for a unit whose lease passed to another worker; the new owner reruns it."""
+        return {"run_number": task.run, "completed_prompts": 0, "success": True,
+                "skipped": True, "lease_lost": True, "prompt_results": []}
+
+    async def _settle_failed(self, task, error_message: str):
+        self.failed += 1
+        await self.task_repository.fail_task(task.id, self.owner, error_message, self.max_attempts)
+
+    async def _heartbeat(self, task, run_task: asyncio.Future) -> bool:
+        """Renew the lease at a third of its duration until cancelled.
+
+        Returns True after cancelling ``run_task`` because the lease was lost.
+        """
+        interval = self.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.task_repository.renew_lease(task.id, self.owner, self.lease_seconds):
+                    self.lost_leases += 1
+                    logger.warning(f"Lease lost for task {task.model_name}/{task.sequence}/run {task.run}, "
+                                   f"cancelling the run")
+                    run_task.cancel()
+                    return True
+            except Exception as e:
+                logger.warning(f"Lease renewal failed for task {task.id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics for monitoring."""
+        return {
+            "owner": self.owner,
+            "claimed": self.claimed,
+            "reclaimed": self.reclaimed,
+            "completed": self.completed,
+            "failed": self.failed,
+            "lost_leases": self.lost_leases
+        }
@@ -2,7 +2,7 @@
 
 import logging
 import hashlib
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 from pathlib import Path
 
 try:
@@ -14,7 +14,9 @@ except ImportError:
         "pip install langchain-community langchain-core"
     )
 
+from .conversation_context import ConversationContext
 from .langchain_context_manager import ContextConfig, LangChainContextManager
+from .utils.tokenizers import tokenizer_registry
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +83,30 @@ class UnifiedContextManager(LangChainContextManager):
         logger.info(f"Context built successfully: {estimated_tokens}/{self.max_context_tokens} tokens")
         return final_context
     
+    def build_conversation(self, conversation: ConversationContext, current_prompt: str) -> str:
+        """
+        Render a conversation and the next prompt with strict limit enforcement.
+        
+        Only segments added since the last call are tokenized.
+        Raises ContextLimitExceededError if the context would exceed limits.
+        """
+        if not current_prompt:
+            raise ValueError("Current prompt cannot be empty")
+        
+        estimated_tokens = self.count_conversation_tokens(conversation, current_prompt)
+        final_context = conversation.render(current_prompt)
+        
+        if estimated_tokens > self.max_context_tokens:
+            raise ContextLimitExceededError(
+                f"Context exceeds limit: {estimated_tokens} tokens > {self.max_context_tokens} max. "
+                f"Context length: {len(final_context)} characters. "
+                f"Consider using a model with larger context window or reducing input size."
+            )
+        
+        logger.info(f"Context built successfully: {estimated_tokens}/{self.max_context_tokens} tokens "
+                    f"({conversation.turn_count} previous turns)")
+        return final_context
+    
     def check_context_size(self, text: str) -> Dict[str, Any]:
         """Check if text fits within context limits.
         
@@ -299,9 +325,8 @@ class UnifiedLlamaCppWrapper:
         
         logger.info(f"Initialized {name} with inherited context size: {n_ctx} tokens")
     
-    def __call__(self, prompt: str, **kwargs) -> str:
-        """Generate response to the given prompt."""
-        # Validate context size before generation
+    def _check_prompt_fits(self, prompt: str):
+        """Validate context size before generation."""
         size_info = self.context_manager.check_context_size(prompt)
         
         if not size_info["fits"]:
@@ -309,10 +334,19 @@ class UnifiedLlamaCppWrapper:
                 f"Input prompt exceeds model context limit: "
                 f"{size_info['estimated_tokens']} tokens > {size_info['max_tokens']} max"
             )
+    
+    def __call__(self, prompt: str, **kwargs) -> str:
+        """Generate response to the given prompt."""
+        self._check_prompt_fits(prompt)
         
         # Use the internal LlamaCpp instance
         return self._llm(prompt, **kwargs)
     
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Generate response to the given prompt, yielding text as it is produced."""
+        self._check_prompt_fits(prompt)
+        return self._llm.stream(prompt, **kwargs)
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model."""
         return {
@@ -326,6 +360,11 @@ class UnifiedLlamaCppWrapper:
         }
     
     # Expose commonly used properties from the internal LlamaCpp instance
+    @property
+    def client(self):
+        """The underlying llama_cpp.Llama instance."""
+        return self._llm.client
+    
     @property
     def n_ctx(self):
         return self._llm.n_ctx
@@ -382,6 +421,11 @@ def create_unified_system(
         **llm_kwargs
     )
     
+    # Count with the model's own tokenizer from here on
+    context_manager.set_token_counter(
+        tokenizer_registry.for_llama(llm_wrapper.client, Path(model_path).name)
+    )
+    
     logger.info(f"Created unified system: {max_context_tokens} tokens, no truncation")
     
     return context_manager, llm_wrapper
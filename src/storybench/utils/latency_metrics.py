@@ -0,0 +1,178 @@
+"""Latency histograms per stage, provider and model, with Prometheus text export."""
+
+import bisect
+import math
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+# Bucket upper bounds in seconds; covers sub-millisecond DB writes up to slow reasoning models
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0
+)
+
+# Stages of one prompt in a parallel evaluation
+STAGE_QUEUE_WAIT = "queue_wait"            # Unit submitted -> started by the scheduler
+STAGE_RATE_LIMIT_WAIT = "rate_limit_wait"  # Waiting for rate budget and a concurrency slot
+STAGE_GENERATION = "generation"            # Model call
+STAGE_FIRST_TOKEN = "first_token"          # Model call -> first streamed token
+STAGE_DB_WRITE = "db_write"                # Saving the response
+
+STAGES = (STAGE_QUEUE_WAIT, STAGE_RATE_LIMIT_WAIT, STAGE_GENERATION, STAGE_FIRST_TOKEN, STAGE_DB_WRITE)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRIC_NAME = "storybench_stage_latency_seconds"
+
+SeriesKey = Tuple[str, str, str]  # (stage, provider, model)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram; quantiles are interpolated within buckets like Prometheus does."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is the +Inf bucket
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        value = max(0.0, value)
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram with the same buckets into this one."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def cumulative_counts(self) -> List[int]:
+        """Counts per bucket bound, cumulative, ending with the +Inf total."""
+        running = 0
+        cumulative = []
+        for bucket_count in self.counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile (0..1), or None without observations."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    # +Inf bucket: the largest observation is the best bound we have
+                    return self.max
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = min(self.buckets[index], self.max)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (max(upper, lower) - lower) * fraction
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean and p50/p95/p99 for JSON monitoring output."""
+        result = {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "max": self.max if self.count else None
+        }
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}"] = self.quantile(q)
+        return result
+
+
+class LatencyMetrics:
+    """Registry of latency histograms keyed by (stage, provider, model)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms: Dict[SeriesKey, LatencyHistogram] = {}
+
+    def observe(self, stage: str, provider: str, model: str, seconds: float):
+        """Record one duration."""
+        key = (stage, provider or "unknown", model or "unknown")
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram(self.buckets)
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str, provider: str, model: str):
+        """Time the enclosed block, whether or not it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, provider, model, time.monotonic() - start)
+
+    def get_histogram(self, stage: str, provider: str, model: str) -> Optional[LatencyHistogram]:
+        return self.histograms.get((stage, provider, model))
+
+    def summary(self, stage: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Per-stage percentiles by provider and by ``provider/model``."""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        by_provider: Dict[Tuple[str, str], LatencyHistogram] = {}
+        for (series_stage, provider, model), histogram in sorted(self.histograms.items()):
+            if stage is not None and series_stage != stage:
+                continue
+            result.setdefault(series_stage, {})[f"{provider}/{model}"] = histogram.summary()
+            by_provider.setdefault((series_stage, provider), LatencyHistogram(self.buckets)).merge(histogram)
+        for (series_stage, provider), histogram in by_provider.items():
+            result[series_stage][provider] = histogram.summary()
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition (format 0.0.4) of every histogram."""
+        lines = [
+            f"# HELP {METRIC_NAME} Latency of evaluation stages per provider and model.",
+            f"# TYPE {METRIC_NAME} histogram"
+        ]
+        quantile_lines = []
+        for (stage, provider, model), histogram in sorted(self.histograms.items()):
+            labels = f'stage="{_escape(stage)}",provider="{_escape(provider)}",model="{_escape(model)}"'
+            cumulative = histogram.cumulative_counts()
+            for bound, count in zip(self.buckets, cumulative):
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{_format_value(bound)}"}} {count}')
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {cumulative[-1]}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {_format_value(histogram.sum)}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {histogram.count}")
+            for q in QUANTILES:
+                value = histogram.quantile(q)
+                if value is not None:
+                    quantile_lines.append(
+                        f'{METRIC_NAME}_quantile{{{labels},quantile="{q}"}} {_format_value(value)}'
+                    )
+
+        if quantile_lines:
+            lines.append(f"# HELP {METRIC_NAME}_quantile Bucket-interpolated p50/p95/p99 of evaluation stage latency.")
+            lines.append(f"# TYPE {METRIC_NAME}_quantile gauge")
+            lines.extend(quantile_lines)
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop all recorded observations."""
+        self.histograms.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value))
+
+
+# Global registry shared by the parallel runner, the web evaluation service and /metrics
+latency_metrics = LatencyMetrics()
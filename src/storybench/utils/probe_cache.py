@@ -0,0 +1,130 @@
+"""Shared, single-flight cache for provider connectivity probes."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+
+logger = logging.getLogger(__name__)
+
+ProbeKey = Tuple[str, str, str]
+
+
+@dataclass
+class ProbeEntry:
+    """A cached probe outcome."""
+    result: Any
+    expires_at: float
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """Short, non-reversible fingerprint of an API key for cache keys and logs."""
+    if not api_key:
+        return "no-key"
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+class ProbeCache:
+    """
+    Caches connectivity probe results per (provider, model, key fingerprint).
+
+    Concurrent callers for the same key await a single in-flight probe
+    instead of each firing their own request; the probe runs as its own
+    task, so cancelling any caller leaves it running for the rest. Successful results are kept
+    for ``ttl_seconds``; failures only for ``failure_ttl_seconds`` so a fixed
+    key or a recovered provider is noticed quickly. A probe that raises is
+    not cached and the exception is re-raised to every waiter.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, failure_ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self.failure_ttl_seconds = failure_ttl_seconds
+
+        self.entries: Dict[ProbeKey, ProbeEntry] = {}
+        self.in_flight: Dict[ProbeKey, asyncio.Future] = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def configure(self, ttl_seconds: Optional[float] = None, failure_ttl_seconds: Optional[float] = None):
+        """Change TTLs; existing entries keep their original expiry."""
+        if ttl_seconds is not None:
+            self.ttl_seconds = ttl_seconds
+        if failure_ttl_seconds is not None:
+            self.failure_ttl_seconds = failure_ttl_seconds
+
+    @staticmethod
+    def make_key(provider: str, model: str, api_key: Optional[str]) -> ProbeKey:
+        return (provider.lower(), model, key_fingerprint(api_key))
+
+    async def get_or_probe(self,
+                           provider: str,
+                           model: str,
+                           api_key: Optional[str],
+                           probe: Callable[[], Awaitable[Any]],
+                           is_success: Callable[[Any], bool] = bool) -> Any:
+        """
+        Return the cached probe result or run ``probe`` once for all waiters.
+
+        ``is_success`` decides which TTL applies to the result.
+        """
+        key = self.make_key(provider, model, api_key)
+
+        entry = self.entries.get(key)
+        if entry and entry.expires_at > time.monotonic():
+            self.hits += 1
+            return entry.result
+
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # The probe runs as its own task so no single caller owns it
+            task = asyncio.ensure_future(probe())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self._probe_finished(key, done, is_success))
+
+        # shield() so a cancelled caller, the first one included, only stops
+        # waiting and does not cancel the probe the other callers share
+        return await asyncio.shield(task)
+
+    def _probe_finished(self, key: ProbeKey, task: asyncio.Future, is_success: Callable[[Any], bool]):
+        """Cache a finished probe's result; exceptions are left uncached."""
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return  # exception() also marks it retrieved when nobody is waiting
+        result = task.result()
+        ttl = self.ttl_seconds if is_success(result) else self.failure_ttl_seconds
+        if ttl > 0:
+            self.entries[key] = ProbeEntry(result=result, expires_at=time.monotonic() + ttl)
+
+    def invalidate(self, provider: Optional[str] = None):
+        """Drop cached results for one provider, or all of them."""
+        if provider is None:
+            self.entries.clear()
+            return
+        for key in [k for k in self.entries if k[0] == provider.lower()]:
+            del self.entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for monitoring."""
+        now = time.monotonic()
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "failure_ttl_seconds": self.failure_ttl_seconds,
+            "cached_probes": sum(1 for e in self.entries.values() if e.expires_at > now),
+            "in_flight_probes": len(self.in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced
+        }
+
+
+# Global probe cache shared by evaluators, the web validation service and the CLI
+probe_cache = ProbeCache()
@@ -0,0 +1,333 @@
+"""Content-addressed cache for model responses."""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Call arguments that change how a request is sent, not what it generates
+NON_SAMPLING_KWARGS = frozenset({"timeout", "stream", "max_retries"})
+
+
+def make_cache_key(model: str,
+                   messages: List[Dict[str, Any]],
+                   params: Dict[str, Any],
+                   sample: Optional[Any] = None) -> str:
+    """
+    Hash of everything that determines a generation.
+
+    ``sample`` separates intentionally repeated requests (e.g. the variance
+    runs of a sequence) that would otherwise share one cached answer.
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "params": {k: v for k, v in params.items() if k not in NON_SAMPLING_KWARGS and v is not None},
+        "sample": sample
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses, keyed by ``make_cache_key`` digests."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored response, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any]):
+        """Store a response, evicting old entries when over the size limit."""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove one entry."""
+
+    @abstractmethod
+    async def clear(self):
+        """Remove every entry."""
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    One JSON file per entry under ``directory``.
+
+    File modification times double as last-use times: hits touch the file,
+    and eviction removes expired entries first, then the least recently
+    used until the cache is back under 90% of ``max_entries``/``max_bytes``.
+    Expiry always follows the ``stored_at`` time inside the entry, since
+    the modification time moves on every hit.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 max_entries: Optional[int] = 10000,
+                 max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+
+        self._entries: Optional[int] = None  # Counted lazily
+        self._bytes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        if self._expired(entry.get("stored_at", 0), time.time()):
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["value"]
+
+    def _write(self, key: str, value: Dict[str, Any]):
+        self._count()
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"stored_at": time.time(), "value": value}, default=str).encode("utf-8")
+        try:
+            old_size = path.stat().st_size
+            existed = True
+        except FileNotFoundError:
+            old_size = 0
+            existed = False
+
+        # Unique per call: concurrent writes of one key must not share a temporary file
+        tmp_path = path.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)  # Atomic, so readers never see half an entry
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        if not existed:
+            self._entries += 1
+        self._bytes += len(data) - old_size
+        if self._over_limit():
+            self._evict()
+
+    def _remove(self, path: Path) -> bool:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return False
+        if self._entries is not None:
+            self._entries -= 1
+            self._bytes -= size
+        return True
+
+    def _scan(self) -> List[Tuple[Path, os.stat_result]]:
+        return [(path, path.stat()) for path in self.directory.glob("*/*.json")]
+
+    def _count(self):
+        if self._entries is None:
+            files = self._scan()
+            self._entries = len(files)
+            self._bytes = sum(stat.st_size for _, stat in files)
+
+    def _over_limit(self, fraction: float = 1.0) -> bool:
+        return ((self.max_entries is not None and self._entries > self.max_entries * fraction) or
+                (self.max_bytes is not None and self._bytes > self.max_bytes * fraction))
+
+    def _stored_at(self, path: Path) -> float:
+        try:
+            return json.loads(path.read_text(encoding="utf-8")).get("stored_at", 0)
+        except (OSError, ValueError):
+            return 0  # Unreadable entries go first
+
+    def _evict(self):
+        now = time.time()
+        files = sorted(self._scan(), key=lambda item: item[1].st_mtime)
+        self._entries = len(files)
+        self._bytes = sum(stat.st_size for _, stat in files)
+
+        for path, stat in files:
+            # An entry is only opened for its stored_at when the size limits would keep it
+            if (not self._over_limit(0.9) and
+                    (self.ttl_seconds is None or not self._expired(self._stored_at(path), now))):
+                continue
+            if self._remove(path):
+                self.evictions += 1
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        await asyncio.to_thread(self._write, key, value)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._remove, self._path(key))
+
+    async def clear(self):
+        def _clear():
+            for path, _ in self._scan():
+                self._remove(path)
+            self._entries = 0
+            self._bytes = 0
+        await asyncio.to_thread(_clear)
+
+
+class MongoCacheBackend(CacheBackend):
+    """
+    Cache entries in a MongoDB collection, shared by every worker host.
+
+    Expiry uses a TTL index on ``expires_at`` (see ``ensure_indexes``), with
+    an explicit check on read because the TTL monitor only runs once a
+    minute. With ``max_entries`` set, the least recently used entries are
+    removed after each write that pushes the collection over the limit.
+    """
+
+    def __init__(self,
+                 database,
+                 collection_name: str = "response_cache",
+                 max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        self.collection = database[collection_name]
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0, background=True)
+        await self.collection.create_index("last_used_at", background=True)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        document = await self.collection.find_one_and_update(
+            {"_id": key, "$or": [{"expires_at": None}, {"expires_at": {"$gt": now}}]},
+            {"$set": {"last_used_at": now}}
+        )
+        return document["value"] if document else None
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl_seconds) if self.ttl_seconds is not None else None
+        await self.collection.replace_one(
+            {"_id": key},
+            {"_id": key, "value": json.loads(json.dumps(value, default=str)),
+             "created_at": now, "last_used_at": now, "expires_at": expires_at},
+            upsert=True
+        )
+        if self.max_entries is not None:
+            await self._evict()
+
+    async def _evict(self):
+        excess = await self.collection.count_documents({}) - self.max_entries
+        if excess <= 0:
+            return
+        oldest = self.collection.find({}, {"_id": 1}).sort("last_used_at", 1).limit(excess)
+        keys = [document["_id"] async for document in oldest]
+        result = await self.collection.delete_many({"_id": {"$in": keys}})
+        self.evictions += result.deleted_count
+
+    async def delete(self, key: str):
+        await self.collection.delete_one({"_id": key})
+
+    async def clear(self):
+        await self.collection.delete_many({})
+
+
+class ResponseCache:
+    """
+    Front for a cache backend with hit/miss accounting.
+
+    Without a backend the cache is disabled and every lookup misses, so
+    nothing is cached unless ``configure`` is called. Backend errors are
+    logged and treated as misses: the cache must never fail a generation.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.bypassed = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def configure(self, backend: Optional[CacheBackend]):
+        """Switch backends; None disables caching."""
+        self.backend = backend
+
+    async def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached response, or None."""
+        if self.backend is None:
+            return None
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    async def store(self, key: str, value: Dict[str, Any]):
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(key, value)
+            self.writes += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Response cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "bypassed": self.bypassed,
+            "errors": self.errors,
+            "evictions": getattr(self.backend, "evictions", 0)
+        }
+
+
+# Global response cache used by all evaluators (disabled until configured)
+response_cache = ResponseCache()
@@ -0,0 +1,253 @@
+"""Token counting with real tokenizers per provider/model family."""
+
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters per token when no tokenizer is available for a family. These are
+# starting points for English prose; CharRatioCounter.calibrate refines them
+# from the prompt token counts providers report.
+DEFAULT_CHARS_PER_TOKEN = 3.5
+FALLBACK_CHARS_PER_TOKEN = {
+    "anthropic": 3.5,
+    "google": 4.0,
+    "gemini": 4.0,
+    "deepinfra": 3.8,
+}
+
+# Separator that segments are split on; kept at the end of each segment so
+# merges with the preceding text are counted
+SEGMENT_SEPARATOR = "\n\n"
+
+
+class SegmentTokenCache:
+    """
+    LRU map from (tokenizer, segment hash) to token count.
+
+    A sequence prompt repeats the whole history on every turn, so counting
+    it segment by segment means only the newest segments are tokenized.
+    Shared across threads: local models count on their own thread.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(segment: str) -> str:
+        return hashlib.blake2b(segment.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, tokenizer: str, segment: str) -> Optional[int]:
+        key = (tokenizer, self._digest(segment))
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self._counts.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def set(self, tokenizer: str, segment: str, count: int):
+        key = (tokenizer, self._digest(segment))
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._counts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+# Global segment cache shared by every token counter
+segment_token_cache = SegmentTokenCache()
+
+
+class TokenCounter(ABC):
+    """Counts tokens for one tokenizer, memoizing counts per text segment."""
+
+    def __init__(self, name: str, cache: Optional[SegmentTokenCache] = None):
+        self.name = name
+        self.cache = cache if cache is not None else segment_token_cache
+
+    @abstractmethod
+    def _count_segment(self, segment: str) -> int:
+        """Tokenize one segment; called on cache misses only."""
+
+    def count(self, text: str) -> int:
+        """Token count of ``text``, summed over its cached segments."""
+        if not text:
+            return 0
+        segments = text.split(SEGMENT_SEPARATOR)
+        total = 0
+        for index, segment in enumerate(segments):
+            if index < len(segments) - 1:
+                segment += SEGMENT_SEPARATOR
+            if not segment:
+                continue
+            count = self.cache.get(self.name, segment)
+            if count is None:
+                count = self._count_segment(segment)
+                self.cache.set(self.name, segment, count)
+            total += count
+        return total
+
+
+class CharRatioCounter(TokenCounter):
+    """
+    Estimate from text length, for families without a local tokenizer.
+
+    Nothing is tokenized, so counts are not memoized.
+    """
+
+    # Weight of each observation when calibrating
+    CALIBRATION_WEIGHT = 0.2
+
+    def __init__(self, family: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        super().__init__(f"chars:{family}")
+        self.chars_per_token = chars_per_token
+        self.calibrations = 0
+
+    def _count_segment(self, segment: str) -> int:
+        return self.count(segment)
+
+    def count(self, text: str) -> int:
+        return int(len(text) / self.chars_per_token)
+
+    def calibrate(self, characters: int, actual_tokens: int):
+        """Move the ratio towards one the provider reported."""
+        if characters <= 0 or not actual_tokens:
+            return
+        observed = min(max(characters / actual_tokens, 1.0), 8.0)
+        self.chars_per_token += self.CALIBRATION_WEIGHT * (observed - self.chars_per_token)
+        self.calibrations += 1
+
+
+class TiktokenCounter(TokenCounter):
+    """
+    OpenAI BPE tokenizer.
+
+    The encoding is loaded on first use; tiktoken downloads it the first
+    time on a machine, so without network access this falls back to a
+    character estimate instead of failing the evaluation.
+    """
+
+    def __init__(self, encoding_name: str):
+        super().__init__(f"tiktoken:{encoding_name}")
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self._fallback: Optional[CharRatioCounter] = None
+        self._load_lock = threading.Lock()
+
+    def _get_encoding(self):
+        with self._load_lock:
+            if self._encoding is None and self._fallback is None:
+                try:
+                    import tiktoken
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+                except Exception as e:
+                    logger.warning(f"tiktoken encoding {self.encoding_name} unavailable, "
+                                   f"estimating from characters: {e}")
+                    self._fallback = CharRatioCounter(self.encoding_name)
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if self._get_encoding() is None:
+            return self._fallback.count(text)
+        return super().count(text)
+
+    def _count_segment(self, segment: str) -> int:
+        return len(self._encoding.encode(segment, disallowed_special=()))
+
+
+class LlamaTokenCounter(TokenCounter):
+    """Tokenizer embedded in a loaded GGUF model (llama_cpp.Llama)."""
+
+    def __init__(self, llama, model_id: str):
+        super().__init__(f"gguf:{model_id}")
+        self.llama = llama
+
+    def _count_segment(self, segment: str) -> int:
+        return len(self.llama.tokenize(segment.encode("utf-8"), add_bos=False, special=True))
+
+
+def _openai_encoding(model: str) -> str:
+    try:
+        from tiktoken.model import encoding_name_for_model
+        return encoding_name_for_model(model)
+    except (ImportError, KeyError):
+        return "o200k_base"  # Current OpenAI models
+
+
+class TokenizerRegistry:
+    """
+    Resolves the token counter for a provider/model family.
+
+    OpenAI models use tiktoken, local GGUF models use the tokenizer loaded
+    with the model, and other providers use a character ratio calibrated
+    from reported usage. Counters are shared, so calibration learned by one
+    evaluator benefits every evaluator of the same family.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, TokenCounter] = {}
+        self._lock = threading.Lock()
+
+    def _shared(self, key: str, factory) -> TokenCounter:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = factory()
+            return counter
+
+    def get_counter(self, provider: Optional[str] = None, model: Optional[str] = None) -> TokenCounter:
+        """Counter for an API model; without a provider, the default estimate."""
+        provider = (provider or "").lower()
+        model = model or ""
+        if provider == "openai" or (not provider and model.startswith(("gpt-", "o1", "o3", "o4"))):
+            encoding = _openai_encoding(model)
+            return self._shared(f"tiktoken:{encoding}", lambda: TiktokenCounter(encoding))
+
+        family = provider or "default"
+        ratio = FALLBACK_CHARS_PER_TOKEN.get(family, DEFAULT_CHARS_PER_TOKEN)
+        return self._shared(f"chars:{family}", lambda: CharRatioCounter(family, ratio))
+
+    def for_llama(self, llama, model_id: str) -> TokenCounter:
+        """Counter using a loaded model's own tokenizer."""
+        return LlamaTokenCounter(llama, model_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tokenizer statistics for monitoring."""
+        return {
+            "counters": {
+                key: {"chars_per_token": counter.chars_per_token, "calibrations": counter.calibrations}
+                if isinstance(counter, CharRatioCounter) else {}
+                for key, counter in self._counters.items()
+            },
+            "segment_cache": segment_token_cache.get_stats()
+        }
+
+
+# Global registry used by all context managers
+tokenizer_registry = TokenizerRegistry()
@@ -12,6 +12,7 @@ from sse_starlette.sse import EventSourceResponse
 
 from ..models.requests import ModelConfigRequest
 from ..services.local_model_service import LocalModelService
+from ...evaluators.model_registry import local_model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +114,19 @@ async def get_hardware_info(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/resident-models")
+async def get_resident_models():
+    """Get the local models kept loaded between evaluations."""
+    return local_model_registry.get_stats()
+
+
+@router.delete("/resident-models")
+async def unload_resident_models():
+    """Unload every resident model that is not in use."""
+    local_model_registry.clear()
+    return local_model_registry.get_stats()
+
+
 @router.post("/start")
 async def start_local_evaluation(
     config: Dict[str, Any],
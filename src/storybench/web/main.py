@@ -9,7 +9,7 @@ load_dotenv()
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from pathlib import Path
 from contextlib import asynccontextmanager
 # Make sure this import path is correct for your project structure
@@ -18,6 +18,7 @@ from .api import models, prompts, evaluations, results, validation, criteria, lo
 from .api import sse_database as sse
 from .api import sse_results
 from .services.background_evaluation_service import start_background_service, stop_background_service
+from storybench.utils.latency_metrics import latency_metrics
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -109,6 +110,12 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": "storybench-web"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint: per-provider/model latency histograms of evaluation stages."""
+    return PlainTextResponse(latency_metrics.render_prometheus(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Setup SSE callbacks for real-time updates
 from .api.sse import setup_sse_callbacks
 # Note: SSE callbacks now use dependency injection instead of global service
@@ -13,11 +13,17 @@ from ...database.connection import get_database
 from ...database.models import EvaluationStatus
 from ...database.services.evaluation_runner import DatabaseEvaluationRunner
 from ...database.services.sequence_evaluation_service import SequenceEvaluationService
+from ...database.services.judge_pipeline import JudgePipeline
 from ...database.repositories.criteria_repo import CriteriaRepository
 from ...evaluators.factory import EvaluatorFactory
+from ...models.config import ModelConfig
+from ...utils.latency_metrics import latency_metrics, STAGE_GENERATION, STAGE_DB_WRITE
 
 logger = logging.getLogger(__name__)
 
+# Judge model for the sequence evaluation that follows generation
+JUDGE_MODEL_NAME = "gpt-4"
+
 class BackgroundEvaluationService:
     """Background service that processes evaluations created by the web UI."""
     
@@ -137,12 +143,23 @@ class BackgroundEvaluationService:
             num_runs = 3  # Default number of runs
             completed_tasks = 0
             
-            # Update evaluation status to response generation phase
+            # Update evaluation status to response generation phase; progress starts
+            # from zero because the whole plan is generated, and save_response
+            # increments it from here
             await self.runner.evaluation_repo.update_by_id(
                 evaluation_id,
-                {"status": EvaluationStatus.GENERATING_RESPONSES}
+                {"status": EvaluationStatus.GENERATING_RESPONSES, "completed_tasks": 0}
             )
             
+            # Judge each sequence run as soon as its last response is saved, so judging
+            # overlaps generation; if the judge cannot start yet, everything is judged afterwards
+            prompt_counts = {name: len(prompts) for name, prompts in sequences.items()}
+            try:
+                judge_pipeline = await self._start_judge_pipeline(evaluation_id, api_keys, prompt_counts)
+            except Exception as e:
+                logger.warning(f"Judging will start after generation: {e}")
+                judge_pipeline = None
+            
             # Build complete response generation plan - ONE evaluation with ALL responses
             response_plan = []
             for model_name in models:
@@ -178,8 +195,7 @@ class BackgroundEvaluationService:
                     {
                         "current_model": model_name,
                         "current_sequence": sequence_name,
-                        "current_run": run,
-                        "completed_tasks": completed_tasks
+                        "current_run": run
                     }
                 )
                 
@@ -232,35 +248,51 @@ class BackgroundEvaluationService:
                 try:
                     logger.info(f"Generating response {completed_tasks + 1}/{total_responses}: {model_name}/{sequence_name}/run{run}/{prompt['name']}")
                     start_time = datetime.now()
-                    response_result = await evaluator.generate_response(prompt['text'])
+                    response_result = await evaluator.generate_response(prompt['text'], cache_sample=run)
                     end_time = datetime.now()
                     generation_time = (end_time - start_time).total_seconds()
+                    provider = evaluator.config.get("provider", "unknown")
+                    if response_result.get("cached"):
+                        # A hit's wall time is the lookup; keep the response's real generation time
+                        generation_time = response_result.get("cached_generation_time") or generation_time
+                    else:
+                        latency_metrics.observe(STAGE_GENERATION, provider, model_name, generation_time)
                     
                     # Extract response text from the result dict
                     response_text = response_result.get("response", "")
+                    # A cut-off stream is stored as PARTIAL and is not counted, judged or used as context
+                    interrupted = response_result.get("interrupted") if response_result.get("partial") else None
                     
                     # Save the response to database - ALL responses belong to the SAME evaluation
-                    await self.runner.save_response(
-                        evaluation_id=str(evaluation_id),  # Convert ObjectId to string
-                        model_name=model_name,
-                        sequence=sequence_name,
-                        run=run,
-                        prompt_index=prompt_index,
-                        prompt_name=prompt["name"],
-                        prompt_text=prompt["text"],
-                        response_text=response_text,
-                        generation_time=generation_time
-                    )
+                    with latency_metrics.time(STAGE_DB_WRITE, provider, model_name):
+                        await self.runner.save_response(
+                            evaluation_id=str(evaluation_id),  # Convert ObjectId to string
+                            model_name=model_name,
+                            sequence=sequence_name,
+                            run=run,
+                            prompt_index=prompt_index,
+                            prompt_name=prompt["name"],
+                            prompt_text=prompt["text"],
+                            response_text=response_text,
+                            generation_time=generation_time,
+                            interrupted=interrupted
+                        )
+                    if interrupted:
+                        logger.warning(f"Response cut short ({interrupted}), stored as partial")
+                        continue
                     any_responses_generated = True
                     completed_tasks += 1
+                    if judge_pipeline and prompt_index == len(sequences[sequence_name]) - 1:
+                        # Earlier prompts of this run may have failed or been cut short
+                        run_completed = await self.runner.response_repo.count_completed_for_run(
+                            str(evaluation_id), model_name, sequence_name, run)
+                        if run_completed == len(sequences[sequence_name]):
+                            judge_pipeline.submit(model_name, sequence_name, run)
+                        else:
+                            logger.warning(f"Not judging {model_name}/{sequence_name}/run{run}: "
+                                           f"{run_completed}/{len(sequences[sequence_name])} prompts completed")
                     logger.info(f"Generated response ({generation_time:.1f}s) - Progress: {completed_tasks}/{total_responses}")
                     
-                    # Update evaluation progress
-                    await self.runner.evaluation_repo.update_by_id(
-                        evaluation_id,
-                        {"completed_tasks": completed_tasks}
-                    )
-                    
                     # Add delay to be nice to APIs
                     await asyncio.sleep(1)
                     
@@ -277,6 +309,9 @@ class BackgroundEvaluationService:
                     except Exception as e:
                         logger.warning(f"Error cleaning up evaluator for {model_name}: {e}")
             
+            # Write the progress increments save_response has batched so far
+            await self.runner.flush_progress()
+            
             # Summary of response generation phase
             logger.info(f"Response generation completed for evaluation {evaluation_id}")
             logger.info(f"✅ Generated {completed_tasks}/{total_responses} responses successfully")
@@ -318,9 +353,6 @@ class BackgroundEvaluationService:
                 await self.runner.mark_evaluation_failed(evaluation_id, "OPENAI_API_KEY not found for LLM evaluation")
                 return
             
-            # Initialize sequence evaluation service
-            sequence_eval_service = SequenceEvaluationService(self.database, openai_api_key)
-            
             # Check if we have active criteria
             criteria_repo = CriteriaRepository(self.database)
             active_criteria = await criteria_repo.find_active()
@@ -332,10 +364,14 @@ class BackgroundEvaluationService:
             
             logger.info(f"Using criteria version {active_criteria.version}")
             
-            # Run sequence-aware evaluations
+            # Wait for pipelined judging and judge whatever was not pipelined
             try:
-                eval_results = await sequence_eval_service.evaluate_all_sequences()
+                if judge_pipeline is None:
+                    judge_pipeline = await self._start_judge_pipeline(evaluation_id, api_keys, prompt_counts)
+                eval_results = await judge_pipeline.finish()
                 logger.info(f"LLM evaluation complete - Sequences evaluated: {eval_results['sequences_evaluated']}, Total evaluations: {eval_results['total_evaluations_created']}")
+                if eval_results.get('incomplete_runs'):
+                    logger.warning(f"{len(eval_results['incomplete_runs'])} incomplete runs were not judged")
                 
                 if eval_results.get('errors'):
                     logger.warning(f"LLM evaluation had {len(eval_results['errors'])} errors")
@@ -355,6 +391,22 @@ class BackgroundEvaluationService:
             logger.error(f"Error processing evaluation {evaluation.id}: {e}")
             await self.runner.mark_evaluation_failed(evaluation.id, str(e))
     
+    async def _start_judge_pipeline(self, evaluation_id, api_keys: Dict[str, str],
+                                    prompt_counts: Optional[Dict[str, int]] = None) -> JudgePipeline:
+        """Set up the sequence judge for this evaluation and start its pipeline."""
+        judge_config = ModelConfig(name=JUDGE_MODEL_NAME, type="api", provider="openai", model_name=JUDGE_MODEL_NAME)
+        # Judge calls count against the same provider limits as generation
+        parallel_runner = getattr(self.runner, "parallel_runner", None)
+        sequence_eval_service = SequenceEvaluationService(
+            self.database, judge_config, api_keys,
+            rate_limit_manager=parallel_runner.rate_limit_manager if parallel_runner else None
+        )
+        await sequence_eval_service.initialize()
+        
+        judge_pipeline = JudgePipeline(sequence_eval_service, evaluation_id, prompt_counts)
+        await judge_pipeline.start()
+        return judge_pipeline
+    
     def _get_api_keys(self) -> Dict[str, str]:
         """Get API keys from environment variables."""
         api_keys = {}
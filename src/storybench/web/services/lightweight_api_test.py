@@ -5,6 +5,11 @@ import asyncio
 import time
 from typing import Dict, Optional, Tuple
 
+from ...utils.probe_cache import probe_cache
+
+# Probe cache model name for key-level (not model-level) lightweight checks
+LIGHTWEIGHT_PROBE_MODEL = "lightweight"
+
 
 class LightweightAPITester:
     """Lightweight API tester that doesn't require full model setup."""
@@ -162,8 +167,27 @@ class LightweightAPITester:
             return False, str(e), latency
     
     @staticmethod
-    async def test_provider(provider: str, api_key: str) -> Tuple[bool, Optional[str], Optional[float]]:
-        """Test any supported provider."""
+    async def test_provider(provider: str, api_key: str,
+                            use_cache: bool = True) -> Tuple[bool, Optional[str], Optional[float]]:
+        """Test any supported provider.
+        
+        Results are shared through the global probe cache, so repeated
+        validations of the same key reuse one recent check.
+        """
+        if not use_cache:
+            return await LightweightAPITester._test_provider_uncached(provider, api_key)
+        
+        return await probe_cache.get_or_probe(
+            provider,
+            LIGHTWEIGHT_PROBE_MODEL,
+            api_key,
+            lambda: LightweightAPITester._test_provider_uncached(provider, api_key),
+            is_success=lambda result: result[0]
+        )
+    
+    @staticmethod
+    async def _test_provider_uncached(provider: str, api_key: str) -> Tuple[bool, Optional[str], Optional[float]]:
+        """Run the provider-specific test without consulting the cache."""
         if provider == "openai":
             return await LightweightAPITester.test_openai(api_key)
         elif provider == "anthropic":
@@ -14,6 +14,7 @@ from ..models.requests import ModelConfigRequest
 
 # Import evaluators using relative imports to avoid module not found errors
 from ...evaluators.local_evaluator import LocalEvaluator
+from ...evaluators.model_registry import local_model_registry
 from ...evaluators.api_evaluator import APIEvaluator
 from ...evaluators.factory import EvaluatorFactory
 
@@ -280,6 +281,10 @@ class LocalModelService:
             
         self._send_output(f"Starting evaluation with {len(selected_sequences)} sequences", "info")
         
+        # Loaded models stay resident between evaluations, within this RAM budget
+        if settings.get("ram_budget_gb"):
+            local_model_registry.configure(int(settings["ram_budget_gb"] * 1024 ** 3))
+        
         # Create generation model
         gen_model_name = f"local_{generation_model['filename']}"
         gen_model_config = {
@@ -350,6 +355,8 @@ class LocalModelService:
                 for run_idx in range(settings.get("num_runs", 1)):
                     self._send_output(f"Run {run_idx + 1}/{settings.get('num_runs', 1)}", "info")
                     
+                    # Each run starts from an empty KV cache; turns within it reuse the prefix
+                    generation_evaluator.reset_context()
                     responses = []
                     context = ""
                     
@@ -466,7 +473,7 @@ class LocalModelService:
                                 )
                                 
                                 try:
-                                    created_response = await response_repo.create(response_obj) 
+                                    created_response = await response_repo.insert(response_obj)
                                     self._send_output(f"Response saved: {response_data['prompt_name']}", "info")
                                 except Exception as resp_error:
                                     self._send_output(f"Error saving response: {str(resp_error)}", "error")
@@ -578,7 +585,7 @@ class LocalModelService:
                                                 criteria_results=criteria_results
                                             )
                                             
-                                            await eval_repo.create(eval_obj)
+                                            await eval_repo.insert(eval_obj)
                                             
                                         self._send_output(f"Evaluated response for {response_data['prompt_name']}", "info")
                                         
@@ -6,13 +6,61 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 import asyncio
+import importlib.util
 import os
+import sys
 from dotenv import load_dotenv
 from datetime import datetime
 
 # Load environment variables from .env file
 load_dotenv()
 
+# The local evaluator and the web hardware services import torch at load time;
+# where it is not installed, one stub serves the whole session so test modules
+# import them normally and never unload anything
+if importlib.util.find_spec("torch") is None:
+    sys.modules["torch"] = MagicMock()
+
+
+class PassthroughContextManager:
+    """UnifiedContextManager double that renders contexts without tokenizing or enforcing limits."""
+
+    max_context_tokens = 32000
+
+    def build_conversation(self, conversation, current_prompt):
+        return conversation.render(current_prompt)
+
+    def get_conversation_stats(self, conversation, prompt):
+        estimated_tokens = len(conversation.render(prompt)) // 4
+        return {"estimated_tokens": estimated_tokens, "max_tokens": self.max_context_tokens,
+                "token_utilization": estimated_tokens / self.max_context_tokens}
+
+    def calibrate_tokens(self, text, actual_tokens):
+        pass
+
+    def validate_context_size_strict(self, prompt, label):
+        return {}
+
+    def get_context_analytics(self, prompt):
+        return {"prompt_hash": "h", "estimated_tokens": 1, "max_tokens": self.max_context_tokens,
+                "utilization_percent": 0.0}
+
+
+@pytest.fixture
+def passthrough_context_manager():
+    """A context manager double for evaluators under test."""
+    return PassthroughContextManager()
+
+
+@pytest.fixture
+def make_evaluator(passthrough_context_manager):
+    """Build ``evaluator_class(*args, **kwargs)`` with the passthrough context manager."""
+    def make(evaluator_class, *args, **kwargs):
+        with patch("storybench.evaluators.base.UnifiedContextManager",
+                   return_value=passthrough_context_manager):
+            return evaluator_class(*args, **kwargs)
+    return make
+
 async def seed_test_data(database):
     """Seed the test database with basic configuration data."""
     from storybench.database.services.config_service import ConfigService
@@ -0,0 +1,91 @@
+"""Tests for judge pipelining in the web background evaluation loop."""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mongomock_motor import AsyncMongoMockClient
+from storybench.database.models import Evaluation, EvaluationCriteria, EvaluationCriterionItem, GlobalSettings
+
+with patch.dict(os.environ, {'ENCRYPTION_KEY': 'a' * 32}):
+    from storybench.web.services import background_evaluation_service
+
+
+class MiddlePromptFailure:
+    """Evaluator double whose second prompt fails on the first run."""
+
+    config = {"provider": "openai"}
+
+    async def setup(self):
+        return True
+
+    async def cleanup(self):
+        pass
+
+    async def generate_response(self, prompt, cache_sample=None, **kwargs):
+        if prompt == "Write 1" and cache_sample == 1:
+            raise RuntimeError("provider error")
+        return {"response": f"answer to {prompt}"}
+
+
+async def process_evaluation(monkeypatch):
+    """Run the background loop over one evaluation of 3 runs x 3 prompts; returns its service, id and judge."""
+    database = AsyncMongoMockClient()["storybench_test"]
+    await database.evaluation_criteria.insert_one(EvaluationCriteria(config_hash="abc", criteria={
+        "creativity": EvaluationCriterionItem(name="creativity", description="Original ideas")
+    }).model_dump(by_alias=True))
+    service = background_evaluation_service.BackgroundEvaluationService(database)
+    evaluation = await service.runner.evaluation_repo.create(Evaluation(
+        config_hash="abc", models=["model-a"], global_settings=GlobalSettings(), total_tasks=9))
+
+    prompts = [SimpleNamespace(name=f"Prompt {i}", text=f"Write {i}") for i in range(3)]
+    directus = MagicMock()
+    directus.return_value.fetch_prompts = AsyncMock(
+        return_value=SimpleNamespace(sequences={"FilmNarrative": prompts}, version=1))
+    config_service = MagicMock()
+    config_service.get_active_models = AsyncMock(return_value=SimpleNamespace(models=[
+        SimpleNamespace(name="model-a", type="api", provider="openai", model_name="gpt-4o")]))
+    pipeline = MagicMock()
+    pipeline.finish = AsyncMock(return_value={"sequences_evaluated": 2, "total_evaluations_created": 6,
+                                              "errors": [], "incomplete_runs": []})
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    monkeypatch.setattr(background_evaluation_service, "config_service", config_service, raising=False)
+    monkeypatch.setattr(service, "_start_judge_pipeline", AsyncMock(return_value=pipeline))
+
+    with patch("storybench.clients.directus_client.DirectusClient", directus), \
+            patch.object(background_evaluation_service.EvaluatorFactory, "create_evaluator",
+                         return_value=MiddlePromptFailure()), \
+            patch.object(background_evaluation_service.asyncio, "sleep", AsyncMock()):
+        await service._process_evaluation(evaluation)
+
+    return service, evaluation.id, pipeline
+
+
+class TestBackgroundPipelining:
+    """The background loop submits a run for judging only when every prompt completed."""
+
+    @pytest.mark.asyncio
+    async def test_run_with_a_failed_middle_prompt_is_not_submitted(self, monkeypatch):
+        service, _, pipeline = await process_evaluation(monkeypatch)
+
+        submitted = [call.args for call in pipeline.submit.call_args_list]
+        assert submitted == [("model-a", "FilmNarrative", 2), ("model-a", "FilmNarrative", 3)]
+        assert service._start_judge_pipeline.call_args.args[2] == {"FilmNarrative": 3}
+        pipeline.finish.assert_awaited_once()
+
+
+class TestBackgroundProgress:
+    """Progress comes only from the runner's batched increments, all flushed by the end."""
+
+    @pytest.mark.asyncio
+    async def test_completed_tasks_counts_each_saved_response_once(self, monkeypatch):
+        service, evaluation_id, _ = await process_evaluation(monkeypatch)
+
+        evaluation = await service.runner.evaluation_repo.find_by_id(evaluation_id)
+        assert evaluation.completed_tasks == 8
+        assert service.runner._batch_updates == []
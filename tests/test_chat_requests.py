@@ -0,0 +1,87 @@
+"""Tests for chat-turn requests and provider prompt caching."""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators.litellm_evaluator import LiteLLMEvaluator
+from storybench.conversation_context import ConversationContext
+
+
+@pytest.fixture
+def chat_evaluator(make_evaluator):
+    """Build a LiteLLM evaluator for ``provider``/``model_name``."""
+    def make(provider="anthropic", model_name="claude-sonnet-4", **config):
+        return make_evaluator(LiteLLMEvaluator, "test-model",
+                              {"provider": provider, "model_name": model_name, **config}, {provider: "key"})
+    return make
+
+
+def completion(text, **usage):
+    usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=100, total_tokens=2100, **usage)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=usage)
+
+
+def run_context() -> ConversationContext:
+    context = ConversationContext()
+    context.add_turn("Prompt one", "Answer one")
+    context.add_turn("Prompt two", "Answer two")
+    return context
+
+
+class TestChatRequests:
+    """Prior turns as messages, with cache breakpoints where the provider needs them."""
+
+    @pytest.mark.asyncio
+    async def test_anthropic_chat_mode_marks_prefix_and_reports_cache_reads(self, chat_evaluator):
+        evaluator = chat_evaluator(request_mode="chat")
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   return_value=completion("Answer three", cache_read_input_tokens=1800,
+                                           cache_creation_input_tokens=150)) as mock_completion:
+            result = await evaluator.generate_response("Prompt three", context=run_context(), use_cache=False)
+
+        messages = mock_completion.call_args.kwargs["messages"]
+        assert [m["role"] for m in messages] == ["user", "assistant", "user", "assistant", "user"]
+        marked = [i for i, m in enumerate(messages) if isinstance(m["content"], list)]
+        assert marked == [2, 4]
+        assert messages[4]["content"][0] == {"type": "text", "text": "Prompt three",
+                                             "cache_control": {"type": "ephemeral"}}
+        assert result["usage"]["cached_tokens"] == 1800
+        assert result["usage"]["cache_creation_tokens"] == 150
+        assert evaluator.total_cached_tokens == 1800
+
+    @pytest.mark.asyncio
+    async def test_automatic_caching_providers_get_plain_messages(self, chat_evaluator):
+        evaluator = chat_evaluator(provider="openai", model_name="gpt-4o", request_mode="chat")
+        details = SimpleNamespace(cached_tokens=1536)
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   return_value=completion("Answer three", prompt_tokens_details=details)) as mock_completion:
+            result = await evaluator.generate_response("Prompt three", context=run_context(), use_cache=False)
+
+        messages = mock_completion.call_args.kwargs["messages"]
+        assert all(isinstance(m["content"], str) for m in messages)
+        assert result["usage"]["cached_tokens"] == 1536
+
+    @pytest.mark.asyncio
+    async def test_flat_mode_is_the_default(self, chat_evaluator):
+        evaluator = chat_evaluator()
+        context = run_context()
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   return_value=completion("Answer three")) as mock_completion:
+            result = await evaluator.generate_response("Prompt three", context=context, use_cache=False)
+
+        assert mock_completion.call_args.kwargs["messages"] == [
+            {"role": "user", "content": context.render("Prompt three")}
+        ]
+        assert result["usage"]["cached_tokens"] == 0
+
+    def test_unknown_mode_rejected(self, chat_evaluator):
+        with pytest.raises(ValueError, match="request_mode"):
+            chat_evaluator(request_mode="turns")
@@ -0,0 +1,70 @@
+"""Tests for concurrent judging under provider rate limits."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.database.services.concurrent_judging import ConcurrentJudge
+from storybench.parallel.rate_limiting import RateLimitManager
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class TestConcurrentJudge:
+    """Bounded concurrency, failure isolation and ordered outcomes."""
+
+    @pytest.mark.asyncio
+    async def test_calls_overlap_up_to_the_provider_window(self):
+        manager = RateLimitManager()
+        in_flight = peak = 0
+
+        async def judge(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [item]
+
+        outcomes = await ConcurrentJudge("openai", manager).run(list(range(30)), judge)
+
+        assert peak == manager.PROVIDER_LIMITS["openai"].max_concurrent
+        assert [outcome.item for outcome in outcomes] == list(range(30))
+        assert all(outcome.succeeded for outcome in outcomes)
+        assert manager.concurrency_limiters["openai"].in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated_and_shrink_the_window(self):
+        manager = RateLimitManager()
+
+        async def judge(item):
+            if item == 2:
+                raise RateLimitError("429 Too Many Requests")
+            return [item]
+
+        outcomes = await ConcurrentJudge("anthropic", manager).run([1, 2, 3], judge)
+
+        assert [outcome.succeeded for outcome in outcomes] == [True, False, True]
+        assert isinstance(outcomes[1].error, RateLimitError)
+        assert manager.concurrency_limiters["anthropic"].rate_limit_errors == 1
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent_caps_below_the_window(self):
+        in_flight = peak = 0
+
+        async def judge(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            return [item]
+
+        await ConcurrentJudge("local", max_concurrent=1).run(list(range(5)), judge)
+
+        assert peak == 1
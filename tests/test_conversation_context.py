@@ -0,0 +1,91 @@
+"""Tests for the segment-based conversation context."""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators.litellm_evaluator import LiteLLMEvaluator
+from storybench.conversation_context import ConversationContext
+
+
+class CountingWordCounter:
+    """Token counter double: one token per word, recording what it counts."""
+
+    name = "words"
+
+    def __init__(self):
+        self.counted = []
+
+    def count(self, text):
+        self.counted.append(text)
+        return len(text.split())
+
+
+def two_turns() -> ConversationContext:
+    context = ConversationContext()
+    context.add_turn("First prompt", "First answer here", name="p1")
+    context.add_turn("Second prompt", "Second answer", name="p2")
+    return context
+
+
+class TestConversationContext:
+    """Rendering and cached token counts."""
+
+    def test_flat_rendering(self):
+        context = two_turns()
+        assert context.render("Third prompt") == ("First prompt\n\nFirst answer here\n\n---\n\n"
+                                                  "Second prompt\n\nSecond answer\n\n---\n\nThird prompt")
+        assert ConversationContext().render("Only prompt") == "Only prompt"
+        assert context.turn_count == 2
+
+    def test_chat_messages(self):
+        messages = two_turns().to_messages("Third prompt")
+        assert [m["role"] for m in messages] == ["user", "assistant", "user", "assistant", "user"]
+        assert messages[-1]["content"] == "Third prompt"
+
+    def test_token_count_matches_rendering_and_only_counts_new_segments(self):
+        counter = CountingWordCounter()
+        context = two_turns()
+
+        assert context.token_count(counter, "Third prompt") == len(context.render("Third prompt").split())
+
+        counter.counted.clear()
+        context.add_turn("Third prompt", "Third answer")
+        context.token_count(counter, "Fourth prompt")
+
+        assert "First answer here" not in counter.counted
+        assert "Third answer" in counter.counted
+
+    def test_clear(self):
+        context = two_turns()
+        context.clear()
+        assert len(context) == 0
+        assert context.render() == ""
+
+
+def completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=None)
+
+
+class TestEvaluatorContext:
+    """A caller's context is used as given; the evaluator's own history is separate."""
+
+    @pytest.mark.asyncio
+    async def test_passed_context_is_sent_but_not_modified(self, make_evaluator):
+        evaluator = make_evaluator(LiteLLMEvaluator, "gpt-test", {"provider": "openai", "model_name": "gpt-4o"},
+                                   {"openai": "sk-test"})
+        context = two_turns()
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   return_value=completion("Third answer")) as mock_completion:
+            await evaluator.generate_response("Third prompt", context=context, use_cache=False)
+            sent = mock_completion.call_args.kwargs["messages"][0]["content"]
+            await evaluator.generate_response("Own prompt", use_cache=False)
+
+        assert sent == context.render("Third prompt")
+        assert context.turn_count == 2  # The caller records the turn
+        assert evaluator.generation_history == "Own prompt\n\nThird answer"
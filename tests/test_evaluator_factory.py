@@ -12,12 +12,25 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 # Mock the problematic dependencies before importing
+_STUBBED_MODULES = ('storybench.unified_context_system', 'storybench.langchain_context_manager')
+_original_modules = {name: sys.modules.get(name) for name in _STUBBED_MODULES}
 sys.modules['storybench.unified_context_system'] = MagicMock()
 sys.modules['storybench.langchain_context_manager'] = MagicMock()
 
 from storybench.evaluators.factory import EvaluatorFactory
 
 
+@pytest.fixture(scope="module", autouse=True)
+def restore_stubbed_modules():
+    """Put back the two stubbed modules once this module's tests are done."""
+    yield
+    for name, module in _original_modules.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+
 class TestEvaluatorFactory:
     """Test the EvaluatorFactory class."""
     
@@ -0,0 +1,158 @@
+"""Tests for the warm evaluator pool."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.parallel import EvaluatorPool, ParallelSequenceEvaluationRunner
+
+
+class CountingEvaluator:
+    """Evaluator double that counts lifecycle calls."""
+
+    def __init__(self, model_config, setup_result=True):
+        self.model_config = model_config
+        self.setup_result = setup_result
+        self.setup_calls = 0
+        self.reset_calls = 0
+        self.cleanup_calls = 0
+        self.history = []
+
+    async def setup(self):
+        self.setup_calls += 1
+        if isinstance(self.setup_result, Exception):
+            raise self.setup_result
+        return self.setup_result
+
+    def reset_context(self):
+        self.reset_calls += 1
+        self.history = []
+
+    async def cleanup(self):
+        self.cleanup_calls += 1
+
+    async def generate_response(self, prompt: str, **kwargs):
+        self.history.append(prompt)
+        await asyncio.sleep(0.005)
+        return {"response": f"Response {len(self.history)}", "generation_time": 0.005}
+
+
+class MockEvaluationRunner:
+    """Collects saved responses in memory."""
+
+    async def save_response(self, **kwargs):
+        pass
+
+
+MODEL = {"name": "gpt-a", "model_id": "gpt-a"}
+
+
+class TestEvaluatorPool:
+    """Test evaluator reuse and lifecycle."""
+
+    def setup_method(self):
+        self.created = []
+
+    def factory(self, model_config):
+        evaluator = CountingEvaluator(model_config)
+        self.created.append(evaluator)
+        return evaluator
+
+    @pytest.mark.asyncio
+    async def test_checkin_makes_evaluator_reusable(self):
+        """Sequential checkouts reuse one set-up evaluator."""
+        pool = EvaluatorPool(self.factory)
+
+        for _ in range(3):
+            async with pool.lease(MODEL) as evaluator:
+                await evaluator.generate_response("prompt")
+
+        assert len(self.created) == 1
+        assert self.created[0].setup_calls == 1
+        assert pool.get_stats()["evaluators_reused"] == 2
+
+    @pytest.mark.asyncio
+    async def test_context_reset_on_checkout(self):
+        """A reused evaluator carries no history from the previous run."""
+        pool = EvaluatorPool(self.factory)
+
+        evaluator = await pool.checkout(MODEL)
+        await evaluator.generate_response("first run")
+        await pool.checkin(evaluator)
+
+        reused = await pool.checkout(MODEL)
+        assert reused is evaluator
+        assert reused.history == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checkouts_get_distinct_evaluators(self):
+        """Evaluators are never shared by two borrowers at once."""
+        pool = EvaluatorPool(self.factory)
+
+        first = await pool.checkout(MODEL)
+        second = await pool.checkout(MODEL)
+        other_model = await pool.checkout({"name": "claude-a", "model_id": "claude-a"})
+
+        assert len({id(first), id(second), id(other_model)}) == 3
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cleans_up_once(self):
+        """Every pooled evaluator is cleaned up exactly once."""
+        pool = EvaluatorPool(self.factory)
+        first = await pool.checkout(MODEL)
+        second = await pool.checkout(MODEL)
+        await pool.checkin(first)
+
+        await pool.shutdown()
+        await pool.shutdown()
+        await pool.checkin(second)
+
+        assert [e.cleanup_calls for e in self.created] == [1, 1]
+        with pytest.raises(RuntimeError):
+            await pool.checkout(MODEL)
+
+    @pytest.mark.asyncio
+    async def test_setup_failure_raises(self):
+        """An evaluator that fails setup is cleaned up and never pooled."""
+        pool = EvaluatorPool(lambda config: CountingEvaluator(config, setup_result=False))
+
+        with pytest.raises(RuntimeError, match="setup failed"):
+            await pool.checkout(MODEL)
+
+        assert pool.get_stats()["setup_failures"] == 1
+        assert pool.get_stats()["idle_evaluators"] == 0
+
+    @pytest.mark.asyncio
+    async def test_setup_exception_cleans_up(self):
+        """An evaluator whose setup raises is cleaned up before the error propagates."""
+        created = []
+
+        def factory(config):
+            created.append(CountingEvaluator(config, setup_result=ConnectionError("provider down")))
+            return created[-1]
+
+        pool = EvaluatorPool(factory)
+
+        with pytest.raises(ConnectionError, match="provider down"):
+            await pool.checkout(MODEL)
+
+        assert created[0].cleanup_calls == 1
+        assert pool.get_stats()["setup_failures"] == 1
+        assert pool.get_stats()["evaluators_created"] == 0
+
+    @pytest.mark.asyncio
+    async def test_runner_sets_up_evaluators_once_per_slot(self):
+        """A parallel evaluation builds far fewer evaluators than runs."""
+        runner = ParallelSequenceEvaluationRunner(None, MockEvaluationRunner(), max_concurrent_sequences=1)
+        sequences = {f"seq{i}": [{"name": "p", "text": "Prompt"}] for i in range(3)}
+
+        results = await runner.run_parallel_evaluation("e", [MODEL], sequences, 3, self.factory)
+
+        assert results["success"] is True
+        assert len(self.created) == 1
+        assert sum(e.setup_calls for e in self.created) == 1
+        assert all(e.cleanup_calls == 1 for e in self.created)
+        assert results["evaluator_pool_stats"]["evaluators_reused"] == 8
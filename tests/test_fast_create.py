@@ -0,0 +1,79 @@
+"""Tests for repository writes that skip the read-back round trip."""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mongomock_motor import AsyncMongoMockClient
+from storybench.database.models import Response, ResponseLLMEvaluation, CriterionEvaluation, PyObjectId
+from storybench.database.repositories import ResponseRepository, ResponseLLMEvaluationRepository
+
+
+def make_response(prompt_index=0, **fields):
+    return Response(evaluation_id="eval-1", model_name="model-a", sequence="FilmNarrative", run=1,
+                    prompt_index=prompt_index, prompt_name=f"Prompt {prompt_index}", prompt_text="Write",
+                    response=f"part {prompt_index}", generation_time=1.0, **fields)
+
+
+def make_evaluation(response_id):
+    return ResponseLLMEvaluation(response_id=response_id, evaluating_llm_provider="openai",
+                                 evaluating_llm_model="judge", evaluation_criteria_id=PyObjectId(),
+                                 criteria_results=[CriterionEvaluation(criterion_name="creativity", score=3,
+                                                                       justification="Fine")])
+
+
+class TestInsert:
+    """insert returns the given model with its id, without reading it back."""
+
+    @pytest.mark.asyncio
+    async def test_insert_sets_the_generated_id(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        repo = ResponseRepository(database)
+        response = make_response(id=None)
+
+        created = await repo.insert(response)
+
+        assert created is response and created.id is not None
+        stored = await repo.find_by_id(created.id)
+        assert stored.response == "part 0"
+
+    @pytest.mark.asyncio
+    async def test_evaluation_save_keeps_the_model_id(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        repo = ResponseLLMEvaluationRepository(database)
+        evaluation = make_evaluation(PyObjectId())
+
+        saved = await repo.save(evaluation)
+
+        assert saved is evaluation
+        assert (await repo.find_by_id(evaluation.id)).response_id == evaluation.response_id
+
+
+class TestBulkCreate:
+    """Every repository batches inserts, stored under the models' own ids."""
+
+    @pytest.mark.asyncio
+    async def test_responses_keep_their_ids(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        repo = ResponseRepository(database)
+        responses = [make_response(i) for i in range(3)]
+        ids = [r.id for r in responses]
+
+        created = await repo.bulk_create(responses)
+
+        assert [r.id for r in created] == ids
+        assert sorted((await repo.find_many({})), key=lambda r: r.prompt_index)[2].id == ids[2]
+
+    @pytest.mark.asyncio
+    async def test_evaluations(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        repo = ResponseLLMEvaluationRepository(database)
+        evaluations = [make_evaluation(PyObjectId()) for _ in range(2)]
+
+        created = await repo.bulk_create(evaluations)
+
+        assert await database.response_llm_evaluations.count_documents({}) == 2
+        assert {e.id for e in await repo.find_many({})} == {e.id for e in created}
+        assert await repo.bulk_create([]) == []
@@ -0,0 +1,93 @@
+"""Tests for the pipelined generate -> judge flow."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mongomock_motor import AsyncMongoMockClient
+from storybench.database.models import Response, ResponseStatus, EvaluationCriteria, EvaluationCriterionItem
+from storybench.database.services.judge_pipeline import JudgePipeline
+from storybench.models.config import ModelConfig
+from storybench.database.services.sequence_evaluation_service import SequenceEvaluationService, EvaluatorFactory
+
+
+class FakeJudge:
+    """Evaluator double scoring every response of a two-prompt sequence."""
+
+    name = "judge"
+
+    def get_context_analytics(self, prompt):
+        return {"prompt_hash": "h", "estimated_tokens": 0, "max_tokens": 1, "utilization_percent": 0.0,
+                "fits": True}
+
+    async def generate_response(self, prompt, context=None, **kwargs):
+        block = "creativity: 3 - Fine\ncoherence: 4 - Good"
+        return {"response": f"R1 EVALUATION:\n{block}\nR2 EVALUATION:\n{block}"}
+
+
+async def make_service():
+    database = AsyncMongoMockClient()["storybench_test"]
+    await database.responses.insert_many([
+        Response(evaluation_id="eval-1", model_name="model-a", sequence="FilmNarrative", run=run,
+                 prompt_index=index, prompt_name=f"Prompt {index}", prompt_text="Write",
+                 response=f"run {run} part {index}", generation_time=1.0).model_dump(by_alias=True)
+        for run in (1, 2, 3) for index in (0, 1)
+    ])
+    await database.evaluation_criteria.insert_one(EvaluationCriteria(config_hash="abc", criteria={
+        "creativity": EvaluationCriterionItem(name="creativity", description="Original ideas"),
+        "coherence": EvaluationCriterionItem(name="coherence", description="Fits with earlier responses")
+    }).model_dump(by_alias=True))
+
+    config = ModelConfig(name="judge", type="api", provider="openai", model_name="gpt-4o")
+    with patch.object(EvaluatorFactory, "create_evaluator", return_value=FakeJudge()):
+        return database, SequenceEvaluationService(database, config, {"openai": "key"})
+
+
+class TestJudgePipeline:
+    """Runs are judged as soon as they are submitted; the rest at finish."""
+
+    @pytest.mark.asyncio
+    async def test_submitted_run_is_judged_before_generation_ends(self):
+        database, service = await make_service()
+        pipeline = JudgePipeline(service, "eval-1")
+        await pipeline.start()
+
+        await pipeline.submit("model-a", "FilmNarrative", 1)
+
+        assert await database.response_llm_evaluations.count_documents({}) == 2
+        assert pipeline.results["sequences_evaluated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_finish_sweeps_runs_that_were_not_submitted(self):
+        database, service = await make_service()
+        pipeline = JudgePipeline(service, "eval-1")
+        await pipeline.start()
+
+        pipeline.on_run_complete("model-a", "FilmNarrative", 1, {"success": True, "complete": True})
+        # A run with a missing prompt is left for the queue to rerun
+        pipeline.on_run_complete("model-a", "FilmNarrative", 2, {"success": True, "complete": False})
+        results = await pipeline.finish()
+
+        assert results["pipelined_runs"] == 1
+        assert results["swept_sequences"] == 2
+        assert results["sequences_evaluated"] == 3
+        assert await database.response_llm_evaluations.count_documents({}) == 6
+
+    @pytest.mark.asyncio
+    async def test_finish_reports_incomplete_runs_instead_of_judging_them(self):
+        database, service = await make_service()
+        await database.responses.update_one({"run": 2, "prompt_index": 1},
+                                            {"$set": {"status": ResponseStatus.PARTIAL.value}})
+        await database.responses.delete_one({"run": 3, "prompt_index": 0})
+        pipeline = JudgePipeline(service, "eval-1", {"FilmNarrative": 2})
+        await pipeline.start()
+
+        results = await pipeline.finish()
+
+        assert results["sequences_evaluated"] == 1
+        assert results["incomplete_runs"] == ["model-a - FilmNarrative - Run 2 (1/2 prompts)",
+                                              "model-a - FilmNarrative - Run 3 (1/2 prompts)"]
+        assert await database.response_llm_evaluations.count_documents({}) == 2
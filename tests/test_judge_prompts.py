@@ -0,0 +1,244 @@
+"""Tests for judge prompts laid out for prefix caching."""
+
+import pytest
+from datetime import datetime
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators.litellm_evaluator import LiteLLMEvaluator
+from mongomock_motor import AsyncMongoMockClient
+from storybench.database.models import Response, EvaluationCriteria, EvaluationCriterionItem
+from storybench.clients.directus_models import StorybenchEvaluationCriterion, StorybenchEvaluationStructure
+from storybench.database.services.judge_prompts import (
+    build_sequence_judge_prompt, build_response_judge_prompt, build_directus_sequence_judge_prompt
+)
+from storybench.models.config import ModelConfig
+from storybench.database.services.sequence_evaluation_service import SequenceEvaluationService, EvaluatorFactory
+
+CRITERIA = EvaluationCriteria(config_hash="abc", criteria={
+    "creativity": EvaluationCriterionItem(name="creativity", description="Original ideas"),
+    "coherence": EvaluationCriterionItem(name="coherence", description="Fits with earlier responses"),
+})
+
+
+def make_sequence(model_name="model-a", sequence="FilmNarrative", story="A lighthouse keeper"):
+    return [
+        Response(evaluation_id="eval-1", model_name=model_name, sequence=sequence, run=1, prompt_index=i,
+                 prompt_name=f"Prompt {i + 1}", prompt_text=f"Write part {i + 1}",
+                 response=f"{story}, part {i + 1}.", generation_time=1.0)
+        for i in range(2)
+    ]
+
+
+DIRECTUS_CRITERIA = StorybenchEvaluationStructure(
+    criteria={"creativity": StorybenchEvaluationCriterion(name="Creativity", description="Original ideas",
+                                                          scale=[1, 5], criteria="Novel premises")},
+    scoring_guidelines="Most work scores 2-3.", version=3, version_name="v3", directus_id=7,
+    created_at=datetime(2025, 1, 1)
+)
+
+
+def make_response_docs(model_name="model-a", story="A lighthouse keeper"):
+    return [{"model_name": model_name, "sequence_name": "FilmNarrative", "response": f"{story}, part {i + 1}."}
+            for i in range(2)]
+
+
+class TestJudgePromptLayout:
+    """Instructions are invariant and come first; judged content comes last."""
+
+    def test_instructions_do_not_depend_on_the_sequence(self):
+        first = build_sequence_judge_prompt(make_sequence(), CRITERIA)
+        second = build_sequence_judge_prompt(make_sequence("model-b", "Other", "A desert caravan"), CRITERIA)
+
+        assert first.instructions == second.instructions
+        assert "model-a" not in first.instructions and "lighthouse" not in first.instructions
+        assert "creativity: Original ideas" in first.instructions
+        assert first.content.endswith("A lighthouse keeper, part 2.\n")
+        assert first.text.startswith(first.instructions)
+
+    def test_context_puts_instructions_in_a_system_message(self):
+        judge_prompt = build_response_judge_prompt(make_sequence()[0], CRITERIA)
+        messages = judge_prompt.as_context().to_messages(judge_prompt.content)
+
+        assert messages == [{"role": "system", "content": judge_prompt.instructions},
+                            {"role": "user", "content": judge_prompt.content}]
+
+    def test_anthropic_marks_the_system_instructions(self):
+        messages = build_sequence_judge_prompt(make_sequence(), CRITERIA).as_context().to_messages("Judge this")
+        LiteLLMEvaluator._mark_cacheable_prefix(messages)
+
+        assert messages[0]["role"] == "system"
+        assert messages[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_directus_sequence_prompt_puts_the_responses_last(self):
+        first = build_directus_sequence_judge_prompt(make_response_docs(), DIRECTUS_CRITERIA)
+        second = build_directus_sequence_judge_prompt(make_response_docs("model-b", "A desert caravan"),
+                                                      DIRECTUS_CRITERIA)
+
+        assert first.instructions == second.instructions
+        assert "Novel premises" in first.instructions and "OVERALL ASSESSMENT:" in first.instructions
+        assert "model-a" not in first.instructions and "lighthouse" not in first.instructions
+        assert "- Model: model-a" in first.content
+        assert first.content.endswith("A lighthouse keeper, part 2.\n")
+
+
+def baseline_sequence_prompt(responses, criteria_config):
+    """The sequence judge prompt as sent before the prefix layout (system + user text)."""
+    criteria_list = [f"• {name}: {criterion.description}" for name, criterion in criteria_config.criteria.items()]
+    sequence_context = [f"""
+=== RESPONSE {i+1}: {response.prompt_name} ===
+PROMPT: {response.prompt_text}
+
+RESPONSE: {response.response}
+""" for i, response in enumerate(responses)]
+    system = ("You are an expert evaluator of creative writing sequences. Evaluate how well responses work "
+              "together as a coherent narrative, with particular attention to how each response builds upon "
+              "previous ones.")
+    blocks = []
+    for label, coherence in (("R1", "internal consistency"), ("R2", "how it builds on R1"),
+                             ("R3", "sequence progression")):
+        blocks.append(f"""{label} EVALUATION:
+creativity: [score] - [justification]
+coherence: [score] - [justification focusing on {coherence}]
+character_depth: [score] - [justification]
+dialogue_quality: [score] - [justification]
+visual_imagination: [score] - [justification]
+conceptual_depth: [score] - [justification]
+adaptability: [score] - [justification]""")
+    user = f"""Evaluate this {len(responses)}-response creative writing sequence for coherence and quality.
+
+MODEL: {responses[0].model_name} | SEQUENCE: {responses[0].sequence}
+
+CRITICAL EVALUATION STANDARDS:
+- Use the FULL 1-5 scale. Most responses should score 2-3 (competent work)
+- Score 4 only for genuinely exceptional quality that exceeds professional standards
+- Score 5 ONLY for masterwork-level writing that redefines expectations
+- Be critical and realistic - even good AI responses have significant limitations
+- Compare against published professional fiction, not just other AI writing
+
+EVALUATION CRITERIA (1-5 scale):
+{chr(10).join(criteria_list)}
+
+SEQUENCE TO EVALUATE:
+{chr(10).join(sequence_context)}
+
+INSTRUCTIONS:
+Evaluate each response individually AND as part of the sequence. Pay special attention to COHERENCE - how well each response builds upon and connects with previous responses. Be stringent in your evaluation - most AI writing has room for improvement.
+
+OUTPUT FORMAT:
+{chr(10).join(blocks[:1])}
+
+{blocks[1]}
+
+{blocks[2]}"""
+    return system, user, "\n\n".join(blocks)
+
+
+def baseline_response_prompt(response, criteria_config):
+    """The single-response judge prompt as sent before the prefix layout (system + user text)."""
+    criteria_descriptions = [f"**{name.upper()}** (Scale 1-{criterion.scale}): {criterion.description}"
+                             for name, criterion in criteria_config.criteria.items()]
+    system = ("You are an expert evaluator of creative writing. Provide detailed, objective assessments "
+              "based on the given criteria.")
+    user = f"""
+Please evaluate the following creative writing response based on these criteria:
+
+{chr(10).join(criteria_descriptions)}
+
+**CONTEXT:**
+- Model: {response.model_name}
+- Sequence: {response.sequence}
+- Prompt: {response.prompt_name}
+- Prompt Text: {response.prompt_text}
+
+**RESPONSE TO EVALUATE:**
+{response.response}
+
+**INSTRUCTIONS:**
+For each criterion, provide:
+1. A score from 1 to {list(criteria_config.criteria.values())[0].scale}
+2. A detailed justification (2-3 sentences)
+
+Format your response as:
+CREATIVITY: [score]
+Justification: [your justification]
+
+COHERENCE: [score]
+Justification: [your justification]
+
+[Continue for all criteria...]
+
+Be objective, specific, and constructive in your evaluations.
+"""
+    return system, user
+
+
+def non_blank_lines(text):
+    return sorted(line for line in text.splitlines() if line.strip())
+
+
+class TestBaselineWording:
+    """The prefix layout only moves the judged content; the scoring instrument is unchanged."""
+
+    def test_sequence_prompt_keeps_the_baseline_text(self):
+        responses = make_sequence() + make_sequence()[:1]
+        judge_prompt = build_sequence_judge_prompt(responses, CRITERIA)
+        system, user, output_format = baseline_sequence_prompt(responses, CRITERIA)
+
+        assert judge_prompt.instructions.startswith(system + "\n\n")
+        assert judge_prompt.instructions.endswith("OUTPUT FORMAT:\n" + output_format)
+        moved = judge_prompt.instructions + "\n\n" + judge_prompt.content
+        assert non_blank_lines(moved) == non_blank_lines(system + "\n\n" + user)
+
+    def test_response_prompt_keeps_the_baseline_text(self):
+        response = make_sequence()[0]
+        judge_prompt = build_response_judge_prompt(response, CRITERIA)
+        system, user = baseline_response_prompt(response, CRITERIA)
+
+        assert judge_prompt.instructions.startswith(system + "\n\n")
+        moved = judge_prompt.instructions + "\n\n" + judge_prompt.content
+        assert non_blank_lines(moved) == non_blank_lines(system + "\n\n" + user)
+
+
+class FakeJudge:
+    """Evaluator double returning a fixed verdict with provider cache usage."""
+
+    name = "judge"
+
+    def __init__(self):
+        self.calls = []
+
+    def get_context_analytics(self, prompt):
+        return {"prompt_hash": "h", "estimated_tokens": 0, "max_tokens": 1, "utilization_percent": 0.0,
+                "fits": True}
+
+    async def generate_response(self, prompt, context=None, **kwargs):
+        self.calls.append((prompt, context))
+        verdict = "\n".join(f"R{i} EVALUATION:\ncreativity: 3 - Fine\ncoherence: 2 - Loose" for i in (1, 2))
+        return {"response": verdict, "usage": {"prompt_tokens": 2400, "cached_tokens": 2048}}
+
+
+class TestSequenceEvaluationService:
+    """The sequence judge sends the split prompt and records cache hits."""
+
+    @pytest.mark.asyncio
+    async def test_records_cached_prompt_tokens(self):
+        judge = FakeJudge()
+        database = AsyncMongoMockClient()["storybench_test"]
+        config = ModelConfig(name="judge", type="api", provider="anthropic", model_name="claude-sonnet-4")
+        with patch.object(EvaluatorFactory, "create_evaluator",
+                   return_value=judge):
+            service = SequenceEvaluationService(database, config, {"anthropic": "key"})
+
+        responses = make_sequence()
+        evaluations = await service.evaluate_sequence(responses, CRITERIA)
+
+        prompt, context = judge.calls[0]
+        assert context.to_messages()[0]["role"] == "system"
+        assert "A lighthouse keeper" in prompt
+        assert len(evaluations) == 2
+        assert [e.response_id for e in evaluations] == [r.id for r in responses]
+        assert all(e.prompt_tokens == 2400 and e.cached_prompt_tokens == 2048 for e in evaluations)
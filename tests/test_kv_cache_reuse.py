@@ -0,0 +1,121 @@
+"""Tests for KV-cache prefix reuse across turns of a local sequence run."""
+
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators.model_registry import ResidentModel
+from storybench.evaluators import local_evaluator
+
+LocalEvaluator = local_evaluator.LocalEvaluator
+
+
+class FakeLlama:
+    """llama_cpp.Llama double: one token per word, tokens kept after each generation."""
+
+    def __init__(self):
+        self.vocab = {}
+        self.input_ids = []
+        self.n_tokens = 0
+        self.resets = 0
+
+    def tokenize(self, text: bytes):
+        return [self.vocab.setdefault(word, len(self.vocab)) for word in text.decode("utf-8").split()]
+
+    def reset(self):
+        self.n_tokens = 0
+        self.resets += 1
+
+    def save_state(self):
+        return list(self.input_ids[:self.n_tokens])
+
+    def load_state(self, state):
+        self.input_ids = list(state)
+        self.n_tokens = len(state)
+
+
+class FakeWrapper:
+    """UnifiedLlamaCppWrapper double exposing the Llama instance as ``client``."""
+
+    def __init__(self, words: int = 30):
+        self.client = FakeLlama()
+        self.words = words
+
+    def stream(self, prompt: str, **kwargs):
+        output = " ".join(f"w{index}" for index in range(self.words))
+        self.client.input_ids = self.client.tokenize(f"{prompt} {output}".encode("utf-8"))
+        self.client.n_tokens = len(self.client.input_ids)
+        yield output
+
+
+@pytest.fixture
+def local_model_evaluator(make_evaluator):
+    """Build a LocalEvaluator whose loaded model is ``llm``."""
+    def make(llm, **config) -> LocalEvaluator:
+        evaluator = make_evaluator(LocalEvaluator, "local-test",
+                                   {"repo_id": "org/model", "filename": "model.gguf", **config})
+        evaluator.llm = llm
+        return evaluator
+    return make
+
+
+async def turn(evaluator, prompt):
+    result = await evaluator.generate_response(prompt, use_cache=False)
+    return result["context_stats"], f"{prompt} {result['response']}"
+
+
+class TestKVCacheReuse:
+    """Later turns of a run only prefill what follows the shared prefix."""
+
+    @pytest.mark.asyncio
+    async def test_follow_up_turn_reuses_previous_turn(self, local_model_evaluator):
+        evaluator = local_model_evaluator(FakeWrapper())
+
+        first, history = await turn(evaluator, "opening prompt about a city")
+        second, _ = await turn(evaluator, f"{history} now continue the story")
+
+        assert first["reused_prefix_tokens"] == 0
+        assert second["reused_prefix_tokens"] == len(history.split())
+        assert second["prompt_tokens"] == len(history.split()) + 4
+        await evaluator.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_reset_context_starts_next_run_empty(self, local_model_evaluator):
+        llm = FakeWrapper()
+        evaluator = local_model_evaluator(llm)
+
+        await turn(evaluator, "opening prompt about a city")
+        evaluator.reset_context()
+        stats, _ = await turn(evaluator, "opening prompt about a city")
+
+        assert stats["reused_prefix_tokens"] == 0
+        assert llm.client.resets == 1
+        await evaluator.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_shared_model_restores_each_evaluators_state(self, local_model_evaluator):
+        llm = FakeWrapper()
+        model = ResidentModel(key=("org/model", "model.gguf", 32768), context_manager=None, llm=llm,
+                              size_bytes=0, executor=ThreadPoolExecutor(max_workers=1), in_use=2)
+        first, second = local_model_evaluator(llm), local_model_evaluator(llm)
+        first._resident_model = second._resident_model = model
+
+        _, history = await turn(first, "a story about the sea")
+        await turn(second, "a poem about mountains")
+        stats, _ = await turn(first, f"{history} continue it")
+
+        assert stats["kv_state_restored"] is True
+        assert stats["reused_prefix_tokens"] == len(history.split())
+        model.executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_reuse_can_be_disabled(self, local_model_evaluator):
+        evaluator = local_model_evaluator(FakeWrapper(), kv_cache_reuse=False)
+
+        stats, _ = await turn(evaluator, "opening prompt about a city")
+
+        assert "reused_prefix_tokens" not in stats
+        await evaluator.cleanup()
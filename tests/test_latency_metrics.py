@@ -0,0 +1,97 @@
+"""Tests for stage latency histograms and their Prometheus export."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.parallel import GlobalWorkScheduler, WorkUnit
+from storybench.parallel.rate_limiting import RateLimitManager
+from storybench.utils.latency_metrics import (
+    LatencyHistogram, LatencyMetrics, latency_metrics, METRIC_NAME,
+    STAGE_GENERATION, STAGE_DB_WRITE, STAGE_QUEUE_WAIT
+)
+
+
+class TestLatencyHistogram:
+    """Bucketed quantile estimation."""
+
+    def test_empty_histogram(self):
+        histogram = LatencyHistogram()
+        assert histogram.quantile(0.5) is None
+        assert histogram.summary()["count"] == 0
+
+    def test_quantiles_within_bucket_bounds(self):
+        histogram = LatencyHistogram(buckets=(1.0, 2.0, 5.0, 10.0))
+        for value in [0.5] * 50 + [1.5] * 45 + [8.0] * 5:
+            histogram.observe(value)
+
+        assert 0.0 < histogram.quantile(0.5) <= 1.0
+        assert 1.0 < histogram.quantile(0.95) <= 2.0
+        assert 5.0 < histogram.quantile(0.99) <= 8.0  # Capped by the largest observation
+
+    def test_overflow_bucket_reports_max(self):
+        histogram = LatencyHistogram(buckets=(1.0,))
+        histogram.observe(42.0)
+        assert histogram.quantile(0.99) == 42.0
+        assert histogram.cumulative_counts() == [0, 1]
+
+
+class TestLatencyMetrics:
+    """Registry summaries and Prometheus text format."""
+
+    def test_summary_per_model_and_provider(self):
+        metrics = LatencyMetrics()
+        metrics.observe(STAGE_GENERATION, "openai", "gpt-a", 1.0)
+        metrics.observe(STAGE_GENERATION, "openai", "gpt-b", 3.0)
+
+        summary = metrics.summary()[STAGE_GENERATION]
+
+        assert summary["openai/gpt-a"]["count"] == 1
+        assert summary["openai"]["count"] == 2
+        assert summary["openai"]["mean"] == pytest.approx(2.0)
+
+    def test_time_records_on_exception(self):
+        metrics = LatencyMetrics()
+        with pytest.raises(RuntimeError):
+            with metrics.time(STAGE_DB_WRITE, "local", "m"):
+                raise RuntimeError("write failed")
+        assert metrics.get_histogram(STAGE_DB_WRITE, "local", "m").count == 1
+
+    def test_render_prometheus(self):
+        metrics = LatencyMetrics(buckets=(1.0, 10.0))
+        metrics.observe(STAGE_GENERATION, "anthropic", 'claude"x', 2.0)
+
+        text = metrics.render_prometheus()
+        labels = 'stage="generation",provider="anthropic",model="claude\\"x"'
+
+        assert f"# TYPE {METRIC_NAME} histogram" in text
+        assert f'{METRIC_NAME}_bucket{{{labels},le="1.0"}} 0' in text
+        assert f'{METRIC_NAME}_bucket{{{labels},le="10.0"}} 1' in text
+        assert f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"{METRIC_NAME}_count{{{labels}}} 1" in text
+        assert f'{METRIC_NAME}_quantile{{{labels},quantile="0.95"}}' in text
+        assert text.endswith("\n")
+
+
+class TestSchedulerQueueWait:
+    """The global scheduler records how long units waited for a slot."""
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_recorded(self):
+        latency_metrics.reset()
+        scheduler = GlobalWorkScheduler(RateLimitManager())
+        for run_number in (1, 2):
+            scheduler.submit(WorkUnit(model_name="m", sequence_name="s", run_number=run_number, provider="local"))
+
+        async def execute(unit):
+            await asyncio.sleep(0)
+            return {"success": True}
+
+        await scheduler.run(execute)
+
+        histogram = latency_metrics.get_histogram(STAGE_QUEUE_WAIT, "local", "m")
+        assert histogram is not None and histogram.count == 2
+        latency_metrics.reset()
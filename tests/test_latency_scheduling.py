@@ -0,0 +1,138 @@
+"""Tests for latency-aware (longest-expected-first) scheduling."""
+
+import pytest
+import sys
+from pathlib import Path
+
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.database.models import Response, ResponseStatus
+from storybench.database.repositories import ResponseRepository
+from storybench.parallel import ParallelSequenceEvaluationRunner, GlobalWorkScheduler, WorkUnit, LatencyEstimator
+from storybench.parallel.latency_model import LatencyStats, DEFAULT_PROMPT_SECONDS
+from storybench.parallel.rate_limiting import RateLimitManager
+
+
+SEQUENCES = {
+    "FilmNarrative": [{"name": f"p{i}", "text": f"Film prompt {i}"} for i in range(3)],
+    "CrossGenre": [{"name": f"p{i}", "text": f"Cross prompt {i}"} for i in range(3)],
+}
+
+
+def make_unit(model_name: str, provider: str, expected_duration: float, run_number: int = 1) -> WorkUnit:
+    return WorkUnit(model_name=model_name, sequence_name="FilmNarrative", run_number=run_number,
+                    provider=provider, expected_duration=expected_duration)
+
+
+class TestLatencyEstimator:
+    """Fallback chain of the historical latency model."""
+
+    def setup_method(self):
+        self.estimator = LatencyEstimator({
+            ("deepseek-r1", "FilmNarrative", 0): LatencyStats(mean=120.0, count=3),
+            ("deepseek-r1", "CrossGenre", 0): LatencyStats(mean=60.0, count=1),
+            ("deepseek-r1", "FilmNarrative", 1): LatencyStats(mean=90.0, count=2),
+            ("gpt-4o", "FilmNarrative", 0): LatencyStats(mean=10.0, count=4),
+        })
+
+    def test_exact_prompt_history(self):
+        assert self.estimator.estimate_prompt("deepseek-r1", "FilmNarrative", 0) == 120.0
+
+    def test_falls_back_to_prompt_position(self):
+        # Unknown sequence: count-weighted mean of prompt 0 across sequences
+        assert self.estimator.estimate_prompt("deepseek-r1", "RegionalThriller", 0) == pytest.approx(105.0)
+
+    def test_falls_back_to_model_mean(self):
+        assert self.estimator.estimate_prompt("deepseek-r1", "FilmNarrative", 2) == pytest.approx(600 / 6)
+
+    def test_unknown_model_uses_median_of_models(self):
+        assert not self.estimator.has_history("claude-new")
+        assert self.estimator.estimate_prompt("claude-new", "FilmNarrative", 0) == pytest.approx(55.0)
+
+    def test_empty_history_uses_default(self):
+        estimator = LatencyEstimator({})
+        assert estimator.estimate_run("any", "FilmNarrative", 3) == 3 * DEFAULT_PROMPT_SECONDS
+
+    def test_from_rows(self):
+        estimator = LatencyEstimator.from_rows([
+            {"_id": {"model_name": "m", "sequence": "s", "prompt_index": 0}, "mean": 5.0, "count": 2}
+        ])
+        assert estimator.estimate_run("m", "s", 2) == 10.0
+
+
+class TestLongestFirstScheduling:
+    """LPT ordering and makespan prediction of the global scheduler."""
+
+    def test_order_longest_first(self):
+        scheduler = GlobalWorkScheduler(RateLimitManager())
+        for model_name, duration in [("fast", 5.0), ("slow", 50.0), ("medium", 20.0)]:
+            scheduler.submit(make_unit(model_name, "deepinfra", duration))
+
+        scheduler.order_longest_first()
+
+        assert [u.model_name for u in scheduler.lanes["deepinfra"]] == ["slow", "medium", "fast"]
+
+    def test_predict_makespan_single_slot(self):
+        scheduler = GlobalWorkScheduler(RateLimitManager())
+        scheduler.rate_limit_manager.get_max_concurrent = lambda provider: 1
+        for duration in (3.0, 4.0, 5.0):
+            scheduler.submit(make_unit("m", "local", duration))
+
+        assert scheduler.predict_makespan() == pytest.approx(12.0)
+        assert scheduler.pending_units == 3  # Prediction does not consume the lanes
+
+    def test_longest_first_shortens_tail(self):
+        # Two slots; the slow unit submitted last would start after the short ones
+        scheduler = GlobalWorkScheduler(RateLimitManager(), max_units_per_model=None)
+        for model_name, duration in [("a", 10.0), ("b", 10.0), ("c", 10.0), ("d", 10.0), ("slow", 40.0)]:
+            scheduler.submit(make_unit(model_name, "local", duration))
+        scheduler.rate_limit_manager.get_max_concurrent = lambda provider: 2
+
+        config_order = scheduler.predict_makespan()
+        scheduler.order_longest_first()
+        longest_first = scheduler.predict_makespan()
+
+        assert config_order == pytest.approx(60.0)
+        assert longest_first == pytest.approx(40.0)
+
+    def test_runner_prediction_bounded_by_slow_model(self):
+        runner = ParallelSequenceEvaluationRunner(database=None, evaluation_runner=None, max_concurrent_sequences=2)
+        estimator = LatencyEstimator({
+            ("deepseek-r1", "FilmNarrative", 0): LatencyStats(mean=100.0, count=1),
+            ("qwen-fast", "FilmNarrative", 0): LatencyStats(mean=5.0, count=1),
+        })
+        models = [{"name": "qwen-fast", "model_id": "qwen-fast"},
+                  {"name": "deepseek-r1", "model_id": "deepseek-r1"}]
+
+        config_order = runner.predict_makespan(models, SEQUENCES, 2, estimator, longest_first=False)
+        longest_first = runner.predict_makespan(models, SEQUENCES, 2, estimator, longest_first=True)
+
+        # deepseek-r1: 4 runs of 3 x 100s prompts, two at a time under the per-model cap
+        assert longest_first == pytest.approx(600.0)
+        assert longest_first <= config_order
+        assert runner.latency_estimator is None  # Dry-run prediction leaves the runner untouched
+
+
+class TestLatencyProfile:
+    """Aggregation of historical generation times from the responses collection."""
+
+    @pytest.mark.asyncio
+    async def test_latency_profile_groups_by_prompt(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        repo = ResponseRepository(database)
+        for generation_time, status in [(10.0, ResponseStatus.COMPLETED), (20.0, ResponseStatus.COMPLETED),
+                                        (99.0, ResponseStatus.FAILED)]:
+            await repo.create(Response(
+                evaluation_id="e1", model_name="deepseek-r1", sequence="FilmNarrative", run=1,
+                prompt_index=0, prompt_name="p0", prompt_text="text", response="r",
+                generation_time=generation_time, status=status
+            ))
+
+        rows = await repo.get_latency_profile(["deepseek-r1", "other"])
+        estimator = LatencyEstimator.from_rows(rows)
+
+        assert len(rows) == 1
+        assert rows[0]["count"] == 2
+        assert estimator.estimate_prompt("deepseek-r1", "FilmNarrative", 0) == pytest.approx(15.0)
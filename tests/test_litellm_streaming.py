@@ -0,0 +1,139 @@
+"""Tests for streamed generation in the LiteLLM evaluator."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators.litellm_evaluator import LiteLLMEvaluator
+from storybench.evaluators.stream_checkpoint import StreamCheckpoint
+
+
+def make_chunk(content=None, finish_reason=None, usage=None):
+    choices = [] if content is None and finish_reason is None else [
+        SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)
+    ]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeStream:
+    """Async iterator over prepared chunks; can stall or fail after them."""
+
+    def __init__(self, chunks, then=None):
+        self.chunks = list(chunks)
+        self.then = then
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0.001)
+        if self.chunks:
+            return self.chunks.pop(0)
+        if self.then == "stall":
+            await asyncio.sleep(10)
+        if isinstance(self.then, Exception):
+            raise self.then
+        raise StopAsyncIteration
+
+
+@pytest.fixture
+def streaming_evaluator(make_evaluator):
+    """Build a streaming LiteLLM evaluator, checkpointing into ``tmp_path`` if given."""
+    def make(tmp_path=None, **config):
+        return make_evaluator(
+            LiteLLMEvaluator,
+            name="gpt-test",
+            config={"provider": "openai", "model_name": "gpt-4o", "context_size": 32000,
+                    "streaming": True,
+                    "stream_checkpoint_dir": str(tmp_path) if tmp_path else None,
+                    **config},
+            api_keys={"openai": "sk-test"}
+        )
+    return make
+
+
+class TestLiteLLMStreaming:
+    """Chunk consumption, first-token timing and partial-output checkpoints."""
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_and_stats(self, streaming_evaluator, tmp_path):
+        evaluator = streaming_evaluator(tmp_path)
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=3, total_tokens=13)
+        stream = FakeStream([make_chunk("Once "), make_chunk("upon "), make_chunk("a time", "stop"),
+                             make_chunk(usage=usage)])
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion", return_value=stream) as mock_completion:
+            result = await evaluator.generate_response("Tell a story")
+
+        assert mock_completion.call_args.kwargs["stream"] is True
+        assert result["response"] == "Once upon a time"
+        assert result["finish_reason"] == "stop"
+        assert result["usage"]["completion_tokens"] == 3
+        assert result["stream_stats"]["time_to_first_token"] > 0
+        assert result["stream_stats"]["tokens_per_second"] > 0
+        assert "partial" not in result
+        assert list(tmp_path.iterdir()) == []  # Checkpoint removed after a complete stream
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_partial_text(self, streaming_evaluator, tmp_path):
+        evaluator = streaming_evaluator(tmp_path)
+        stream = FakeStream([make_chunk("The beginning "), make_chunk("of a long story")], then="stall")
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion", return_value=stream):
+            result = await evaluator.generate_response("Tell a story", timeout=0.2)
+
+        assert result["partial"] is True
+        assert result["response"] == "The beginning of a long story"
+        assert "timeout" in result["interrupted"]
+        checkpoint_files = list(tmp_path.glob("*.partial.txt"))
+        assert len(checkpoint_files) == 1
+        assert checkpoint_files[0].read_text() == "The beginning of a long story"
+        assert result["timed_out"] is True
+        # Cut-off text is not an answer and never feeds the next prompt's context
+        assert "of a long story" not in evaluator.generation_history
+
+    @pytest.mark.asyncio
+    async def test_error_before_first_token_raises(self, streaming_evaluator):
+        evaluator = streaming_evaluator()
+        stream = FakeStream([], then=RuntimeError("connection reset"))
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion", return_value=stream):
+            with pytest.raises(RuntimeError, match="connection reset"):
+                await evaluator.generate_response("Tell a story")
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_still_default(self, streaming_evaluator):
+        evaluator = streaming_evaluator(streaming=False)
+        message = SimpleNamespace(content="Plain response")
+        response = SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion", return_value=response) as mock_completion:
+            result = await evaluator.generate_response("Tell a story")
+
+        assert "stream" not in mock_completion.call_args.kwargs
+        assert result["response"] == "Plain response"
+        assert "stream_stats" not in result
+
+
+class TestStreamCheckpoint:
+    """Flushing policy of the partial-output checkpoint."""
+
+    def test_flushes_after_enough_text(self, tmp_path):
+        checkpoint = StreamCheckpoint("model/x", directory=str(tmp_path), flush_interval=3600, flush_chars=5)
+        checkpoint.append("abc")
+        assert not checkpoint.path.exists()
+        checkpoint.append("def")
+        assert checkpoint.path.read_text() == "abcdef"
+        assert "/" not in checkpoint.path.name
+
+    def test_in_memory_without_directory(self):
+        checkpoint = StreamCheckpoint("m")
+        checkpoint.append("text")
+        checkpoint.interrupt("test")
+        assert checkpoint.path is None
+        assert checkpoint.text == "text"
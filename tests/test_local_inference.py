@@ -0,0 +1,103 @@
+"""Tests for running local llama.cpp inference off the event loop."""
+
+import asyncio
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators import local_evaluator
+
+LocalEvaluator = local_evaluator.LocalEvaluator
+
+
+class BlockingLLM:
+    """llama.cpp double: every token blocks its thread like a real forward pass."""
+
+    def __init__(self, tokens: int = 20, token_seconds: float = 0.01):
+        self.tokens = tokens
+        self.token_seconds = token_seconds
+        self.produced = 0
+        self.threads = set()
+
+    def stream(self, prompt: str, **kwargs):
+        self.threads.add(threading.current_thread().name)
+        for index in range(self.tokens):
+            time.sleep(self.token_seconds)
+            self.produced += 1
+            yield f"t{index} "
+
+
+@pytest.fixture
+def local_model_evaluator(make_evaluator):
+    """Build a LocalEvaluator whose loaded model is ``llm``."""
+    def make(llm) -> LocalEvaluator:
+        evaluator = make_evaluator(LocalEvaluator, "local-test",
+                                   {"repo_id": "org/model", "filename": "model.gguf", "max_tokens": 20})
+        evaluator.llm = llm
+        return evaluator
+    return make
+
+
+class TestOffLoopGeneration:
+    """Generation runs on the model thread with progress and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, local_model_evaluator):
+        llm = BlockingLLM(tokens=20, token_seconds=0.01)
+        evaluator = local_model_evaluator(llm)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        result = await evaluator.generate_response("Tell a story", use_cache=False)
+        ticker_task.cancel()
+
+        assert result["response"].startswith("t0 t1")
+        assert ticks >= 10  # The loop kept running during the ~0.2s generation
+        assert all(name.startswith("llama-local-test") for name in llm.threads)
+        await evaluator.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_progress_reaches_callbacks_on_loop_thread(self, local_model_evaluator):
+        evaluator = local_model_evaluator(BlockingLLM(tokens=20, token_seconds=0.01))
+        updates = []
+        evaluator.register_progress_callback(
+            lambda progress, status: updates.append((progress, status, threading.current_thread()))
+        )
+
+        with patch.object(local_evaluator, "GENERATION_PROGRESS_INTERVAL", 0.0):
+            await evaluator.generate_response("Tell a story", use_cache=False)
+
+        assert updates
+        assert all(thread is threading.main_thread() for _, _, thread in updates)
+        assert 0 < updates[-1][0] < 100
+        assert "tokens" in updates[-1][1]
+        await evaluator.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_generation(self, local_model_evaluator):
+        llm = BlockingLLM(tokens=1000, token_seconds=0.01)
+        evaluator = local_model_evaluator(llm)
+
+        task = asyncio.create_task(evaluator.generate_response("Tell a story", use_cache=False))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await asyncio.sleep(0.1)
+        produced = llm.produced
+        await asyncio.sleep(0.1)
+        assert produced < 1000
+        assert llm.produced == produced  # The model thread stopped at the next token
+        await evaluator.cleanup()
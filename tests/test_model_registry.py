@@ -0,0 +1,127 @@
+"""Tests for the resident local-model registry."""
+
+import asyncio
+import threading
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators.model_registry import LocalModelRegistry
+from storybench.evaluators import local_evaluator
+
+LocalEvaluator = local_evaluator.LocalEvaluator
+
+GB = 1024 ** 3
+
+
+def loader(name: str, loads: list):
+    def load():
+        loads.append((name, threading.current_thread().name))
+        return MagicMock(name=f"{name}-context"), MagicMock(name=f"{name}-llm")
+    return load
+
+
+class TestLocalModelRegistry:
+    """Reuse, LRU eviction within the RAM budget, and single-flight loads."""
+
+    @pytest.mark.asyncio
+    async def test_second_acquire_reuses_model(self):
+        registry = LocalModelRegistry(ram_budget_bytes=10 * GB)
+        loads = []
+        key = ("org/model", "model.gguf", 32768)
+
+        first = await registry.acquire(key, loader("a", loads), 4 * GB)
+        registry.release(first)
+        second = await registry.acquire(key, loader("a", loads), 4 * GB)
+
+        assert second is first
+        assert len(loads) == 1
+        assert loads[0][1].startswith("llama-model.gguf")  # Loaded on the model's own thread
+        assert registry.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_n_ctx_is_part_of_the_key(self):
+        registry = LocalModelRegistry(ram_budget_bytes=None)
+        loads = []
+        await registry.acquire(("org/model", "model.gguf", 32768), loader("a", loads), GB)
+        await registry.acquire(("org/model", "model.gguf", 131072), loader("b", loads), GB)
+        assert len(loads) == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_idle_model_evicted(self):
+        registry = LocalModelRegistry(ram_budget_bytes=10 * GB)
+        loads = []
+        key_a, key_b, key_c = [("org/m", name, 4096) for name in ("a.gguf", "b.gguf", "c.gguf")]
+
+        model_a = await registry.acquire(key_a, loader("a", loads), 4 * GB)
+        model_b = await registry.acquire(key_b, loader("b", loads), 4 * GB)
+        registry.release(model_b)
+        registry.release(model_a)
+        registry.release(await registry.acquire(key_a, loader("a", loads), 4 * GB))  # a is now most recent
+
+        await registry.acquire(key_c, loader("c", loads), 4 * GB)
+
+        assert list(registry.models) == [key_a, key_c]
+        assert model_b.llm is None  # Closed on eviction
+        assert registry.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_models_in_use_are_not_evicted(self):
+        registry = LocalModelRegistry(ram_budget_bytes=6 * GB)
+        loads = []
+        held = await registry.acquire(("org/m", "a.gguf", 4096), loader("a", loads), 4 * GB)
+
+        await registry.acquire(("org/m", "b.gguf", 4096), loader("b", loads), 4 * GB)
+
+        assert held.llm is not None
+        assert len(registry.models) == 2  # Over budget rather than pulling a model from under its user
+        assert registry.evict(("org/m", "a.gguf", 4096)) is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquires_load_once(self):
+        registry = LocalModelRegistry(ram_budget_bytes=None)
+        loads = []
+        key = ("org/model", "model.gguf", 32768)
+
+        models = await asyncio.gather(*[registry.acquire(key, loader("a", loads), GB) for _ in range(3)])
+
+        assert len(loads) == 1
+        assert models[0] is models[1] is models[2]
+        assert models[0].in_use == 3
+
+
+class TestLocalEvaluatorResidency:
+    """Back-to-back evaluators share one loaded model."""
+
+    @pytest.mark.asyncio
+    async def test_setup_loads_once_across_evaluators(self, tmp_path, make_evaluator, passthrough_context_manager):
+        model_file = tmp_path / "model.gguf"
+        model_file.write_bytes(b"gguf")
+        registry = LocalModelRegistry(ram_budget_bytes=None)
+        llm = MagicMock(return_value="test output")
+        create_system = MagicMock(return_value=(passthrough_context_manager, llm))
+
+        config = {"repo_id": "org/model", "filename": "model.gguf"}
+
+        async def download(self, max_retries=3):
+            return model_file
+
+        with patch.object(local_evaluator, "local_model_registry", registry), \
+                patch.object(local_evaluator, "create_32k_system", create_system), \
+                patch.object(LocalEvaluator, "_download_model", download):
+            first = make_evaluator(LocalEvaluator, "local-test", config)
+            assert await first.setup() is True
+            await first.cleanup()
+
+            second = make_evaluator(LocalEvaluator, "local-test", config)
+            assert await second.setup() is True
+
+        assert create_system.call_count == 1
+        assert llm.call_count == 1  # Smoke test only on the first load
+        assert second.llm is llm
+        assert registry.get_stats()["models"][0]["in_use"] == 1
+        await second.cleanup()
+        assert registry.get_stats()["models"][0]["in_use"] == 0
@@ -0,0 +1,190 @@
+"""Tests for the global cross-model work scheduler."""
+
+import asyncio
+import pytest
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.parallel import ParallelSequenceEvaluationRunner, GlobalWorkScheduler, WorkUnit
+from storybench.parallel.rate_limiting import RateLimitManager
+
+
+class ConcurrencyProbe:
+    """Records peak concurrency per provider while fake generations run."""
+
+    def __init__(self):
+        self.current = defaultdict(int)
+        self.peak = defaultdict(int)
+
+    def enter(self, provider: str):
+        self.current[provider] += 1
+        self.peak[provider] = max(self.peak[provider], self.current[provider])
+
+    def exit(self, provider: str):
+        self.current[provider] -= 1
+
+
+class MockEvaluator:
+    """Evaluator double that sleeps briefly instead of calling an API."""
+
+    def __init__(self, provider: str, probe: ConcurrencyProbe):
+        self.provider = provider
+        self.probe = probe
+
+    async def setup(self):
+        return True
+
+    def reset_context(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def generate_response(self, prompt: str, **kwargs):
+        self.probe.enter(self.provider)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.probe.exit(self.provider)
+        return {"response": f"Response to: {prompt[:20]}", "generation_time": 0.01}
+
+
+class MockEvaluationRunner:
+    """Collects saved responses in memory."""
+
+    def __init__(self):
+        self.saved = []
+
+    async def save_response(self, **kwargs):
+        self.saved.append(kwargs)
+
+
+MODELS = [
+    {"name": "claude-a", "model_id": "claude-a"},
+    {"name": "claude-b", "model_id": "claude-b"},
+    {"name": "gpt-a", "model_id": "gpt-a"},
+    {"name": "gemini-a", "model_id": "gemini-a"},
+]
+
+SEQUENCES = {
+    "FilmNarrative": [{"name": f"p{i}", "text": f"Film prompt {i}"} for i in range(3)],
+    "CrossGenre": [{"name": f"p{i}", "text": f"Cross prompt {i}"} for i in range(3)],
+}
+
+
+class TestGlobalWorkScheduler:
+    """Test the global scheduler dispatching rules."""
+
+    @pytest.mark.asyncio
+    async def test_respects_provider_and_model_caps(self):
+        """Units never exceed the provider limit or the per-model cap."""
+        manager = RateLimitManager()
+        scheduler = GlobalWorkScheduler(manager, max_units_per_model=2)
+
+        running_by_model = defaultdict(int)
+        peak_by_model = defaultdict(int)
+
+        for model in ["m1", "m2", "m3"]:
+            for run in range(1, 5):
+                scheduler.submit(WorkUnit(model_name=model, sequence_name="s", run_number=run, provider="local"))
+
+        async def execute(unit):
+            running_by_model[unit.model_name] += 1
+            peak_by_model[unit.model_name] = max(peak_by_model[unit.model_name], running_by_model[unit.model_name])
+            await asyncio.sleep(0.01)
+            running_by_model[unit.model_name] -= 1
+            return {"run_number": unit.run_number, "completed_prompts": 3, "success": True}
+
+        completed = await scheduler.run(execute)
+
+        assert len(completed) == 12
+        assert scheduler.completed_units == 12
+        assert scheduler.pending_units == 0
+        assert all(peak <= 2 for peak in peak_by_model.values())
+
+    @pytest.mark.asyncio
+    async def test_exceptions_become_failed_results(self):
+        """A unit raising an exception is reported as a failed run."""
+        scheduler = GlobalWorkScheduler(RateLimitManager())
+        scheduler.submit(WorkUnit(model_name="m1", sequence_name="s", run_number=1, provider="openai"))
+
+        async def execute(unit):
+            raise RuntimeError("boom")
+
+        completed = await scheduler.run(execute)
+
+        assert len(completed) == 1
+        unit, result = completed[0]
+        assert result["success"] is False
+        assert "boom" in result["error"]
+        assert scheduler.failed_units == 1
+
+
+class TestGlobalScheduling:
+    """Test the runner's cross-model scheduling path."""
+
+    @pytest.mark.asyncio
+    async def test_all_providers_run_concurrently(self):
+        """Models on different providers overlap instead of running one by one."""
+        probe = ConcurrencyProbe()
+        evaluation_runner = MockEvaluationRunner()
+        runner = ParallelSequenceEvaluationRunner(database=None, evaluation_runner=evaluation_runner)
+
+        def factory(model_config):
+            return MockEvaluator(_provider_for(model_config), probe)
+
+        results = await runner.run_parallel_evaluation(
+            evaluation_id="eval-1",
+            models=MODELS,
+            sequences=SEQUENCES,
+            num_runs=3,
+            evaluator_factory=factory
+        )
+
+        assert results["success"] is True
+        assert results["total_workers"] == len(MODELS) * len(SEQUENCES)
+        assert results["successful_workers"] == results["total_workers"]
+        assert len(evaluation_runner.saved) == len(MODELS) * len(SEQUENCES) * 3 * 3
+        assert runner.progress.completed_prompts == runner.progress.total_prompts
+
+        # Every provider had more than one request in flight at some point
+        assert probe.peak["anthropic"] > 1
+        assert probe.peak["openai"] > 1
+        assert probe.peak["google"] > 1
+
+    @pytest.mark.asyncio
+    async def test_model_results_shape_matches_per_model_path(self):
+        """Global and per-model scheduling report the same aggregate structure."""
+        probe = ConcurrencyProbe()
+
+        def factory(model_config):
+            return MockEvaluator(_provider_for(model_config), probe)
+
+        global_runner = ParallelSequenceEvaluationRunner(None, MockEvaluationRunner())
+        legacy_runner = ParallelSequenceEvaluationRunner(None, MockEvaluationRunner(), global_scheduling=False)
+
+        global_results = await global_runner.run_parallel_evaluation("e", MODELS[:2], SEQUENCES, 2, factory)
+        legacy_results = await legacy_runner.run_parallel_evaluation("e", MODELS[:2], SEQUENCES, 2, factory)
+
+        for model_name in ["claude-a", "claude-b"]:
+            global_model = global_results["model_results"][model_name]
+            legacy_model = legacy_results["model_results"][model_name]
+            assert global_model.keys() == legacy_model.keys()
+            assert global_model["completed_prompts"] == legacy_model["completed_prompts"] == 12
+
+            worker = global_model["worker_results"][0]
+            assert [r["run_number"] for r in worker["run_results"]] == [1, 2]
+            assert worker["completed_runs"] == 2
+
+
+def _provider_for(model_config):
+    """Mirror SequenceWorker provider detection for the mock models."""
+    model_id = model_config["model_id"]
+    if "claude" in model_id:
+        return "anthropic"
+    if "gpt" in model_id:
+        return "openai"
+    return "google"
@@ -0,0 +1,143 @@
+"""Tests for the shared provider probe cache."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.utils.probe_cache import ProbeCache, key_fingerprint
+
+
+class CountingProbe:
+    """Probe double that counts how often it actually runs."""
+
+    def __init__(self, result=True, delay=0.02, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class TestProbeCache:
+    """Test single-flight coalescing and TTL caching."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_probe(self):
+        """Fifteen simultaneous setups for one model fire a single probe."""
+        cache = ProbeCache()
+        probe = CountingProbe()
+
+        results = await asyncio.gather(*[
+            cache.get_or_probe("openai", "gpt-4o", "sk-test", probe) for _ in range(15)
+        ])
+
+        assert results == [True] * 15
+        assert probe.calls == 1
+        assert cache.get_stats()["coalesced"] == 14
+
+    @pytest.mark.asyncio
+    async def test_results_cached_until_ttl_expires(self):
+        """A cached result is reused within its TTL and refreshed afterwards."""
+        cache = ProbeCache(ttl_seconds=60)
+        probe = CountingProbe(delay=0)
+
+        with patch("storybench.utils.probe_cache.time.monotonic") as clock:
+            clock.return_value = 0.0
+            await cache.get_or_probe("openai", "gpt-4o", "sk-test", probe)
+            clock.return_value = 59.0
+            await cache.get_or_probe("openai", "gpt-4o", "sk-test", probe)
+            assert probe.calls == 1
+
+            clock.return_value = 61.0
+            await cache.get_or_probe("openai", "gpt-4o", "sk-test", probe)
+            assert probe.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_use_shorter_ttl(self):
+        """Failed probes expire after the failure TTL."""
+        cache = ProbeCache(ttl_seconds=300, failure_ttl_seconds=10)
+        probe = CountingProbe(result=False, delay=0)
+
+        with patch("storybench.utils.probe_cache.time.monotonic") as clock:
+            clock.return_value = 0.0
+            assert await cache.get_or_probe("anthropic", "claude", "key", probe) is False
+            clock.return_value = 11.0
+            await cache.get_or_probe("anthropic", "claude", "key", probe)
+
+        assert probe.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_key_fingerprint_separates_entries(self):
+        """Different models or API keys are probed independently."""
+        cache = ProbeCache()
+        probe = CountingProbe(delay=0)
+
+        await cache.get_or_probe("openai", "gpt-4o", "key-a", probe)
+        await cache.get_or_probe("openai", "gpt-4o", "key-b", probe)
+        await cache.get_or_probe("openai", "gpt-4o-mini", "key-a", probe)
+
+        assert probe.calls == 3
+        assert "key-a" not in str(cache.entries)
+        assert key_fingerprint("key-a") != key_fingerprint("key-b")
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate_and_are_not_cached(self):
+        """Every waiter sees the probe's exception and the next call retries."""
+        cache = ProbeCache()
+        probe = CountingProbe(error=ConnectionError("down"))
+
+        results = await asyncio.gather(*[
+            cache.get_or_probe("google", "gemini", "key", probe) for _ in range(3)
+        ], return_exceptions=True)
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert probe.calls == 1
+
+        probe.error = None
+        assert await cache.get_or_probe("google", "gemini", "key", probe) is True
+        assert probe.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_provider(self):
+        """Invalidation forces the next call to probe again."""
+        cache = ProbeCache()
+        probe = CountingProbe(delay=0)
+
+        await cache.get_or_probe("openai", "gpt-4o", "key", probe)
+        cache.invalidate("openai")
+        await cache.get_or_probe("openai", "gpt-4o", "key", probe)
+
+        assert probe.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelling_first_caller_keeps_shared_probe(self):
+        """Cancelling the caller that started the probe does not cancel the other waiters."""
+        cache = ProbeCache()
+        probe = CountingProbe(delay=0.05)
+
+        first = asyncio.ensure_future(cache.get_or_probe("openai", "gpt-4o", "key", probe))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.ensure_future(cache.get_or_probe("openai", "gpt-4o", "key", probe))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        first.cancel()
+        results = await asyncio.gather(*waiters)
+
+        assert first.cancelled()
+        assert results == [True] * 3
+        assert probe.calls == 1
+        assert cache.get_stats()["cached_probes"] == 1
+        assert cache.get_stats()["in_flight_probes"] == 0
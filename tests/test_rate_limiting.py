@@ -0,0 +1,224 @@
+"""Tests for provider rate limiting in the parallel evaluation system."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.parallel.rate_limiting import (
+    RateLimitManager, ProviderRateLimit, TokenBucket, AdaptiveConcurrencyLimiter
+)
+
+
+class TestTokenBucket:
+    """Test token bucket admission."""
+
+    def test_reserve_within_capacity_is_immediate(self):
+        """Reservations covered by the balance do not wait."""
+        with patch("storybench.parallel.rate_limiting.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(rate_per_minute=60, capacity=5)
+            waits = [bucket.reserve(1) for _ in range(5)]
+
+        assert waits == [0.0] * 5
+
+    def test_reserve_beyond_capacity_returns_wait(self):
+        """Exhausted buckets queue callers one refill interval apart."""
+        with patch("storybench.parallel.rate_limiting.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(rate_per_minute=60, capacity=2)
+            bucket.reserve(1)
+            bucket.reserve(1)
+            first_wait = bucket.reserve(1)
+            second_wait = bucket.reserve(1)
+
+        assert first_wait == pytest.approx(1.0)
+        assert second_wait == pytest.approx(2.0)
+
+    def test_refill_over_time(self):
+        """Tokens refill at the per-minute rate up to capacity."""
+        with patch("storybench.parallel.rate_limiting.time.monotonic") as clock:
+            clock.return_value = 0.0
+            bucket = TokenBucket(rate_per_minute=600)
+            bucket.reserve(600)
+            assert bucket.available() == pytest.approx(0.0)
+
+            clock.return_value = 30.0
+            assert bucket.available() == pytest.approx(300.0)
+
+            clock.return_value = 600.0
+            assert bucket.available() == pytest.approx(600.0)
+
+    def test_oversized_request_is_capped(self):
+        """A request larger than the bucket waits at most one full refill."""
+        with patch("storybench.parallel.rate_limiting.time.monotonic", return_value=0.0):
+            bucket = TokenBucket(rate_per_minute=1000)
+            bucket.reserve(1000)
+            wait = bucket.reserve(50_000)
+
+        assert wait == pytest.approx(60.0)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test AIMD adjustment of the concurrency window."""
+
+    def test_rate_limit_halves_window_with_cooldown(self):
+        """Burst errors from in-flight requests shrink the window only once."""
+        limiter = AdaptiveConcurrencyLimiter(ceiling=10, floor=2, decrease_factor=0.5)
+
+        limiter.on_rate_limited()
+        limiter.on_rate_limited()
+        limiter.on_rate_limited()
+
+        assert limiter.limit == 5
+        assert limiter.decreases == 1
+        assert limiter.rate_limit_errors == 3
+
+    def test_window_respects_floor_and_ceiling(self):
+        """The window never leaves the configured bounds."""
+        limiter = AdaptiveConcurrencyLimiter(ceiling=4, floor=2, decrease_factor=0.1, cooldown_seconds=0)
+
+        limiter.on_rate_limited()
+        assert limiter.limit == 2
+
+        for _ in range(100):
+            limiter.on_success()
+        assert limiter.limit == 4
+
+    def test_additive_increase(self):
+        """Roughly one slot is added per window's worth of successes."""
+        limiter = AdaptiveConcurrencyLimiter(ceiling=20, floor=1, decrease_factor=0.5)
+        limiter.on_rate_limited()
+        assert limiter.limit == 10
+
+        for _ in range(11):
+            limiter.on_success()
+
+        assert limiter.limit == 11
+
+    def test_latency_degradation_triggers_decrease(self):
+        """p95 latency well above the baseline shrinks the window."""
+        limiter = AdaptiveConcurrencyLimiter(ceiling=8, floor=1, decrease_factor=0.5, min_latency_samples=5)
+
+        for _ in range(5):
+            limiter.on_success(latency=1.0)
+        assert limiter.baseline_p95() == pytest.approx(1.0)
+
+        for _ in range(5):
+            limiter.on_success(latency=10.0)
+
+        assert limiter.limit == 4
+        assert limiter.decreases == 1
+
+    def test_slower_model_does_not_look_like_degradation(self):
+        """Each model on a provider is compared against its own baseline."""
+        limiter = AdaptiveConcurrencyLimiter(ceiling=8, floor=1, decrease_factor=0.5, min_latency_samples=5)
+
+        for _ in range(5):
+            limiter.on_success(latency=1.0, model="fast")
+        for _ in range(5):
+            limiter.on_success(latency=20.0, model="slow")
+
+        assert limiter.decreases == 0
+        assert limiter.baseline_p95("fast") == pytest.approx(1.0)
+        assert limiter.baseline_p95("slow") == pytest.approx(20.0)
+
+    def test_baseline_reanchors_after_max_age(self):
+        """An old baseline is replaced by the current p95 instead of pinning the minimum."""
+        limiter = AdaptiveConcurrencyLimiter(ceiling=8, floor=1, decrease_factor=0.5,
+                                             min_latency_samples=5, latency_samples=5,
+                                             baseline_max_age_seconds=60)
+
+        with patch("storybench.parallel.rate_limiting.time.monotonic") as clock:
+            clock.return_value = 0.0
+            for _ in range(5):
+                limiter.on_success(latency=1.0, model="gpt-4o")
+
+            clock.return_value = 61.0
+            for _ in range(5):
+                limiter.on_success(latency=3.0, model="gpt-4o")
+
+        assert limiter.decreases == 0
+        assert limiter.baseline_p95("gpt-4o") == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_waiters_blocked_until_release(self):
+        """Callers beyond the window wait until a slot is released."""
+        limiter = AdaptiveConcurrencyLimiter(ceiling=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        limiter.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert limiter.in_flight == 1
+
+
+class TestRateLimitManager:
+    """Test RateLimitManager admission and stats."""
+
+    def setup_method(self):
+        self.original_limits = RateLimitManager.PROVIDER_LIMITS
+
+    def teardown_method(self):
+        RateLimitManager.PROVIDER_LIMITS = self.original_limits
+
+    @pytest.mark.asyncio
+    async def test_rate_wait_does_not_hold_concurrency_slot(self):
+        """A caller waiting on the token budget leaves its slot free."""
+        RateLimitManager.PROVIDER_LIMITS = {
+            "openai": ProviderRateLimit(max_concurrent=2, requests_per_minute=6000, tokens_per_minute=600)
+        }
+        manager = RateLimitManager()
+
+        # Drain the token bucket, then start a caller that must wait for refill
+        await manager.acquire("openai", estimated_tokens=600)
+        waiter = asyncio.create_task(manager.acquire("openai", estimated_tokens=60))
+        await asyncio.sleep(0.05)
+
+        assert not waiter.done()
+        assert manager.get_provider_stats("openai")["current_concurrent"] == 1
+
+        waiter.cancel()
+        manager.release("openai")
+
+    @pytest.mark.asyncio
+    async def test_acquire_and_release_update_stats(self):
+        """Stats keep their original shape and reflect in-flight requests."""
+        manager = RateLimitManager()
+
+        await manager.acquire("google", estimated_tokens=1000)
+        stats = manager.get_provider_stats("google")
+
+        assert set(stats.keys()) == {
+            "provider", "max_concurrent", "current_concurrent", "requests_per_minute_limit",
+            "requests_this_minute", "utilization_percent", "circuit_breaker_active", "error_count"
+        }
+        assert stats["current_concurrent"] == 1
+        assert stats["requests_this_minute"] == 1
+
+        manager.release("google")
+        assert manager.get_provider_stats("google")["current_concurrent"] == 0
+
+    def test_local_provider_has_no_token_limit(self):
+        """Providers without tokens_per_minute skip the token bucket."""
+        manager = RateLimitManager()
+
+        assert "local" not in manager.token_buckets
+        assert "anthropic" in manager.token_buckets
+
+    def test_only_rate_limit_errors_shrink_window(self):
+        """Ordinary failures are counted without shrinking the window."""
+        manager = RateLimitManager()
+        ceiling = manager.get_max_concurrent("openai")
+
+        manager.record_error("openai", error=ValueError("Invalid prompt"))
+        assert manager.get_max_concurrent("openai") == ceiling
+
+        manager.record_error("openai", error=Exception("Error code: 429 - rate limit exceeded"))
+        assert manager.get_max_concurrent("openai") < ceiling
+        assert manager.get_provider_stats("openai")["circuit_breaker_active"] is True
+        assert manager.get_provider_stats("openai")["error_count"] == 2
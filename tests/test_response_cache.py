@@ -0,0 +1,274 @@
+"""Tests for the content-addressed response cache."""
+
+import json
+import os
+import time
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.evaluators.litellm_evaluator import LiteLLMEvaluator
+from storybench.parallel import SequenceWorker, RateLimitManager, TailLatencyPolicy
+from mongomock_motor import AsyncMongoMockClient
+from storybench.utils.response_cache import (
+    ResponseCache, DiskCacheBackend, MongoCacheBackend, make_cache_key, response_cache
+)
+
+MESSAGES = [{"role": "user", "content": "Tell a story"}]
+
+
+class TestCacheKey:
+    """Keys depend on what is generated, not on how it is sent."""
+
+    def test_key_is_stable_and_content_addressed(self):
+        key = make_cache_key("openai/gpt-4o", MESSAGES, {"temperature": 0.3, "max_tokens": 100})
+        assert key == make_cache_key("openai/gpt-4o", MESSAGES, {"max_tokens": 100, "temperature": 0.3})
+        assert key != make_cache_key("openai/gpt-4o", MESSAGES, {"temperature": 0.7, "max_tokens": 100})
+        assert key != make_cache_key("openai/gpt-4o-mini", MESSAGES, {"temperature": 0.3, "max_tokens": 100})
+
+    def test_transport_arguments_are_ignored(self):
+        params = {"temperature": 0.3}
+        assert make_cache_key("m", MESSAGES, params) == make_cache_key("m", MESSAGES, {**params, "timeout": 60})
+
+    def test_samples_are_distinct(self):
+        assert make_cache_key("m", MESSAGES, {}, sample=1) != make_cache_key("m", MESSAGES, {}, sample=2)
+
+
+class TestDiskCacheBackend:
+    """File-per-entry storage with TTL and LRU eviction."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path))
+        await backend.set("ab12", {"response": "text"})
+        assert await backend.get("ab12") == {"response": "text"}
+        assert await backend.get("cd34") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path), ttl_seconds=0.01)
+        await backend.set("ab12", {"response": "text"})
+        time.sleep(0.05)
+        assert await backend.get("ab12") is None
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path), max_entries=3)
+        for index, key in enumerate(["aa01", "bb02", "cc03"]):
+            await backend.set(key, {"response": key})
+            os.utime(backend._path(key), (1000 + index, 1000 + index))
+        await backend.get("aa01")  # Touch: bb02 and cc03 are now the oldest
+
+        await backend.set("dd04", {"response": "dd04"})  # Over the limit: evict down to 90%
+
+        assert await backend.get("bb02") is None
+        assert await backend.get("cc03") is None
+        assert await backend.get("aa01") is not None
+        assert await backend.get("dd04") is not None
+        assert backend.evictions == 2
+
+    @pytest.mark.asyncio
+    async def test_rewrites_do_not_grow_the_byte_count(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path), max_bytes=10000)
+        for _ in range(3):
+            await backend.set("ab12", {"response": "caf\u00e9 " * 10})
+
+        size = backend._path("ab12").stat().st_size
+        assert backend._bytes == size
+        assert size > len("caf\u00e9 " * 10) + len('{"stored_at": , "value": {"response": ""}}')
+        assert list(tmp_path.glob("*/*.tmp")) == []
+
+    @pytest.mark.asyncio
+    async def test_eviction_expires_entries_kept_fresh_by_hits(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path), max_entries=3, ttl_seconds=60)
+        for index, key in enumerate(["bb02", "cc03"]):
+            await backend.set(key, {"response": key})
+            os.utime(backend._path(key), (1000 + index, 1000 + index))
+        await backend.set("aa01", {"response": "old"})
+        path = backend._path("aa01")
+        path.write_text(json.dumps({"stored_at": time.time() - 120, "value": {"response": "old"}}))
+        os.utime(path)  # Stored long ago, but just hit
+
+        await backend.set("dd04", {"response": "dd04"})  # LRU evicts bb02 and cc03; aa01 has expired
+
+        assert not path.exists()
+        assert await backend.get("dd04") is not None
+        assert backend.evictions == 3
+
+
+class TestMongoCacheBackend:
+    """Shared MongoDB storage with entry limit."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_eviction(self):
+        database = AsyncMongoMockClient()["test_storybench"]
+        backend = MongoCacheBackend(database, max_entries=2, ttl_seconds=3600)
+
+        for key in ["k1", "k2", "k3"]:
+            await backend.set(key, {"response": key})
+
+        assert await database.response_cache.count_documents({}) == 2
+        assert await backend.get("k1") is None
+        assert await backend.get("k3") == {"response": "k3"}
+
+    @pytest.mark.asyncio
+    async def test_cli_backend_is_bounded_by_default(self):
+        """The parallel command's MongoDB cache gets a finite entry limit."""
+        from storybench.cli import _configure_response_cache, parallel_evaluation
+
+        max_entries = next(p for p in parallel_evaluation.params if p.name == "response_cache_max_entries")
+        assert max_entries.default == 10000
+
+        database = AsyncMongoMockClient()["test_storybench"]
+        with patch.object(response_cache, "backend", None):
+            await _configure_response_cache("mongo", None, None, max_entries.default, database)
+            assert response_cache.backend.max_entries == 10000
+            assert response_cache.backend.ttl_seconds is None
+
+
+@pytest.fixture
+def cached_evaluator(make_evaluator):
+    """Build a LiteLLM evaluator that uses ``cache`` unless its config disables caching."""
+    def make(cache=None, **config):
+        evaluator = make_evaluator(
+            LiteLLMEvaluator,
+            name="gpt-test",
+            config={"provider": "openai", "model_name": "gpt-4o", "context_size": 32000, **config},
+            api_keys={"openai": "sk-test"}
+        )
+        if cache is not None and evaluator.response_cache is not None:
+            evaluator.response_cache = cache
+        return evaluator
+    return make
+
+
+def completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=None)
+
+
+class TestEvaluatorCaching:
+    """The cache sits under generate_response."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_provider_and_replays_context(self, cached_evaluator, tmp_path):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)))
+        first, second = cached_evaluator(cache), cached_evaluator(cache)
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   return_value=completion("Once upon a time")) as mock_completion:
+            original = await first.generate_response("Tell a story", temperature=0.3)
+            cached = await second.generate_response("Tell a story", temperature=0.3)
+
+        assert mock_completion.call_count == 1
+        assert cached["response"] == original["response"]
+        assert cached["cached"] is True
+        assert "cached" not in original
+        assert second.generation_history == first.generation_history
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_different_params_and_samples_miss(self, cached_evaluator, tmp_path):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)))
+        evaluator = cached_evaluator(cache)
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   return_value=completion("Story")) as mock_completion:
+            await evaluator.generate_response("Tell a story", temperature=0.3, cache_sample=1)
+            evaluator.reset_context()
+            await evaluator.generate_response("Tell a story", temperature=0.3, cache_sample=2)
+            evaluator.reset_context()
+            await evaluator.generate_response("Tell a story", temperature=0.7, cache_sample=1)
+
+        assert mock_completion.call_count == 3
+        assert "cache_sample" not in mock_completion.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_bypass_flags(self, cached_evaluator, tmp_path):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)))
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   side_effect=[completion("one"), completion("two"), completion("three")]) as mock_completion:
+            await cached_evaluator(cache).generate_response("Prompt")
+            bypassed = await cached_evaluator(cache).generate_response("Prompt", use_cache=False)
+            refreshed = await cached_evaluator(cache).generate_response("Prompt", refresh_cache=True)
+            cached = await cached_evaluator(cache).generate_response("Prompt")
+
+        assert mock_completion.call_count == 3
+        assert bypassed["response"] == "two"
+        assert refreshed["response"] == "three"
+        assert cached["response"] == "three"  # The refresh replaced the entry
+        assert cache.bypassed == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default_and_per_model(self, cached_evaluator, tmp_path):
+        assert cached_evaluator().response_cache.enabled is False
+        assert cached_evaluator(ResponseCache(DiskCacheBackend(str(tmp_path))),
+                              response_cache=False).response_cache is None
+
+    @pytest.mark.asyncio
+    async def test_lookup_serves_a_hit_without_generating(self, cached_evaluator, tmp_path):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)))
+
+        with patch("storybench.evaluators.litellm_evaluator.acompletion",
+                   return_value=completion("Once upon a time")) as mock_completion:
+            assert await cached_evaluator(cache).lookup_cached_response("Tell a story", cache_sample=1) is None
+            await cached_evaluator(cache).generate_response("Tell a story", cache_sample=1, refresh_cache=True)
+            hit = await cached_evaluator(cache).lookup_cached_response("Tell a story", cache_sample=1,
+                                                                        timeout=30.0)
+
+        assert mock_completion.call_count == 1
+        assert hit["response"] == "Once upon a time" and hit["cached"] is True
+        assert hit["cached_generation_time"] is not None
+        assert cache.get_stats()["misses"] == 1  # The refresh did not look up again
+
+
+class CacheHitEvaluator:
+    """Evaluator double whose every prompt is already in the response cache."""
+
+    async def setup(self):
+        return True
+
+    async def lookup_cached_response(self, prompt, context=None, cache_sample=None, **kwargs):
+        return {"response": f"cached answer to {prompt}", "cached": True,
+                "generation_time": 0.001, "cached_generation_time": 12.5}
+
+    async def generate_response(self, prompt, **kwargs):
+        raise AssertionError("a cached prompt must not be generated")
+
+
+class MockEvaluationRunner:
+    """Collects saved responses in memory."""
+
+    def __init__(self):
+        self.saved = []
+
+    async def save_response(self, **kwargs):
+        self.saved.append(kwargs)
+
+
+class TestWorkerCacheHits:
+    """Hits skip admission and never feed latency tracking."""
+
+    @pytest.mark.asyncio
+    async def test_hit_spends_no_budget_and_keeps_its_generation_time(self):
+        policy = TailLatencyPolicy(min_timeout=30.0, max_timeout=300.0, min_samples=1)
+        manager = RateLimitManager(tail_policy=policy)
+        worker = SequenceWorker(
+            worker_id="model_FilmNarrative", sequence_name="FilmNarrative",
+            sequence_prompts=[{"name": "p0", "text": "Prompt"}], model_name="model",
+            model_config={"name": "model", "model_id": "gpt-test"}, num_runs=1,
+            evaluator_factory=lambda config: CacheHitEvaluator(), evaluation_runner=MockEvaluationRunner(),
+            evaluation_id="eval-1", rate_limit_manager=manager
+        )
+
+        result = await worker.execute_run(1)
+
+        assert result["complete"] is True
+        assert worker.evaluation_runner.saved[0]["generation_time"] == 12.5
+        assert manager._requests_this_minute("openai") == 0
+        assert manager.get_provider_stats("openai")["current_concurrent"] == 0
+        assert policy.timeout_for("openai", "model") == 300.0  # No latency sample was recorded
@@ -85,25 +85,24 @@ class TestResponseLLMEvaluationRepository:
         mock_insert_result = MagicMock()
         mock_insert_result.inserted_id = new_eval_id
         mock_motor_collection.insert_one.return_value = mock_insert_result
-        
-        # Data that find_one should return (dict form, as from DB)
-        db_return_data = sample_llm_evaluation_data.copy()
-        db_return_data['_id'] = new_eval_id # Add the _id that MongoDB would assign
-        mock_motor_collection.find_one.return_value = db_return_data
+
+        # Built before saving: insert sets the inserted _id on the caller's model
+        expected_insert_data = sample_llm_evaluation.model_dump(by_alias=True)
+        if expected_insert_data.get("_id") is None: # Pydantic might put _id: None if id was None
+            expected_insert_data.pop("_id", None)
+        assert expected_insert_data["prompt_tokens"] is None
+        assert expected_insert_data["cached_prompt_tokens"] is None
 
         # sample_llm_evaluation has id=None before saving
         created_eval = await evaluation_repo.save(sample_llm_evaluation)
 
-        # Verify insert_one call (BaseRepository.create logic)
-        expected_insert_data = sample_llm_evaluation.model_dump(by_alias=True, exclude_unset=True)
-        if expected_insert_data.get("_id") is None: # Pydantic might put _id: None if id was None
-            expected_insert_data.pop("_id", None)
+        # Verify insert_one call (BaseRepository.insert logic)
         mock_motor_collection.insert_one.assert_called_once_with(expected_insert_data)
         
-        # Verify find_one call (part of repo's save method)
-        mock_motor_collection.find_one.assert_called_once_with({"_id": new_eval_id})
+        # The saved model is returned without reading it back
+        mock_motor_collection.find_one.assert_not_called()
         
-        assert created_eval is not None
+        assert created_eval is sample_llm_evaluation
         assert created_eval.id == new_eval_id
         assert created_eval.response_id == sample_llm_evaluation.response_id
         assert created_eval.evaluating_llm_model == sample_llm_evaluation.evaluating_llm_model
@@ -0,0 +1,134 @@
+"""Tests for sequence workers and run-level concurrency."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.parallel import SequenceWorker, RateLimitManager
+
+
+class RecordingEvaluator:
+    """Evaluator double that records the prompts it receives."""
+
+    instances = []
+
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        RecordingEvaluator.instances.append(self)
+
+    async def setup(self):
+        return True
+
+    def reset_context(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def generate_response(self, prompt: str, context=None, **kwargs):
+        self.prompts.append(context.render(prompt) if context is not None else prompt)
+        await asyncio.sleep(0.02)
+        return {"response": f"answer-{id(self)}-{len(self.prompts)}", "generation_time": 0.02}
+
+
+class MockEvaluationRunner:
+    """Collects saved responses in memory."""
+
+    def __init__(self):
+        self.saved = []
+
+    async def save_response(self, **kwargs):
+        self.saved.append(kwargs)
+
+
+PROMPTS = [{"name": f"prompt{i}", "text": f"Prompt text {i}"} for i in range(3)]
+
+
+def make_worker(concurrent_runs: bool, evaluation_runner=None) -> SequenceWorker:
+    return SequenceWorker(
+        worker_id="model_FilmNarrative",
+        sequence_name="FilmNarrative",
+        sequence_prompts=PROMPTS,
+        model_name="model",
+        model_config={"name": "model", "model_id": "gpt-test"},
+        num_runs=3,
+        evaluator_factory=lambda config: RecordingEvaluator(),
+        evaluation_runner=evaluation_runner or MockEvaluationRunner(),
+        evaluation_id="eval-1",
+        rate_limit_manager=RateLimitManager(),
+        concurrent_runs=concurrent_runs
+    )
+
+
+class TestConcurrentRuns:
+    """Test the concurrent run mode of SequenceWorker."""
+
+    def setup_method(self):
+        RecordingEvaluator.instances = []
+
+    @pytest.mark.asyncio
+    async def test_runs_use_isolated_evaluators_and_context(self):
+        """Each run gets its own evaluator and only sees its own history."""
+        worker = make_worker(concurrent_runs=True)
+
+        results = await worker.execute()
+
+        assert results["success"] is True
+        assert results["completed_runs"] == 3
+        assert results["completed_prompts"] == 9
+        assert len(RecordingEvaluator.instances) == 3
+
+        for evaluator in RecordingEvaluator.instances:
+            own_answers = f"answer-{id(evaluator)}"
+            assert len(evaluator.prompts) == 3
+            # Later prompts only reference this evaluator's earlier answers
+            assert own_answers in evaluator.prompts[2]
+            for other in RecordingEvaluator.instances:
+                if other is not evaluator:
+                    assert f"answer-{id(other)}" not in evaluator.prompts[2]
+
+    @pytest.mark.asyncio
+    async def test_result_structure_matches_sequential_mode(self):
+        """Concurrent and sequential modes return the same per-run structure."""
+        concurrent_results = await make_worker(concurrent_runs=True).execute()
+        sequential_results = await make_worker(concurrent_runs=False).execute()
+
+        assert concurrent_results.keys() == sequential_results.keys()
+        assert [r["run_number"] for r in concurrent_results["run_results"]] == [1, 2, 3]
+        for concurrent_run, sequential_run in zip(concurrent_results["run_results"],
+                                                  sequential_results["run_results"]):
+            assert concurrent_run.keys() == sequential_run.keys()
+            assert concurrent_run["completed_prompts"] == sequential_run["completed_prompts"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_are_faster(self):
+        """Three runs overlap instead of executing back to back."""
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await make_worker(concurrent_runs=False).execute()
+        sequential_duration = loop.time() - start
+
+        start = loop.time()
+        await make_worker(concurrent_runs=True).execute()
+        concurrent_duration = loop.time() - start
+
+        assert concurrent_duration < sequential_duration / 2
+
+
+class TestRunCompletionCallback:
+    """Finished runs are reported as they complete, e.g. to start judging them."""
+
+    @pytest.mark.asyncio
+    async def test_each_successful_run_is_reported_once(self):
+        worker = make_worker(concurrent_runs=False)
+        completed = []
+        worker.on_run_complete = lambda model, sequence, run, result: completed.append((model, sequence, run))
+
+        await worker.execute()
+
+        assert completed == [("model", "FilmNarrative", run) for run in (1, 2, 3)]
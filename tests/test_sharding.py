@@ -0,0 +1,91 @@
+"""Tests for multi-process sharding of parallel evaluations."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.database.models import EvaluationStatus
+from storybench.database.services.evaluation_runner import DatabaseEvaluationRunner
+from storybench.parallel import RateLimitManager
+from storybench.parallel.sharding import launch_local_shards, wait_for_shards, default_rate_share
+
+
+SEQUENCES = {
+    "FilmNarrative": [{"name": f"p{i}", "text": f"Film prompt {i}"} for i in range(3)],
+    "CrossGenre": [{"name": f"p{i}", "text": f"Cross prompt {i}"} for i in range(3)],
+}
+MODELS = [{"name": "gpt-a", "model_id": "gpt-a"}, {"name": "claude-a", "model_id": "claude-a"}]
+
+
+class MockEvaluator:
+    """Evaluator double that answers after a short delay."""
+
+    async def setup(self):
+        return True
+
+    def reset_context(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def generate_response(self, prompt: str, **kwargs):
+        await asyncio.sleep(0.005)
+        return {"response": "ok", "generation_time": 0.005}
+
+
+class TestShardedEvaluation:
+    """Test that shard processes split work and merge progress."""
+
+    @pytest.mark.asyncio
+    async def test_shards_merge_progress_into_one_evaluation(self):
+        """Two runners on one evaluation share the work and its progress document."""
+        database = AsyncMongoMockClient()["storybench_test"]
+        shards = [DatabaseEvaluationRunner(database) for _ in range(2)]
+
+        evaluation = await shards[0].start_evaluation(
+            models=[m["name"] for m in MODELS], sequences=SEQUENCES,
+            criteria={}, global_settings={"num_runs": 2}
+        )
+        evaluation_id = str(evaluation.id)
+
+        results = await asyncio.gather(*[
+            shard.run_parallel_evaluation(evaluation_id, MODELS, SEQUENCES, 2, lambda config: MockEvaluator())
+            for shard in shards
+        ])
+
+        stored = await database["evaluations"].find_one({"_id": evaluation.id})
+        assert all(r["success"] for r in results)
+        assert await database["responses"].count_documents({}) == evaluation.total_tasks
+        assert stored["completed_tasks"] == evaluation.total_tasks
+        assert stored["status"] == EvaluationStatus.COMPLETED.value
+
+    @pytest.mark.asyncio
+    async def test_launch_local_shards_appends_join_options(self):
+        """Launched shards join the evaluation as single workers with a rate share."""
+        check = ("import sys; args = sys.argv[1:]; "
+                 "sys.exit(0 if args[args.index('--evaluation-id') + 1] == 'eval-1' "
+                 "and args[args.index('--workers') + 1] == '1' "
+                 "and float(args[args.index('--rate-share') + 1]) == 0.25 else 1)")
+
+        processes = await launch_local_shards([sys.executable, "-c", check], "eval-1", 4, 0.25)
+
+        assert len(processes) == 3
+        assert await wait_for_shards(processes) == [0, 0, 0]
+
+    def test_rate_share_scales_provider_limits(self):
+        """Each of four shards gets a quarter of every provider budget."""
+        full = RateLimitManager()
+        quarter = RateLimitManager(share=default_rate_share(4))
+
+        for provider, limits in full.limits.items():
+            shard_limits = quarter.limits[provider]
+            assert shard_limits.requests_per_minute <= limits.requests_per_minute / 4
+            assert shard_limits.tokens_per_minute <= limits.tokens_per_minute / 4
+            assert 1 <= shard_limits.max_concurrent < limits.max_concurrent
+            assert shard_limits.min_concurrent <= shard_limits.max_concurrent
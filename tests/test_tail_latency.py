@@ -0,0 +1,229 @@
+"""Tests for adaptive timeouts and hedged requests."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.parallel import SequenceWorker, RateLimitManager, TailLatencyPolicy
+from storybench.parallel.tail_latency import race_with_hedge
+
+
+async def respond(value, delay: float):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def fail(delay: float):
+    await asyncio.sleep(delay)
+    raise RuntimeError("upstream error")
+
+
+class TestTailLatencyPolicy:
+    """Percentile-driven timeouts and the hedge budget."""
+
+    def test_timeout_defaults_to_max_without_history(self):
+        policy = TailLatencyPolicy(max_timeout=300.0)
+        assert policy.timeout_for("openai", "gpt") == 300.0
+
+    def test_timeout_tracks_tail_latency(self):
+        policy = TailLatencyPolicy(min_timeout=5.0, max_timeout=300.0, timeout_multiplier=2.0, min_samples=10)
+        for latency in [10.0] * 19 + [40.0]:
+            policy.record("openai", "gpt", latency)
+
+        assert policy.timeout_for("openai", "gpt") == pytest.approx(80.0)
+        assert policy.timeout_for("openai", "other-model") == 300.0
+
+    def test_timeout_is_bounded(self):
+        policy = TailLatencyPolicy(min_timeout=30.0, max_timeout=60.0, min_samples=1)
+        policy.record("openai", "fast", 0.5)
+        policy.record("openai", "slow", 500.0)
+
+        assert policy.timeout_for("openai", "fast") == 30.0
+        assert policy.timeout_for("openai", "slow") == 60.0
+
+    def test_hedging_is_opt_in_and_budgeted(self):
+        policy = TailLatencyPolicy(min_timeout=1.0, min_samples=5, max_hedge_fraction=0.5)
+        for latency in range(1, 11):
+            policy.record("anthropic", "claude", float(latency))
+
+        assert policy.begin_request("anthropic", "claude")[1] is None  # Hedging off
+
+        policy.hedging = True
+        _, hedge_delay = policy.begin_request("anthropic", "claude")
+        assert hedge_delay == pytest.approx(10.0)  # p95 of 1..10
+
+        policy.hedges = policy.requests  # Budget exhausted
+        assert policy.begin_request("anthropic", "claude")[1] is None
+
+
+class TestRaceWithHedge:
+    """First successful response wins; everything stops at the timeout."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_never_hedges(self):
+        result, hedged, hedge_won = await race_with_hedge(
+            lambda: respond("primary", 0.01), lambda: respond("hedge", 0.0), timeout=1.0, hedge_delay=0.2
+        )
+        assert (result, hedged, hedge_won) == ("primary", False, False)
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_beaten_by_hedge(self):
+        result, hedged, hedge_won = await race_with_hedge(
+            lambda: respond("primary", 1.0), lambda: respond("hedge", 0.01), timeout=2.0, hedge_delay=0.05
+        )
+        assert (result, hedged, hedge_won) == ("hedge", True, True)
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_falls_back_to_primary(self):
+        result, hedged, hedge_won = await race_with_hedge(
+            lambda: respond("primary", 0.2), lambda: fail(0.0), timeout=1.0, hedge_delay=0.05
+        )
+        assert (result, hedged, hedge_won) == ("primary", True, False)
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        with pytest.raises(asyncio.TimeoutError):
+            await race_with_hedge(lambda: respond("primary", 1.0), lambda: respond("hedge", 1.0), timeout=0.05)
+
+    @pytest.mark.asyncio
+    async def test_primary_error_propagates(self):
+        with pytest.raises(RuntimeError, match="upstream error"):
+            await race_with_hedge(lambda: fail(0.0), lambda: respond("hedge", 0.0), timeout=1.0)
+
+
+class SlowFirstEvaluator:
+    """Evaluator double whose first instance is stuck; later instances answer quickly."""
+
+    instances = 0
+
+    def __init__(self):
+        SlowFirstEvaluator.instances += 1
+        self.delay = 5.0 if SlowFirstEvaluator.instances == 1 else 0.01
+
+    async def setup(self):
+        return True
+
+    def reset_context(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def generate_response(self, prompt: str, **kwargs):
+        await asyncio.sleep(self.delay)
+        return {"response": "ok", "generation_time": self.delay}
+
+
+class StreamingDeadlineEvaluator:
+    """Evaluator double that streams until its ``timeout`` and returns the text so far, like LiteLLM."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def setup(self):
+        return True
+
+    async def generate_response(self, prompt: str, context=None, **kwargs):
+        self.calls.append((prompt, context.to_messages() if context else [], kwargs.get("timeout")))
+        if prompt == "Slow prompt":
+            await asyncio.sleep(kwargs["timeout"])
+            return {"response": "Cut off mid", "generation_time": kwargs["timeout"], "partial": True,
+                    "interrupted": f"timeout after {kwargs['timeout']:.0f}s", "timed_out": True}
+        return {"response": "Full answer", "generation_time": 0.0}
+
+
+class MockEvaluationRunner:
+    """Collects saved responses in memory."""
+
+    def __init__(self):
+        self.saved = []
+
+    async def save_response(self, **kwargs):
+        self.saved.append(kwargs)
+
+
+def make_worker(rate_limit_manager: RateLimitManager, evaluator_factory=lambda config: SlowFirstEvaluator(),
+                prompts=({"name": "p0", "text": "Prompt"},)) -> SequenceWorker:
+    return SequenceWorker(
+        worker_id="model_FilmNarrative",
+        sequence_name="FilmNarrative",
+        sequence_prompts=list(prompts),
+        model_name="model",
+        model_config={"name": "model", "model_id": "gpt-test"},
+        num_runs=1,
+        evaluator_factory=evaluator_factory,
+        evaluation_runner=MockEvaluationRunner(),
+        evaluation_id="eval-1",
+        rate_limit_manager=rate_limit_manager
+    )
+
+
+class TestWorkerTailControl:
+    """Sequence workers apply the policy and count hedges in the rate limiter."""
+
+    def setup_method(self):
+        SlowFirstEvaluator.instances = 0
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_is_counted_and_rate_limited(self):
+        policy = TailLatencyPolicy(hedging=True, min_timeout=1.0, max_timeout=2.0, min_samples=1,
+                                   max_hedge_fraction=1.0)
+        policy.record("openai", "model", 0.05)
+        manager = RateLimitManager(tail_policy=policy)
+
+        result = await make_worker(manager).execute_run(1)
+
+        stats = manager.get_tail_latency_stats()["providers"]["openai"]
+        assert result["completed_prompts"] == 1
+        assert stats["hedged_requests"] == 1
+        assert stats["hedge_wins"] == 1
+        assert manager.get_provider_stats("openai")["current_concurrent"] == 0  # Both requests released their slots
+        assert manager._requests_this_minute("openai") == 2
+
+    @pytest.mark.asyncio
+    async def test_winning_hedge_records_end_to_end_latency(self):
+        """The recorded latency includes the hedge delay, not just the hedge's own generation time."""
+        policy = TailLatencyPolicy(hedging=True, min_timeout=1.0, max_timeout=2.0, min_samples=1,
+                                   max_hedge_fraction=1.0)
+        policy.record("openai", "model", 0.05)
+        manager = RateLimitManager(tail_policy=policy)
+
+        worker = make_worker(manager)
+        await worker.execute_run(1)
+
+        assert worker.evaluation_runner.saved[0]["generation_time"] == pytest.approx(0.01)
+        assert policy.samples[("openai", "model")][-1] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_stuck_request_times_out(self):
+        policy = TailLatencyPolicy(min_timeout=0.05, max_timeout=0.1)
+        manager = RateLimitManager(tail_policy=policy)
+
+        result = await make_worker(manager).execute_run(1)
+
+        assert result["completed_prompts"] == 0
+        assert "adaptive timeout" in result["prompt_results"][0]["error"]
+        assert manager.get_tail_latency_stats()["providers"]["openai"]["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_ends_the_stream_and_keeps_it_out_of_the_run(self):
+        """The evaluator gets the adaptive deadline; its partial text is stored but not used as an answer."""
+        policy = TailLatencyPolicy(min_timeout=0.05, max_timeout=0.05)
+        manager = RateLimitManager(tail_policy=policy)
+        evaluator = StreamingDeadlineEvaluator()
+        prompts = [{"name": "p0", "text": "Slow prompt"}, {"name": "p1", "text": "Next prompt"}]
+        worker = make_worker(manager, lambda config: evaluator, prompts)
+
+        result = await worker.execute_run(1)
+
+        assert [call[2] for call in evaluator.calls] == [0.05, 0.05]
+        assert evaluator.calls[1][1] == []  # The cut-off text is not context for the next prompt
+        assert result["completed_prompts"] == 1 and result["complete"] is False
+        assert "cut short" in result["prompt_results"][0]["error"]
+        partial, answer = worker.evaluation_runner.saved
+        assert partial["interrupted"] == "timeout after 0s" and partial["response_text"] == "Cut off mid"
+        assert "interrupted" not in answer
+        assert manager.get_tail_latency_stats()["providers"]["openai"]["timeouts"] == 1
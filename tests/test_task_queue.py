@@ -0,0 +1,302 @@
+"""Tests for the lease-based evaluation task queue."""
+
+import asyncio
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.database.models import EvaluationStatus, TaskStatus
+from storybench.database.repositories import EvaluationTaskRepository, ResponseRepository
+from storybench.database.services.evaluation_runner import DatabaseEvaluationRunner
+from storybench.parallel import ParallelSequenceEvaluationRunner, EvaluationTaskQueue
+
+
+EVALUATION_ID = "eval-queue"
+SEQUENCES = {
+    "FilmNarrative": [{"name": f"p{i}", "text": f"Film prompt {i}"} for i in range(2)],
+    "CrossGenre": [{"name": f"p{i}", "text": f"Cross prompt {i}"} for i in range(2)],
+}
+MODELS = [{"name": "gpt-a", "model_id": "gpt-a"}, {"name": "claude-a", "model_id": "claude-a"}]
+
+
+class MockEvaluator:
+    """Evaluator double that answers immediately."""
+
+    async def setup(self):
+        return True
+
+    def reset_context(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def generate_response(self, prompt: str, **kwargs):
+        await asyncio.sleep(0)
+        return {"response": "ok", "generation_time": 0.0}
+
+
+class FlakyEvaluator(MockEvaluator):
+    """Evaluator double whose calls fail for prompts listed in ``failures``.
+
+    ``failures`` maps a prompt text to how many more times it fails; -1 fails forever.
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+
+    async def generate_response(self, prompt: str, **kwargs):
+        remaining = self.failures.get(prompt, 0)
+        if remaining:
+            self.failures[prompt] = remaining - 1
+            raise RuntimeError("provider error")
+        return await super().generate_response(prompt, **kwargs)
+
+
+class CutOffEvaluator(FlakyEvaluator):
+    """Evaluator double whose listed prompts come back as cut-off streams instead of failing."""
+
+    async def generate_response(self, prompt: str, **kwargs):
+        remaining = self.failures.get(prompt, 0)
+        if remaining:
+            self.failures[prompt] = remaining - 1
+            return {"response": "Cut off", "generation_time": 0.0, "partial": True, "interrupted": "timeout"}
+        return await MockEvaluator.generate_response(self, prompt, **kwargs)
+
+
+class MockEvaluationRunner:
+    """Collects saved responses in memory."""
+
+    def __init__(self):
+        self.saved = []
+
+    async def save_response(self, **kwargs):
+        self.saved.append(kwargs)
+
+
+@pytest.fixture
+def database():
+    return AsyncMongoMockClient()["storybench_test"]
+
+
+@pytest.fixture
+def task_repo(database):
+    return EvaluationTaskRepository(database)
+
+
+class TestEvaluationTaskRepository:
+    """Test atomic claims and lease handling."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_is_idempotent(self, task_repo):
+        """Re-enqueueing an evaluation does not duplicate or reset tasks."""
+        created = await task_repo.enqueue_tasks(EVALUATION_ID, ["m1", "m2"], ["s1"], 3)
+        task = await EvaluationTaskQueue(task_repo, owner="worker-a").claim(EVALUATION_ID, "m1", "s1", 1)
+        await task_repo.complete_task(task.id, "worker-a")
+
+        recreated = await task_repo.enqueue_tasks(EVALUATION_ID, ["m1", "m2"], ["s1"], 3)
+        counts = await task_repo.count_by_status(EVALUATION_ID)
+
+        assert created == 6
+        assert recreated == 0
+        assert counts[TaskStatus.COMPLETED.value] == 1
+        assert counts[TaskStatus.PENDING.value] == 5
+
+    @pytest.mark.asyncio
+    async def test_task_claimed_only_once(self, task_repo):
+        """Two workers racing for one task: exactly one wins."""
+        await task_repo.enqueue_tasks(EVALUATION_ID, ["m1"], ["s1"], 1)
+
+        first = await task_repo.claim_task(EVALUATION_ID, "m1", "s1", 1, "worker-a", 60)
+        second = await task_repo.claim_task(EVALUATION_ID, "m1", "s1", 1, "worker-b", 60)
+
+        assert first is not None and first.lease_owner == "worker-a"
+        assert first.status == TaskStatus.LEASED
+        assert first.attempts == 1
+        assert second is None
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, database, task_repo):
+        """A crashed worker's lease expires and another worker takes over from a clean run."""
+        await task_repo.enqueue_tasks(EVALUATION_ID, ["m1"], ["s1"], 1)
+        crashed = await EvaluationTaskQueue(task_repo, owner="worker-a").claim(EVALUATION_ID, "m1", "s1", 1)
+        await database["responses"].insert_one(
+            {"evaluation_id": EVALUATION_ID, "model_name": "m1", "sequence": "s1", "run": 1}
+        )
+
+        await task_repo.collection.update_one(
+            {"_id": crashed.id}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        queue = EvaluationTaskQueue(task_repo, ResponseRepository(database), owner="worker-b")
+        reclaimed = await queue.claim(EVALUATION_ID, "m1", "s1", 1)
+
+        assert reclaimed.id == crashed.id
+        assert reclaimed.lease_owner == "worker-b"
+        assert reclaimed.attempts == 2
+        assert queue.get_stats()["reclaimed"] == 1
+        assert await database["responses"].count_documents({}) == 0
+        # The crashed worker can no longer settle or renew the task
+        assert await task_repo.complete_task(crashed.id, "worker-a") is False
+        assert await task_repo.renew_lease(crashed.id, "worker-a", 60) is False
+
+    @pytest.mark.asyncio
+    async def test_failed_task_retried_until_max_attempts(self, task_repo):
+        """Failures release the task until attempts run out."""
+        await task_repo.enqueue_tasks(EVALUATION_ID, ["m1"], ["s1"], 1)
+        queue = EvaluationTaskQueue(task_repo, owner="worker-a")
+
+        for attempt in range(2):
+            task = await queue.claim(EVALUATION_ID, "m1", "s1", 1)
+            await task_repo.fail_task(task.id, "worker-a", "boom", max_attempts=2)
+
+        counts = await task_repo.count_by_status(EVALUATION_ID)
+        assert counts[TaskStatus.FAILED.value] == 1
+        assert await queue.claim(EVALUATION_ID, "m1", "s1", 1) is None
+
+
+class TestLostLease:
+    """A worker that loses its lease stops the run and reports nothing for it."""
+
+    @pytest.mark.asyncio
+    async def test_run_is_cancelled_when_renewal_fails(self, task_repo):
+        await task_repo.enqueue_tasks(EVALUATION_ID, ["m1"], ["s1"], 1)
+        queue = EvaluationTaskQueue(task_repo, owner="worker-a", lease_seconds=0.03)
+        task = await queue.claim(EVALUATION_ID, "m1", "s1", 1)
+        saved = []
+
+        async def slow_run():
+            for prompt_index in range(100):
+                await asyncio.sleep(0.005)
+                saved.append(prompt_index)
+            return {"complete": True}
+
+        # Another worker reclaims the expired lease while the run is still going
+        await task_repo.collection.update_one(
+            {"_id": task.id}, {"$set": {"lease_owner": "worker-b"}}
+        )
+        result = await queue.run_leased(task, slow_run())
+        saved_at_return = len(saved)
+        await asyncio.sleep(0.05)
+
+        assert result["skipped"] is True and result["lease_lost"] is True
+        assert result["completed_prompts"] == 0
+        assert 0 < saved_at_return < 100
+        assert len(saved) == saved_at_return
+        assert queue.get_stats()["lost_leases"] == 1
+        assert (await task_repo.count_by_status(EVALUATION_ID))[TaskStatus.LEASED.value] == 1
+
+
+class TestQueuedParallelRuns:
+    """Test the parallel runner driven by the task queue."""
+
+    @pytest.mark.asyncio
+    async def test_resume_runs_only_unfinished_units(self, database, task_repo):
+        """A restarted evaluation skips completed units and retries reclaimed ones."""
+        await task_repo.enqueue_tasks(EVALUATION_ID, ["gpt-a", "claude-a"], list(SEQUENCES), 2)
+
+        # First process finished every gpt-a unit, then died holding a claude-a lease
+        for sequence in SEQUENCES:
+            for run in (1, 2):
+                task = await task_repo.claim_task(EVALUATION_ID, "gpt-a", sequence, run, "dead", 60)
+                await task_repo.complete_task(task.id, "dead")
+        await task_repo.claim_task(EVALUATION_ID, "claude-a", "CrossGenre", 1, "dead", 60)
+        await task_repo.collection.update_many(
+            {"lease_owner": "dead", "status": TaskStatus.LEASED.value},
+            {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        await database["responses"].insert_one({
+            "evaluation_id": EVALUATION_ID, "model_name": "claude-a", "sequence": "CrossGenre", "run": 1
+        })
+
+        evaluation_runner = MockEvaluationRunner()
+        queue = EvaluationTaskQueue(task_repo, ResponseRepository(database), owner="restarted")
+        runner = ParallelSequenceEvaluationRunner(None, evaluation_runner, task_queue=queue)
+
+        results = await runner.run_parallel_evaluation(
+            EVALUATION_ID, MODELS, SEQUENCES, 2, lambda config: MockEvaluator()
+        )
+
+        assert results["success"] is True
+        assert {r["model_name"] for r in evaluation_runner.saved} == {"claude-a"}
+        assert len(evaluation_runner.saved) == 2 * 2 * 2
+        assert results["task_queue_stats"]["reclaimed"] == 1
+        assert await database["responses"].count_documents({"model_name": "claude-a"}) == 0
+        assert (await task_repo.count_by_status(EVALUATION_ID))[TaskStatus.COMPLETED.value] == 8
+
+    @pytest.mark.asyncio
+    async def test_two_processes_split_work_without_overlap(self, task_repo):
+        """Concurrent runners on one evaluation never execute the same unit twice."""
+        saved = MockEvaluationRunner()
+        runners = [
+            ParallelSequenceEvaluationRunner(None, saved, task_queue=EvaluationTaskQueue(task_repo, owner=owner))
+            for owner in ("proc-a", "proc-b")
+        ]
+
+        await asyncio.gather(*[
+            runner.run_parallel_evaluation(EVALUATION_ID, MODELS, SEQUENCES, 2, lambda config: MockEvaluator())
+            for runner in runners
+        ])
+
+        units = [(r["model_name"], r["sequence"], r["run"], r["prompt_index"]) for r in saved.saved]
+        assert len(units) == len(set(units)) == 2 * 2 * 2 * 2
+        assert (await task_repo.count_by_status(EVALUATION_ID))[TaskStatus.COMPLETED.value] == 8
+
+
+class TestFailedRunRetry:
+    """A single process retries its failed units instead of leaving them pending."""
+
+    async def run_single_process(self, database, failures, evaluator_class=FlakyEvaluator):
+        runner = DatabaseEvaluationRunner(database)
+        evaluation = await runner.start_evaluation(
+            models=[m["name"] for m in MODELS], sequences=SEQUENCES,
+            criteria={}, global_settings={"num_runs": 1}
+        )
+        results = await runner.run_parallel_evaluation(
+            str(evaluation.id), MODELS, SEQUENCES, 1, lambda config: evaluator_class(failures)
+        )
+        stored = await database["evaluations"].find_one({"_id": evaluation.id})
+        counts = await runner.task_repo.count_by_status(str(evaluation.id))
+        return evaluation, results, stored, counts
+
+    @pytest.mark.asyncio
+    async def test_run_missing_a_prompt_is_rerun_whole(self, database):
+        """A run whose second prompt failed once is cleared, rerun and completed."""
+        evaluation, results, stored, counts = await self.run_single_process(database, {"Film prompt 1": 1})
+
+        assert counts[TaskStatus.COMPLETED.value] == 4
+        assert stored["status"] == EvaluationStatus.COMPLETED.value
+        assert await database["responses"].count_documents({}) == evaluation.total_tasks
+        assert stored["completed_tasks"] == evaluation.total_tasks
+        assert results["task_queue_stats"]["reclaimed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_run_failing_every_attempt_still_settles_the_evaluation(self, database):
+        """Once a unit fails max_attempts times it is failed for good and the evaluation finishes."""
+        evaluation, results, stored, counts = await self.run_single_process(database, {"Cross prompt 1": -1})
+
+        assert counts[TaskStatus.FAILED.value] == 2  # CrossGenre of both models
+        assert counts[TaskStatus.COMPLETED.value] == 2
+        assert counts[TaskStatus.PENDING.value] == counts[TaskStatus.LEASED.value] == 0
+        assert stored["status"] == EvaluationStatus.COMPLETED.value
+        assert results["task_queue_stats"]["failed"] == 2 * 3
+
+    @pytest.mark.asyncio
+    async def test_cut_off_response_is_stored_as_partial_and_not_counted(self, database):
+        """A run cut off on every attempt keeps its partial text aside; progress counts only answers."""
+        evaluation, results, stored, counts = await self.run_single_process(
+            database, {"Cross prompt 0": -1}, CutOffEvaluator
+        )
+
+        partial = await database["responses"].find({"status": "partial"}).to_list(None)
+        assert [(r["model_name"], r["prompt_index"]) for r in sorted(partial, key=lambda r: r["model_name"])] == [
+            ("claude-a", 0), ("gpt-a", 0)
+        ]
+        assert all(r["error_message"] == "timeout" for r in partial)
+        assert counts[TaskStatus.FAILED.value] == 2
+        assert stored["completed_tasks"] == evaluation.total_tasks - 2
+        assert stored["status"] == EvaluationStatus.COMPLETED.value
@@ -0,0 +1,92 @@
+"""Tests for tokenizer-backed token counting."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storybench.utils.tokenizers import (
+    TokenCounter, TiktokenCounter, CharRatioCounter, LlamaTokenCounter,
+    SegmentTokenCache, TokenizerRegistry
+)
+
+
+class WordCounter(TokenCounter):
+    """One token per whitespace-separated word, recording what it tokenizes."""
+
+    def __init__(self, cache):
+        super().__init__("words", cache)
+        self.tokenized = []
+
+    def _count_segment(self, segment):
+        self.tokenized.append(segment)
+        return len(segment.split())
+
+
+class TestSegmentMemoization:
+    """Repeated history is tokenized once."""
+
+    def test_growing_history_only_tokenizes_new_segments(self):
+        counter = WordCounter(SegmentTokenCache())
+        history = "first story paragraph\n\nsecond paragraph here"
+
+        assert counter.count(history) == 6
+        assert counter.count(f"{history}\n\nthe next prompt") == 9
+
+        assert counter.tokenized == ["first story paragraph\n\n", "second paragraph here",
+                                     "second paragraph here\n\n", "the next prompt"]
+        assert counter.cache.get_stats()["hits"] == 1
+
+    def test_cache_is_bounded(self):
+        counter = WordCounter(SegmentTokenCache(max_entries=2))
+        counter.count("a\n\nb\n\nc")
+        assert counter.cache.get_stats()["entries"] == 2
+
+
+class TestTokenizerRegistry:
+    """Counters resolve per provider/model family."""
+
+    def test_openai_uses_tiktoken(self):
+        registry = TokenizerRegistry()
+        counter = registry.get_counter("openai", "gpt-4o")
+        assert isinstance(counter, TiktokenCounter)
+        assert counter.encoding_name == "o200k_base"
+        assert registry.get_counter("openai", "gpt-4o-mini") is counter
+
+    def test_other_families_use_calibrated_ratios(self):
+        registry = TokenizerRegistry()
+        assert isinstance(registry.get_counter("anthropic", "claude-sonnet-4"), CharRatioCounter)
+        assert registry.get_counter("google", "gemini-2.5-pro").chars_per_token == 4.0
+        assert registry.get_counter().count("x" * 35) == 10  # Default matches the previous estimate
+
+    def test_calibration_follows_reported_usage(self):
+        counter = CharRatioCounter("anthropic", 3.5)
+        for _ in range(30):
+            counter.calibrate(characters=4500, actual_tokens=1000)
+        assert counter.chars_per_token == pytest.approx(4.5, abs=0.01)
+
+    def test_tiktoken_unavailable_falls_back_to_estimate(self):
+        counter = TiktokenCounter("cl100k_base")
+        with patch("tiktoken.get_encoding", side_effect=ConnectionError("offline")) as get_encoding:
+            assert counter.count("x" * 35) == 10
+            assert counter.count("x" * 70) == 20
+        assert get_encoding.call_count == 1  # The failure is not retried on every count
+
+    def test_tiktoken_counts_with_encoding(self):
+        encoding = MagicMock()
+        encoding.encode.side_effect = lambda text, disallowed_special: text.split()
+        counter = TiktokenCounter("cl100k_base")
+        counter.cache = SegmentTokenCache()
+        with patch("tiktoken.get_encoding", return_value=encoding):
+            assert counter.count("one two\n\nthree <|endoftext|>") == 4
+
+    def test_gguf_counter_uses_model_tokenizer(self):
+        llama = MagicMock()
+        llama.tokenize.side_effect = lambda data, add_bos, special: data.split()
+        counter = LlamaTokenCounter(llama, "model.gguf")
+        counter.cache = SegmentTokenCache()
+
+        assert counter.count("three word prompt") == 3
+        assert llama.tokenize.call_args.kwargs["add_bos"] is False
@@ -0,0 +1,116 @@
+"""Tests for the single-query discovery of responses and sequences still to judge."""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mongomock_motor import AsyncMongoMockClient
+from storybench.database.models import Response, ResponseStatus, EvaluationCriteria, EvaluationCriterionItem
+from storybench.database.repositories.response_repo import ResponseRepository
+from storybench.models.config import ModelConfig
+from storybench.database.services.sequence_evaluation_service import SequenceEvaluationService, EvaluatorFactory
+
+
+async def seed(database, evaluation_id="eval-1"):
+    """Three runs of two prompts each; run 2 has one judged response."""
+    responses = [
+        Response(evaluation_id=evaluation_id, model_name="model-a", sequence="FilmNarrative", run=run,
+                 prompt_index=index, prompt_name=f"Prompt {index}", prompt_text="Write",
+                 response=f"run {run} part {index}", generation_time=1.0)
+        for run in (1, 2, 3) for index in (1, 0)  # Inserted out of prompt order
+    ]
+    await database.responses.insert_many([r.model_dump(by_alias=True) for r in responses])
+    judged = next(r for r in responses if r.run == 2 and r.prompt_index == 1)
+    await database.response_llm_evaluations.insert_one({"response_id": judged.id})
+    return responses
+
+
+class TestUnevaluatedDiscovery:
+    """One aggregation replaces a judge-result lookup per response."""
+
+    @pytest.mark.asyncio
+    async def test_unevaluated_sequences_exclude_partly_judged_runs(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        await seed(database)
+        repo = ResponseRepository(database)
+
+        sequences = await repo.find_unevaluated_sequences()
+
+        assert list(sequences) == [("model-a", "FilmNarrative", 1), ("model-a", "FilmNarrative", 3)]
+        assert [r.prompt_index for r in sequences[("model-a", "FilmNarrative", 1)]] == [0, 1]
+        assert await repo.count_sequences() == 3
+
+    @pytest.mark.asyncio
+    async def test_partial_responses_are_never_judged(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        await seed(database)
+        await database.responses.update_one({"run": 1, "prompt_index": 1},
+                                            {"$set": {"status": ResponseStatus.PARTIAL.value}})
+        repo = ResponseRepository(database)
+
+        sequences = await repo.find_unevaluated_sequences()
+        unevaluated = await repo.find_unevaluated(match={"run": 1})
+
+        # Discovery drops the partial response; the evaluation sweep then skips the truncated run
+        assert [r.prompt_index for r in sequences[("model-a", "FilmNarrative", 1)]] == [0]
+        assert [r.prompt_index for r in unevaluated] == [0]
+
+    @pytest.mark.asyncio
+    async def test_unevaluated_responses(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        responses = await seed(database)
+        repo = ResponseRepository(database)
+
+        unevaluated = await repo.find_unevaluated(match={"run": 2})
+
+        assert [r.id for r in unevaluated] == [r.id for r in responses if r.run == 2 and r.prompt_index == 0]
+
+
+class TestEvaluationScopedJudgePass:
+    """Finishing an evaluation judges its own sequences, not the whole history."""
+
+    @pytest.mark.asyncio
+    async def test_only_the_given_evaluation_is_judged(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        await seed(database, "eval-old")
+        current = await seed(database, "eval-new")
+        await database.evaluation_criteria.insert_one(EvaluationCriteria(config_hash="abc", criteria={
+            "creativity": EvaluationCriterionItem(name="creativity", description="Original ideas")
+        }).model_dump(by_alias=True))
+
+        config = ModelConfig(name="judge", type="api", provider="openai", model_name="gpt-4o")
+        with patch.object(EvaluatorFactory, "create_evaluator"):
+            service = SequenceEvaluationService(database, config, {"openai": "key"})
+        service._judge_sequence = AsyncMock(return_value=[])
+
+        results = await service.evaluate_sequences_for_evaluation("eval-new")
+
+        judged = [call.args[0] for call in service._judge_sequence.call_args_list]
+        current_ids = {r.id for r in current}
+        assert results["total_sequences"] == 3
+        assert results["unevaluated_sequences"] == 2
+        assert len(judged) == 2 and all(r.id in current_ids for responses in judged for r in responses)
+
+    @pytest.mark.asyncio
+    async def test_truncated_runs_are_reported_not_judged(self):
+        database = AsyncMongoMockClient()["storybench_test"]
+        await seed(database)
+        await database.responses.update_one({"run": 1, "prompt_index": 1},
+                                            {"$set": {"status": ResponseStatus.PARTIAL.value}})
+        await database.evaluation_criteria.insert_one(EvaluationCriteria(config_hash="abc", criteria={
+            "creativity": EvaluationCriterionItem(name="creativity", description="Original ideas")
+        }).model_dump(by_alias=True))
+
+        config = ModelConfig(name="judge", type="api", provider="openai", model_name="gpt-4o")
+        with patch.object(EvaluatorFactory, "create_evaluator"):
+            service = SequenceEvaluationService(database, config, {"openai": "key"})
+        service._judge_sequence = AsyncMock(return_value=[])
+
+        results = await service.evaluate_sequences_for_evaluation("eval-1", {"FilmNarrative": 2})
+
+        judged = [call.args[0] for call in service._judge_sequence.call_args_list]
+        assert [{r.run for r in responses} for responses in judged] == [{3}]
+        assert results["incomplete_runs"] == ["model-a - FilmNarrative - Run 1 (1/2 prompts)"]